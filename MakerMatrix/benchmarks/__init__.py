@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for MakerMatrix.
+
+dataset generates seeded synthetic inventories (1k to 500k parts), suite times the
+repository and service operations behind the main pages against them, and results stores
+each run as JSON and compares it with a baseline. See __main__ for the command line.
+"""
@@ -0,0 +1,295 @@
+"""
+Command line interface of the benchmark suite.
+
+    python -m MakerMatrix.benchmarks generate --size 10k [--seed 42] [--db PATH] [--force]
+    python -m MakerMatrix.benchmarks run --db PATH [--repeat 5] [--only parts. labels]
+                                         [--output results.json] [--baseline previous.json]
+    python -m MakerMatrix.benchmarks compare results.json previous.json [--threshold 0.25]
+    python -m MakerMatrix.benchmarks mock-suppliers [--port 8089] [--latency 120] [--jitter 40]
+                                                    [--error-rate 0.02] [--rate-limit 60] [--fixtures DIR]
+    python -m MakerMatrix.benchmarks load --db PATH [--scenario bulk|queue] [--supplier lcsc]
+                                          [--parts 200] [--batch-size 10] [--mock-url URL] [--output FILE]
+
+DATABASE_URL is pointed at --db before any MakerMatrix module creates the engine, so the
+services under test never touch the configured database. run and compare exit with status 1
+if a benchmark regressed against the baseline or failed. load starts the mock supplier server
+in-process unless --mock-url points at one started with mock-suppliers.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+DATASET_SUFFIX = ".dataset.json"
+
+
+def _use_database(path: Path) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{path.resolve()}"
+
+
+def _dataset_file(db: Path) -> Path:
+    return db.with_name(db.name + DATASET_SUFFIX)
+
+
+def generate(args) -> int:
+    db = Path(args.db or f"benchmark-{args.size}-seed{args.seed}.db")
+    if db.exists():
+        if not args.force:
+            print(f"{db} already exists (use --force to replace it)", file=sys.stderr)
+            return 2
+        db.unlink()
+    _use_database(db)
+
+    from MakerMatrix.benchmarks.dataset import generate_dataset, parse_size
+    from MakerMatrix.database.db import create_db_and_tables
+    from MakerMatrix.models.models import engine
+
+    parts = parse_size(args.size)
+    create_db_and_tables()
+    print(f"Generating {parts} parts (seed {args.seed}) into {db}")
+    info = generate_dataset(engine, parts, args.seed)
+    info["size"] = args.size
+    _dataset_file(db).write_text(json.dumps(info, indent=2) + "\n")
+
+    for table, count in info["rows"].items():
+        print(f"  {table:<28} {count:>10}")
+    print(f"Done in {info['duration_seconds']} s")
+    return 0
+
+
+def _print_result(name, result) -> None:
+    if "error" in result:
+        print(f"{name:<32} ERROR {result['error']}")
+        return
+    rate = f"  {result['items_per_second']:>9.1f}/s" if "items_per_second" in result else ""
+    print(f"{name:<32} median {result['median_ms']:>10.2f} ms  p95 {result['p95_ms']:>10.2f} ms{rate}")
+
+
+def _compare(current, baseline_path: str, threshold: float) -> int:
+    from MakerMatrix.benchmarks.results import compare_results, format_comparison, load_results
+
+    try:
+        rows = compare_results(current, load_results(baseline_path), threshold)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(format_comparison(rows))
+    failed = [row["name"] for row in rows if row["status"] in ("regression", "error")]
+    if failed:
+        print(f"\n{len(failed)} benchmark(s) regressed or failed: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+def run(args) -> int:
+    db = Path(args.db)
+    dataset_file = _dataset_file(db)
+    if not db.exists() or not dataset_file.exists():
+        print(f"{db} is not a generated benchmark database (run 'generate' first)", file=sys.stderr)
+        return 2
+    dataset = json.loads(dataset_file.read_text())
+    _use_database(db)
+
+    from MakerMatrix.benchmarks.results import build_results, save_results
+    from MakerMatrix.benchmarks.suite import DEFAULT_REPEAT, DEFAULT_WARMUP, BenchmarkContext, run_suite
+    from MakerMatrix.models.models import engine
+
+    repeat = args.repeat or DEFAULT_REPEAT
+    warmup = args.warmup if args.warmup is not None else DEFAULT_WARMUP
+    context = BenchmarkContext(
+        engine, seed=dataset["seed"], import_rows=args.import_rows, labels=args.labels, tasks=args.tasks
+    )
+    print(f"Benchmarking {db} ({dataset['parts']} parts, {repeat} runs each)")
+    benchmarks = asyncio.run(run_suite(context, repeat, warmup, args.only, progress=_print_result))
+
+    results = build_results(dataset, benchmarks, repeat)
+    output = args.output or f"{db.stem}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    save_results(results, output)
+    print(f"Results written to {output}")
+
+    status = 1 if any("error" in result for result in benchmarks.values()) else 0
+    if args.baseline:
+        print()
+        status = max(status, _compare(results, args.baseline, args.threshold))
+    return status
+
+
+def compare(args) -> int:
+    from MakerMatrix.benchmarks.results import load_results
+
+    return _compare(load_results(args.results), args.baseline, args.threshold)
+
+
+def _mock_server(args):
+    from MakerMatrix.benchmarks.mock_suppliers import MockBehavior, MockSupplierServer
+
+    behavior = MockBehavior(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_per_minute=args.rate_limit,
+    )
+    return MockSupplierServer(port=args.port, behavior=behavior, fixtures_dir=args.fixtures, seed=args.seed)
+
+
+def mock_suppliers(args) -> int:
+    from MakerMatrix.benchmarks.mock_suppliers import serve
+
+    server = _mock_server(args)
+    print(f"Mock suppliers on http://{server.host}:{args.port} (set SUPPLIER_MOCK_URL to use them, Ctrl+C stops)")
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+async def _fetch_mock_stats(url: str):
+    import aiohttp
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url.rstrip('/')}/_stats") as response:
+            return await response.json()
+
+
+async def _run_load(context, args):
+    from MakerMatrix.benchmarks.load import run_load
+
+    if args.mock_url:
+        os.environ["SUPPLIER_MOCK_URL"] = args.mock_url
+        result = await run_load(context)
+        result["mock_suppliers"] = await _fetch_mock_stats(args.mock_url)
+        return result
+
+    from MakerMatrix.benchmarks.mock_suppliers import running_in_thread
+
+    server = _mock_server(args)
+    with running_in_thread(server) as url:
+        os.environ["SUPPLIER_MOCK_URL"] = url
+        result = await run_load(context)
+    result["mock_suppliers"] = server.stats()
+    return result
+
+
+def load(args) -> int:
+    db = Path(args.db)
+    _use_database(db)
+    # Datasheets and images downloaded during enrichment go next to the database
+    os.environ["STATIC_FILES_PATH"] = str(db.resolve().with_name(f"{db.stem}-static"))
+
+    from MakerMatrix.benchmarks.load import MOCK_CREDENTIALS, LoadContext
+    from MakerMatrix.benchmarks.results import environment
+    from MakerMatrix.database.db import create_db_and_tables
+    from MakerMatrix.models.models import engine
+
+    # Never send real credentials from the environment or .env to the mock server
+    os.environ.update(MOCK_CREDENTIALS)
+    create_db_and_tables()
+    context = LoadContext(
+        engine, supplier=args.supplier, scenario=args.scenario, parts=args.parts, batch_size=args.batch_size
+    )
+    print(f"Enriching {args.parts} {args.supplier} parts ({args.scenario}) against {db}")
+    result = asyncio.run(_run_load(context, args))
+    result["environment"] = environment()
+
+    enrichment, database = result["enrichment"], result["database"]
+    latency = enrichment["latency"]
+    print(f"Import      {result['import']['seconds']:>9.2f} s  {result['import']['parts_per_second']:>9.1f} parts/s")
+    print(
+        f"Enrichment  {enrichment['seconds']:>9.2f} s  {enrichment['parts_per_minute'] or 0:>9.1f} parts/min  "
+        f"({enrichment['enriched']} enriched, {enrichment['failed']} failed)"
+    )
+    if latency["count"]:
+        print(
+            f"Per part    p50 {latency['p50_ms']:.0f} ms  p95 {latency['p95_ms']:.0f} ms  "
+            f"p99 {latency['p99_ms']:.0f} ms  max {latency['max_ms']:.0f} ms"
+        )
+    print(
+        f"Database    {database['statements']} statements ({database['statements_per_part']}/part), "
+        f"{database['db_seconds']:.2f} s, {database['locked_errors']} locked errors, "
+        f"peak {database['peak_checked_out_connections']} connections"
+    )
+    supplier_stats = result["mock_suppliers"].get(args.supplier, {})
+    print(
+        f"Mock        {supplier_stats.get('requests', 0)} requests, {supplier_stats.get('rate_limited', 0)} rate limited, "
+        f"{supplier_stats.get('errors', 0)} injected errors"
+    )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2, default=str) + "\n")
+        print(f"Results written to {args.output}")
+    return 0 if enrichment["enriched"] else 1
+
+
+def _add_mock_arguments(parser) -> None:
+    parser.add_argument("--port", type=int, default=8089, help="mock server port (0 picks a free one)")
+    parser.add_argument("--latency", type=float, default=0.0, help="response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency of up to this many ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per minute before 429 (0: unlimited)")
+    parser.add_argument("--fixtures", help="directory of <supplier>/<part number>.json response fixtures")
+    parser.add_argument("--seed", type=int, default=42, help="seed of the latency and error injection")
+
+
+def main(argv=None) -> int:
+    # Only modules that do not create the engine may be imported before the database is chosen
+    from MakerMatrix.benchmarks.load import DEFAULT_BATCH_SIZE, DEFAULT_PARTS, LOAD_SUPPLIERS, SCENARIOS
+    from MakerMatrix.benchmarks.results import DEFAULT_THRESHOLD
+
+    parser = argparse.ArgumentParser(prog="python -m MakerMatrix.benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-v", "--verbose", action="store_true", help="log service output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = commands.add_parser("generate", help="create a synthetic dataset")
+    generate_parser.add_argument("--size", default="10k", help="1k, 10k, 100k, 500k or a number of parts")
+    generate_parser.add_argument("--seed", type=int, default=42)
+    generate_parser.add_argument("--db", help="SQLite file to create (default: benchmark-<size>-seed<seed>.db)")
+    generate_parser.add_argument("--force", action="store_true", help="replace an existing file")
+    generate_parser.set_defaults(handler=generate)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks against a generated dataset")
+    run_parser.add_argument("--db", required=True)
+    run_parser.add_argument("--repeat", type=int, help="timed runs per benchmark (default: 5)")
+    run_parser.add_argument("--warmup", type=int, help="untimed runs per benchmark (default: 1)")
+    run_parser.add_argument("--only", nargs="+", metavar="PREFIX", help="benchmark name prefixes, e.g. parts.search")
+    run_parser.add_argument("--output", help="result file (default: <db>-<timestamp>.json)")
+    run_parser.add_argument("--baseline", help="result file to compare against")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run_parser.add_argument("--import-rows", type=int, default=100, help="rows per CSV import")
+    run_parser.add_argument("--labels", type=int, default=25, help="labels per render batch")
+    run_parser.add_argument("--tasks", type=int, default=20, help="tasks per throughput batch")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare a result file with a baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser.set_defaults(handler=compare)
+
+    mock_parser = commands.add_parser("mock-suppliers", help="serve the mock supplier APIs")
+    _add_mock_arguments(mock_parser)
+    mock_parser.set_defaults(handler=mock_suppliers)
+
+    load_parser = commands.add_parser("load", help="measure end-to-end enrichment throughput")
+    load_parser.add_argument("--db", required=True, help="SQLite file to run against (created if missing)")
+    load_parser.add_argument("--scenario", choices=SCENARIOS, default="bulk")
+    load_parser.add_argument("--supplier", choices=LOAD_SUPPLIERS, default="lcsc")
+    load_parser.add_argument("--parts", type=int, default=DEFAULT_PARTS)
+    load_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="parts enriched concurrently")
+    load_parser.add_argument("--mock-url", help="use a running mock-suppliers server instead of an in-process one")
+    load_parser.add_argument("--output", help="write the measurements to this JSON file")
+    _add_mock_arguments(load_parser)
+    load_parser.set_defaults(handler=load, port=0)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,651 @@
+"""
+Benchmark Dataset - seeded synthetic inventories for performance work.
+
+generate_dataset() fills an empty database with an inventory of a given number of parts:
+a location tree that gets deeper as the inventory grows, containers with simple and grid
+slots, parts with parametric properties, allocations (some split between bulk storage and
+working stock), categories, tags, projects with BOM quantities, pricing history and an
+activity log. The same size and seed always produce the same rows, ids included, so two
+runs on different machines or commits measure the same data.
+
+Rows are written with Core executemany in chunks and therefore bypass the ORM flush hooks.
+The data those hooks maintain (location paths, cached part totals, inventory aggregates, the
+property index) and the tag and project counters are rebuilt once at the end.
+"""
+
+import logging
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_metadata_models import PartPricingHistory
+from MakerMatrix.models.part_models import PartCategoryLink, PartModel
+from MakerMatrix.models.project_models import PartProjectLink, ProjectModel
+from MakerMatrix.models.system_models import ActivityLogModel
+from MakerMatrix.models.tag_models import PartTagLink, TagModel
+from MakerMatrix.repositories.inventory_aggregate_repository import InventoryAggregateRepository, set_stale
+from MakerMatrix.repositories.location_path_repository import LocationPathRepository
+from MakerMatrix.repositories.part_property_repository import PartPropertyRepository
+
+logger = logging.getLogger(__name__)
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "500k": 500_000}
+DEFAULT_SEED = 42
+
+INSERT_CHUNK_SIZE = 5000
+
+# Shape of the location tree
+PARTS_PER_CONTAINER = 40
+CONTAINERS_PER_SHELF = 6
+TREE_FANOUT = 5
+# Location types of the tree levels, from the shelves up
+LEVEL_TYPES = ["shelf", "rack", "cabinet", "room", "building", "site"]
+
+E12 = (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2)
+SMD_PACKAGES = ("0402", "0603", "0805", "1206")
+QUANTITIES = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 4000)
+QUANTITY_WEIGHTS = (3, 6, 6, 10, 14, 14, 14, 12, 8, 6, 4, 3)
+
+SUPPLIERS = ("LCSC", "DIGIKEY", "MOUSER", None)
+SUPPLIER_WEIGHTS = (45, 25, 18, 12)
+SUPPLIER_URLS = {
+    "LCSC": "https://www.lcsc.com",
+    "DIGIKEY": "https://www.digikey.com",
+    "MOUSER": "https://www.mouser.com",
+    "MCMASTER": "https://www.mcmaster.com",
+}
+
+BASE_TAGS = [
+    "smd",
+    "tht",
+    "esd-sensitive",
+    "rohs",
+    "obsolete",
+    "reorder",
+    "prototype",
+    "todo",
+    "high-voltage",
+    "precision",
+    "automotive",
+    "low-power",
+    "salvaged",
+    "spare",
+    "kit",
+]
+PROJECT_STATUSES = ("planning", "active", "active", "completed", "archived")
+ACTIVITY_ACTIONS = ("updated", "updated", "printed", "moved", "quantity_changed")
+
+
+def parse_size(size: str) -> int:
+    """Number of parts for a size name ("10k") or a plain or suffixed number ("60k", "2500")"""
+    text = str(size).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    multiplier = 1
+    if text.endswith("k"):
+        text, multiplier = text[:-1], 1000
+    try:
+        parts = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid dataset size: {size!r} (use {', '.join(SIZES)} or a number of parts)")
+    if parts < 1:
+        raise ValueError("A dataset needs at least one part")
+    return parts
+
+
+def _si(value: float) -> str:
+    """4700 -> "4.7k", 1e-07 -> "100n" """
+    for prefix, factor in (("G", 1e9), ("M", 1e6), ("k", 1e3), ("", 1.0), ("m", 1e-3), ("u", 1e-6), ("n", 1e-9)):
+        if value >= factor * 0.999:
+            return f"{value / factor:.3g}{prefix}"
+    return f"{value / 1e-12:.3g}p"
+
+
+# === Component catalog ===
+# Each builder returns (additional_properties, description)
+
+
+def _resistor(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    resistance = _si(rng.choice(E12) * 10 ** rng.randint(0, 6))
+    package = rng.choice(SMD_PACKAGES)
+    tolerance = rng.choice(("1%", "5%"))
+    power = {"0402": "1/16W", "0603": "1/10W", "0805": "1/8W", "1206": "1/4W"}[package]
+    properties = {"resistance": f"{resistance}Ω", "tolerance": tolerance, "power": power, "package": package}
+    return properties, f"{resistance}Ω ±{tolerance} {power} {package} Thick Film Resistor"
+
+
+def _capacitor(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    capacitance = _si(rng.choice(E12) * 10 ** rng.randint(-12, -5))
+    voltage = rng.choice(("6.3V", "10V", "16V", "25V", "50V", "100V"))
+    package = rng.choice(SMD_PACKAGES)
+    dielectric = rng.choice(("X7R", "X5R", "C0G"))
+    properties = {
+        "capacitance": f"{capacitance}F",
+        "voltage_rating": voltage,
+        "tolerance": rng.choice(("5%", "10%", "20%")),
+        "dielectric": dielectric,
+        "package": package,
+    }
+    return properties, f"{capacitance}F {voltage} {dielectric} {package} Multilayer Ceramic Capacitor"
+
+
+def _inductor(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    inductance = _si(rng.choice(E12) * 10 ** rng.randint(-7, -3))
+    current = rng.choice(("0.5A", "1A", "2A", "3.5A"))
+    properties = {"inductance": f"{inductance}H", "current_rating": current, "package": rng.choice(SMD_PACKAGES)}
+    return properties, f"{inductance}H {current} Power Inductor"
+
+
+def _diode(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    kind = rng.choice(("Schottky", "Zener", "Rectifier", "TVS"))
+    voltage = rng.choice(("5.1V", "12V", "30V", "40V", "100V", "400V"))
+    properties = {"diode_type": kind, "voltage_rating": voltage, "package": rng.choice(("SOD-123", "SMA", "SMB"))}
+    return properties, f"{voltage} {kind} Diode {properties['package']}"
+
+
+def _transistor(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    kind = rng.choice(("N-Channel MOSFET", "P-Channel MOSFET", "NPN", "PNP"))
+    voltage = rng.choice(("20V", "30V", "40V", "60V", "100V"))
+    current = rng.choice(("200mA", "500mA", "2A", "5A", "30A"))
+    package = rng.choice(("SOT-23", "SOT-223", "TO-252", "TO-220"))
+    properties = {"transistor_type": kind, "voltage_rating": voltage, "current_rating": current, "package": package}
+    return properties, f"{voltage} {current} {kind} {package}"
+
+
+def _led(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    color = rng.choice(("Red", "Green", "Blue", "Yellow", "White", "RGB"))
+    package = rng.choice(SMD_PACKAGES + ("5mm", "3mm"))
+    properties = {"color": color, "forward_voltage": rng.choice(("2V", "3.2V")), "package": package}
+    return properties, f"{color} LED {package}"
+
+
+def _ic(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    function = rng.choice(("Microcontroller", "Op Amp", "LDO Regulator", "Buck Converter", "EEPROM", "Logic Gate"))
+    package, pins = rng.choice((("SOIC-8", 8), ("TSSOP-20", 20), ("QFN-32", 32), ("LQFP-48", 48), ("SOT-23-5", 5)))
+    properties = {
+        "package": package,
+        "pins": pins,
+        "operating_voltage": rng.choice(("1.8V", "3.3V", "5V")),
+        "interface": rng.choice(("SPI", "I2C", "UART", "GPIO")),
+    }
+    return properties, f"{function} {package}"
+
+
+def _connector(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    pins = rng.randint(2, 40)
+    pitch = rng.choice(("1.25mm", "2.0mm", "2.54mm"))
+    family = rng.choice(("Pin Header", "JST PH", "JST XH", "Molex Micro-Fit", "USB-C Receptacle"))
+    return {"pins": pins, "pitch": pitch, "mounting": rng.choice(("SMD", "THT"))}, f"{family} {pins}P {pitch}"
+
+
+def _crystal(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    frequency = rng.choice(("8MHz", "12MHz", "16MHz", "25MHz", "32.768kHz"))
+    properties = {"frequency": frequency, "load_capacitance": rng.choice(("12pF", "18pF", "20pF"))}
+    return properties, f"{frequency} Crystal Oscillator"
+
+
+def _hardware(rng: random.Random) -> Tuple[Dict[str, Any], str]:
+    thread = rng.choice(("M2", "M2.5", "M3", "M4", "M5"))
+    length = rng.choice((4, 6, 8, 10, 12, 16, 20))
+    kind = rng.choice(("Socket Head Cap Screw", "Button Head Screw", "Standoff", "Hex Nut", "Washer"))
+    material = rng.choice(("Stainless Steel", "Zinc-Plated Steel", "Nylon", "Brass"))
+    return {"thread": thread, "length": f"{length}mm", "material": material}, f"{thread}x{length} {material} {kind}"
+
+
+# (component_type, category, weight, manufacturers, mpn prefix, builder, unit price range)
+CATALOG = [
+    ("resistor", "Resistors", 30, ("Yageo", "UniOhm", "Vishay"), "RC", _resistor, (0.001, 0.05)),
+    ("capacitor", "Capacitors", 24, ("Samsung", "Murata", "Yageo"), "CL", _capacitor, (0.002, 0.4)),
+    ("inductor", "Inductors", 4, ("Sunlord", "Bourns"), "SWPA", _inductor, (0.05, 0.8)),
+    ("diode", "Diodes", 5, ("ON Semi", "Diodes Inc", "Vishay"), "SS", _diode, (0.02, 0.3)),
+    ("transistor", "Transistors", 5, ("ON Semi", "Infineon", "Nexperia"), "BSS", _transistor, (0.02, 1.5)),
+    ("led", "LEDs", 4, ("Everlight", "Kingbright"), "LTST", _led, (0.01, 0.2)),
+    ("ic", "Integrated Circuits", 12, ("Texas Instruments", "STMicro", "Microchip", "Espressif"), "TPS", _ic, (0.2, 9)),
+    ("connector", "Connectors", 8, ("JST", "Molex", "Amphenol"), "B", _connector, (0.05, 2)),
+    ("crystal", "Crystals", 3, ("Epson", "Abracon"), "FA", _crystal, (0.1, 0.9)),
+    ("hardware", "Hardware", 5, ("McMaster-Carr", "Bolt Depot"), "91290A", _hardware, (0.03, 0.6)),
+]
+CATALOG_WEIGHTS = [entry[2] for entry in CATALOG]
+
+
+# === Writing ===
+
+
+class _BulkWriter:
+    """Buffers rows per table and writes them with executemany in chunks"""
+
+    def __init__(self, conn: Connection, chunk_size: int = INSERT_CHUNK_SIZE):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self._buffers: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, table, row: Dict[str, Any]) -> None:
+        buffer = self._buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self._write(table)
+
+    def flush(self) -> None:
+        for table in list(self._buffers):
+            self._write(table)
+
+    def _write(self, table) -> None:
+        rows = self._buffers.pop(table, [])
+        if rows:
+            self.conn.execute(table.insert(), rows)
+            self.counts[table.name] += len(rows)
+
+
+class _Generator:
+    """One generation run; all randomness comes from a single seeded Random"""
+
+    def __init__(self, conn: Connection, parts: int, seed: int, now: datetime):
+        self.rng = random.Random(seed)
+        self.parts = parts
+        self.now = now
+        self.writer = _BulkWriter(conn)
+        self.category_ids: Dict[str, str] = {}
+        self.tag_ids: List[str] = []
+        self.tag_weights: List[float] = []
+        self.part_ids: List[str] = []
+        self.shelf_ids: List[str] = []
+        self.slot_ids: List[str] = []
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def past(self, days: float) -> datetime:
+        """A random moment within the last `days` days"""
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def run(self) -> None:
+        self.categories()
+        self.tags()
+        self.locations()
+        self.part_rows()
+        self.projects()
+        self.location_activity()
+        self.writer.flush()
+
+    def categories(self) -> None:
+        for _, name, *_ in CATALOG:
+            category_id = self.uuid()
+            self.category_ids[name] = category_id
+            self.writer.add(
+                CategoryModel.__table__,
+                {"id": category_id, "name": name, "description": f"{name} (generated)", "parent_id": None},
+            )
+
+    def tags(self) -> None:
+        names = BASE_TAGS + [f"batch-{n:03d}" for n in range(max(0, self.parts // 250 - len(BASE_TAGS)))]
+        for rank, name in enumerate(names):
+            tag_id = self.uuid()
+            self.tag_ids.append(tag_id)
+            # A few tags are on many parts, most on few
+            self.tag_weights.append(1.0 / (rank + 1))
+            self.writer.add(
+                TagModel.__table__,
+                {
+                    "id": tag_id,
+                    "name": name,
+                    "name_lower": name.lower(),
+                    "color": f"#{self.rng.randrange(0x1000000):06X}",
+                    "created_at": self.past(1000),
+                    "updated_at": self.now,
+                    "is_system": False,
+                    "is_active": True,
+                },
+            )
+
+    def _location(self, name: str, parent_id: Optional[str], location_type: str, **fields) -> str:
+        location_id = self.uuid()
+        row = {
+            "id": location_id,
+            "name": name,
+            "parent_id": parent_id,
+            "location_type": location_type,
+            "slot_count": None,
+            "slot_naming_pattern": None,
+            "slot_layout_type": None,
+            "grid_rows": None,
+            "grid_columns": None,
+            "is_auto_generated_slot": False,
+            "slot_number": None,
+            "slot_metadata": None,
+        }
+        row.update(fields)
+        self.writer.add(LocationModel.__table__, row)
+        return location_id
+
+    def locations(self) -> None:
+        containers = max(2, math.ceil(self.parts / PARTS_PER_CONTAINER))
+        # Level sizes from the shelves up to a single root; bigger inventories get deeper trees
+        levels = [math.ceil(containers / CONTAINERS_PER_SHELF)]
+        while levels[-1] > 1:
+            levels.append(math.ceil(levels[-1] / TREE_FANOUT))
+
+        parents: List[str] = []
+        for depth, count in reversed(list(enumerate(levels))):
+            location_type = LEVEL_TYPES[depth] if depth < len(LEVEL_TYPES) else "area"
+            ids = [
+                self._location(
+                    f"{location_type.title()} {n + 1}", parents[n // TREE_FANOUT] if parents else None, location_type
+                )
+                for n in range(count)
+            ]
+            parents = ids
+        self.shelf_ids = parents
+
+        for n in range(containers):
+            shelf_id = self.shelf_ids[n // CONTAINERS_PER_SHELF]
+            if self.rng.random() < 0.35:
+                rows, columns = self.rng.choice(((3, 4), (4, 6), (6, 8)))
+                container_id = self._location(
+                    f"Box {n + 1}",
+                    shelf_id,
+                    "container",
+                    slot_count=rows * columns,
+                    slot_naming_pattern="R{row}-C{col}",
+                    slot_layout_type="grid",
+                    grid_rows=rows,
+                    grid_columns=columns,
+                )
+                cells = [(row, column) for row in range(1, rows + 1) for column in range(1, columns + 1)]
+                for number, (row, column) in enumerate(cells, start=1):
+                    self.slot_ids.append(
+                        self._location(
+                            f"R{row}-C{column}",
+                            container_id,
+                            "slot",
+                            is_auto_generated_slot=True,
+                            slot_number=number,
+                            slot_metadata={"row": row, "column": column},
+                        )
+                    )
+            else:
+                slot_count = self.rng.choice((12, 24))
+                container_id = self._location(
+                    f"Cassette {n + 1}",
+                    shelf_id,
+                    "container",
+                    slot_count=slot_count,
+                    slot_naming_pattern="Slot {n}",
+                    slot_layout_type="simple",
+                )
+                for number in range(1, slot_count + 1):
+                    self.slot_ids.append(
+                        self._location(
+                            f"Slot {number}", container_id, "slot", is_auto_generated_slot=True, slot_number=number
+                        )
+                    )
+
+    def part_rows(self) -> None:
+        for index in range(self.parts):
+            component_type, category, _, manufacturers, prefix, build, price_range = self.rng.choices(
+                CATALOG, weights=CATALOG_WEIGHTS
+            )[0]
+            properties, description = build(self.rng)
+            mpn = f"{prefix}{index:07d}-{self.rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ')}"
+            supplier = "MCMASTER" if component_type == "hardware" else self.rng.choices(SUPPLIERS, SUPPLIER_WEIGHTS)[0]
+            supplier_part_number = _supplier_part_number(self.rng, supplier, mpn)
+            created_at = self.past(3 * 365)
+            part_id = self.uuid()
+            self.part_ids.append(part_id)
+
+            self.writer.add(
+                PartModel.__table__,
+                {
+                    "id": part_id,
+                    "part_name": mpn,
+                    "part_number": supplier_part_number or mpn,
+                    "description": description,
+                    "manufacturer": self.rng.choice(manufacturers),
+                    "manufacturer_part_number": mpn,
+                    "component_type": component_type,
+                    "supplier": supplier,
+                    "supplier_part_number": supplier_part_number,
+                    "supplier_url": SUPPLIER_URLS.get(supplier),
+                    "additional_properties": properties,
+                    "created_at": created_at,
+                    "updated_at": created_at + (self.now - created_at) * self.rng.random(),
+                },
+            )
+            # A few parts are left uncategorized
+            if self.rng.random() < 0.95:
+                self.writer.add(
+                    PartCategoryLink.__table__, {"part_id": part_id, "category_id": self.category_ids[category]}
+                )
+            self.allocations(part_id)
+            self.part_tags(part_id)
+            self.pricing(part_id, supplier, price_range, created_at)
+            self.part_activity(part_id, mpn, created_at)
+
+    def allocations(self, part_id: str) -> None:
+        if self.rng.random() < 0.08:
+            return  # Not stored anywhere yet
+        quantity = self.rng.choices(QUANTITIES, QUANTITY_WEIGHTS)[0]
+        primary = self.rng.choice(self.slot_ids) if self.rng.random() < 0.7 else self.rng.choice(self.shelf_ids)
+        self._allocation(part_id, primary, quantity, True)
+        # Bulk stock with some working stock split off into a slot
+        if quantity >= 100 and self.rng.random() < 0.4:
+            working = self.rng.choice(self.slot_ids)
+            if working != primary:
+                self._allocation(part_id, working, self.rng.randint(1, quantity // 10), False)
+
+    def _allocation(self, part_id: str, location_id: str, quantity: int, primary: bool) -> None:
+        allocated_at = self.past(2 * 365)
+        self.writer.add(
+            PartLocationAllocation.__table__,
+            {
+                "id": self.uuid(),
+                "part_id": part_id,
+                "location_id": location_id,
+                "quantity_at_location": quantity,
+                "is_primary_storage": primary,
+                "allocated_at": allocated_at,
+                "last_updated": allocated_at,
+                "notes": None,
+                "auto_synced": False,
+            },
+        )
+
+    def part_tags(self, part_id: str) -> None:
+        count = self.rng.choices((0, 1, 2, 3, 4), (25, 35, 25, 10, 5))[0]
+        tag_ids = set(self.rng.choices(self.tag_ids, self.tag_weights, k=count)) if count else ()
+        for tag_id in sorted(tag_ids):
+            self.writer.add(
+                PartTagLink.__table__,
+                {"part_id": part_id, "tag_id": tag_id, "added_at": self.past(365), "added_by": "admin"},
+            )
+
+    def pricing(self, part_id: str, supplier: Optional[str], price_range: Tuple[float, float], since: datetime) -> None:
+        if supplier is None:
+            return
+        price = self.rng.uniform(*price_range)
+        entries = self.rng.randint(1, 4)
+        valid_from = since
+        for n in range(entries):
+            current = n == entries - 1
+            valid_until = None if current else valid_from + (self.now - valid_from) * self.rng.uniform(0.2, 0.6)
+            self.writer.add(
+                PartPricingHistory.__table__,
+                {
+                    "id": self.uuid(),
+                    "part_id": part_id,
+                    "supplier": supplier,
+                    "unit_price": round(price, 4),
+                    "currency": "USD",
+                    "stock_quantity": self.rng.randint(0, 200_000),
+                    "pricing_tiers": {"1": round(price, 4), "10": round(price * 0.85, 4), "100": round(price * 0.6, 4)},
+                    "source": self.rng.choice(("import", "enrichment", "api")),
+                    "source_reference": None,
+                    "valid_from": valid_from,
+                    "valid_until": valid_until,
+                    "is_current": current,
+                    "created_at": valid_from,
+                },
+            )
+            if valid_until is not None:
+                valid_from = valid_until
+            price *= self.rng.uniform(0.85, 1.2)
+
+    def _activity(self, action: str, entity_type: str, entity_id: str, name: str, at: datetime, details) -> None:
+        self.writer.add(
+            ActivityLogModel.__table__,
+            {
+                "id": self.uuid(),
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "entity_name": name,
+                "user_id": None,
+                "username": "admin",
+                "timestamp": at,
+                "details": details,
+            },
+        )
+
+    def part_activity(self, part_id: str, name: str, created_at: datetime) -> None:
+        self._activity("created", "part", part_id, name, created_at, {"source": "generator"})
+        for _ in range(self.rng.choices((0, 1, 2), (55, 35, 10))[0]):
+            at = created_at + (self.now - created_at) * self.rng.random()
+            self._activity(self.rng.choice(ACTIVITY_ACTIONS), "part", part_id, name, at, {})
+
+    def location_activity(self) -> None:
+        for n, shelf_id in enumerate(self.shelf_ids):
+            self._activity("created", "location", shelf_id, f"Shelf {n + 1}", self.past(3 * 365), {})
+
+    def projects(self) -> None:
+        for n in range(max(4, self.parts // 1000)):
+            project_id = self.uuid()
+            name = f"Project {n + 1:04d}"
+            created_at = self.past(2 * 365)
+            self.writer.add(
+                ProjectModel.__table__,
+                {
+                    "id": project_id,
+                    "name": name,
+                    "slug": f"project-{n + 1:04d}",
+                    "description": f"Generated build {n + 1}",
+                    "status": self.rng.choice(PROJECT_STATUSES),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                },
+            )
+            bom_size = min(len(self.part_ids), self.rng.randint(10, 120))
+            for part_id in self.rng.sample(self.part_ids, bom_size):
+                self.writer.add(
+                    PartProjectLink.__table__,
+                    {
+                        "part_id": part_id,
+                        "project_id": project_id,
+                        "added_at": created_at,
+                        "notes": None,
+                        "quantity_required": self.rng.choice((1, 1, 2, 4, 10)),
+                    },
+                )
+
+
+def _supplier_part_number(rng: random.Random, supplier: Optional[str], mpn: str) -> Optional[str]:
+    if supplier == "LCSC":
+        return f"C{rng.randint(1000, 9_999_999)}"
+    if supplier == "DIGIKEY":
+        return f"{rng.randint(100, 999)}-{mpn}-ND"
+    if supplier == "MOUSER":
+        return f"{rng.randint(10, 999)}-{mpn}"
+    if supplier == "MCMASTER":
+        return f"{rng.randint(10000, 99999)}A{rng.randint(100, 999)}"
+    return None
+
+
+def _refresh_counters(conn: Connection) -> None:
+    """Tag and project counters from their link tables"""
+    tags = TagModel.__table__
+    tag_links = PartTagLink.__table__
+    tag_parts = select(func.count()).where(tag_links.c.tag_id == tags.c.id).scalar_subquery()
+    conn.execute(update(tags).values(parts_count=tag_parts, usage_count=tag_parts + tags.c.tools_count))
+
+    projects = ProjectModel.__table__
+    project_links = PartProjectLink.__table__
+    project_parts = select(func.count()).where(project_links.c.project_id == projects.c.id).scalar_subquery()
+    conn.execute(update(projects).values(parts_count=project_parts))
+
+
+def generate_dataset(
+    engine: Engine, parts: int, seed: int = DEFAULT_SEED, now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Write a synthetic inventory of `parts` parts into the (empty) database of `engine`.
+
+    Returns the generation parameters and the number of rows written per table.
+    """
+    now = now or datetime.utcnow().replace(microsecond=0)
+    started = time.monotonic()
+
+    with engine.begin() as conn:
+        generator = _Generator(conn, parts, seed, now)
+        generator.run()
+        logger.info(f"Generated {parts} parts, rebuilding derived data")
+
+        LocationPathRepository.rebuild(conn)
+        PartPropertyRepository.rebuild(conn)
+        InventoryAggregateRepository.rebuild(conn)
+        _refresh_counters(conn)
+    set_stale(False)
+
+    return {
+        "parts": parts,
+        "seed": seed,
+        "generated_at": now.isoformat(),
+        "duration_seconds": round(time.monotonic() - started, 1),
+        "rows": dict(sorted(generator.writer.counts.items())),
+    }
+
+
+def lcsc_order_csv(rows: int, seed: int, batch: int) -> str:
+    """An LCSC order export of `rows` parts; each batch number gives distinct part numbers"""
+    rng = random.Random(seed)
+    lines = [
+        "LCSC Part Number,Manufacture Part Number,Manufacturer,Customer NO.,Package,Description,RoHS,"
+        "Order Qty.,Min\\Mult Order Qty.,Unit Price($),Order Price($)"
+    ]
+    for n in range(rows):
+        component_type, _, _, manufacturers, _, build, price_range = rng.choices(CATALOG[:7], CATALOG_WEIGHTS[:7])[0]
+        properties, description = build(rng)
+        quantity = rng.choice((10, 50, 100, 500))
+        price = rng.uniform(*price_range)
+        lines.append(
+            ",".join(
+                _csv_field(value)
+                for value in (
+                    f"C9{batch:04d}{n:05d}",
+                    f"BENCH{batch:04d}-{component_type.upper()}-{n:05d}",
+                    rng.choice(manufacturers),
+                    "",
+                    properties.get("package", "-"),
+                    description,
+                    "YES",
+                    quantity,
+                    "5\\5",
+                    f"{price:.4f}",
+                    f"{price * quantity:.2f}",
+                )
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _csv_field(value: Any) -> str:
+    text = str(value)
+    return f'"{text}"' if "," in text or '"' in text else text
@@ -0,0 +1,318 @@
+"""
+Enrichment Load Harness - end-to-end enrichment throughput against the mock supplier server.
+
+A load run imports `parts` parts of one supplier (timed as the import phase), enriches all
+of them through one of the production paths and removes them again:
+
+    bulk   a BULK_ENRICHMENT task run by the task service, like the enrich-all action
+    queue  one enrichment queue item per part, processed by the supplier queue workers
+
+Both paths end in PartEnrichmentService.handle_part_enrichment, whose duration per call is
+the per-part latency. Around the enrichment phase the harness counts SQL statements and
+database time (track_queries), "database is locked" errors and the peak of checked out pool
+connections, which together show where parts wait on the database rather than the supplier.
+
+The supplier clients reach the mock server through SUPPLIER_MOCK_URL (see __main__.py,
+which sets it and fake credentials). Rate limits stored in the database apply as they would
+in production; a fresh benchmark database has none. Like __main__.py this module creates no
+engine on import, so the models are imported where they are used.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import delete, event, or_
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from MakerMatrix.database.query_stats import register_query_hooks, track_queries
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("bulk", "queue")
+LOAD_SUPPLIERS = ("lcsc", "mouser", "digikey", "mcmaster-carr")
+
+DEFAULT_PARTS = 200
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_CAPABILITIES = ("get_part_details",)
+
+LOAD_PART_PREFIX = "LOAD-"
+
+# Credentials the supplier clients need before they call the (mock) API
+MOCK_CREDENTIALS = {
+    "MOUSER_API_KEY": "mock-mouser-key",
+    "DIGIKEY_CLIENT_ID": "mock-digikey-client",
+    "DIGIKEY_CLIENT_SECRET": "mock-digikey-secret",
+    "MCMASTER_CARR_USERNAME": "mock-user",
+    "MCMASTER_CARR_PASSWORD": "mock-password",
+}
+
+POOL_SAMPLE_INTERVAL = 0.05
+QUEUE_POLL_INTERVAL = 0.25
+
+
+@dataclass
+class LoadContext:
+    engine: Engine
+    supplier: str = "lcsc"
+    scenario: str = "bulk"
+    parts: int = DEFAULT_PARTS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    capabilities: Sequence[str] = DEFAULT_CAPABILITIES
+    # Give up on the enrichment phase after this many seconds
+    timeout: float = 1800.0
+
+
+def load_part_number(supplier: str, n: int) -> str:
+    """A supplier part number of the shape each client expects, unique per n"""
+    if supplier == "digikey":
+        # The -ND suffix makes the DigiKey client look the number up directly instead of searching
+        return f"LOAD{n:06d}-ND"
+    if supplier == "mouser":
+        return f"511-LOAD{n:06d}"
+    if supplier == "mcmaster-carr":
+        return f"{91000 + n}A{n % 1000:03d}"
+    return f"C{900000 + n}"
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def latency_summary(samples_seconds: Sequence[float]) -> Dict[str, Any]:
+    """p50/p95/p99/max milliseconds of the per-part enrichment latencies"""
+    if not samples_seconds:
+        return {"count": 0}
+    ordered = sorted(samples_seconds)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+@contextmanager
+def part_latencies() -> Iterator[Dict[str, List[float]]]:
+    """Time every PartEnrichmentService.handle_part_enrichment call made inside the block"""
+    from MakerMatrix.services.system.part_enrichment_service import PartEnrichmentService
+
+    samples: Dict[str, List[float]] = {"succeeded": [], "failed": []}
+    original = PartEnrichmentService.handle_part_enrichment
+
+    async def timed(self, *args, **kwargs):
+        started = time.perf_counter()
+        outcome = "failed"
+        try:
+            result = await original(self, *args, **kwargs)
+            outcome = "succeeded"
+            return result
+        finally:
+            samples[outcome].append(time.perf_counter() - started)
+
+    PartEnrichmentService.handle_part_enrichment = timed
+    try:
+        yield samples
+    finally:
+        PartEnrichmentService.handle_part_enrichment = original
+
+
+class ContentionProbe:
+    """ "database is locked" errors and the peak of checked out connections of one engine"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.locked_errors = 0
+        self.peak_checked_out = 0
+        self._sampler: Optional[asyncio.Task] = None
+
+    def _on_error(self, context) -> None:
+        if "database is locked" in str(context.original_exception):
+            self.locked_errors += 1
+
+    async def _sample(self) -> None:
+        checked_out = getattr(self.engine.pool, "checkedout", None)
+        if checked_out is None:
+            return
+        while True:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out())
+            await asyncio.sleep(POOL_SAMPLE_INTERVAL)
+
+    async def __aenter__(self) -> "ContentionProbe":
+        event.listen(self.engine, "handle_error", self._on_error)
+        self._sampler = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._sampler.cancel()
+        try:
+            await self._sampler
+        except asyncio.CancelledError:
+            pass
+        event.remove(self.engine, "handle_error", self._on_error)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"locked_errors": self.locked_errors, "peak_checked_out_connections": self.peak_checked_out}
+
+
+# === Phases ===
+
+
+def import_parts(context: LoadContext, run_id: str) -> List[str]:
+    """Create the parts to enrich the way a CSV import does, one add_part call each"""
+    from MakerMatrix.benchmarks.suite import _ok
+    from MakerMatrix.services.data.part_service import PartService
+
+    part_service = PartService(context.engine)
+    part_ids = []
+    for n in range(context.parts):
+        part_number = load_part_number(context.supplier, n)
+        created = _ok(
+            part_service.add_part(
+                {
+                    "part_name": f"{LOAD_PART_PREFIX}{run_id}-{n:06d}",
+                    "part_number": part_number,
+                    "supplier_part_number": part_number,
+                    "supplier": context.supplier.upper(),
+                    "quantity": 1,
+                }
+            )
+        )
+        part_ids.append(created["id"] if isinstance(created, dict) else created.id)
+    return part_ids
+
+
+async def enrich_bulk(context: LoadContext, part_ids: List[str]) -> Dict[str, Any]:
+    """One bulk enrichment task over all parts, run to completion by the task service"""
+    from MakerMatrix.benchmarks.suite import BENCHMARK_ENTITY_TYPE, _ok
+    from MakerMatrix.models.task_models import CreateTaskRequest, TaskModel, TaskType
+    from MakerMatrix.services.system.task_service import TaskService
+
+    service = TaskService(context.engine)
+    request = CreateTaskRequest(
+        task_type=TaskType.BULK_ENRICHMENT,
+        name=f"Load test enrichment of {len(part_ids)} parts",
+        related_entity_type=BENCHMARK_ENTITY_TYPE,
+        input_data={
+            "part_ids": part_ids,
+            "supplier_filter": context.supplier.upper(),
+            "capabilities": list(context.capabilities),
+            "batch_size": context.batch_size,
+        },
+    )
+    task_id = _ok(await service.create_task(request))["id"]
+    # The worker loop without its poll interval
+    while True:
+        await service._process_pending_tasks()
+        if not service.running_tasks:
+            break
+        await asyncio.gather(*list(service.running_tasks.values()), return_exceptions=True)
+
+    with Session(context.engine) as session:
+        task = session.get(TaskModel, task_id)
+        return {"status": task.status.value if task else "missing", "error": task.error_message if task else None}
+
+
+async def enrich_queue(context: LoadContext, part_ids: List[str]) -> Dict[str, Any]:
+    """One enrichment queue item per part; waits until the supplier queue is drained"""
+    from MakerMatrix.services.rate_limit_service import RateLimitService
+    from MakerMatrix.services.system.enrichment_queue_manager import EnrichmentQueueManager
+
+    manager = EnrichmentQueueManager(context.engine, RateLimitService(context.engine))
+    supplier = context.supplier.upper()
+    for n, part_id in enumerate(part_ids):
+        await manager.queue_part_enrichment(part_id, f"{LOAD_PART_PREFIX}{n:06d}", supplier, list(context.capabilities))
+
+    queue = manager.supplier_queues[supplier]
+    while True:
+        await asyncio.sleep(QUEUE_POLL_INTERVAL)
+        counts = queue.status_counts()
+        unfinished = sum(
+            count for status, count in counts.items() if status not in ("completed", "failed", "cancelled")
+        )
+        if not unfinished and not queue.is_processing:
+            return {"status": "completed", "items": counts}
+
+
+def cleanup(engine: Engine, part_ids: List[str]) -> None:
+    """Remove the load parts, the queue items and the tasks (including follow-up downloads) they caused"""
+    from MakerMatrix.benchmarks.suite import BENCHMARK_ENTITY_TYPE
+    from MakerMatrix.models.enrichment_queue_models import EnrichmentQueueItemModel
+    from MakerMatrix.models.task_models import TaskModel
+    from MakerMatrix.repositories.parts_repositories import PartRepository
+
+    with engine.begin() as conn:
+        conn.execute(delete(EnrichmentQueueItemModel.__table__).where(EnrichmentQueueItemModel.part_id.in_(part_ids)))
+        conn.execute(
+            delete(TaskModel.__table__).where(
+                or_(
+                    TaskModel.related_entity_type == BENCHMARK_ENTITY_TYPE,
+                    TaskModel.related_entity_id.in_(part_ids),
+                )
+            )
+        )
+    with Session(engine) as session:
+        for part_id in part_ids:
+            PartRepository.delete_part(session, part_id)
+        session.commit()
+
+
+async def run_load(context: LoadContext) -> Dict[str, Any]:
+    """Import, enrich and remove the load parts; returns the measurements of both phases"""
+    from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
+
+    if context.scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario {context.scenario!r} (expected one of {', '.join(SCENARIOS)})")
+    SupplierConfigService().initialize_default_suppliers()
+
+    run_id = uuid.uuid4().hex[:8]
+    started = time.perf_counter()
+    part_ids = import_parts(context, run_id)
+    import_seconds = time.perf_counter() - started
+
+    enrich = enrich_bulk if context.scenario == "bulk" else enrich_queue
+    # Statements are counted even when REQUEST_METRICS_ENABLED=false left the listeners out
+    register_query_hooks()
+    try:
+        with track_queries() as stats, part_latencies() as latencies:
+            async with ContentionProbe(context.engine) as probe:
+                started = time.perf_counter()
+                outcome = await asyncio.wait_for(enrich(context, part_ids), context.timeout)
+                enrich_seconds = time.perf_counter() - started
+    finally:
+        cleanup(context.engine, part_ids)
+
+    enriched = len(latencies["succeeded"])
+    return {
+        "scenario": context.scenario,
+        "supplier": context.supplier,
+        "parts": context.parts,
+        "batch_size": context.batch_size,
+        "capabilities": list(context.capabilities),
+        "outcome": outcome,
+        "import": {
+            "seconds": round(import_seconds, 3),
+            "parts_per_second": round(context.parts / import_seconds, 1) if import_seconds else None,
+        },
+        "enrichment": {
+            "seconds": round(enrich_seconds, 3),
+            "enriched": enriched,
+            "failed": len(latencies["failed"]),
+            "parts_per_minute": round(enriched / enrich_seconds * 60, 1) if enrich_seconds else None,
+            "latency": latency_summary(latencies["succeeded"] + latencies["failed"]),
+        },
+        "database": {
+            "statements": stats.statements,
+            "statements_per_part": round(stats.statements / context.parts, 1) if context.parts else None,
+            "db_seconds": round(stats.db_seconds, 3),
+            **probe.to_dict(),
+            "top_statements": stats.top_statements(5),
+        },
+    }
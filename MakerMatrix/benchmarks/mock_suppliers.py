@@ -0,0 +1,518 @@
+"""
+Mock Supplier Server - local stand-in for the LCSC, DigiKey, Mouser and McMaster-Carr APIs.
+
+Serves each supplier's endpoints under /<supplier> with responses in the shape the supplier
+clients parse, so enrichment can be exercised end to end without network access, API keys
+or quota. Start it and point the application at it with SUPPLIER_MOCK_URL:
+
+    python -m MakerMatrix.benchmarks mock-suppliers --port 8089 --latency 120 --rate-limit 60
+    SUPPLIER_MOCK_URL=http://127.0.0.1:8089 python -m MakerMatrix.main
+
+Part data is synthesized from the part number, so every lookup of a part returns the same
+response. A fixture file <fixtures>/<supplier>/<part number>.json replaces the synthesized
+body of that part with a recorded one. Part numbers starting with MISSING are not found.
+
+Every supplier gets the configured latency (plus uniform jitter), fails with 503 at the
+configured error rate and answers 429 with Retry-After once it received rate_limit_per_minute
+requests within the last minute. Error injection draws from a generator seeded with `seed`.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+SUPPLIERS = ("lcsc", "digikey", "mouser", "mcmaster-carr")
+
+MISSING_PREFIX = "MISSING"
+
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+_MANUFACTURERS = ("Yageo", "Samsung Electro-Mechanics", "Texas Instruments", "Murata", "Vishay", "onsemi")
+_CATEGORIES = (
+    ("Resistors", "R?", "RC0603FR-07{value}L", ("1k", "4.7k", "10k", "47k", "100k")),
+    ("Capacitors", "C?", "CL10B{value}KB8NNNC", ("100nF", "1uF", "4.7uF", "10uF")),
+    ("Integrated Circuits (ICs)", "U?", "TPS{value}DBVR", ("62130", "7A33", "54202", "3840")),
+)
+_PACKAGES = ("0402", "0603", "0805", "SOT-23-5", "SOIC-8")
+
+# A blank one-page PDF, padded with comment lines past the minimum size of downloaded datasheets
+_PDF = (
+    b"%PDF-1.1\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 72 72]>>endobj\n"
+    + b"% mock datasheet\n" * 80
+    + b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def _png() -> bytes:
+    from io import BytesIO
+
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@dataclass
+class MockBehavior:
+    """How one supplier of the mock server responds"""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    # 0 disables the rate limit
+    rate_limit_per_minute: int = 0
+
+
+@dataclass
+class SupplierStats:
+    requests: int = 0
+    responses: int = 0
+    not_found: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    recent: Deque[float] = field(default_factory=deque)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "responses": self.responses,
+            "not_found": self.not_found,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+        }
+
+
+def synthetic_part(supplier: str, part_number: str) -> Dict[str, Any]:
+    """Supplier-neutral part data derived from the part number alone"""
+    rng = random.Random(f"{supplier}:{part_number}")
+    category, prefix, mpn_pattern, values = rng.choice(_CATEGORIES)
+    value = rng.choice(values)
+    package = rng.choice(_PACKAGES)
+    unit_price = round(rng.uniform(0.002, 2.5), 4)
+    return {
+        "part_number": part_number,
+        "mpn": mpn_pattern.format(value=value.replace(".", "").upper()),
+        "manufacturer": rng.choice(_MANUFACTURERS),
+        "category": category,
+        "prefix": prefix,
+        "value": value,
+        "package": package,
+        "description": f"{value} {package} {category.rstrip('s')}",
+        "stock": rng.randint(0, 250_000),
+        "price_breaks": [(1, unit_price), (10, round(unit_price * 0.8, 4)), (100, round(unit_price * 0.6, 4))],
+    }
+
+
+class MockSupplierServer:
+    """aiohttp application serving the mock supplier APIs on host:port (port 0 picks a free one)"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        behavior: Optional[MockBehavior] = None,
+        supplier_behavior: Optional[Dict[str, MockBehavior]] = None,
+        fixtures_dir: Optional[str] = None,
+        seed: int = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.behavior = behavior or MockBehavior()
+        self.supplier_behavior = supplier_behavior or {}
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self._random = random.Random(seed)
+        self._stats: Dict[str, SupplierStats] = {name: SupplierStats() for name in SUPPLIERS}
+        self._runner: Optional[web.AppRunner] = None
+        self._image = _png()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # === Lifecycle ===
+
+    async def start(self) -> str:
+        """Start serving and return the base URL"""
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # With port 0 the operating system picked the port
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Mock supplier server listening on {self.url}")
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests, responses and injected failures per supplier"""
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        self._stats = {name: SupplierStats() for name in SUPPLIERS}
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._behave])
+        app.router.add_get("/_stats", self._get_stats)
+        app.router.add_get("/files/{supplier}/{name}", self._get_file)
+
+        app.router.add_get("/lcsc/api/products/{part_number}/components", self._lcsc_components)
+        app.router.add_get("/lcsc/product-detail/{page}", self._lcsc_product_page)
+
+        app.router.add_post("/digikey/v1/oauth2/token", self._digikey_token)
+        app.router.add_get("/digikey/products/v4/search/{part_number}/productdetails", self._digikey_details)
+        app.router.add_post("/digikey/products/v4/search/keyword", self._digikey_keyword)
+
+        app.router.add_post("/mouser/search/partnumber", self._mouser_part_number)
+        app.router.add_post("/mouser/search/keyword", self._mouser_keyword)
+
+        app.router.add_post("/mcmaster-carr/v1/login", self._mcmaster_login)
+        app.router.add_put("/mcmaster-carr/v1/products", self._mcmaster_subscribe)
+        app.router.add_get("/mcmaster-carr/v1/products/{part_number}", self._mcmaster_product)
+        app.router.add_get("/mcmaster-carr/v1/files/{name}", self._get_file)
+        return app
+
+    # === Latency, errors and rate limits ===
+
+    @web.middleware
+    async def _behave(self, request: web.Request, handler):
+        supplier = request.path.strip("/").split("/", 1)[0]
+        stats = self._stats.get(supplier)
+        if stats is None:
+            return await handler(request)
+
+        behavior = self.supplier_behavior.get(supplier, self.behavior)
+        stats.requests += 1
+
+        if behavior.rate_limit_per_minute > 0:
+            now = time.monotonic()
+            while stats.recent and now - stats.recent[0] >= RATE_LIMIT_WINDOW_SECONDS:
+                stats.recent.popleft()
+            if len(stats.recent) >= behavior.rate_limit_per_minute:
+                stats.rate_limited += 1
+                retry_after = math.ceil(RATE_LIMIT_WINDOW_SECONDS - (now - stats.recent[0]))
+                return web.json_response(
+                    {"error": "Too Many Requests"}, status=429, headers={"Retry-After": str(max(retry_after, 1))}
+                )
+            stats.recent.append(now)
+
+        delay = behavior.latency_ms + self._random.uniform(0, behavior.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if behavior.error_rate > 0 and self._random.random() < behavior.error_rate:
+            stats.errors += 1
+            return web.json_response({"error": "Service Unavailable (injected)"}, status=503)
+
+        try:
+            response = await handler(request)
+        except web.HTTPNotFound:
+            stats.not_found += 1
+            raise
+        if response.status == 404:
+            stats.not_found += 1
+        else:
+            stats.responses += 1
+        return response
+
+    # === Helpers ===
+
+    def _fixture(self, supplier: str, part_number: str) -> Optional[Any]:
+        if self.fixtures_dir is None:
+            return None
+        path = self.fixtures_dir / supplier / f"{part_number}.json"
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text())
+
+    @staticmethod
+    def _file_url(request: web.Request, supplier: str, part_number: str, extension: str) -> str:
+        return f"{request.url.origin()}/files/{supplier}/{part_number}.{extension}"
+
+    @staticmethod
+    def _exists(part_number: str) -> bool:
+        return not part_number.upper().startswith(MISSING_PREFIX)
+
+    async def _get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    async def _get_file(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        if name.endswith(".pdf"):
+            return web.Response(body=_PDF, content_type="application/pdf")
+        if name.endswith(".png"):
+            return web.Response(body=self._image, content_type="image/png")
+        raise web.HTTPNotFound()
+
+    # === LCSC (EasyEDA component API and product page) ===
+
+    async def _lcsc_components(self, request: web.Request) -> web.Response:
+        part_number = request.match_info["part_number"]
+        fixture = self._fixture("lcsc", part_number)
+        if fixture is not None:
+            return web.json_response(fixture)
+        if not self._exists(part_number):
+            return web.json_response({"success": False, "code": 404, "result": None})
+
+        part = synthetic_part("lcsc", part_number)
+        return web.json_response(
+            {
+                "success": True,
+                "code": 0,
+                "result": {
+                    "title": part["mpn"],
+                    "description": part["description"],
+                    "thumb": self._file_url(request, "lcsc", part_number, "png"),
+                    "tags": [part["category"]],
+                    "SMT": True,
+                    "dataStr": {
+                        "head": {
+                            "c_para": {
+                                "Manufacturer": part["manufacturer"],
+                                "Manufacturer Part": part["mpn"],
+                                "Value": part["value"],
+                                "package": part["package"],
+                                "pre": part["prefix"],
+                                "link": self._file_url(request, "lcsc", part_number, "pdf"),
+                            }
+                        }
+                    },
+                },
+            }
+        )
+
+    async def _lcsc_product_page(self, request: web.Request) -> web.Response:
+        part_number = request.match_info["page"].removesuffix(".html")
+        if not self._exists(part_number):
+            raise web.HTTPNotFound()
+
+        part = synthetic_part("lcsc", part_number)
+        json_ld = {
+            "@context": "https://schema.org",
+            "@type": "Product",
+            "name": part["mpn"],
+            "mpn": part["mpn"],
+            "sku": part_number,
+            "description": part["description"],
+            "brand": {"@type": "Brand", "name": part["manufacturer"]},
+            "offers": {
+                "@type": "Offer",
+                "price": part["price_breaks"][0][1],
+                "priceCurrency": "USD",
+                "inventoryLevel": part["stock"],
+            },
+        }
+        html = (
+            f"<html><head><title>{part['mpn']} | LCSC</title>"
+            f'<script type="application/ld+json">{json.dumps(json_ld)}</script></head><body><table>'
+            f"<tr><td>Manufacturer</td><td>{part['manufacturer']}</td></tr>"
+            f"<tr><td>Mfr. Part #</td><td>{part['mpn']}</td></tr>"
+            f"<tr><td>Package</td><td>{part['package']}</td></tr>"
+            f"<tr><td>Description</td><td>{part['description']}, {part['value']}, {part['package']}</td></tr>"
+            "</table></body></html>"
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    # === DigiKey (Product Information V4) ===
+
+    async def _digikey_token(self, request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "mock-digikey-token", "token_type": "Bearer", "expires_in": 599})
+
+    def _digikey_product(self, request: web.Request, part_number: str) -> Dict[str, Any]:
+        part = synthetic_part("digikey", part_number)
+        return {
+            "ManufacturerProductNumber": part["mpn"],
+            "Manufacturer": {"Id": 1, "Name": part["manufacturer"]},
+            "Description": {
+                "ProductDescription": part["description"],
+                "DetailedDescription": f"{part['description']} ({part['manufacturer']} {part['mpn']})",
+            },
+            "Category": {"CategoryId": 1, "Name": part["category"]},
+            "DatasheetUrl": self._file_url(request, "digikey", part_number, "pdf"),
+            "PhotoUrl": self._file_url(request, "digikey", part_number, "png"),
+            "ProductUrl": f"https://www.digikey.com/en/products/detail/{part_number}",
+            "QuantityAvailable": part["stock"],
+            "ProductStatus": {"Id": 0, "Status": "Active"},
+            "Classifications": {"RohsStatus": "ROHS3 Compliant", "MoistureSensitivityLevel": "1  (Unlimited)"},
+            "ProductVariations": [
+                {
+                    "DigiKeyProductNumber": part_number,
+                    "StandardPricing": [
+                        {"BreakQuantity": quantity, "UnitPrice": price, "TotalPrice": round(quantity * price, 4)}
+                        for quantity, price in part["price_breaks"]
+                    ],
+                }
+            ],
+            "Parameters": [
+                {"ParameterText": "Package / Case", "ValueText": part["package"]},
+                {"ParameterText": "Value", "ValueText": part["value"]},
+            ],
+        }
+
+    async def _digikey_details(self, request: web.Request) -> web.Response:
+        part_number = request.match_info["part_number"]
+        fixture = self._fixture("digikey", part_number)
+        if fixture is not None:
+            return web.json_response(fixture)
+        if not self._exists(part_number):
+            return web.json_response({"title": "Not Found", "status": 404}, status=404)
+        return web.json_response({"Product": self._digikey_product(request, part_number)})
+
+    async def _digikey_keyword(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        keywords = str(body.get("Keywords", "")).strip()
+        products = [] if not keywords or not self._exists(keywords) else [self._digikey_product(request, keywords)]
+        return web.json_response({"Products": products, "ProductsCount": len(products)})
+
+    # === Mouser (Search API v1) ===
+
+    def _mouser_part(self, request: web.Request, part_number: str) -> Dict[str, Any]:
+        fixture = self._fixture("mouser", part_number)
+        if fixture is not None:
+            return fixture
+        part = synthetic_part("mouser", part_number)
+        return {
+            "MouserPartNumber": part_number,
+            "ManufacturerPartNumber": part["mpn"],
+            "Manufacturer": part["manufacturer"],
+            "Description": part["description"],
+            "Category": part["category"],
+            "DataSheetUrl": self._file_url(request, "mouser", part_number, "pdf"),
+            "ImagePath": self._file_url(request, "mouser", part_number, "png"),
+            "ProductDetailUrl": f"https://www.mouser.com/ProductDetail/{part_number}",
+            "Availability": f"{part['stock']:,} In Stock",
+            "AvailabilityInStock": str(part["stock"]),
+            "PriceBreaks": [
+                {"Quantity": quantity, "Price": f"${price:.4f}", "Currency": "USD"}
+                for quantity, price in part["price_breaks"]
+            ],
+            "ProductAttributes": [
+                {"AttributeName": "Packaging", "AttributeValue": "Cut Tape"},
+                {"AttributeName": "Package / Case", "AttributeValue": part["package"]},
+            ],
+            "ROHSStatus": "RoHS Compliant",
+            "LifecycleStatus": "New Product",
+            "Min": "1",
+            "Mult": "1",
+        }
+
+    def _mouser_results(self, request: web.Request, part_numbers: List[str]) -> web.Response:
+        parts = [self._mouser_part(request, number) for number in part_numbers if number and self._exists(number)]
+        return web.json_response({"Errors": [], "SearchResults": {"NumberOfResult": len(parts), "Parts": parts}})
+
+    async def _mouser_part_number(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        query = body.get("SearchByPartRequest", {}).get("mouserPartNumber", "")
+        return self._mouser_results(request, [number.strip() for number in query.split("|")])
+
+    async def _mouser_keyword(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        keyword = str(body.get("SearchByKeywordRequest", {}).get("keyword", "")).strip()
+        return self._mouser_results(request, [keyword])
+
+    # === McMaster-Carr (Product Information API) ===
+
+    async def _mcmaster_login(self, request: web.Request) -> web.Response:
+        return web.json_response({"AuthToken": "mock-mcmaster-token", "ExpirationTS": int(time.time()) + 86400})
+
+    def _mcmaster_response(self, request: web.Request, part_number: str) -> web.Response:
+        fixture = self._fixture("mcmaster-carr", part_number)
+        if fixture is not None:
+            return web.json_response(fixture)
+        if not self._exists(part_number):
+            return web.json_response({"ErrorMessage": f"Product {part_number} not found"}, status=404)
+
+        part = synthetic_part("mcmaster-carr", part_number)
+        return web.json_response(
+            {
+                "PartNumber": part_number,
+                "FamilyDescription": f"{part['category']} {part['package']}",
+                "DetailDescription": part["description"],
+                "ProductCategory": part["category"],
+                "ProductStatus": "Active",
+                "Specifications": [
+                    {"Attribute": "Package", "Values": [part["package"]]},
+                    {"Attribute": "Value", "Values": [part["value"]]},
+                ],
+                "Links": [
+                    {"Key": "Image", "Value": f"/v1/files/{part_number}.png"},
+                    {"Key": "2-D PDF", "Value": f"/v1/files/{part_number}.pdf"},
+                    {"Key": "Price", "Value": f"/v1/products/{part_number}/price"},
+                ],
+            }
+        )
+
+    async def _mcmaster_subscribe(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        part_number = str(body.get("URL", "")).rstrip("/").rsplit("/", 1)[-1]
+        return self._mcmaster_response(request, part_number)
+
+    async def _mcmaster_product(self, request: web.Request) -> web.Response:
+        return self._mcmaster_response(request, request.match_info["part_number"])
+
+
+async def serve(server: MockSupplierServer) -> None:
+    """Run the server until cancelled (Ctrl+C)"""
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+@contextmanager
+def running_in_thread(server: MockSupplierServer) -> Iterator[str]:
+    """
+    Serve from an event loop on a thread of its own and yield the base URL.
+
+    Enrichment still makes some blocking calls (e.g. image downloads with requests); a mock
+    server on the caller's event loop could not answer them until they time out.
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    failure: List[BaseException] = []
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(server.start())
+        except BaseException as e:
+            failure.append(e)
+            started.set()
+            return
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(server.stop())
+
+    thread = threading.Thread(target=run, name="mock-suppliers", daemon=True)
+    thread.start()
+    started.wait()
+    if failure:
+        thread.join()
+        loop.close()
+        raise failure[0]
+    try:
+        yield server.url
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
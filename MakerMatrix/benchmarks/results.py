@@ -0,0 +1,138 @@
+"""
+Benchmark Results - JSON result files and run-to-run comparison.
+
+A result file records the environment (Python, SQLite, platform, git commit), the dataset
+(size, seed, row counts) and the summary of every benchmark. compare_results() checks a run
+against a baseline run of the same dataset: a benchmark regresses when its median is slower
+than the baseline median by more than its threshold and by more than MIN_DELTA_MS, so
+sub-millisecond jitter on fast operations is not reported.
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RESULTS_FORMAT = 1
+
+DEFAULT_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))
+MIN_DELTA_MS = 2.0
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                cwd=Path(__file__).resolve().parent,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def build_results(dataset: Dict[str, Any], benchmarks: Dict[str, Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.utcnow().replace(microsecond=0).isoformat(),
+        "environment": environment(),
+        "dataset": dataset,
+        "repeat": repeat,
+        "benchmarks": benchmarks,
+    }
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    results = json.loads(Path(path).read_text())
+    if results.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a benchmark result file of format {RESULTS_FORMAT}")
+    return results
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = MIN_DELTA_MS,
+) -> List[Dict[str, Any]]:
+    """
+    One row per benchmark with its baseline and current median and a status: "regression",
+    "improvement", "ok", "new" (not in the baseline), "missing" (not in this run) or "error".
+
+    Raises ValueError if the runs measured different datasets.
+    """
+    for key in ("parts", "seed"):
+        if current["dataset"].get(key) != baseline["dataset"].get(key):
+            raise ValueError(
+                f"Results are for different datasets ({key}: {baseline['dataset'].get(key)} in the baseline, "
+                f"{current['dataset'].get(key)} now)"
+            )
+
+    rows = []
+    names = list(current["benchmarks"]) + [name for name in baseline["benchmarks"] if name not in current["benchmarks"]]
+    for name in names:
+        now = current["benchmarks"].get(name)
+        before = baseline["benchmarks"].get(name)
+        row = {"name": name, "baseline_ms": None, "current_ms": None, "change": None}
+        if now is None:
+            rows.append({**row, "baseline_ms": before.get("median_ms"), "status": "missing"})
+            continue
+        if "error" in now:
+            rows.append({**row, "status": "error", "error": now["error"]})
+            continue
+        row["current_ms"] = now["median_ms"]
+        if before is None or "error" in before:
+            rows.append({**row, "status": "new"})
+            continue
+
+        allowed = now.get("threshold", threshold)
+        row.update(baseline_ms=before["median_ms"], threshold=allowed)
+        delta = now["median_ms"] - before["median_ms"]
+        if before["median_ms"] > 0:
+            row["change"] = round(delta / before["median_ms"], 4)
+        if abs(delta) < min_delta_ms or row["change"] is None:
+            row["status"] = "ok"
+        elif row["change"] > allowed:
+            row["status"] = "regression"
+        elif row["change"] < -allowed:
+            row["status"] = "improvement"
+        else:
+            row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<32} {'baseline ms':>12} {'current ms':>12} {'change':>8}  status"]
+    for row in rows:
+        baseline = f"{row['baseline_ms']:.2f}" if row["baseline_ms"] is not None else "-"
+        current = f"{row['current_ms']:.2f}" if row["current_ms"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        status = row["status"] if row["status"] != "error" else f"error: {row['error']}"
+        lines.append(f"{row['name']:<32} {baseline:>12} {current:>12} {change:>8}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,412 @@
+"""
+Benchmark Suite - timed operations against a generated dataset.
+
+Each benchmark calls the repository or service method an API route uses: part search and
+pagination, the dashboard summary, location tree reads and a subtree move, an LCSC order
+import, label rendering and task queue throughput. Benchmarks that write (the move, the
+import, the tasks) undo their changes outside the timed section, so a dataset can be
+benchmarked any number of times.
+
+Every benchmark runs `warmup` untimed times and then `repeat` timed times. Its samples are
+summarized as min, median, p95 and mean milliseconds, plus items per second for benchmarks
+that process a batch.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from MakerMatrix.benchmarks.dataset import lcsc_order_csv
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_models import AdvancedPartSearch, PartModel
+from MakerMatrix.models.task_models import CreateTaskRequest, TaskModel, TaskType
+from MakerMatrix.repositories.parts_repositories import PartRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# Benchmarks that depend on threads, fonts or the event loop vary more between runs
+NOISY_THRESHOLD = 0.4
+
+BENCHMARK_ENTITY_TYPE = "benchmark"
+
+
+@dataclass
+class Benchmark:
+    """One timed operation; `run`, `setup` and `teardown` may be sync or async"""
+
+    name: str
+    group: str
+    run: Callable[[], Any]
+    items: int = 1
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[], Any]] = None
+    # Allowed median slowdown against a baseline (0.25 = 25%); None uses the comparison default
+    threshold: Optional[float] = None
+
+
+@dataclass
+class BenchmarkContext:
+    engine: Engine
+    seed: int = 0
+    import_rows: int = 100
+    labels: int = 25
+    tasks: int = 20
+
+
+async def _call(function: Optional[Callable[[], Any]]) -> Any:
+    if function is None:
+        return None
+    result = function()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _ok(response):
+    """Unwrap a ServiceResponse; a failed call must not be timed as a fast one"""
+    if not response.success:
+        raise RuntimeError(response.message)
+    return response.data
+
+
+def summarize(samples_ms: Sequence[float], items: int = 1) -> Dict[str, Any]:
+    ordered = sorted(samples_ms)
+    median = statistics.median(ordered)
+    summary = {
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(median, 3),
+        "p95_ms": round(ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "samples_ms": [round(sample, 3) for sample in samples_ms],
+        "items": items,
+    }
+    if items > 1 and median > 0:
+        summary["items_per_second"] = round(items / (median / 1000), 1)
+    return summary
+
+
+async def run_benchmark(benchmark: Benchmark, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP):
+    samples = []
+    for n in range(warmup + repeat):
+        await _call(benchmark.setup)
+        started = time.perf_counter()
+        try:
+            await _call(benchmark.run)
+        finally:
+            elapsed = time.perf_counter() - started
+            await _call(benchmark.teardown)
+        if n >= warmup:
+            samples.append(elapsed * 1000)
+    result = summarize(samples, benchmark.items)
+    result["group"] = benchmark.group
+    if benchmark.threshold is not None:
+        result["threshold"] = benchmark.threshold
+    return result
+
+
+async def run_suite(
+    context: BenchmarkContext,
+    repeat: int = DEFAULT_REPEAT,
+    warmup: int = DEFAULT_WARMUP,
+    only: Optional[Sequence[str]] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the benchmarks whose names start with one of `only` (all by default).
+
+    A benchmark that raises is reported with its error instead of timings; the rest still run.
+    """
+    results = {}
+    for benchmark in build_benchmarks(context):
+        if only and not any(benchmark.name.startswith(prefix) for prefix in only):
+            continue
+        try:
+            result = await run_benchmark(benchmark, repeat, warmup)
+        except Exception as e:
+            logger.exception(f"Benchmark {benchmark.name} failed")
+            result = {"group": benchmark.group, "error": str(e)}
+        results[benchmark.name] = result
+        if progress:
+            progress(benchmark.name, result)
+    return results
+
+
+def build_benchmarks(context: BenchmarkContext) -> List[Benchmark]:
+    targets = _pick_targets(context.engine)
+    return [
+        *_part_benchmarks(context, targets),
+        *_dashboard_benchmarks(context),
+        *_location_benchmarks(context, targets),
+        _import_benchmark(context),
+        _label_benchmark(context, targets),
+        _task_benchmark(context),
+    ]
+
+
+def _pick_targets(engine: Engine) -> Dict[str, Any]:
+    """Locations and parts the benchmarks work on, chosen the same way on every run"""
+    locations = LocationModel.__table__
+    depth = func.length(locations.c.path_ids)
+    with engine.connect() as conn:
+        root = conn.execute(
+            select(locations.c.id).where(locations.c.parent_id.is_(None)).order_by(locations.c.name, locations.c.id)
+        ).scalar()
+        deepest = conn.execute(select(locations.c.id).order_by(depth.desc(), locations.c.id)).scalar()
+        shelves = list(
+            conn.execute(
+                select(locations.c.id, locations.c.parent_id)
+                .where(locations.c.location_type == "shelf")
+                .order_by(locations.c.name, locations.c.id)
+                .limit(2)
+            ).all()
+        )
+        container = conn.execute(
+            select(locations.c.id).where(locations.c.location_type == "container").order_by(locations.c.id)
+        ).scalar()
+        part_count = conn.execute(select(func.count()).select_from(PartModel.__table__)).scalar()
+        sample_parts = conn.execute(
+            select(PartModel.__table__).order_by(PartModel.__table__.c.part_name).limit(50)
+        ).mappings()
+        label_parts = [dict(row) for row in sample_parts]
+
+    if root is None or not shelves or container is None:
+        raise RuntimeError("The database has no generated location tree; generate a dataset first")
+
+    # The first shelf moves between its own parent and another location of the same kind
+    shelf_id, shelf_parent = shelves[0]
+    with engine.connect() as conn:
+        parent_type = conn.execute(select(locations.c.location_type).where(locations.c.id == shelf_parent)).scalar()
+        other_parent = conn.execute(
+            select(locations.c.id)
+            .where(locations.c.location_type == parent_type, locations.c.id != shelf_parent)
+            .order_by(locations.c.id)
+        ).scalar()
+    if other_parent is None and len(shelves) > 1:
+        other_parent = shelves[1][0]
+
+    return {
+        "root": root,
+        "deepest": deepest,
+        "shelf": shelf_id,
+        "move": (shelf_id, shelf_parent, other_parent),
+        "container": container,
+        "part_count": part_count,
+        "label_parts": label_parts,
+    }
+
+
+# === Parts ===
+
+
+def _part_benchmarks(context: BenchmarkContext, targets: Dict[str, Any]) -> List[Benchmark]:
+    engine = context.engine
+
+    def search(query: str):
+        def run():
+            with Session(engine) as session:
+                return PartRepository.search_parts_text(session, query, page=1, page_size=20)
+
+        return run
+
+    def page(**params):
+        def run():
+            with Session(engine) as session:
+                return PartRepository.advanced_search(session, AdvancedPartSearch(**params))
+
+        return run
+
+    middle_page = max(1, targets["part_count"] // 40)
+    return [
+        Benchmark("parts.search.text", "parts", search("capacitor")),
+        Benchmark("parts.search.exact_value", "parts", search("10k")),
+        Benchmark("parts.search.field", "parts", search("name:TPS")),
+        Benchmark("parts.search.property", "parts", search("prop:package 0603")),
+        Benchmark("parts.search.property_range", "parts", search("prop:voltage_rating>=50V")),
+        Benchmark("parts.search.tag_missing", "parts", search("tag:missing")),
+        Benchmark("parts.page.first", "parts", page(page=1, page_size=20)),
+        Benchmark("parts.page.middle", "parts", page(page=middle_page, page_size=20)),
+        Benchmark("parts.page.by_quantity", "parts", page(sort_by="quantity", sort_order="desc", page_size=50)),
+        Benchmark(
+            "parts.page.filtered",
+            "parts",
+            page(supplier="LCSC", category_names=["Capacitors"], min_quantity=10, page_size=50),
+        ),
+    ]
+
+
+# === Dashboard ===
+
+
+def _dashboard_benchmarks(context: BenchmarkContext) -> List[Benchmark]:
+    from MakerMatrix.services.data.dashboard_service import DashboardService
+
+    service = DashboardService(context.engine)
+    return [
+        Benchmark("dashboard.summary", "dashboard", lambda: service.get_dashboard_summary(use_cache=False)),
+        Benchmark("dashboard.rebuild_aggregates", "dashboard", service.rebuild_aggregates),
+    ]
+
+
+# === Locations ===
+
+
+def _location_benchmarks(context: BenchmarkContext, targets: Dict[str, Any]) -> List[Benchmark]:
+    from MakerMatrix.services.data.location_service import LocationService
+
+    service = LocationService(context.engine)
+    shelf_id, parent_id, other_parent_id = targets["move"]
+
+    def parts_below_shelf():
+        with Session(context.engine) as session:
+            return PartRepository.get_parts_by_location_id(session, targets["shelf"], recursive=True)
+
+    def move_and_back():
+        _ok(service.update_location(shelf_id, {"parent_id": other_parent_id}))
+        _ok(service.update_location(shelf_id, {"parent_id": parent_id}))
+
+    return [
+        Benchmark("locations.list_all", "locations", lambda: _ok(service.get_all_locations())),
+        Benchmark("locations.details", "locations", lambda: _ok(service.get_location_details(targets["root"]))),
+        Benchmark("locations.path", "locations", lambda: _ok(service.get_location_path(targets["deepest"]))),
+        Benchmark(
+            "locations.container_slots", "locations", lambda: _ok(service.get_container_slots(targets["container"]))
+        ),
+        Benchmark("locations.parts_recursive", "locations", parts_below_shelf),
+        Benchmark("locations.move_subtree", "locations", move_and_back, items=2),
+    ]
+
+
+# === CSV import ===
+
+
+def _import_benchmark(context: BenchmarkContext) -> Benchmark:
+    """Parse an LCSC order export and create its parts the way the import route does"""
+    from MakerMatrix.services.data.part_service import PartService
+    from MakerMatrix.suppliers.registry import get_supplier
+
+    part_service = PartService(context.engine)
+    batch = {"number": 0, "content": b"", "part_ids": []}
+
+    def setup():
+        batch["number"] += 1
+        batch["content"] = lcsc_order_csv(context.import_rows, context.seed + batch["number"], batch["number"])
+        batch["content"] = batch["content"].encode("utf-8")
+        batch["part_ids"] = []
+
+    async def run():
+        supplier = get_supplier("lcsc")
+        result = await supplier.import_order_file(batch["content"], "csv", "benchmark.csv")
+        if not result.success:
+            raise RuntimeError(result.error_message)
+        for part_data in result.parts:
+            part_data.setdefault("supplier", "LCSC")
+            created = _ok(part_service.add_part(part_data))
+            batch["part_ids"].append(created["id"] if isinstance(created, dict) else created.id)
+
+    def teardown():
+        with Session(context.engine) as session:
+            for part_id in batch["part_ids"]:
+                PartRepository.delete_part(session, part_id)
+            session.commit()
+
+    return Benchmark(
+        "import.lcsc_csv",
+        "import",
+        run,
+        items=context.import_rows,
+        setup=setup,
+        teardown=teardown,
+        threshold=NOISY_THRESHOLD,
+    )
+
+
+# === Labels ===
+
+
+def _label_benchmark(context: BenchmarkContext, targets: Dict[str, Any]) -> Benchmark:
+    """Render part labels with a QR code, bypassing the preview cache"""
+    from MakerMatrix.lib.print_settings import PrintSettings
+    from MakerMatrix.models.label_template_models import LabelTemplateModel
+    from MakerMatrix.services.printer.template_processor import TemplateProcessor
+
+    processor = TemplateProcessor()
+    template = LabelTemplateModel(
+        name="benchmark",
+        display_name="Benchmark",
+        text_template="{part_name}\n{description}",
+        label_width_mm=62.0,
+        label_height_mm=29.0,
+        qr_enabled=True,
+    )
+    settings = PrintSettings(label_size=29, label_len=62 / 25.4, dpi=300, qr_scale=template.qr_scale)
+    parts = (targets["label_parts"] * context.labels)[: context.labels]
+
+    def run():
+        for part in parts:
+            processor.process_template(template, part, settings)
+
+    return Benchmark("labels.render", "labels", run, items=len(parts), threshold=NOISY_THRESHOLD)
+
+
+# === Tasks ===
+
+
+def _task_benchmark(context: BenchmarkContext) -> Benchmark:
+    """Create a batch of no-op tasks and run them through the task queue"""
+    from MakerMatrix.services.system.task_service import TaskService
+    from MakerMatrix.tasks.base_task import BaseTask
+
+    class _NoOpTask(BaseTask):
+        @property
+        def task_type(self) -> str:
+            return TaskType.DATA_SYNC.value
+
+        @property
+        def name(self) -> str:
+            return "Benchmark Task"
+
+        @property
+        def description(self) -> str:
+            return "Reports progress once and completes"
+
+        async def execute(self, task: TaskModel) -> Dict[str, Any]:
+            await self.update_progress(task, 50, "Working")
+            return {}
+
+    service = TaskService(context.engine)
+    service.task_instances[TaskType.DATA_SYNC.value] = _NoOpTask(task_service=service)
+
+    async def run():
+        for n in range(context.tasks):
+            request = CreateTaskRequest(
+                task_type=TaskType.DATA_SYNC,
+                name=f"Benchmark task {n}",
+                related_entity_type=BENCHMARK_ENTITY_TYPE,
+            )
+            _ok(await service.create_task(request))
+        # The worker loop without its poll interval
+        while True:
+            await service._process_pending_tasks()
+            if not service.running_tasks:
+                break
+            await asyncio.gather(*list(service.running_tasks.values()), return_exceptions=True)
+
+    def teardown():
+        with context.engine.begin() as conn:
+            conn.execute(delete(TaskModel.__table__).where(TaskModel.related_entity_type == BENCHMARK_ENTITY_TYPE))
+
+    return Benchmark(
+        "tasks.throughput", "tasks", run, items=context.tasks, teardown=teardown, threshold=NOISY_THRESHOLD
+    )
@@ -21,6 +21,8 @@ from MakerMatrix.models.csv_import_config_model import *
 from MakerMatrix.models.label_template_models import *
 from MakerMatrix.models.part_metadata_models import *
 from MakerMatrix.models.backup_models import *
+from MakerMatrix.models.part_property_models import *
+from MakerMatrix.models.enrichment_queue_models import *
 from sqlalchemy import inspect, event
 
 # Database URL for backup and utility operations
@@ -36,6 +38,47 @@ def get_session() -> Generator[Session, None, None]:
 # Function to create tables in the SQLite database
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    apply_schema_upgrades()
+    populate_property_index()
+
+
+def populate_property_index():
+    """Build the parametric property index for databases that predate it."""
+    from MakerMatrix.repositories.part_property_repository import PartPropertyRepository
+
+    with engine.begin() as conn:
+        if PartPropertyRepository.needs_rebuild(conn):
+            PartPropertyRepository.rebuild(conn)
+
+
+def apply_schema_upgrades():
+    """Bring tables created by older versions up to date (create_all never alters existing tables)."""
+    from MakerMatrix.migrations import (
+        add_part_stock_columns,
+        add_datasheet_content_columns,
+        add_task_log_column,
+        add_location_path_columns,
+        add_project_link_quantity,
+        add_query_indexes,
+        enable_incremental_vacuum,
+    )
+
+    raw_connection = engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        add_part_stock_columns.upgrade(cursor)
+        add_datasheet_content_columns.upgrade(cursor)
+        add_task_log_column.upgrade(cursor)
+        add_location_path_columns.upgrade(cursor)
+        add_project_link_quantity.upgrade(cursor)
+        add_query_indexes.upgrade(cursor)
+        # VACUUM cannot run inside the transaction the migrations above may have opened
+        raw_connection.commit()
+        enable_incremental_vacuum.upgrade(cursor)
+        cursor.close()
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
 
 
 @event.listens_for(engine, "connect")
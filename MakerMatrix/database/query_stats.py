@@ -0,0 +1,187 @@
+"""
+Query Stats - SQL statement counts, database time and rows per request or other scope.
+
+register_query_hooks() installs cursor execute listeners on every Engine. While a QueryStats
+is active (track_queries()), each statement run in that context adds its duration to it.
+That includes statements run in the event loop, in threadpool endpoints and in
+asyncio.to_thread calls, which all copy the context. Rows fetched through the SQLite cursors
+of the application engine are counted too (see InstrumentedConnection). Statements outside
+a tracked scope only go to the process-wide totals.
+
+With REQUEST_METRICS_ENABLED=false the application engine is created without the
+instrumented connection and the listeners are never installed, so statements and fetches
+run without the extra Python layer.
+
+Statements are grouped by their SQL text with a redacted copy of the first parameters, so a
+slow request log shows repeated (N+1) queries without leaking the values that were bound.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "true").lower() == "true"
+
+# Distinct statements kept per scope for the slow request log
+MAX_CAPTURED_STATEMENTS = 100
+MAX_STATEMENT_LENGTH = 1000
+
+_START_ATTRIBUTE = "_query_stats_start"
+
+
+class QueryStats:
+    """Statements, database seconds and fetched rows of one scope"""
+
+    def __init__(self, capture: bool = True):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.capture = capture
+        # SQL text -> [executions, seconds, redacted parameters of the first execution]
+        self.captured: Dict[str, List[Any]] = {}
+        self.closed = False
+
+    def record(self, statement: str, parameters: Any, duration: float, executemany: bool) -> None:
+        self.statements += 1
+        self.db_seconds += duration
+        if not self.capture:
+            return
+        entry = self.captured.get(statement)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += duration
+        elif len(self.captured) < MAX_CAPTURED_STATEMENTS:
+            self.captured[statement] = [1, duration, redact_parameters(parameters, executemany)]
+
+    def top_statements(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """The captured statements that took the most time in total"""
+        ranked = sorted(self.captured.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {
+                "statement": " ".join(statement.split())[:MAX_STATEMENT_LENGTH],
+                "executions": executions,
+                "seconds": seconds,
+                "parameters": parameters,
+            }
+            for statement, (executions, seconds, parameters) in ranked
+        ]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+_totals_lock = threading.Lock()
+_totals = {"tracked": [0, 0.0], "untracked": [0, 0.0]}  # scope -> [statements, seconds]
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    stats = _current.get()
+    return stats if stats is not None and not stats.closed else None
+
+
+@contextmanager
+def track_queries(capture: bool = True, close: bool = True) -> Iterator[QueryStats]:
+    """
+    Count the statements run in this context until the block exits.
+
+    With close=False, tasks started inside the block keep adding to the stats until the
+    caller sets stats.closed, e.g. once a streamed response body has been sent.
+    """
+    stats = QueryStats(capture)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        # Tasks started inside the block inherit the context; stop them adding to finished stats
+        if close:
+            stats.closed = True
+
+
+def query_totals() -> Dict[str, Dict[str, float]]:
+    """Statements and seconds since start, split by whether a scope was tracking them"""
+    with _totals_lock:
+        return {scope: {"statements": count, "seconds": seconds} for scope, (count, seconds) in _totals.items()}
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace bound values with their type so logged statements carry no data"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return tuple(_redact(value) for value in parameters)
+    return _redact(parameters)
+
+
+def _redact(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    return f"<{type(value).__name__}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        setattr(context, _START_ATTRIBUTE, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, _START_ATTRIBUTE, None)
+    if started is None:
+        return
+    duration = time.perf_counter() - started
+    stats = current_query_stats()
+    with _totals_lock:
+        totals = _totals["tracked" if stats is not None else "untracked"]
+        totals[0] += 1
+        totals[1] += duration
+    if stats is not None:
+        stats.record(statement, parameters, duration, executemany)
+
+
+def register_query_hooks() -> None:
+    """Install the statement listeners on all engines (idempotent)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _count_rows(count: int) -> None:
+    if count:
+        stats = _current.get()
+        if stats is not None and not stats.closed:
+            stats.rows += count
+
+
+class _CountingCursor(sqlite3.Cursor):
+    """SQLite cursor that adds the rows it returns to the current QueryStats"""
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            _count_rows(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = super().fetchmany(*args, **kwargs)
+        _count_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        _count_rows(len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3 connection factory whose cursors count fetched rows"""
+
+    def cursor(self, factory=_CountingCursor):
+        return super().cursor(factory)
@@ -434,6 +434,7 @@ export const SupplierConfigPage: React.FC = () => {
                         fetch_pricing: 'Pricing Data',
                         fetch_stock: 'Stock Levels',
                         import_orders: 'Order Import',
+                        bulk_search: 'Batch Lookup',
                         parametric_search: 'Advanced Search',
                       }
                       return (
@@ -338,7 +338,7 @@ export class SettingsService {
     const url = window.URL.createObjectURL(blob)
     const a = document.createElement('a')
     a.href = url
-    a.download = `makermatrix_export_${new Date().toISOString().slice(0, 10)}.json`
+    a.download = `makermatrix_export_${new Date().toISOString().slice(0, 10)}.ndjson`
     document.body.appendChild(a)
     a.click()
     window.URL.revokeObjectURL(url)
@@ -257,7 +257,7 @@ class TemplateService {
     templateConfig: Record<string, unknown>,
     data: Record<string, unknown>
   ): Promise<Blob> {
-    const response = await fetch('/api/printer/preview/template/draft', {
+    const response = await fetch('/api/printer/preview/template/draft.png', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -268,22 +268,16 @@ class TemplateService {
 
     if (!response.ok) {
       const errorData = await response.json()
-      throw new Error(errorData.message || 'Failed to generate draft preview')
+      throw new Error(errorData.message || errorData.detail || 'Failed to generate draft preview')
     }
 
-    const jsonResponse = await response.json()
-    if (jsonResponse.status === 'success' && jsonResponse.data?.preview_url) {
-      const base64Data = jsonResponse.data.preview_url
-      const resp = await fetch(base64Data)
-      return resp.blob()
-    }
-
-    throw new Error('Invalid preview response format')
+    // Backend returns the PNG itself
+    return response.blob()
   }
 
   // Preview template with data
   async previewTemplate(request: TemplatePreviewRequest): Promise<Blob> {
-    const response = await fetch('/api/printer/preview/template', {
+    const response = await fetch('/api/printer/preview/template.png', {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -294,19 +288,11 @@ class TemplateService {
 
     if (!response.ok) {
       const errorData = await response.json()
-      throw new Error(errorData.message || 'Failed to generate template preview')
-    }
-
-    // Backend returns JSON with {status, data: {preview_url, width, height}}
-    const jsonResponse = await response.json()
-    if (jsonResponse.status === 'success' && jsonResponse.data?.preview_url) {
-      // Convert base64 data URL to Blob
-      const base64Data = jsonResponse.data.preview_url
-      const response = await fetch(base64Data)
-      return response.blob()
+      throw new Error(errorData.message || errorData.detail || 'Failed to generate template preview')
     }
 
-    throw new Error('Invalid preview response format')
+    // Backend returns the PNG itself
+    return response.blob()
   }
 
   // Print using template
@@ -1,7 +1,11 @@
 from contextlib import asynccontextmanager
 import asyncio
+import time
 from dotenv import load_dotenv
 
+# Measured for the startup report; importing the routers is a large part of a cold start
+_imports_started = time.perf_counter()
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -41,6 +45,7 @@ from MakerMatrix.routers import (
     tag_routes,
     backup_routes,
     dashboard_routes,
+    metrics_routes,
 )
 from MakerMatrix.database.db import create_db_and_tables
 from MakerMatrix.handlers.exception_handlers import register_exception_handlers
@@ -49,156 +54,220 @@ from MakerMatrix.scripts.setup_admin import setup_default_roles, setup_default_a
 from MakerMatrix.repositories.user_repository import UserRepository
 from MakerMatrix.services.system.task_service import task_service
 from MakerMatrix.services.system.websocket_service import start_ping_task
+from MakerMatrix.services.system.coordination import coordination_enabled, get_coordination_store
+from MakerMatrix.services.system.event_bus import get_event_bus
+from MakerMatrix.services.system.leader_election import LeaderElector
 from MakerMatrix.services.printer.printer_manager_service import initialize_default_printers
+from MakerMatrix.services.system.startup import (
+    FAST_START,
+    setup_fingerprint,
+    setup_is_current,
+    startup_report,
+    write_setup_fingerprint,
+)
+
+startup_report.record_imports(_imports_started)
+
+
+async def initialize_rate_limits():
+    from MakerMatrix.services.rate_limit_service import RateLimitService
+    from MakerMatrix.models.models import engine
+
+    await RateLimitService(engine).initialize_default_limits()
+
+
+def initialize_default_suppliers():
+    from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
+
+    # Initialize default suppliers (will skip if they already exist)
+    configs = SupplierConfigService().initialize_default_suppliers()
+    print(f"Initialized {len(configs)} supplier configurations")
+
+
+def auto_configure_env_suppliers():
+    """Create configurations for suppliers whose credentials are set in the environment"""
+    from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
+    from MakerMatrix.utils.env_credentials import list_available_env_credentials
+    from MakerMatrix.suppliers.registry import get_available_suppliers, get_supplier
+
+    config_service = SupplierConfigService()
+    available_creds = list_available_env_credentials()
+    available_suppliers = get_available_suppliers()
+
+    for supplier_name in available_suppliers:
+        # Check if we have credentials for this supplier
+        supplier_key = supplier_name.replace("-", "").replace("_", "").lower()
+        cred_key = None
+        for cred_supplier in available_creds.keys():
+            if cred_supplier.replace("-", "").replace("_", "").lower() == supplier_key:
+                cred_key = cred_supplier
+                break
+
+        if cred_key and available_creds[cred_key]:
+            try:
+                # Check if supplier is already configured
+                existing_config = None
+                try:
+                    existing_config = config_service.get_supplier_config(supplier_name)
+                except:
+                    # Supplier not found, which is fine - we'll create it
+                    pass
+
+                if not existing_config:
+                    # Auto-create supplier configuration
+                    supplier = get_supplier(supplier_name)
+                    supplier_info = supplier.get_supplier_info()
+                    config_data = {
+                        "supplier_name": supplier_name,
+                        "display_name": supplier_info.display_name,
+                        "description": supplier_info.description,
+                        "api_type": "rest",
+                        "base_url": getattr(supplier_info, "website_url", "https://api.example.com"),
+                        "enabled": True,
+                        "capabilities": [cap.value for cap in supplier.get_capabilities()],
+                    }
+                    config_service.create_supplier_config(config_data)
+                    print(
+                        f"Auto-configured supplier: {supplier_name} (found credentials: {list(available_creds[cred_key])})"
+                    )
+                else:
+                    print(f"Supplier {supplier_name} already configured")
+            except Exception as supplier_error:
+                print(f"Failed to auto-configure supplier {supplier_name}: {supplier_error}")
+
+
+def initialize_csv_import_config():
+    from MakerMatrix.models.csv_import_config_model import CSVImportConfigModel
+    from MakerMatrix.models.models import engine
+    from sqlmodel import Session, select
+
+    with Session(engine) as session:
+        existing_config = session.exec(select(CSVImportConfigModel).where(CSVImportConfigModel.id == "default")).first()
+        if not existing_config:
+            default_config = CSVImportConfigModel(
+                id="default",
+                download_datasheets=True,
+                download_images=True,
+                overwrite_existing_files=False,
+                download_timeout_seconds=30,
+                show_progress=True,
+                enable_enrichment=True,
+                auto_create_enrichment_tasks=True,
+                additional_settings={},
+            )
+            session.add(default_config)
+            session.commit()
+            print("Created default CSV import configuration!")
+        else:
+            print("Default CSV import configuration already exists")
+
+
+async def run_setup():
+    """Create whatever is missing: the tables first, then the independent defaults concurrently"""
+    await startup_report.run("create database tables", create_db_and_tables, required=True)
+
+    async def users():
+        user_repo = UserRepository()
+        await startup_report.run("set up default roles", setup_default_roles, user_repo, required=True)
+        await startup_report.run("set up default admin", setup_default_admin, user_repo, required=True)
+
+    async def suppliers():
+        # The environment credentials step only adds suppliers the defaults did not create
+        await startup_report.run("initialize default suppliers", initialize_default_suppliers)
+        await startup_report.run("configure suppliers from environment credentials", auto_configure_env_suppliers)
+
+    await asyncio.gather(
+        users(),
+        suppliers(),
+        startup_report.run("initialize default printers", initialize_default_printers),
+        startup_report.run("initialize rate limits", initialize_rate_limits),
+        startup_report.run("initialize CSV import configuration", initialize_csv_import_config),
+    )
+
+
+async def restore_printers():
+    from MakerMatrix.services.printer.printer_persistence_service import get_printer_persistence_service
+
+    restored_printers = await get_printer_persistence_service().restore_printers_from_database()
+    print(f"Restored {len(restored_printers)} printers from database: {restored_printers}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
-    # Run the database setup
-    create_db_and_tables()
-
-    # Set up default roles and admin user
-    print("Setting up default roles and admin user...")
-    user_repo = UserRepository()
-    setup_default_roles(user_repo)
-    setup_default_admin(user_repo)
-    print("Setup complete!")
-
-    # Initialize default printers
-    print("Initializing default printers...")
-    await initialize_default_printers()
-    print("Default printers initialized!")
-
-    # Initialize rate limiting system
-    print("Initializing rate limiting system...")
-    try:
-        from MakerMatrix.services.rate_limit_service import RateLimitService
-        from MakerMatrix.models.models import engine
+    startup_report.begin()
+    from MakerMatrix.models.models import engine
+
+    # With FAST_START=true the setup is skipped while nothing it depends on has changed
+    fingerprint = setup_fingerprint() if FAST_START else None
+    if fingerprint is not None and await asyncio.to_thread(setup_is_current, engine, fingerprint):
+        startup_report.fast_start = True
+        startup_report.skip("setup")
+        print("Database setup unchanged since the last start, skipping it (FAST_START)")
+    else:
+        await run_setup()
+        # A failed step runs again on the next start
+        if fingerprint is not None and not startup_report.failed:
+            await asyncio.to_thread(write_setup_fingerprint, engine, fingerprint)
+        print("Setup complete!")
+
+    # Start the event bus that carries broadcasts between worker processes, and restore
+    # the printers saved in the database meanwhile
+    event_bus = get_event_bus()
+    await asyncio.gather(
+        startup_report.run("start event bus", event_bus.start, required=True),
+        startup_report.run("restore printers", restore_printers),
+    )
+    print(f"Event bus started ({event_bus.backend})")
 
-        rate_limit_service = RateLimitService(engine)
-        await rate_limit_service.initialize_default_limits()
-        print("Rate limiting system initialized!")
-    except Exception as e:
-        print(f"Failed to initialize rate limiting: {e}")
-        # Don't fail startup if rate limiting initialization fails
+    # Start WebSocket ping task
+    asyncio.create_task(start_ping_task())
 
-    # Initialize default supplier configurations
-    print("Initializing default supplier configurations...")
-    try:
-        from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
+    # Start the task worker and backup scheduler (after all setup is complete).
+    # With several worker processes only the holder of the lease runs them.
+    app.state.leader_elector = LeaderElector(
+        "background-services",
+        get_coordination_store() if coordination_enabled() else None,
+        on_elected=start_background_services,
+        on_demoted=stop_background_services,
+    )
+    await startup_report.run("start leader election", app.state.leader_elector.start, required=True)
 
-        config_service = SupplierConfigService()
-        # Initialize default suppliers (will skip if they already exist)
-        configs = config_service.initialize_default_suppliers()
-        print(f"Initialized {len(configs)} supplier configurations")
+    # Every worker flushes its own part view/search counters
+    from MakerMatrix.services.system.part_usage_counters import part_usage_counters
 
-        print("Default supplier initialization completed!")
-    except Exception as e:
-        print(f"Failed to initialize default suppliers: {e}")
-        # Don't fail startup if supplier initialization fails
+    await part_usage_counters.start()
 
-    # Auto-initialize suppliers with environment credentials
-    print("Auto-initializing suppliers with environment credentials...")
-    try:
-        from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
-        from MakerMatrix.utils.env_credentials import list_available_env_credentials
-        from MakerMatrix.suppliers.registry import get_available_suppliers, get_supplier
-
-        config_service = SupplierConfigService()
-        available_creds = list_available_env_credentials()
-        available_suppliers = get_available_suppliers()
-
-        for supplier_name in available_suppliers:
-            # Check if we have credentials for this supplier
-            supplier_key = supplier_name.replace("-", "").replace("_", "").lower()
-            cred_key = None
-            for cred_supplier in available_creds.keys():
-                if cred_supplier.replace("-", "").replace("_", "").lower() == supplier_key:
-                    cred_key = cred_supplier
-                    break
-
-            if cred_key and available_creds[cred_key]:
-                try:
-                    # Check if supplier is already configured
-                    existing_config = None
-                    try:
-                        existing_config = config_service.get_supplier_config(supplier_name)
-                    except:
-                        # Supplier not found, which is fine - we'll create it
-                        pass
-
-                    if not existing_config:
-                        # Auto-create supplier configuration
-                        supplier_info = get_supplier(supplier_name).get_supplier_info()
-                        config_data = {
-                            "supplier_name": supplier_name,
-                            "display_name": supplier_info.display_name,
-                            "description": supplier_info.description,
-                            "api_type": "rest",
-                            "base_url": getattr(supplier_info, "website_url", "https://api.example.com"),
-                            "enabled": True,
-                            "capabilities": [cap.value for cap in get_supplier(supplier_name).get_capabilities()],
-                        }
-                        config_service.create_supplier_config(config_data)
-                        print(
-                            f"Auto-configured supplier: {supplier_name} (found credentials: {list(available_creds[cred_key])})"
-                        )
-                    else:
-                        print(f"Supplier {supplier_name} already configured")
-                except Exception as supplier_error:
-                    print(f"Failed to auto-configure supplier {supplier_name}: {supplier_error}")
-
-        print("Supplier auto-initialization completed!")
-    except Exception as e:
-        print(f"Failed to auto-initialize suppliers: {e}")
-        # Don't fail startup if supplier initialization fails
+    # Opt-in: measure event loop lag and record the code that blocks the loop
+    from MakerMatrix.services.system.event_loop_monitor import ENABLED as loop_monitor_enabled, event_loop_monitor
 
-    # Initialize default CSV import configuration
-    print("Initializing default CSV import configuration...")
-    try:
-        from MakerMatrix.models.csv_import_config_model import CSVImportConfigModel
-        from MakerMatrix.models.models import engine
-        from sqlmodel import Session, select
+    if loop_monitor_enabled:
+        await event_loop_monitor.start()
 
-        session = Session(engine)
-        try:
-            existing_config = session.exec(
-                select(CSVImportConfigModel).where(CSVImportConfigModel.id == "default")
-            ).first()
-            if not existing_config:
-                default_config = CSVImportConfigModel(
-                    id="default",
-                    download_datasheets=True,
-                    download_images=True,
-                    overwrite_existing_files=False,
-                    download_timeout_seconds=30,
-                    show_progress=True,
-                    enable_enrichment=True,
-                    auto_create_enrichment_tasks=True,
-                    additional_settings={},
-                )
-                session.add(default_config)
-                session.commit()
-                print("Created default CSV import configuration!")
-            else:
-                print("Default CSV import configuration already exists")
-        finally:
-            session.close()
-    except Exception as e:
-        print(f"Failed to initialize CSV import config: {e}")
-        # Don't fail startup if CSV config initialization fails
+    startup_report.ready()
+    print(startup_report.summary())
+
+    yield  # App continues running
+
+    print("Shutting down...")
+
+    # Stops the backup scheduler and task worker if this process runs them
+    await app.state.leader_elector.stop()
+    await part_usage_counters.stop()
+    await event_loop_monitor.stop()
+    await event_bus.stop()
+
+    from MakerMatrix.services.system.pdf_proxy_cache import close_pdf_proxy_cache
+
+    await close_pdf_proxy_cache()
 
-    # Start the task worker (after all setup is complete)
+
+async def start_background_services():
+    """Start the services that must run in a single worker process"""
     print("Starting task worker...")
     asyncio.create_task(task_service.start_worker())
     print("Task worker started!")
 
-    # Start WebSocket ping task
-    print("Starting WebSocket ping task...")
-    asyncio.create_task(start_ping_task())
-    print("WebSocket service started!")
-
     # Start backup scheduler
     print("Starting backup scheduler...")
     try:
@@ -210,23 +279,23 @@ async def lifespan(app: FastAPI):
         print(f"Failed to start backup scheduler: {e}")
         # Don't fail startup if backup scheduler fails
 
-    # Restore printers from database
-    print("Restoring printers from database...")
+    # Resume enrichment tasks queued or interrupted before the restart
     try:
-        from MakerMatrix.services.printer.printer_persistence_service import get_printer_persistence_service
+        from MakerMatrix.services.system.enrichment_queue_manager import get_enrichment_queue_manager
 
-        persistence_service = get_printer_persistence_service()
-        restored_printers = await persistence_service.restore_printers_from_database()
-        print(f"Restored {len(restored_printers)} printers from database: {restored_printers}")
+        resumed = await get_enrichment_queue_manager().resume()
+        print(f"Enrichment queue resumed ({resumed} interrupted tasks released)")
     except Exception as e:
-        print(f"Failed to restore printers from database: {e}")
-        # Don't fail startup if printer restoration fails
+        print(f"Failed to resume enrichment queue: {e}")
 
-    yield  # App continues running
+    # Fold supplier request rows into the usage buckets
+    from MakerMatrix.services.system.supplier_usage_rollup import supplier_usage_rollup
 
-    print("Shutting down...")
+    await supplier_usage_rollup.start()
 
-    # Stop backup scheduler on shutdown
+
+async def stop_background_services():
+    # Stop backup scheduler
     try:
         from MakerMatrix.services.system.backup_scheduler import backup_scheduler
 
@@ -235,10 +304,22 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Failed to stop backup scheduler: {e}")
 
-    # Stop the task worker on shutdown
+    # Stop the task worker
     await task_service.stop_worker()
     print("Task worker stopped!")
 
+    # Hand running enrichment tasks back to the queue
+    try:
+        from MakerMatrix.services.system.enrichment_queue_manager import get_enrichment_queue_manager
+
+        await get_enrichment_queue_manager().stop()
+    except Exception as e:
+        print(f"Failed to stop enrichment queue: {e}")
+
+    from MakerMatrix.services.system.supplier_usage_rollup import supplier_usage_rollup
+
+    await supplier_usage_rollup.stop()
+
 
 # Initialize the FastAPI app with lifespan
 app = FastAPI(
@@ -285,6 +366,13 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Add the middleware to the app
 app.middleware("http")(guest_rate_limit_middleware)
 
+# Record per-route timings and SQL counts (added last so it also times the middleware above)
+from MakerMatrix.database.query_stats import ENABLED as request_metrics_enabled
+from MakerMatrix.middleware.request_metrics import request_metrics_middleware
+
+if request_metrics_enabled:
+    app.middleware("http")(request_metrics_middleware)
+
 # Define permissions for specific routes
 parts_permissions = {
     "/add_part": "parts:create",
@@ -526,6 +614,7 @@ app.include_router(rate_limit_routes.router, prefix="/api/rate-limits", tags=["R
 app.include_router(activity_routes.router, prefix="/api/activity", tags=["Activity"])
 app.include_router(backup_routes.router, tags=["Backup Management"])
 app.include_router(websocket_routes.router, tags=["WebSocket"])
+app.include_router(metrics_routes.router, tags=["Metrics"])
 
 # Include user management router also at /users for backward compatibility
 app.include_router(user_management_routes.router, prefix="/users", tags=["Users Legacy"])
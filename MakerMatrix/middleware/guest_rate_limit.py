@@ -10,6 +10,9 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from jose import jwt, JWTError
 import os
+import sqlite3
+import time
+from typing import Tuple
 
 # Get JWT secret from environment
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -72,11 +75,69 @@ guest_limiter = Limiter(
 
 from slowapi.util import get_ipaddr
 from limits import RateLimitItem, parse
-from limits.storage import MemoryStorage
+from limits.storage import MemoryStorage, MovingWindowSupport, Storage, storage_from_string
 from limits.strategies import MovingWindowRateLimiter
 
-# Create in-memory storage for rate limits
-storage = MemoryStorage()
+from MakerMatrix.services.system.coordination import CoordinationStore, event_bus_backend, get_coordination_store
+
+
+class SharedRateLimitStorage(Storage, MovingWindowSupport):
+    """
+    limits storage backed by the coordination store, so every worker process counts
+    against the same limits. Used when the deployment runs more than one worker.
+    """
+
+    STORAGE_SCHEME = None
+
+    def __init__(self, store: CoordinationStore, **options):
+        super().__init__(**options)
+        self.store = store
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.store.increment_value(f"limits:{key}", expiry, amount)
+
+    def get(self, key: str) -> int:
+        return self.store.get_value(f"limits:{key}") or 0
+
+    def get_expiry(self, key: str) -> float:
+        return self.store.get_value_expiry(f"limits:{key}") or time.time()
+
+    def check(self) -> bool:
+        try:
+            self.store.connect().execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def reset(self) -> int:
+        return self.store.clear_rate_limit()
+
+    def clear(self, key: str) -> None:
+        self.store.delete_value(f"limits:{key}")
+        self.store.clear_rate_limit(key)
+
+    def acquire_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        return self.store.acquire_rate_limit_entry(key, limit, expiry, amount)
+
+    def get_moving_window(self, key: str, limit: int, expiry: int) -> Tuple[float, int]:
+        return self.store.get_rate_limit_window(key, expiry)
+
+
+def create_rate_limit_storage() -> Storage:
+    """In-memory for a single worker; shared between workers otherwise"""
+    backend = event_bus_backend()
+    if backend == "redis":
+        return storage_from_string(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "sqlite":
+        return SharedRateLimitStorage(get_coordination_store())
+    return MemoryStorage()
+
+
+storage = create_rate_limit_storage()
 rate_limiter_strategy = MovingWindowRateLimiter(storage)
 
 # Define rate limits for guests
@@ -0,0 +1,86 @@
+"""
+Request Metrics Middleware
+
+Times every HTTP request, counts the SQL statements and rows it causes and records them
+under the route template in the request metrics (see services/system/request_metrics.py).
+With SERVER_TIMING_HEADER=true the timings are also returned in a Server-Timing header,
+which browser developer tools show next to each request.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import Request
+
+from MakerMatrix.database.query_stats import track_queries
+from MakerMatrix.services.system.request_metrics import request_metrics
+
+
+def route_template(scope) -> Optional[str]:
+    """Path template of the matched route, including the prefixes of the routers it was included with"""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    regex = getattr(route, "path_regex", None)
+    if template is None or regex is None:
+        return template
+    path = scope.get("path", "")
+    if regex.match(path):
+        return template
+    # Routers included by reference leave their prefix out of the route path: the prefix is
+    # whatever precedes the part of the path the route matched
+    for index, char in enumerate(path):
+        if char == "/" and index and regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+async def _recorded_body(body_iterator, finish):
+    """Pass the body through and record the request once it has been sent (or abandoned)"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        finish()
+
+
+async def request_metrics_middleware(request: Request, call_next):
+    """
+    Middleware to record wall time, database time, statements, rows and event loop lag
+    per method and route template.
+
+    The request is recorded when its body has been sent, so a streaming response counts the
+    statements and time of the whole stream. The Server-Timing header goes out before the
+    body and covers the time to the first byte only.
+    """
+    started = time.perf_counter()
+
+    # A callback queued now runs once the loop has worked through everything ahead of it
+    loop_lag = []
+    asyncio.get_running_loop().call_soon(lambda: loop_lag.append(time.perf_counter() - started))
+
+    def finish(status_code: int) -> None:
+        stats.closed = True
+        request_metrics.in_progress -= 1
+        request_metrics.record(
+            request.method,
+            route_template(request.scope),
+            status_code,
+            time.perf_counter() - started,
+            stats,
+            loop_lag[0] if loop_lag else None,
+        )
+
+    request_metrics.in_progress += 1
+    try:
+        # Left open: the endpoint task keeps adding the statements it runs while streaming
+        with track_queries(close=False) as stats:
+            response = await call_next(request)
+    except BaseException:
+        finish(500)
+        raise
+
+    if request_metrics.server_timing:
+        response.headers["Server-Timing"] = request_metrics.server_timing_value(time.perf_counter() - started, stats)
+    response.body_iterator = _recorded_body(response.body_iterator, lambda: finish(response.status_code))
+    return response
@@ -0,0 +1,86 @@
+"""
+Migration: Add content-addressing columns to datasheets table
+
+Adds content_hash (SHA-256 of the stored file), etag and last_modified (validators
+for conditional re-downloads), and indexes content_hash and url.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+COLUMNS = {
+    "content_hash": "VARCHAR",
+    "etag": "VARCHAR",
+    "last_modified": "VARCHAR",
+}
+
+INDEXES = {
+    "ix_datasheets_content_hash": "content_hash",
+    "ix_datasheets_url": "url",
+}
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if columns were added, False if the schema was already current.
+    """
+    cursor.execute("PRAGMA table_info(datasheets)")
+    existing = {col[1] for col in cursor.fetchall()}
+    if not existing:
+        # Fresh database; create_all() builds the table with the columns
+        return False
+
+    missing = [name for name in COLUMNS if name not in existing]
+    for name in missing:
+        cursor.execute(f"ALTER TABLE datasheets ADD COLUMN {name} {COLUMNS[name]}")
+
+    for index_name, column in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON datasheets ({column})")
+
+    return bool(missing)
+
+
+def run_migration():
+    """Add content-addressing columns to datasheets table"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            conn.commit()
+            print("✓ Columns already exist, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,110 @@
+"""
+Migration: Add materialized path columns to locationmodel table
+
+Adds path_ids ('/'-separated ids from the root down) and path_names (JSON list of
+names from the root down), indexes path_ids for subtree range queries and backfills
+both columns from the parent links. The columns are maintained afterwards by the
+flush hooks in LocationPathRepository.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+COLUMNS = {
+    "path_ids": "VARCHAR",
+    "path_names": "JSON",
+}
+
+
+def backfill(cursor) -> int:
+    """Compute every location's path from the parent links; locations in a parent cycle are skipped"""
+    cursor.execute("SELECT id, parent_id, name FROM locationmodel")
+    nodes = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    paths = {}
+
+    for start in nodes:
+        chain = []
+        current = start
+        while current is not None and current not in paths and current in nodes and current not in chain:
+            chain.append(current)
+            current = nodes[current][0]
+        if current is not None and current in chain:
+            continue
+        ids, names = paths.get(current, ([], []))
+        for location_id in reversed(chain):
+            ids = ids + [location_id]
+            names = names + [nodes[location_id][1]]
+            paths[location_id] = (ids, names)
+
+    cursor.executemany(
+        "UPDATE locationmodel SET path_ids = ?, path_names = ? WHERE id = ?",
+        [("/".join(ids), json.dumps(names), location_id) for location_id, (ids, names) in paths.items()],
+    )
+    return len(paths)
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if columns were added, False if the schema was already current.
+    """
+    cursor.execute("PRAGMA table_info(locationmodel)")
+    existing = {col[1] for col in cursor.fetchall()}
+    if not existing:
+        # Fresh database; create_all() builds the table with the columns
+        return False
+
+    missing = [name for name in COLUMNS if name not in existing]
+    for name in missing:
+        cursor.execute(f"ALTER TABLE locationmodel ADD COLUMN {name} {COLUMNS[name]}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_locationmodel_path_ids ON locationmodel (path_ids)")
+
+    if missing:
+        backfill(cursor)
+    return bool(missing)
+
+
+def run_migration():
+    """Add materialized path columns to locationmodel table"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            print("✓ Columns already exist, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
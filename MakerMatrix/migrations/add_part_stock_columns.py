@@ -0,0 +1,90 @@
+"""
+Migration: Add denormalized stock columns to partmodel table
+
+Adds cached_total_quantity and cached_location_count (maintained from
+part_location_allocations), indexes the quantity column and backfills both
+columns from the existing allocations.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+COLUMNS = {
+    "cached_total_quantity": "INTEGER NOT NULL DEFAULT 0",
+    "cached_location_count": "INTEGER NOT NULL DEFAULT 0",
+}
+
+BACKFILL_SQL = """
+    UPDATE partmodel SET
+        cached_total_quantity = COALESCE(
+            (SELECT SUM(quantity_at_location) FROM part_location_allocations WHERE part_id = partmodel.id), 0
+        ),
+        cached_location_count = (SELECT COUNT(*) FROM part_location_allocations WHERE part_id = partmodel.id)
+"""
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if columns were added, False if the schema was already current.
+    """
+    cursor.execute("PRAGMA table_info(partmodel)")
+    existing = {col[1] for col in cursor.fetchall()}
+    if not existing:
+        # Fresh database; create_all() builds the table with the columns
+        return False
+
+    missing = [name for name in COLUMNS if name not in existing]
+    for name in missing:
+        cursor.execute(f"ALTER TABLE partmodel ADD COLUMN {name} {COLUMNS[name]}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_partmodel_cached_total_quantity ON partmodel (cached_total_quantity)")
+
+    if missing:
+        cursor.execute(BACKFILL_SQL)
+    return bool(missing)
+
+
+def run_migration():
+    """Add stock columns to partmodel table"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            conn.commit()
+            print("✓ Columns already exist, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
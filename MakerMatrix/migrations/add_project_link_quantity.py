@@ -0,0 +1,68 @@
+"""
+Migration: Add quantity_required column to part_project_link table
+
+quantity_required is the number of units of a part one build of the project needs;
+existing BOM lines default to 1.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if the column was added, False if the schema was already current.
+    """
+    cursor.execute("PRAGMA table_info(part_project_link)")
+    existing = {col[1] for col in cursor.fetchall()}
+    if not existing or "quantity_required" in existing:
+        # Fresh database (create_all() builds the column) or already migrated
+        return False
+
+    cursor.execute("ALTER TABLE part_project_link ADD COLUMN quantity_required INTEGER NOT NULL DEFAULT 1")
+    return True
+
+
+def run_migration():
+    """Add quantity_required column to part_project_link table"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            print("✓ Column already exists, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,90 @@
+"""
+Migration: Add composite and expression indexes for the hot query shapes
+
+The single-column indexes created with the tables do not serve these queries:
+
+- rate limit window counts filter supplier_usage_tracking by supplier and request time
+- the task runner takes pending tasks ordered by priority and age
+- the advanced search supplier filter compares lower(supplier)
+- primary storage lookups filter allocations by part and is_primary_storage
+- parts of a tag, and child locations of a location, are looked up by tag_id / parent_id
+
+The models declare the same indexes, so create_all() builds them on fresh databases.
+IndexAdvisor (services/system/index_advisor.py) checks the plans of these queries.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Index name -> (table, indexed columns or expressions)
+INDEXES = {
+    "ix_supplier_usage_tracking_supplier_time": ("supplier_usage_tracking", "supplier_name, request_timestamp"),
+    "ix_tasks_pending_order": ("tasks", "status, priority DESC, created_at, scheduled_at"),
+    "ix_partmodel_supplier_lower": ("partmodel", "lower(supplier)"),
+    "ix_part_location_allocations_primary": ("part_location_allocations", "part_id, is_primary_storage"),
+    "ix_part_tag_links_tag": ("part_tag_links", "tag_id, part_id"),
+    "ix_locationmodel_parent_id": ("locationmodel", "parent_id"),
+}
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if indexes were created, False if all of them already existed.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    created = False
+    for name, (table, columns) in INDEXES.items():
+        if name in existing or table not in tables:
+            continue
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        created = True
+    return created
+
+
+def run_migration():
+    """Add composite and expression indexes for the hot query shapes"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            print("✓ Indexes already exist, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,68 @@
+"""
+Migration: Add log_data column to tasks table
+
+log_data holds the JSON array of log lines a task produced; it is written once
+when the task reaches a final state.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor.
+
+    Returns True if the column was added, False if the schema was already current.
+    """
+    cursor.execute("PRAGMA table_info(tasks)")
+    existing = {col[1] for col in cursor.fetchall()}
+    if not existing or "log_data" in existing:
+        # Fresh database (create_all() builds the column) or already migrated
+        return False
+
+    cursor.execute("ALTER TABLE tasks ADD COLUMN log_data VARCHAR")
+    return True
+
+
+def run_migration():
+    """Add log_data column to tasks table"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path))
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            conn.commit()
+            print("✓ Migration completed successfully")
+        else:
+            print("✓ Column already exists, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,81 @@
+"""
+Migration: Switch the database to incremental auto_vacuum
+
+With auto_vacuum=INCREMENTAL, pages freed by deletes can be returned to the filesystem in
+small steps (PRAGMA incremental_vacuum) by the database maintenance task. SQLite only
+changes the mode when the whole file is rebuilt with VACUUM, so this migration converts
+small databases at startup; larger ones are converted by the first maintenance run, which
+can be scheduled off-hours.
+
+Runs automatically from create_db_and_tables(); can also be run standalone.
+"""
+
+import sqlite3
+from pathlib import Path
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+# Databases up to this size are converted at startup; the VACUUM takes well under a second
+MAX_STARTUP_CONVERSION_BYTES = 64 * 1024 * 1024
+
+
+def upgrade(cursor) -> bool:
+    """
+    Apply the migration using a DB-API cursor (outside a transaction, VACUUM cannot run in one).
+
+    Returns True if the database was converted, False if it already uses incremental
+    auto_vacuum or is left for the maintenance task.
+    """
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+        return False
+
+    cursor.execute("PRAGMA page_count")
+    page_count = cursor.fetchone()[0]
+    cursor.execute("PRAGMA page_size")
+    if page_count * cursor.fetchone()[0] > MAX_STARTUP_CONVERSION_BYTES:
+        return False
+
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("VACUUM")
+    return True
+
+
+def run_migration():
+    """Convert the database to incremental auto_vacuum"""
+    # Get database path - try multiple locations
+    possible_paths = [
+        Path(__file__).parent.parent.parent / "makers_matrix.db",
+        Path(__file__).parent.parent.parent / "makermatrix.db",
+        Path("/home/ril3y/MakerMatrix/makermatrix.db"),
+    ]
+
+    db_path = None
+    for path in possible_paths:
+        if path.exists():
+            db_path = path
+            break
+
+    if not db_path:
+        print("Database not found in any expected location")
+        return False
+
+    try:
+        conn = sqlite3.connect(str(db_path), isolation_level=None)
+        cursor = conn.cursor()
+
+        if upgrade(cursor):
+            print("✓ Migration completed successfully")
+        else:
+            print("✓ Already incremental or too large for startup conversion, skipping migration")
+
+        conn.close()
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    run_migration()
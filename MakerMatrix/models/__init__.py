@@ -11,6 +11,8 @@ from .category_models import *
 from .system_models import *
 from .part_metadata_models import *
 from .part_allocation_models import *
+from .inventory_aggregate_models import *
+from .part_property_models import *
 from .project_models import *
 
 # User and authentication models
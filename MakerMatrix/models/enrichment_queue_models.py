@@ -0,0 +1,49 @@
+"""
+Enrichment Queue Models
+
+Durable queue of part enrichment work items, one row per (part, supplier) task. Workers claim
+pending rows atomically; finished rows are pruned after a retention period.
+"""
+
+from typing import Optional, List
+from datetime import datetime
+from sqlmodel import SQLModel, Field, JSON, Column
+from sqlalchemy import Index
+import uuid
+
+
+class EnrichmentQueueItemModel(SQLModel, table=True):
+    """A queued enrichment task"""
+
+    __tablename__ = "enrichment_queue_items"
+    __table_args__ = (
+        # Claim order within a supplier: state, then priority, then readiness and age
+        Index("ix_enrichment_queue_claim", "supplier_name", "status", "priority_rank", "not_before", "created_at"),
+        # Pruning of finished items
+        Index("ix_enrichment_queue_finished", "status", "completed_at"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    part_id: str = Field(nullable=False, index=True)
+    part_name: str = Field(default="", nullable=False)
+    supplier_name: str = Field(max_length=100, nullable=False)
+    capabilities: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    completed_capabilities: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    failed_capabilities: List[str] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+
+    priority: str = Field(default="normal", max_length=20, nullable=False)
+    priority_rank: int = Field(default=1, nullable=False)  # Higher is claimed first
+    status: str = Field(default="pending", max_length=20, nullable=False)
+    not_before: Optional[datetime] = Field(default=None)  # Not claimable before this time (retries, rate limits)
+
+    # Worker holding the item and when it last reported progress
+    claimed_by: Optional[str] = Field(default=None, max_length=200)
+    heartbeat_at: Optional[datetime] = Field(default=None)
+
+    error_message: Optional[str] = Field(default=None)
+    retry_count: int = Field(default=0, nullable=False)
+    max_retries: int = Field(default=3, nullable=False)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    started_at: Optional[datetime] = Field(default=None)
+    completed_at: Optional[datetime] = Field(default=None)
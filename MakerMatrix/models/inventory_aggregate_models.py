@@ -0,0 +1,64 @@
+"""
+Inventory Aggregate Models Module
+
+Contains materialized inventory aggregates used by the dashboard. These tables are
+derived data: they are maintained incrementally whenever parts or allocations are
+flushed and can always be rebuilt from PartModel/PartLocationAllocation.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, Any
+from sqlmodel import SQLModel, Field, Column, String, ForeignKey
+from sqlalchemy import Index
+
+
+class PartInventoryAggregate(SQLModel, table=True):
+    """
+    Per-part stock totals across all allocations.
+
+    One row per part. location_count is 0 for parts without any allocation, which
+    keeps "no location" parts out of the low/zero stock figures just like the
+    original per-request queries did.
+    """
+
+    __tablename__ = "part_inventory_aggregates"
+
+    part_id: str = Field(
+        sa_column=Column(String, ForeignKey("partmodel.id", ondelete="CASCADE"), primary_key=True),
+        description="Part the totals belong to",
+    )
+    supplier: Optional[str] = Field(default=None, description="Copy of PartModel.supplier for supplier rollups")
+    total_quantity: int = Field(default=0, description="Sum of quantity_at_location over all allocations")
+    location_count: int = Field(default=0, description="Number of allocations for the part")
+    location_names: Optional[str] = Field(default=None, description="Comma separated allocation location names")
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_part_inventory_aggregates_stock", "location_count", "total_quantity"),
+        Index("ix_part_inventory_aggregates_supplier", "supplier"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Custom serialization method for API responses"""
+        base_dict = self.model_dump()
+        base_dict["updated_at"] = self.updated_at.isoformat() if self.updated_at else None
+        return base_dict
+
+
+class InventoryRollup(SQLModel, table=True):
+    """
+    Part count and unit total for one dashboard bucket.
+
+    dimension is one of "category", "location", "supplier" or "stock". For category
+    and location rows key is the entity id (names are joined at read time so renames
+    need no maintenance); the empty key in the category dimension is the
+    "Uncategorized" bucket. Stock rows use the keys "allocated", "low" and "zero".
+    """
+
+    __tablename__ = "inventory_rollups"
+
+    dimension: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    part_count: int = Field(default=0)
+    total_quantity: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -7,10 +7,11 @@ Supports mobile containers (cassettes) and future smart location integration.
 """
 
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship, Session, select, Column, JSON
-from sqlalchemy import UniqueConstraint, Index
+from sqlalchemy import UniqueConstraint, Index, inspect
 from sqlalchemy.orm import selectinload
 from pydantic import ConfigDict
 
@@ -22,6 +23,19 @@ class LocationQueryModel(SQLModel):
     name: Optional[str] = None
 
 
+@dataclass
+class LocationBatch:
+    """
+    Parent and container data for a page of locations, loaded up front so that
+    LocationModel.to_dict() does not lazy-load per location.
+
+    Built by LocationPathRepository.load_batch().
+    """
+
+    parents: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # parent id -> summary
+    capacity_used: Dict[str, int] = field(default_factory=dict)  # container id -> allocated quantity
+
+
 class LocationModel(SQLModel, table=True):
     """
     Model for hierarchical location/storage organization.
@@ -42,6 +56,16 @@ class LocationModel(SQLModel, table=True):
     image_url: Optional[str] = None
     emoji: Optional[str] = None
 
+    # === MATERIALIZED PATH ===
+    # Maintained by the flush hooks in LocationPathRepository; a rename or move rewrites the
+    # paths of the whole subtree in the same transaction.
+    path_ids: Optional[str] = Field(
+        default=None, index=True, description="'/'-separated ids from the root location down to this one"
+    )
+    path_names: Optional[List[str]] = Field(
+        default=None, sa_column=Column(JSON), description="Names from the root location down to this one"
+    )
+
     # === CONTAINER PROPERTIES ===
     is_mobile: bool = Field(
         default=False,
@@ -140,6 +164,8 @@ class LocationModel(SQLModel, table=True):
         ),
         # For slots, uniqueness is enforced by (parent_id, slot_number) which is
         # implicit since parent_id must exist and slot_number is sequential per container
+        # Children of a location; the unique index above starts with name
+        Index("ix_locationmodel_parent_id", "parent_id"),
     )
 
     # === RELATIONSHIPS ===
@@ -174,6 +200,10 @@ class LocationModel(SQLModel, table=True):
 
         Example: "Office > Storage > Reel Storage Shelf"
         """
+        # Materialized path, unless the location was renamed and not flushed yet
+        if self.path_names and self.path_names[-1] == self.name:
+            return separator.join(self.path_names)
+
         path_parts = [self.name]
         current = self.parent if hasattr(self, "parent") else None
 
@@ -183,14 +213,19 @@ class LocationModel(SQLModel, table=True):
 
         return separator.join(path_parts)
 
-    def get_capacity_info(self) -> Optional[Dict[str, Any]]:
-        """Get container capacity information if this is a container"""
+    def get_capacity_info(self, used: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get container capacity information if this is a container
+
+        Args:
+            used: Allocated quantity when already known (batch loading); otherwise summed from allocations
+        """
         if not self.is_mobile or self.container_capacity is None:
             return None
 
         # Calculate total allocated quantity from allocations
-        total_allocated = 0
-        if hasattr(self, "allocations") and self.allocations:
+        total_allocated = used or 0
+        if used is None and hasattr(self, "allocations") and self.allocations:
             total_allocated = sum(alloc.quantity_at_location for alloc in self.allocations)
 
         return {
@@ -200,8 +235,14 @@ class LocationModel(SQLModel, table=True):
             "usage_percentage": (total_allocated / self.container_capacity * 100) if self.container_capacity > 0 else 0,
         }
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Custom serialization method for LocationModel"""
+    def to_dict(self, batch: Optional[LocationBatch] = None) -> Dict[str, Any]:
+        """
+        Custom serialization method for LocationModel
+
+        Args:
+            batch: Preloaded parent/capacity data for a page of locations. When given, nothing
+                is lazy-loaded and children are only included if already loaded.
+        """
         # Start with basic fields
         base_dict = {
             "id": self.id,
@@ -235,8 +276,22 @@ class LocationModel(SQLModel, table=True):
             "is_connected": self.is_connected,
             "last_seen": self.last_seen.isoformat() if self.last_seen else None,
             "firmware_version": self.firmware_version,
+            # Materialized path
+            "path_ids": self.path_ids.split("/") if self.path_ids else [],
+            "path_names": self.path_names or [],
+            "full_path": self.get_full_path(),
         }
 
+        if batch is not None:
+            capacity_info = self.get_capacity_info(used=batch.capacity_used.get(self.id, 0))
+            if capacity_info:
+                base_dict["capacity_info"] = capacity_info
+            if self.parent_id in batch.parents:
+                base_dict["parent"] = batch.parents[self.parent_id]
+            if "children" not in inspect(self).unloaded:
+                base_dict["children"] = [self._child_dict(child) for child in self.children]
+            return base_dict
+
         # Add capacity info if this is a container
         capacity_info = self.get_capacity_info()
         if capacity_info:
@@ -258,24 +313,25 @@ class LocationModel(SQLModel, table=True):
         # Safely include children if loaded and available
         try:
             if hasattr(self, "children") and self.children is not None:
-                base_dict["children"] = []
-                for child in self.children:
-                    child_dict = {
-                        "id": child.id,
-                        "name": child.name,
-                        "description": child.description,
-                        "parent_id": child.parent_id,
-                        "location_type": child.location_type,
-                        "image_url": child.image_url,
-                        "emoji": child.emoji,
-                    }
-                    base_dict["children"].append(child_dict)
+                base_dict["children"] = [self._child_dict(child) for child in self.children]
         except Exception:
             # If children can't be accessed, skip them
             pass
 
         return base_dict
 
+    @staticmethod
+    def _child_dict(child: "LocationModel") -> Dict[str, Any]:
+        return {
+            "id": child.id,
+            "name": child.name,
+            "description": child.description,
+            "parent_id": child.parent_id,
+            "location_type": child.location_type,
+            "image_url": child.image_url,
+            "emoji": child.emoji,
+        }
+
 
 class LocationUpdate(SQLModel):
     """Update model for location modifications"""
@@ -24,6 +24,7 @@ from .rate_limiting_models import *
 from .csv_import_config_model import *
 from .label_template_models import *
 from .tool_models import *
+from .enrichment_queue_models import *
 
 # Create an engine for SQLite
 import os
@@ -32,9 +33,19 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Imported after load_dotenv(): REQUEST_METRICS_ENABLED may come from .env
+from MakerMatrix.database.query_stats import ENABLED as _request_metrics_enabled
+from MakerMatrix.database.query_stats import InstrumentedConnection, register_query_hooks
+
 # Use DATABASE_URL from .env, fallback to absolute path
 sqlite_url = os.getenv("DATABASE_URL", "sqlite:////home/ril3y/MakerMatrix/makermatrix.db")
 
+_connect_args = {"check_same_thread": False}
+if _request_metrics_enabled:
+    # Request metrics count the statements and the rows each query returns
+    _connect_args["factory"] = InstrumentedConnection
+    register_query_hooks()
+
 engine = create_engine(
     sqlite_url,
     echo=False,
@@ -42,7 +53,7 @@ engine = create_engine(
     max_overflow=30,
     pool_timeout=30,
     pool_recycle=3600,
-    connect_args={"check_same_thread": False},
+    connect_args=_connect_args,
 )
 
 
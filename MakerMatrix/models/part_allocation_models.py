@@ -9,7 +9,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship, Column, String, ForeignKey
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from pydantic import ConfigDict
 
 
@@ -63,7 +63,10 @@ class PartLocationAllocation(SQLModel, table=True):
     )
 
     # === CONSTRAINTS ===
-    __table_args__ = (UniqueConstraint("part_id", "location_id", name="uix_part_location"),)
+    __table_args__ = (
+        UniqueConstraint("part_id", "location_id", name="uix_part_location"),
+        Index("ix_part_location_allocations_primary", "part_id", "is_primary_storage"),
+    )
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
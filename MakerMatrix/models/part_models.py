@@ -8,10 +8,10 @@ This module focuses specifically on electronic part inventory management.
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlmodel import SQLModel, Field, Relationship, Session, Column, String, ForeignKey, JSON, select
 from MakerMatrix.models.project_models import PartProjectLink
-from sqlalchemy import or_, UniqueConstraint, Numeric
+from sqlalchemy import or_, Index, UniqueConstraint, Numeric, inspect, text
 from pydantic import field_serializer, model_validator, ConfigDict
 
 
@@ -39,9 +39,15 @@ class DatasheetModel(SQLModel, table=True):
     # Metadata
     title: Optional[str] = Field(default=None, description="Datasheet title")
     supplier: Optional[str] = Field(default=None, description="Supplier that provided the datasheet")
-    url: Optional[str] = Field(default=None, description="Original URL of the datasheet")
+    url: Optional[str] = Field(default=None, index=True, description="Original URL of the datasheet")
     download_date: datetime = Field(default_factory=datetime.utcnow)
 
+    # Content-addressed storage: files named <content_hash>.pdf are shared by every
+    # datasheet row with the same hash
+    content_hash: Optional[str] = Field(default=None, index=True, description="SHA-256 of the file content")
+    etag: Optional[str] = Field(default=None, description="ETag returned with the download")
+    last_modified: Optional[str] = Field(default=None, description="Last-Modified returned with the download")
+
     # Status
     is_primary: bool = Field(default=False, description="Whether this is the primary datasheet")
     is_active: bool = Field(default=True)
@@ -78,6 +84,9 @@ class PartModel(SQLModel, table=True):
     - Rich metadata relationships for enrichment, pricing, and orders
     """
 
+    # Case-insensitive supplier filter of the advanced search
+    __table_args__ = (Index("ix_partmodel_supplier_lower", text("lower(supplier)")),)
+
     # === CORE IDENTIFICATION ===
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     part_name: str = Field(index=True, unique=True, max_length=255, description="Part name (max 255 characters)")
@@ -95,6 +104,11 @@ class PartModel(SQLModel, table=True):
     # NOTE: Quantity and location are managed through allocations (PartLocationAllocation)
     # Use part.total_quantity and part.primary_location computed properties instead
     supplier: Optional[str] = None  # Primary/preferred supplier
+
+    # Denormalized allocation totals for SQL sorting/filtering. Maintained by the flush hooks in
+    # InventoryAggregateRepository within the same transaction as every allocation write.
+    cached_total_quantity: int = Field(default=0, index=True, description="Sum of allocation quantities")
+    cached_location_count: int = Field(default=0, description="Number of allocations")
     supplier_part_number: Optional[str] = Field(
         default=None,
         index=True,
@@ -127,7 +141,7 @@ class PartModel(SQLModel, table=True):
 
     # === TIMESTAMPS ===
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
 
     # === CORE RELATIONSHIPS ===
     categories: List["CategoryModel"] = Relationship(
@@ -276,7 +290,12 @@ class PartModel(SQLModel, table=True):
             .all()
         )
 
-    def to_dict(self, include: List[str] = None) -> Dict[str, Any]:
+    def to_dict(
+        self,
+        include: List[str] = None,
+        location_batch: Optional["LocationBatch"] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Custom serialization method for PartModel
 
@@ -287,8 +306,16 @@ class PartModel(SQLModel, table=True):
                 - 'system': Include system metadata
                 - 'orders': Include order relationships
                 - 'all': Include all metadata
+            location_batch: Preloaded location data for a page of parts
+                (LocationPathRepository.load_batch); avoids per-part lazy loads
+            fields: Only build these top-level keys (see PartProjection); relationships
+                behind other keys are not touched
         """
         include = include or []
+        fields = set(fields) if fields is not None else None
+
+        def wanted(key: str) -> bool:
+            return fields is None or key in fields
 
         # Always exclude metadata relationships unless specifically requested
         exclude_fields = {
@@ -310,82 +337,96 @@ class PartModel(SQLModel, table=True):
         include_orders = "orders" in include or "all" in include
 
         # Get base part data (core fields only)
-        base_dict = self.model_dump(exclude=exclude_fields)
+        if fields is None:
+            base_dict = self.model_dump(exclude=exclude_fields)
+        else:
+            base_dict = {name: getattr(self, name) for name in self.__table__.columns.keys() if name in fields}
 
         # Always include categories (core part data)
-        base_dict["categories"] = (
-            [
-                {"id": category.id, "name": category.name, "description": category.description}
-                for category in self.categories
-            ]
-            if self.categories
-            else []
-        )
+        if wanted("categories"):
+            base_dict["categories"] = (
+                [
+                    {"id": category.id, "name": category.name, "description": category.description}
+                    for category in self.categories
+                ]
+                if self.categories
+                else []
+            )
 
         # Always include tags (core part data)
-        base_dict["tags"] = (
-            [{"id": tag.id, "name": tag.name, "color": tag.color, "icon": tag.icon} for tag in self.tags]
-            if hasattr(self, "tags") and self.tags
-            else []
-        )
+        if wanted("tags"):
+            base_dict["tags"] = (
+                [{"id": tag.id, "name": tag.name, "color": tag.color, "icon": tag.icon} for tag in self.tags]
+                if hasattr(self, "tags") and self.tags
+                else []
+            )
 
         # Always include projects (core part data)
-        base_dict["projects"] = (
-            [
-                {
-                    "id": project.id,
-                    "name": project.name,
-                    "description": project.description,
-                    "status": project.status,
-                    "image_url": project.image_url,
-                    "parts_count": project.parts_count,
-                    "estimated_cost": project.estimated_cost,
-                    "links": project.links,
-                }
-                for project in self.projects
-            ]
-            if self.projects
-            else []
-        )
+        if wanted("projects"):
+            base_dict["projects"] = (
+                [
+                    {
+                        "id": project.id,
+                        "name": project.name,
+                        "description": project.description,
+                        "status": project.status,
+                        "image_url": project.image_url,
+                        "parts_count": project.parts_count,
+                        "estimated_cost": project.estimated_cost,
+                        "links": project.links,
+                    }
+                    for project in self.projects
+                ]
+                if self.projects
+                else []
+            )
 
         # Always include primary location from allocations (core part data)
-        primary_loc = self.primary_location
-        if primary_loc:
-            # Use LocationModel's to_dict() to include all fields (container slots, parent, etc.)
-            base_dict["location"] = primary_loc.to_dict()
-            # Include location_id for frontend compatibility
-            base_dict["location_id"] = primary_loc.id
-        else:
-            base_dict["location"] = None
-            base_dict["location_id"] = None
+        if wanted("location") or wanted("location_id"):
+            primary_loc = self.primary_location
+            if wanted("location"):
+                # Use LocationModel's to_dict() to include all fields (container slots, parent, etc.)
+                base_dict["location"] = primary_loc.to_dict(batch=location_batch) if primary_loc else None
+            if wanted("location_id"):
+                # Include location_id for frontend compatibility
+                base_dict["location_id"] = primary_loc.id if primary_loc else None
 
         # Include total quantity from allocations
-        base_dict["quantity"] = self.total_quantity
+        if fields is None:
+            base_dict["quantity"] = self.total_quantity
+        elif "quantity" in fields:
+            # The denormalized total, unless the allocations are loaded anyway
+            allocations_loaded = "allocations" not in inspect(self).unloaded
+            base_dict["quantity"] = self.total_quantity if allocations_loaded else self.cached_total_quantity
 
         # Always include allocations (core part data for inventory management)
-        if hasattr(self, "allocations") and self.allocations:
-            base_dict["allocations"] = [
-                {
-                    "id": alloc.id,
-                    "location_id": alloc.location_id,
-                    "location_name": (
-                        getattr(alloc.location, "name", None) if hasattr(alloc, "location") and alloc.location else None
-                    ),
-                    "quantity_at_location": alloc.quantity_at_location,
-                    "is_primary_storage": alloc.is_primary_storage,
-                    "notes": alloc.notes,
-                    "last_updated": alloc.last_updated.isoformat() if alloc.last_updated else None,
-                }
-                for alloc in self.allocations
-            ]
-        else:
-            base_dict["allocations"] = []
+        if wanted("allocations"):
+            if hasattr(self, "allocations") and self.allocations:
+                base_dict["allocations"] = [
+                    {
+                        "id": alloc.id,
+                        "location_id": alloc.location_id,
+                        "location_name": (
+                            getattr(alloc.location, "name", None)
+                            if hasattr(alloc, "location") and alloc.location
+                            else None
+                        ),
+                        "quantity_at_location": alloc.quantity_at_location,
+                        "is_primary_storage": alloc.is_primary_storage,
+                        "notes": alloc.notes,
+                        "last_updated": alloc.last_updated.isoformat() if alloc.last_updated else None,
+                    }
+                    for alloc in self.allocations
+                ]
+            else:
+                base_dict["allocations"] = []
 
         # Always include datasheets (core part data)
-        if hasattr(self, "datasheets") and self.datasheets:
-            base_dict["datasheets"] = [datasheet.to_dict() for datasheet in self.datasheets]
-        else:
-            base_dict["datasheets"] = []
+        if wanted("datasheets"):
+            if hasattr(self, "datasheets") and self.datasheets:
+                base_dict["datasheets"] = [datasheet.to_dict() for datasheet in self.datasheets]
+            else:
+                base_dict["datasheets"] = []
 
         # === OPTIONAL METADATA ===
 
@@ -701,6 +742,15 @@ class GenericPartQuery(SQLModel):
     manufacturer_part_number: Optional[str] = None
 
 
+class PropertyFilter(SQLModel):
+    """Typed filter on the parametric property index (values may carry units, e.g. "1k", "25V", "100nF")"""
+
+    key: str  # resistance, capacitance, voltage_rating, package, ...
+    equals: Optional[str] = None  # exact text ("0603") or numeric ("10k") match
+    min_value: Optional[str] = None  # inclusive lower bound
+    max_value: Optional[str] = None  # inclusive upper bound
+
+
 class AdvancedPartSearch(SQLModel):
     """Advanced search model for parts with multiple criteria"""
 
@@ -715,7 +765,8 @@ class AdvancedPartSearch(SQLModel):
     has_datasheet: Optional[bool] = None
     has_image: Optional[bool] = None
     needs_enrichment: Optional[bool] = None
-    sort_by: str = "part_name"  # part_name, part_number, quantity, manufacturer, created_at
+    property_filters: Optional[List[PropertyFilter]] = None
+    sort_by: str = "part_name"  # part_name, part_number, quantity, location_count, popularity, manufacturer, created_at
     sort_order: str = "asc"  # asc, desc
     page: int = 1
     page_size: int = 20
@@ -726,7 +777,7 @@ class AdvancedPartSearch(SQLModel):
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .location_models import LocationModel
+    from .location_models import LocationModel, LocationBatch
     from .category_models import CategoryModel
     from .order_models import OrderItemModel
     from .part_metadata_models import PartSystemMetadata
@@ -0,0 +1,33 @@
+"""
+Part Property Index Models Module
+
+Contains the parametric property index: one row per scalar entry of
+PartModel.additional_properties, with the value normalized to SI base units where it
+parses as a quantity. The table is derived data maintained on every part write and can
+always be rebuilt from PartModel.additional_properties.
+"""
+
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column, String, ForeignKey
+from sqlalchemy import Index
+
+
+class PartPropertyIndex(SQLModel, table=True):
+    """Indexed copy of one additional property of a part"""
+
+    __tablename__ = "part_property_index"
+
+    part_id: str = Field(
+        sa_column=Column(String, ForeignKey("partmodel.id", ondelete="CASCADE"), primary_key=True),
+        description="Part the property belongs to",
+    )
+    key: str = Field(primary_key=True, description="Normalized property key (lowercase, underscores)")
+    raw_value: str = Field(description="Value as stored on the part")
+    text_value: str = Field(description="Lowercased, trimmed value for equality matches")
+    numeric_value: Optional[float] = Field(default=None, description="Value in SI base units, if numeric")
+    unit: Optional[str] = Field(default=None, description="Canonical unit of numeric_value (ohm, F, V, W, ...)")
+
+    __table_args__ = (
+        Index("ix_part_property_index_key_text", "key", "text_value"),
+        Index("ix_part_property_index_key_numeric", "key", "numeric_value"),
+    )
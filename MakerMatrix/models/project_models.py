@@ -21,6 +21,7 @@ class PartProjectLink(SQLModel, table=True):
     project_id: str = Field(foreign_key="projectmodel.id", primary_key=True)
     added_at: datetime = Field(default_factory=datetime.utcnow, description="When the part was added to the project")
     notes: Optional[str] = Field(default=None, description="Notes about this part's use in the project")
+    quantity_required: int = Field(default=1, ge=1, description="Units of this part needed to build one project")
 
 
 class ProjectModel(SQLModel, table=True):
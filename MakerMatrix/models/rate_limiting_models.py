@@ -7,6 +7,7 @@ Models for tracking supplier API usage and enforcing rate limits.
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 from sqlmodel import SQLModel, Field, JSON, Column
+from sqlalchemy import Index, UniqueConstraint
 import uuid
 
 
@@ -14,6 +15,8 @@ class SupplierUsageTrackingModel(SQLModel, table=True):
     """Track individual API requests to suppliers for rate limiting"""
 
     __tablename__ = "supplier_usage_tracking"
+    # Rate limit window counts: one supplier's requests within a time range
+    __table_args__ = (Index("ix_supplier_usage_tracking_supplier_time", "supplier_name", "request_timestamp"),)
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     supplier_name: str = Field(max_length=100, nullable=False, index=True)
@@ -100,3 +103,53 @@ class SupplierUsageSummaryModel(SQLModel, table=True):
             "success_rate": (self.successful_requests / self.total_requests * 100) if self.total_requests > 0 else 0,
             "created_at": self.created_at.isoformat(),
         }
+
+
+class SupplierUsageBucketModel(SQLModel, table=True):
+    """
+    Requests of one supplier endpoint within a minute, hour or day, folded from
+    supplier_usage_tracking by the usage rollup. Response times are kept as a histogram
+    (latency_le_*ms / latency_over_10000ms) so percentiles can be computed across buckets.
+    """
+
+    __tablename__ = "supplier_usage_buckets"
+    __table_args__ = (
+        UniqueConstraint(
+            "supplier_name", "resolution", "bucket_start", "endpoint_type", name="uq_supplier_usage_bucket"
+        ),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    supplier_name: str = Field(max_length=100, nullable=False)
+    resolution: str = Field(max_length=10, nullable=False)  # 'minute', 'hour', 'day'
+    bucket_start: datetime = Field(nullable=False)  # UTC
+    endpoint_type: str = Field(max_length=50, nullable=False)
+
+    total_requests: int = Field(default=0, nullable=False)
+    successful_requests: int = Field(default=0, nullable=False)
+    failed_requests: int = Field(default=0, nullable=False)
+    response_time_total_ms: int = Field(default=0, nullable=False)
+    response_time_count: int = Field(default=0, nullable=False)  # Requests with a recorded response time
+    max_response_time_ms: Optional[int] = Field(default=None)
+
+    # Response time histogram: requests in (previous bound, bound]
+    latency_le_50ms: int = Field(default=0, nullable=False)
+    latency_le_100ms: int = Field(default=0, nullable=False)
+    latency_le_250ms: int = Field(default=0, nullable=False)
+    latency_le_500ms: int = Field(default=0, nullable=False)
+    latency_le_1000ms: int = Field(default=0, nullable=False)
+    latency_le_2500ms: int = Field(default=0, nullable=False)
+    latency_le_5000ms: int = Field(default=0, nullable=False)
+    latency_le_10000ms: int = Field(default=0, nullable=False)
+    latency_over_10000ms: int = Field(default=0, nullable=False)
+
+
+class SupplierUsageRollupStateModel(SQLModel, table=True):
+    """How far supplier_usage_tracking has been folded into supplier_usage_buckets"""
+
+    __tablename__ = "supplier_usage_rollup_state"
+
+    id: str = Field(default="supplier_usage", primary_key=True)
+    # Raw rows before this time (always on a minute boundary) are counted in the buckets
+    rolled_up_until: Optional[datetime] = Field(default=None)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
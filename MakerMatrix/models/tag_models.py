@@ -15,7 +15,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship, Column, String, ForeignKey
-from sqlalchemy import UniqueConstraint, func
+from sqlalchemy import Index, UniqueConstraint, func
 from pydantic import ConfigDict, field_validator
 
 
@@ -23,6 +23,8 @@ class PartTagLink(SQLModel, table=True):
     """Link table for many-to-many relationship between parts and tags"""
 
     __tablename__ = "part_tag_links"
+    # The primary key starts with part_id; parts of a tag are looked up by tag_id
+    __table_args__ = (Index("ix_part_tag_links_tag", "tag_id", "part_id"),)
 
     part_id: str = Field(foreign_key="partmodel.id", primary_key=True)
     tag_id: str = Field(foreign_key="tagmodel.id", primary_key=True)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index, text
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
@@ -70,6 +71,8 @@ class TaskModel(SQLModel, table=True):
     """Background task management model"""
 
     __tablename__ = "tasks"
+    # Pending tasks in the order the runner takes them, without a sort
+    __table_args__ = (Index("ix_tasks_pending_order", "status", text("priority DESC"), "created_at", "scheduled_at"),)
 
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
 
@@ -88,6 +91,7 @@ class TaskModel(SQLModel, table=True):
     input_data: Optional[str] = Field(default=None)  # JSON string
     result_data: Optional[str] = Field(default=None)  # JSON string
     error_message: Optional[str] = None
+    log_data: Optional[str] = Field(default=None)  # JSON array of log entries, written when the task finishes
 
     # Execution tracking
     max_retries: int = Field(default=3)
@@ -125,6 +129,14 @@ class TaskModel(SQLModel, table=True):
         """Get result data from JSON"""
         return json.loads(self.result_data) if self.result_data else {}
 
+    def set_log_entries(self, entries: List[Dict[str, Any]]):
+        """Set log entries as JSON"""
+        self.log_data = json.dumps(entries) if entries else None
+
+    def get_log_entries(self) -> List[Dict[str, Any]]:
+        """Get log entries from JSON"""
+        return json.loads(self.log_data) if self.log_data else []
+
     def set_depends_on(self, task_ids: List[str]):
         """Set task dependencies"""
         self.depends_on_task_ids = json.dumps(task_ids) if task_ids else None
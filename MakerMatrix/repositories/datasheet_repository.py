@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 from typing import List, Optional
-from sqlmodel import Session, select, and_
+from sqlmodel import Session, select, and_, func
 from MakerMatrix.models.models import DatasheetModel
 from MakerMatrix.repositories.base_repository import BaseRepository
 
@@ -20,16 +20,28 @@ class DatasheetRepository(BaseRepository[DatasheetModel]):
     def __init__(self):
         super().__init__(DatasheetModel)
 
-    def get_datasheet_by_part_and_url(
-        self, session: Session, part_id: str, source_url: str
-    ) -> Optional[DatasheetModel]:
+    def get_datasheet_by_part_and_url(self, session: Session, part_id: str, url: str) -> Optional[DatasheetModel]:
         """Get datasheet by part ID and source URL."""
-        query = select(DatasheetModel).where(
-            and_(DatasheetModel.part_id == part_id, DatasheetModel.source_url == source_url)
-        )
+        query = select(DatasheetModel).where(and_(DatasheetModel.part_id == part_id, DatasheetModel.url == url))
         datasheet = session.exec(query).first()
         return datasheet
 
+    def get_latest_by_url(self, session: Session, url: str) -> Optional[DatasheetModel]:
+        """Get the most recently downloaded datasheet for a source URL, across all parts."""
+        query = (
+            select(DatasheetModel)
+            .where(DatasheetModel.url == url, DatasheetModel.file_size.is_not(None))
+            .order_by(DatasheetModel.download_date.desc())
+        )
+        return session.exec(query).first()
+
+    def count_file_references(self, session: Session, filename: str, exclude_part_id: str = None) -> int:
+        """Count datasheet rows pointing at a stored file, optionally ignoring one part's rows."""
+        query = select(func.count()).select_from(DatasheetModel).where(DatasheetModel.filename == filename)
+        if exclude_part_id:
+            query = query.where(DatasheetModel.part_id != exclude_part_id)
+        return session.exec(query).one()
+
     def create_datasheet(self, session: Session, datasheet_data: dict) -> DatasheetModel:
         """Create a new datasheet with proper session management."""
         datasheet = DatasheetModel(**datasheet_data)
@@ -40,12 +52,40 @@ class DatasheetRepository(BaseRepository[DatasheetModel]):
 
     def update_datasheet(self, session: Session, datasheet: DatasheetModel) -> DatasheetModel:
         """Update an existing datasheet with proper session management."""
-        datasheet.updated_at = datetime.utcnow()
+        datasheet.download_date = datetime.utcnow()
         session.add(datasheet)
         session.commit()
         session.refresh(datasheet)
         return datasheet
 
+    def record_download(
+        self, session: Session, part_id: str, download_result: dict, supplier: str = None, title: str = None
+    ) -> DatasheetModel:
+        """Create or refresh the datasheet row for a downloaded file (as returned by FileDownloadService)."""
+        datasheet = self.get_datasheet_by_part_and_url(session, part_id, download_result["url"])
+        if datasheet is None:
+            has_primary = session.exec(
+                select(DatasheetModel.id).where(DatasheetModel.part_id == part_id, DatasheetModel.is_primary == True)
+            ).first()
+            datasheet = DatasheetModel(
+                part_id=part_id,
+                url=download_result["url"],
+                supplier=supplier,
+                title=title,
+                filename=download_result["filename"],
+                file_path=download_result["file_path"],
+                is_primary=has_primary is None,
+            )
+
+        datasheet.filename = download_result["filename"]
+        datasheet.file_path = download_result["file_path"]
+        datasheet.file_size = download_result["size"]
+        datasheet.file_type = download_result["extension"].lstrip(".") or "pdf"
+        datasheet.content_hash = download_result.get("content_hash")
+        datasheet.etag = download_result.get("etag")
+        datasheet.last_modified = download_result.get("last_modified")
+        return self.update_datasheet(session, datasheet)
+
     def get_datasheets_by_part(self, session: Session, part_id: str) -> List[DatasheetModel]:
         """Get all datasheets for a specific part."""
         query = select(DatasheetModel).where(DatasheetModel.part_id == part_id)
@@ -0,0 +1,195 @@
+"""
+Enrichment Queue Repository
+
+Queries over the durable enrichment queue (enrichment_queue_items). Claiming is a single
+UPDATE ... RETURNING on the next ready row of a supplier, so two workers never get the same
+item. Workers refresh heartbeat_at while they hold an item; items whose holder stopped
+reporting are released back to pending, which is how work resumes after a restart.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.engine import Connection, Row
+
+from MakerMatrix.models.enrichment_queue_models import EnrichmentQueueItemModel
+
+# Rows deleted per statement when pruning
+PRUNE_BATCH_SIZE = 1000
+
+PENDING = "pending"
+RUNNING = "running"
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_items = EnrichmentQueueItemModel.__table__
+
+
+def _ready(now: datetime):
+    return or_(_items.c.not_before.is_(None), _items.c.not_before <= now)
+
+
+def _held_by(item_id: str, worker_id: str):
+    return and_(_items.c.id == item_id, _items.c.status == RUNNING, _items.c.claimed_by == worker_id)
+
+
+class EnrichmentQueueRepository:
+    """Repository for the durable enrichment queue"""
+
+    @staticmethod
+    def enqueue(conn: Connection, values: Dict[str, Any]) -> None:
+        conn.execute(_items.insert().values(**values))
+
+    @staticmethod
+    def get(conn: Connection, item_id: str) -> Optional[Row]:
+        return conn.execute(select(_items).where(_items.c.id == item_id)).first()
+
+    @staticmethod
+    def claim_next(conn: Connection, supplier_name: str, worker_id: str, now: datetime) -> Optional[Row]:
+        """Atomically take the highest-priority ready item of a supplier"""
+        next_id = (
+            select(_items.c.id)
+            .where(_items.c.supplier_name == supplier_name, _items.c.status == PENDING, _ready(now))
+            .order_by(_items.c.priority_rank.desc(), _items.c.created_at)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(_items)
+            .where(_items.c.id == next_id, _items.c.status == PENDING)
+            .values(status=RUNNING, claimed_by=worker_id, heartbeat_at=now, started_at=now)
+            .returning(*_items.c)
+        )
+        return conn.execute(stmt).first()
+
+    @staticmethod
+    def heartbeat(
+        conn: Connection,
+        item_id: str,
+        worker_id: str,
+        now: datetime,
+        completed_capabilities: List[str],
+        failed_capabilities: List[str],
+    ) -> bool:
+        """Record progress; False if the item is no longer held (cancelled or released)"""
+        result = conn.execute(
+            update(_items)
+            .where(_held_by(item_id, worker_id))
+            .values(
+                heartbeat_at=now,
+                completed_capabilities=completed_capabilities,
+                failed_capabilities=failed_capabilities,
+            )
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def finish(conn: Connection, item_id: str, worker_id: str, status: str, now: datetime, **values: Any) -> bool:
+        """Move a held item to a finished status"""
+        result = conn.execute(
+            update(_items)
+            .where(_held_by(item_id, worker_id))
+            .values(status=status, completed_at=now, claimed_by=None, heartbeat_at=None, **values)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def requeue(conn: Connection, item_id: str, worker_id: str, not_before: Optional[datetime], **values: Any) -> bool:
+        """Put a held item back to pending, claimable again from `not_before`"""
+        result = conn.execute(
+            update(_items)
+            .where(_held_by(item_id, worker_id))
+            .values(status=PENDING, not_before=not_before, claimed_by=None, heartbeat_at=None, **values)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def cancel(conn: Connection, item_id: str, now: datetime) -> bool:
+        result = conn.execute(
+            update(_items)
+            .where(_items.c.id == item_id, _items.c.status.in_((PENDING, RUNNING)))
+            .values(status="cancelled", completed_at=now, claimed_by=None, heartbeat_at=None)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def release_stale(conn: Connection, heartbeat_before: datetime) -> int:
+        """Return items whose worker stopped reporting before `heartbeat_before` to pending"""
+        result = conn.execute(
+            update(_items)
+            .where(_items.c.status == RUNNING, _items.c.heartbeat_at < heartbeat_before)
+            .values(status=PENDING, claimed_by=None, heartbeat_at=None)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def release_worker(conn: Connection, worker_id: str, supplier_name: Optional[str] = None) -> int:
+        """Return the items held by a worker, optionally of one supplier only, to pending (shutdown)"""
+        stmt = update(_items).where(_items.c.status == RUNNING, _items.c.claimed_by == worker_id)
+        if supplier_name:
+            stmt = stmt.where(_items.c.supplier_name == supplier_name)
+        return conn.execute(stmt.values(status=PENDING, claimed_by=None, heartbeat_at=None)).rowcount
+
+    @staticmethod
+    def status_counts(conn: Connection, supplier_name: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """Item counts per supplier and status"""
+        stmt = select(_items.c.supplier_name, _items.c.status, func.count()).group_by(
+            _items.c.supplier_name, _items.c.status
+        )
+        if supplier_name:
+            stmt = stmt.where(_items.c.supplier_name == supplier_name)
+        counts: Dict[str, Dict[str, int]] = {}
+        for supplier, status, count in conn.execute(stmt):
+            counts.setdefault(supplier, {})[status] = count
+        return counts
+
+    @staticmethod
+    def remaining_capabilities(conn: Connection, supplier_name: str) -> int:
+        """Capabilities still to run across the pending items of a supplier"""
+        remaining = func.json_array_length(_items.c.capabilities) - func.json_array_length(
+            _items.c.completed_capabilities
+        )
+        stmt = select(func.coalesce(func.sum(remaining), 0)).where(
+            _items.c.supplier_name == supplier_name, _items.c.status == PENDING
+        )
+        return conn.execute(stmt).scalar_one()
+
+    @staticmethod
+    def next_ready_at(conn: Connection, supplier_name: str) -> Optional[datetime]:
+        """Earliest not_before among the deferred pending items of a supplier"""
+        return conn.execute(
+            select(func.min(_items.c.not_before)).where(
+                _items.c.supplier_name == supplier_name, _items.c.status == PENDING
+            )
+        ).scalar_one()
+
+    @staticmethod
+    def suppliers_with_pending(conn: Connection) -> List[str]:
+        return list(conn.execute(select(_items.c.supplier_name).where(_items.c.status == PENDING).distinct()).scalars())
+
+    @staticmethod
+    def prune(conn: Connection, finished_before: datetime, keep_max: int) -> int:
+        """Delete finished items older than `finished_before` and all but the newest `keep_max`"""
+        finished = _items.c.status.in_(FINISHED_STATUSES)
+        deleted = 0
+        while True:
+            batch = (
+                select(_items.c.id)
+                .where(finished, _items.c.completed_at < finished_before)
+                .limit(PRUNE_BATCH_SIZE)
+                .scalar_subquery()
+            )
+            count = conn.execute(delete(_items).where(_items.c.id.in_(batch))).rowcount
+            deleted += count
+            if count < PRUNE_BATCH_SIZE:
+                break
+
+        overflow = (
+            select(_items.c.id)
+            .where(finished)
+            .order_by(_items.c.completed_at.desc())
+            .offset(keep_max)
+            .scalar_subquery()
+        )
+        deleted += conn.execute(delete(_items).where(_items.c.id.in_(overflow))).rowcount
+        return deleted
@@ -0,0 +1,518 @@
+"""
+Inventory Aggregate Repository
+
+Maintains the materialized dashboard aggregates (PartInventoryAggregate and InventoryRollup) and
+the denormalized PartModel.cached_total_quantity / cached_location_count columns.
+
+Maintenance is incremental: a before_flush hook snapshots the stock/category/supplier state of
+every part touched by the flush, an after_flush hook snapshots it again and applies the
+difference to the per-part rows and to the rollup counters. Work is proportional to the number
+of touched parts, never to the size of the inventory. Writes that bypass the ORM unit of work
+(bulk UPDATE/DELETE statements, raw SQL, external tools) are not seen by the hooks; rebuild()
+recomputes everything from scratch for that case.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select, delete, insert, update, func, literal, bindparam, DateTime, exists
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from MakerMatrix.models.part_models import PartModel, PartCategoryLink
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.inventory_aggregate_models import PartInventoryAggregate, InventoryRollup
+from MakerMatrix.utils.batching import chunks
+
+logger = logging.getLogger(__name__)
+
+# Parts below this many units (across all locations) count as low stock
+LOW_STOCK_THRESHOLD = 10
+
+# Rollup key used for parts without any category
+UNCATEGORIZED_KEY = ""
+
+_SNAPSHOT_KEY = "inventory_aggregate_snapshot"
+
+_parts = PartModel.__table__
+_links = PartCategoryLink.__table__
+_allocations = PartLocationAllocation.__table__
+_locations = LocationModel.__table__
+_part_aggregates = PartInventoryAggregate.__table__
+_rollups = InventoryRollup.__table__
+
+
+@dataclass
+class PartState:
+    """Stock-relevant state of one part at a point in time"""
+
+    supplier: Optional[str] = None
+    category_ids: Set[str] = field(default_factory=set)
+    allocations: Dict[str, int] = field(default_factory=dict)  # location_id -> quantity
+    location_names: List[str] = field(default_factory=list)
+
+    @property
+    def total_quantity(self) -> int:
+        return sum(self.allocations.values())
+
+    @property
+    def location_count(self) -> int:
+        return len(self.allocations)
+
+    def stock_buckets(self) -> List[str]:
+        """Stock rollup keys this part contributes to"""
+        if not self.allocations:
+            return []
+        buckets = ["allocated"]
+        total = self.total_quantity
+        if total < LOW_STOCK_THRESHOLD:
+            buckets.append("low")
+        if total == 0:
+            buckets.append("zero")
+        return buckets
+
+
+def history_values(obj: Any, attr: str) -> Set[Any]:
+    """Current and previous values of a column attribute on a pending/dirty/deleted instance"""
+    history = inspect(obj).attrs[attr].history
+    values = set(history.added or ()) | set(history.unchanged or ()) | set(history.deleted or ())
+    if not values:
+        values = {getattr(obj, attr, None)}
+    return {v for v in values if v is not None}
+
+
+class InventoryAggregateRepository:
+    """Repository for the materialized inventory aggregates"""
+
+    @staticmethod
+    def load_part_states(conn: Connection, part_ids: Set[str]) -> Dict[str, PartState]:
+        """Read the current state of the given parts. Parts that do not exist are omitted."""
+        states: Dict[str, PartState] = {}
+        for chunk in chunks(part_ids):
+            for part_id, supplier in conn.execute(select(_parts.c.id, _parts.c.supplier).where(_parts.c.id.in_(chunk))):
+                states[part_id] = PartState(supplier=supplier)
+
+            for part_id, category_id in conn.execute(
+                select(_links.c.part_id, _links.c.category_id).where(_links.c.part_id.in_(chunk))
+            ):
+                if part_id in states:
+                    states[part_id].category_ids.add(category_id)
+
+            for part_id, location_id, quantity, location_name in conn.execute(
+                select(
+                    _allocations.c.part_id,
+                    _allocations.c.location_id,
+                    _allocations.c.quantity_at_location,
+                    _locations.c.name,
+                )
+                .select_from(_allocations.outerjoin(_locations, _locations.c.id == _allocations.c.location_id))
+                .where(_allocations.c.part_id.in_(chunk))
+            ):
+                if part_id in states:
+                    states[part_id].allocations[location_id] = quantity or 0
+                    if location_name:
+                        states[part_id].location_names.append(location_name)
+        return states
+
+    @staticmethod
+    def get_part_ids_for_locations(conn: Connection, location_ids: Set[str]) -> Set[str]:
+        """Parts that currently have an allocation at any of the given locations"""
+        part_ids: Set[str] = set()
+        for chunk in chunks(location_ids):
+            part_ids.update(
+                conn.execute(select(_allocations.c.part_id).where(_allocations.c.location_id.in_(chunk))).scalars()
+            )
+        return part_ids
+
+    @staticmethod
+    def get_part_ids_for_categories(conn: Connection, category_ids: Set[str]) -> Set[str]:
+        """Parts currently linked to any of the given categories"""
+        part_ids: Set[str] = set()
+        for chunk in chunks(category_ids):
+            part_ids.update(conn.execute(select(_links.c.part_id).where(_links.c.category_id.in_(chunk))).scalars())
+        return part_ids
+
+    @staticmethod
+    def apply_part_changes(
+        conn: Connection, before: Dict[str, PartState], after: Dict[str, PartState], part_ids: Set[str]
+    ) -> None:
+        """
+        Bring the aggregates in line with a change from `before` to `after` for `part_ids`.
+
+        Rewrites the per-part rows and applies the resulting deltas to every rollup bucket the
+        parts moved into or out of.
+        """
+        if not part_ids:
+            return
+
+        now = datetime.utcnow()
+        deltas: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+
+        def contribute(state: PartState, sign: int) -> None:
+            total = state.total_quantity
+            if state.supplier is not None:
+                bucket = deltas[("supplier", state.supplier)]
+                bucket[0] += sign
+                bucket[1] += sign * total
+            for category_id in state.category_ids or {UNCATEGORIZED_KEY}:
+                bucket = deltas[("category", category_id)]
+                bucket[0] += sign
+                bucket[1] += sign * total
+            for location_id, quantity in state.allocations.items():
+                bucket = deltas[("location", location_id)]
+                bucket[0] += sign
+                bucket[1] += sign * quantity
+            for key in state.stock_buckets():
+                bucket = deltas[("stock", key)]
+                bucket[0] += sign
+                bucket[1] += sign * total
+
+        for part_id in part_ids:
+            if part_id in before:
+                contribute(before[part_id], -1)
+            if part_id in after:
+                contribute(after[part_id], 1)
+
+        for chunk in chunks(part_ids):
+            conn.execute(delete(_part_aggregates).where(_part_aggregates.c.part_id.in_(chunk)))
+            rows = [
+                {
+                    "part_id": part_id,
+                    "supplier": after[part_id].supplier,
+                    "total_quantity": after[part_id].total_quantity,
+                    "location_count": after[part_id].location_count,
+                    "location_names": ", ".join(after[part_id].location_names) or None,
+                    "updated_at": now,
+                }
+                for part_id in chunk
+                if part_id in after
+            ]
+            if rows:
+                conn.execute(insert(_part_aggregates), rows)
+
+        InventoryAggregateRepository.write_part_stock_columns(
+            conn, {part_id: after[part_id] for part_id in part_ids if part_id in after}
+        )
+        InventoryAggregateRepository._apply_rollup_deltas(conn, deltas, now)
+
+    @staticmethod
+    def write_part_stock_columns(conn: Connection, states: Dict[str, PartState]) -> None:
+        """Store the allocation totals of `states` on the partmodel rows"""
+        if not states:
+            return
+        conn.execute(
+            update(_parts)
+            .where(_parts.c.id == bindparam("b_part_id"))
+            .values(cached_total_quantity=bindparam("b_total"), cached_location_count=bindparam("b_count")),
+            [
+                {"b_part_id": part_id, "b_total": state.total_quantity, "b_count": state.location_count}
+                for part_id, state in states.items()
+            ],
+        )
+
+    @staticmethod
+    def _allocation_totals():
+        """Correlated (total, count) subqueries over the allocations of the outer partmodel row"""
+        total = (
+            select(func.coalesce(func.sum(_allocations.c.quantity_at_location), 0))
+            .where(_allocations.c.part_id == _parts.c.id)
+            .scalar_subquery()
+        )
+        count = select(func.count(_allocations.c.id)).where(_allocations.c.part_id == _parts.c.id).scalar_subquery()
+        return total, count
+
+    @staticmethod
+    def find_stock_column_mismatches(conn: Connection, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parts whose cached stock columns disagree with their allocation rows"""
+        actual_total = func.coalesce(func.sum(_allocations.c.quantity_at_location), 0)
+        actual_count = func.count(_allocations.c.id)
+        stmt = (
+            select(
+                _parts.c.id,
+                _parts.c.part_name,
+                _parts.c.cached_total_quantity,
+                _parts.c.cached_location_count,
+                actual_total.label("actual_total_quantity"),
+                actual_count.label("actual_location_count"),
+            )
+            .select_from(_parts.outerjoin(_allocations, _allocations.c.part_id == _parts.c.id))
+            .group_by(_parts.c.id)
+            .having(or_(_parts.c.cached_total_quantity != actual_total, _parts.c.cached_location_count != actual_count))
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [dict(row._mapping) for row in conn.execute(stmt)]
+
+    @staticmethod
+    def repair_stock_columns(conn: Connection, part_ids: Optional[List[str]] = None) -> int:
+        """Recompute the cached stock columns from allocations, for all parts or only `part_ids`"""
+        total, count = InventoryAggregateRepository._allocation_totals()
+        # A repair is not a part change; keep updated_at so incremental exports are unaffected
+        stmt = update(_parts).values(
+            cached_total_quantity=total, cached_location_count=count, updated_at=_parts.c.updated_at
+        )
+        if part_ids is None:
+            return conn.execute(stmt).rowcount
+        repaired = 0
+        for chunk in chunks(part_ids):
+            repaired += conn.execute(stmt.where(_parts.c.id.in_(chunk))).rowcount
+        return repaired
+
+    @staticmethod
+    def _apply_rollup_deltas(conn: Connection, deltas: Dict[Tuple[str, str], List[int]], now: datetime) -> None:
+        changed = [(key, delta) for key, delta in deltas.items() if delta[0] or delta[1]]
+        if not changed:
+            return
+
+        stmt = sqlite_insert(_rollups)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_rollups.c.dimension, _rollups.c.key],
+            set_={
+                "part_count": _rollups.c.part_count + stmt.excluded.part_count,
+                "total_quantity": _rollups.c.total_quantity + stmt.excluded.total_quantity,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        conn.execute(
+            stmt,
+            [
+                {
+                    "dimension": dimension,
+                    "key": key,
+                    "part_count": part_delta,
+                    "total_quantity": quantity_delta,
+                    "updated_at": now,
+                }
+                for (dimension, key), (part_delta, quantity_delta) in changed
+            ],
+        )
+        # Buckets that lost their last part disappear, matching the GROUP BY they replace
+        conn.execute(delete(_rollups).where(_rollups.c.part_count <= 0))
+
+    @staticmethod
+    def rebuild(conn: Connection) -> Dict[str, int]:
+        """Recompute every aggregate row from the source tables"""
+        now = literal(datetime.utcnow(), DateTime())
+
+        conn.execute(delete(_rollups))
+        conn.execute(delete(_part_aggregates))
+        InventoryAggregateRepository.repair_stock_columns(conn)
+
+        part_totals = (
+            select(
+                _parts.c.id,
+                _parts.c.supplier,
+                func.coalesce(func.sum(_allocations.c.quantity_at_location), 0),
+                func.count(_allocations.c.id),
+                func.group_concat(_locations.c.name, ", "),
+                now,
+            )
+            .select_from(
+                _parts.outerjoin(_allocations, _allocations.c.part_id == _parts.c.id).outerjoin(
+                    _locations, _locations.c.id == _allocations.c.location_id
+                )
+            )
+            .group_by(_parts.c.id)
+        )
+        conn.execute(
+            insert(_part_aggregates).from_select(
+                ["part_id", "supplier", "total_quantity", "location_count", "location_names", "updated_at"],
+                part_totals,
+            )
+        )
+
+        rollup_columns = ["dimension", "key", "part_count", "total_quantity", "updated_at"]
+        agg = _part_aggregates.c
+
+        # Supplier buckets
+        conn.execute(
+            insert(_rollups).from_select(
+                rollup_columns,
+                select(literal("supplier"), agg.supplier, func.count(), func.sum(agg.total_quantity), now)
+                .where(agg.supplier.isnot(None))
+                .group_by(agg.supplier),
+            )
+        )
+
+        # Category buckets, plus the uncategorized bucket
+        conn.execute(
+            insert(_rollups).from_select(
+                rollup_columns,
+                select(
+                    literal("category"),
+                    _links.c.category_id,
+                    func.count(),
+                    func.coalesce(func.sum(agg.total_quantity), 0),
+                    now,
+                )
+                .select_from(_links.join(_part_aggregates, agg.part_id == _links.c.part_id))
+                .group_by(_links.c.category_id),
+            )
+        )
+        conn.execute(
+            insert(_rollups).from_select(
+                rollup_columns,
+                select(
+                    literal("category"),
+                    literal(UNCATEGORIZED_KEY),
+                    func.count(),
+                    func.coalesce(func.sum(agg.total_quantity), 0),
+                    now,
+                )
+                .where(~exists().where(_links.c.part_id == agg.part_id))
+                .having(func.count() > 0),
+            )
+        )
+
+        # Location buckets
+        conn.execute(
+            insert(_rollups).from_select(
+                rollup_columns,
+                select(
+                    literal("location"),
+                    _allocations.c.location_id,
+                    func.count(func.distinct(_allocations.c.part_id)),
+                    func.coalesce(func.sum(_allocations.c.quantity_at_location), 0),
+                    now,
+                ).group_by(_allocations.c.location_id),
+            )
+        )
+
+        # Stock buckets
+        stock_filters = {
+            "allocated": agg.location_count > 0,
+            "low": and_(agg.location_count > 0, agg.total_quantity < LOW_STOCK_THRESHOLD),
+            "zero": and_(agg.location_count > 0, agg.total_quantity == 0),
+        }
+        for key, condition in stock_filters.items():
+            conn.execute(
+                insert(_rollups).from_select(
+                    rollup_columns,
+                    select(
+                        literal("stock"),
+                        literal(key),
+                        func.count(),
+                        func.coalesce(func.sum(agg.total_quantity), 0),
+                        now,
+                    )
+                    .where(condition)
+                    .having(func.count() > 0),
+                )
+            )
+
+        return {
+            "parts": conn.execute(select(func.count()).select_from(_part_aggregates)).scalar_one(),
+            "rollups": conn.execute(select(func.count()).select_from(_rollups)).scalar_one(),
+        }
+
+    @staticmethod
+    def get_rollups(conn: Connection, dimension: str) -> Dict[str, Tuple[int, int]]:
+        """Return {key: (part_count, total_quantity)} for one rollup dimension"""
+        rows = conn.execute(
+            select(_rollups.c.key, _rollups.c.part_count, _rollups.c.total_quantity).where(
+                _rollups.c.dimension == dimension
+            )
+        )
+        return {key: (part_count, total_quantity) for key, part_count, total_quantity in rows}
+
+
+class _AggregateStaleFlag:
+    """Process-wide marker set when incremental maintenance could not be applied"""
+
+    stale = False
+
+
+def is_stale() -> bool:
+    return _AggregateStaleFlag.stale
+
+
+def set_stale(value: bool) -> None:
+    _AggregateStaleFlag.stale = value
+
+
+def _collect_touched(session: OrmSession, conn: Connection) -> Set[str]:
+    """Part ids whose aggregates may change when the pending unit of work is flushed"""
+    part_ids: Set[str] = set()
+    location_ids: Set[str] = set()
+    category_ids: Set[str] = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, PartModel):
+            if obj.id:
+                part_ids.add(obj.id)
+        elif isinstance(obj, PartLocationAllocation):
+            part_ids.update(history_values(obj, "part_id"))
+        elif isinstance(obj, PartCategoryLink):
+            part_ids.update(history_values(obj, "part_id"))
+        elif isinstance(obj, LocationModel):
+            # Renames change location_names, deletes cascade to allocations
+            if obj in session.deleted or inspect(obj).attrs.name.history.has_changes():
+                location_ids.add(obj.id)
+        elif isinstance(obj, CategoryModel):
+            if obj in session.deleted or inspect(obj).attrs.parts.history.has_changes():
+                category_ids.add(obj.id)
+                for part in inspect(obj).attrs.parts.history.sum() or ():
+                    if part is not None and part.id:
+                        part_ids.add(part.id)
+
+    if location_ids:
+        part_ids |= InventoryAggregateRepository.get_part_ids_for_locations(conn, location_ids)
+    if category_ids:
+        part_ids |= InventoryAggregateRepository.get_part_ids_for_categories(conn, category_ids)
+    return part_ids
+
+
+def _before_flush(session: OrmSession, _flush_context, _instances) -> None:
+    session.info.pop(_SNAPSHOT_KEY, None)
+    if not (session.new or session.dirty or session.deleted):
+        return
+    try:
+        conn = session.connection()
+        part_ids = _collect_touched(session, conn)
+        if part_ids:
+            session.info[_SNAPSHOT_KEY] = (
+                part_ids,
+                InventoryAggregateRepository.load_part_states(conn, part_ids),
+            )
+    except Exception as e:
+        logger.warning(f"Inventory aggregate snapshot failed, aggregates marked stale: {e}")
+        set_stale(True)
+
+
+def _after_flush(session: OrmSession, _flush_context) -> None:
+    snapshot = session.info.pop(_SNAPSHOT_KEY, None)
+    if snapshot is None:
+        return
+    part_ids, before = snapshot
+    try:
+        conn = session.connection()
+        after = InventoryAggregateRepository.load_part_states(conn, part_ids)
+        InventoryAggregateRepository.apply_part_changes(conn, before, after, part_ids)
+
+        # Keep loaded instances in step with the columns written above without dirtying them
+        for part_id, state in after.items():
+            part = session.identity_map.get(session.identity_key(PartModel, part_id))
+            if part is not None:
+                set_committed_value(part, "cached_total_quantity", state.total_quantity)
+                set_committed_value(part, "cached_location_count", state.location_count)
+    except Exception as e:
+        logger.warning(f"Inventory aggregate update failed, aggregates marked stale: {e}")
+        set_stale(True)
+
+
+def register_aggregate_hooks() -> None:
+    """Install the flush hooks that keep the aggregates current (idempotent)"""
+    if not event.contains(OrmSession, "before_flush", _before_flush):
+        event.listen(OrmSession, "before_flush", _before_flush)
+        event.listen(OrmSession, "after_flush", _after_flush)
+
+
+register_aggregate_hooks()
@@ -0,0 +1,296 @@
+"""
+Location Path Repository
+
+Maintains the materialized path columns on LocationModel (path_ids and path_names) and
+batch-loads the location data that part listings serialize.
+
+A before_flush hook computes the path of every new location and of every location whose
+name or parent changed. An after_flush hook then rewrites the paths of the descendants of
+renamed or moved locations with one range query on the indexed path_ids column, so a move
+costs one read and one bulk update regardless of how deep the subtree is. Writes that
+bypass the ORM unit of work are not seen by the hooks; rebuild() recomputes every path.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select, update, bindparam, func
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from MakerMatrix.models.location_models import LocationModel, LocationBatch
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.utils.batching import chunks
+
+logger = logging.getLogger(__name__)
+
+PATH_SEPARATOR = "/"
+
+_MOVES_KEY = "location_path_moves"
+
+_locations = LocationModel.__table__
+_allocations = PartLocationAllocation.__table__
+
+Path = Tuple[List[str], List[str]]  # (ids, names) from the root down
+
+
+def _subtree_filter(path_ids: str):
+    """Rows strictly below the location with `path_ids`, as an index range on path_ids"""
+    # '0' is the character after the separator, so the range covers exactly "<path_ids>/..."
+    return (_locations.c.path_ids > path_ids + PATH_SEPARATOR) & (_locations.c.path_ids < path_ids + "0")
+
+
+def compute_paths(rows: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> Dict[str, Path]:
+    """Paths for (id, parent_id, name) rows; ids in a parent cycle are left out"""
+    nodes = {location_id: (parent_id, name) for location_id, parent_id, name in rows}
+    paths: Dict[str, Path] = {}
+
+    for start in nodes:
+        chain = []
+        current = start
+        while current is not None and current not in paths and current in nodes and current not in chain:
+            chain.append(current)
+            current = nodes[current][0]
+        if current is not None and current in chain:
+            logger.warning(f"Location {current} is part of a parent cycle; its path is not materialized")
+            continue
+        ids, names = paths.get(current, ([], []))
+        for location_id in reversed(chain):
+            ids = ids + [location_id]
+            names = names + [nodes[location_id][1]]
+            paths[location_id] = (ids, names)
+    return paths
+
+
+class LocationPathRepository:
+    """Repository for the materialized location paths"""
+
+    @staticmethod
+    def rebuild(conn: Connection) -> int:
+        """Recompute the path of every location from the parent links"""
+        rows = conn.execute(select(_locations.c.id, _locations.c.parent_id, _locations.c.name)).all()
+        paths = compute_paths(rows)
+        if paths:
+            conn.execute(
+                update(_locations)
+                .where(_locations.c.id == bindparam("b_id"))
+                .values(path_ids=bindparam("b_path_ids"), path_names=bindparam("b_path_names")),
+                [
+                    {"b_id": location_id, "b_path_ids": PATH_SEPARATOR.join(ids), "b_path_names": names}
+                    for location_id, (ids, names) in paths.items()
+                ],
+            )
+        return len(paths)
+
+    @staticmethod
+    def get_descendant_ids(conn: Connection, path_ids: str) -> List[str]:
+        """Ids of every location below the location with `path_ids`, parents before their children"""
+        return list(
+            conn.execute(
+                select(_locations.c.id).where(_subtree_filter(path_ids)).order_by(_locations.c.path_ids)
+            ).scalars()
+        )
+
+    @staticmethod
+    def get_descendants(session: OrmSession, path_ids: str) -> List[LocationModel]:
+        """Every location below the location with `path_ids`, parents before their children"""
+        return list(
+            session.scalars(select(LocationModel).where(_subtree_filter(path_ids)).order_by(LocationModel.path_ids))
+        )
+
+    @staticmethod
+    def rewrite_subtree(
+        conn: Connection, old_path_ids: str, new_ids: List[str], new_names: List[str]
+    ) -> Dict[str, Path]:
+        """
+        Re-root the paths below a location whose own path changed from `old_path_ids` to
+        (`new_ids`, `new_names`). Returns the new paths by location id.
+        """
+        depth = len(old_path_ids.split(PATH_SEPARATOR))
+        rewritten: Dict[str, Path] = {}
+        for location_id, path_ids, path_names in conn.execute(
+            select(_locations.c.id, _locations.c.path_ids, _locations.c.path_names).where(_subtree_filter(old_path_ids))
+        ):
+            rewritten[location_id] = (
+                new_ids + path_ids.split(PATH_SEPARATOR)[depth:],
+                new_names + list(path_names or [])[depth:],
+            )
+
+        if rewritten:
+            conn.execute(
+                update(_locations)
+                .where(_locations.c.id == bindparam("b_id"))
+                .values(path_ids=bindparam("b_path_ids"), path_names=bindparam("b_path_names")),
+                [
+                    {"b_id": location_id, "b_path_ids": PATH_SEPARATOR.join(ids), "b_path_names": names}
+                    for location_id, (ids, names) in rewritten.items()
+                ],
+            )
+        return rewritten
+
+    @staticmethod
+    def load_batch(conn: Connection, locations: Iterable[Optional[LocationModel]]) -> LocationBatch:
+        """
+        Load the parent summaries and container usage for a page of locations: one query
+        for the parents and one grouped query over the allocations of the containers.
+        """
+        parent_ids: Set[str] = set()
+        container_ids: Set[str] = set()
+        for location in locations:
+            if location is None:
+                continue
+            if location.parent_id:
+                parent_ids.add(location.parent_id)
+            if location.is_mobile and location.container_capacity is not None:
+                container_ids.add(location.id)
+
+        batch = LocationBatch()
+        for chunk in chunks(parent_ids):
+            for row in conn.execute(
+                select(_locations.c.id, _locations.c.name, _locations.c.description, _locations.c.location_type).where(
+                    _locations.c.id.in_(chunk)
+                )
+            ):
+                batch.parents[row.id] = dict(row._mapping)
+
+        for chunk in chunks(container_ids):
+            for location_id, used in conn.execute(
+                select(_allocations.c.location_id, func.coalesce(func.sum(_allocations.c.quantity_at_location), 0))
+                .where(_allocations.c.location_id.in_(chunk))
+                .group_by(_allocations.c.location_id)
+            ):
+                batch.capacity_used[location_id] = used
+        return batch
+
+
+def _parent_changed(obj: LocationModel) -> bool:
+    state = inspect(obj)
+    return state.attrs.parent_id.history.has_changes() or state.attrs.parent.history.has_changes()
+
+
+def _current_parent_id(obj: LocationModel) -> Optional[str]:
+    """parent_id, or the id of a parent assigned through the relationship and not synced yet"""
+    history = inspect(obj).attrs.parent.history
+    if history.added:
+        parent = history.added[0]
+        if parent is not None:
+            return parent.id
+        if not inspect(obj).attrs.parent_id.history.has_changes():
+            return None
+    return obj.parent_id
+
+
+class _PathResolver:
+    """Resolves paths during a flush: pending objects first, then loaded instances, then the database"""
+
+    def __init__(self, session: OrmSession, conn: Connection, changed: Dict[str, LocationModel]):
+        self.session = session
+        self.conn = conn
+        self.changed = changed
+        self.paths: Dict[str, Path] = {}
+        self._resolving: Set[str] = set()
+
+    def path_of(self, location_id: Optional[str]) -> Path:
+        if location_id is None:
+            return [], []
+        if location_id in self.paths:
+            return self.paths[location_id]
+        if location_id in self._resolving:
+            raise ValueError(f"Location {location_id} is its own ancestor")
+
+        self._resolving.add(location_id)
+        try:
+            path = self._lookup(location_id)
+        finally:
+            self._resolving.discard(location_id)
+        self.paths[location_id] = path
+        return path
+
+    def _lookup(self, location_id: str) -> Path:
+        obj = self.changed.get(location_id)
+        if obj is not None:
+            ids, names = self.path_of(_current_parent_id(obj))
+            return ids + [obj.id], names + [obj.name]
+
+        loaded = self.session.identity_map.get(self.session.identity_key(LocationModel, location_id))
+        if loaded is not None and "path_ids" not in inspect(loaded).unloaded and loaded.path_ids:
+            return loaded.path_ids.split(PATH_SEPARATOR), list(loaded.path_names or [])
+
+        row = self.conn.execute(
+            select(_locations.c.parent_id, _locations.c.name, _locations.c.path_ids, _locations.c.path_names).where(
+                _locations.c.id == location_id
+            )
+        ).first()
+        if row is None:
+            # Dangling parent reference; the foreign key rejects it at flush time
+            return [location_id], [None]
+        if row.path_ids:
+            return row.path_ids.split(PATH_SEPARATOR), list(row.path_names or [])
+        # Not materialized yet (rows written outside the ORM); walk up
+        ids, names = self.path_of(row.parent_id)
+        return ids + [location_id], names + [row.name]
+
+
+def _before_flush(session: OrmSession, _flush_context, _instances) -> None:
+    session.info.pop(_MOVES_KEY, None)
+    changed: Dict[str, LocationModel] = {}
+    for obj in session.new:
+        if isinstance(obj, LocationModel) and obj.id:
+            changed[obj.id] = obj
+    for obj in session.dirty:
+        if isinstance(obj, LocationModel) and obj not in session.deleted:
+            if not obj.path_ids or _parent_changed(obj) or inspect(obj).attrs.name.history.has_changes():
+                changed[obj.id] = obj
+    if not changed:
+        return
+
+    try:
+        resolver = _PathResolver(session, session.connection(), changed)
+        moves = []
+        for location_id, obj in changed.items():
+            ids, names = resolver.path_of(location_id)
+            path_ids = PATH_SEPARATOR.join(ids)
+            old_path_ids = inspect(obj).attrs.path_ids.history.deleted or inspect(obj).attrs.path_ids.history.unchanged
+            old_path_ids = old_path_ids[0] if old_path_ids else None
+            if obj.path_ids != path_ids:
+                obj.path_ids = path_ids
+            if obj.path_names != names:
+                obj.path_names = names
+            if old_path_ids and obj not in session.new:
+                moves.append((old_path_ids, ids, names))
+        # Deepest first, so a subtree moved together with one of its ancestors is rewritten
+        # from its own new path before the ancestor's rewrite runs
+        moves.sort(key=lambda move: move[0].count(PATH_SEPARATOR), reverse=True)
+        session.info[_MOVES_KEY] = moves
+    except Exception as e:
+        logger.warning(f"Location path update failed, run LocationPathRepository.rebuild(): {e}")
+
+
+def _after_flush(session: OrmSession, _flush_context) -> None:
+    moves = session.info.pop(_MOVES_KEY, None)
+    if not moves:
+        return
+    try:
+        conn = session.connection()
+        for old_path_ids, ids, names in moves:
+            rewritten = LocationPathRepository.rewrite_subtree(conn, old_path_ids, ids, names)
+
+            # Keep loaded instances in step with the rows written above without dirtying them
+            for location_id, (new_ids, new_names) in rewritten.items():
+                location = session.identity_map.get(session.identity_key(LocationModel, location_id))
+                if location is not None:
+                    set_committed_value(location, "path_ids", PATH_SEPARATOR.join(new_ids))
+                    set_committed_value(location, "path_names", new_names)
+    except Exception as e:
+        logger.warning(f"Location subtree path update failed, run LocationPathRepository.rebuild(): {e}")
+
+
+def register_location_path_hooks() -> None:
+    """Install the flush hooks that keep the materialized paths current (idempotent)"""
+    if not event.contains(OrmSession, "before_flush", _before_flush):
+        event.listen(OrmSession, "before_flush", _before_flush)
+        event.listen(OrmSession, "after_flush", _after_flush)
+
+
+register_location_path_hooks()
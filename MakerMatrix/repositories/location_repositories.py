@@ -8,6 +8,7 @@ from MakerMatrix.repositories.custom_exceptions import (
     InvalidReferenceError,
 )
 from sqlalchemy.orm import joinedload, selectinload
+from MakerMatrix.repositories.location_path_repository import PATH_SEPARATOR, LocationPathRepository
 
 
 class LocationRepository:
@@ -27,28 +28,25 @@ class LocationRepository:
     @staticmethod
     def get_location_hierarchy(session: Session, location_id: str) -> Dict[str, Any]:
         """Get a location and its complete hierarchy of descendants"""
-        location = session.exec(
-            select(LocationModel).options(selectinload(LocationModel.children)).where(LocationModel.id == location_id)
-        ).first()
+        location = session.exec(select(LocationModel).where(LocationModel.id == location_id)).first()
 
         if not location:
             raise ResourceNotFoundError(resource="Location", resource_id=location_id)
 
+        # The whole subtree in one range query on the materialized path
+        children_by_parent: Dict[str, List[LocationModel]] = {}
+        if location.path_ids:
+            for descendant in LocationPathRepository.get_descendants(session, location.path_ids):
+                children_by_parent.setdefault(descendant.parent_id, []).append(descendant)
         affected_ids = []
 
         def build_hierarchy(loc: LocationModel) -> Dict[str, Any]:
             affected_ids.append(loc.id)
-            children = session.exec(
-                select(LocationModel)
-                .options(selectinload(LocationModel.children))
-                .where(LocationModel.parent_id == loc.id)
-            ).all()
-
             hierarchy = {
                 "id": loc.id,
                 "name": loc.name,
                 "description": loc.description,
-                "children": [build_hierarchy(child) for child in children],
+                "children": [build_hierarchy(child) for child in children_by_parent.get(loc.id, [])],
             }
             return hierarchy
 
@@ -176,9 +174,22 @@ class LocationRepository:
 
         # Build the path from the target location up to the root
         path = []
-        current = location
+        if location.path_ids:
+            # Materialized path: load all ancestors in one query
+            ancestor_ids = location.path_ids.split(PATH_SEPARATOR)
+            ancestors = {
+                loc.id: loc
+                for loc in session.exec(select(LocationModel).where(LocationModel.id.in_(ancestor_ids))).all()
+            }
+            chain = [ancestors[ancestor_id] for ancestor_id in reversed(ancestor_ids) if ancestor_id in ancestors]
+        else:
+            chain = []
+            current = location
+            while current:
+                chain.append(current)
+                current = session.get(LocationModel, current.parent_id) if current.parent_id else None
 
-        while current:
+        for current in chain:
             path.append(
                 {
                     "id": current.id,
@@ -187,10 +198,6 @@ class LocationRepository:
                     "location_type": current.location_type,
                 }
             )
-            if current.parent_id:
-                current = session.get(LocationModel, current.parent_id)
-            else:
-                current = None
 
         # Convert the list into a nested dictionary structure
         if not path:
@@ -248,6 +255,12 @@ class LocationRepository:
                     message=f"Parent location with ID '{location_data['parent_id']}' does not exist",
                     data={"parent_id": location_data["parent_id"]},
                 )
+            if location_id in LocationRepository._ancestor_ids(session, parent):
+                raise InvalidReferenceError(
+                    status="error",
+                    message="A location cannot be moved into itself or one of its descendants",
+                    data={"parent_id": location_data["parent_id"]},
+                )
 
         # Update only the provided fields
         for key, value in location_data.items():
@@ -258,6 +271,18 @@ class LocationRepository:
         session.refresh(location)
         return location
 
+    @staticmethod
+    def _ancestor_ids(session: Session, location: LocationModel) -> List[str]:
+        """Ids from the root down to and including `location`"""
+        if location.path_ids:
+            return location.path_ids.split(PATH_SEPARATOR)
+        ids = []
+        current = location
+        while current is not None and current.id not in ids:
+            ids.insert(0, current.id)
+            current = session.get(LocationModel, current.parent_id) if current.parent_id else None
+        return ids
+
     @staticmethod
     def cleanup_locations(session: Session) -> int:
         """
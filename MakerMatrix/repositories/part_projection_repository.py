@@ -0,0 +1,197 @@
+"""
+Part Projection Repository
+
+Response projections for part listings. A projection is chosen per request and decides both
+which relationships the listing query loads and how the page is serialized:
+
+- view=full (default): PartModel.to_dict() with the listing's default loaders
+- fields=a,b,c: only the requested top-level keys of to_dict(); relationships that none of
+  them needs are not loaded
+- view=summary: the columns of the parts grid, serialized from plain rows. Parts are loaded
+  with only the grid columns and no relationships; the primary locations, categories and
+  projects of the page come from one query each.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import lazyload, load_only, selectinload
+
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_models import PartCategoryLink, PartModel
+from MakerMatrix.models.project_models import PartProjectLink, ProjectModel
+from MakerMatrix.utils.batching import chunks
+
+VIEWS = ("full", "summary")
+
+# Keys of PartModel.to_dict() built from relationships, and the relationship each one needs
+RELATIONSHIP_FIELDS = {
+    "categories": "categories",
+    "tags": "tags",
+    "projects": "projects",
+    "datasheets": "datasheets",
+    "allocations": "allocations",
+    "location": "allocations",
+    "location_id": "allocations",
+}
+COLUMN_FIELDS = frozenset(PartModel.__table__.columns.keys())
+PROJECTABLE_FIELDS = COLUMN_FIELDS | set(RELATIONSHIP_FIELDS) | {"quantity"}
+
+# Columns the grid rows are built from
+SUMMARY_COLUMNS = (
+    "id",
+    "part_name",
+    "part_number",
+    "image_url",
+    "emoji",
+    "supplier",
+    "cached_total_quantity",
+    "cached_location_count",
+    "created_at",
+)
+
+# Eager loaders for the relationships a projection needs; nested relationships are not
+# followed (CategoryModel.parts would otherwise load every part of each category)
+_EAGER_LOADERS = {
+    "categories": lambda: selectinload(PartModel.categories).lazyload("*"),
+    "tags": lambda: selectinload(PartModel.tags).lazyload("*"),
+    "projects": lambda: selectinload(PartModel.projects).lazyload("*"),
+    "datasheets": lambda: selectinload(PartModel.datasheets),
+    "allocations": lambda: selectinload(PartModel.allocations).selectinload(PartLocationAllocation.location),
+}
+
+_allocations = PartLocationAllocation.__table__
+_locations = LocationModel.__table__
+_category_links = PartCategoryLink.__table__
+_categories = CategoryModel.__table__
+_project_links = PartProjectLink.__table__
+_projects = ProjectModel.__table__
+
+
+@dataclass(frozen=True)
+class PartProjection:
+    """The view or field list a part listing was requested with"""
+
+    view: str = "full"
+    fields: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def parse(cls, view: Optional[str] = None, fields: Optional[str] = None) -> "PartProjection":
+        """Build a projection from the `view` and comma-separated `fields` query parameters"""
+        view = (view or "full").strip().lower()
+        if view not in VIEWS:
+            raise ValueError(f"Unknown view '{view}', expected one of: {', '.join(VIEWS)}")
+
+        requested = {field.strip() for field in (fields or "").split(",") if field.strip()}
+        if not requested:
+            return cls(view)
+        if view != "full":
+            raise ValueError("fields cannot be combined with view=summary")
+        unknown = requested - PROJECTABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown part fields: {', '.join(sorted(unknown))}")
+        return cls(view, frozenset(requested | {"id"}))
+
+    @property
+    def is_default(self) -> bool:
+        return self.view == "full" and self.fields is None
+
+    @property
+    def is_summary(self) -> bool:
+        return self.view == "summary"
+
+    def relationships(self) -> Set[str]:
+        """Relationships the serialized fields read"""
+        if self.fields is None:
+            return set(_EAGER_LOADERS)
+        return {RELATIONSHIP_FIELDS[field] for field in self.fields if field in RELATIONSHIP_FIELDS}
+
+    def loader_options(self) -> Optional[list]:
+        """Loader options for the listing query, or None for the listing's defaults"""
+        if self.is_default:
+            return None
+        if self.is_summary:
+            return [load_only(*(getattr(PartModel, column) for column in SUMMARY_COLUMNS)), lazyload("*")]
+
+        needed = self.relationships()
+        columns = (self.fields & COLUMN_FIELDS) | {"id", "cached_total_quantity"}
+        options = [load_only(*(getattr(PartModel, column) for column in sorted(columns)))]
+        for name, loader in _EAGER_LOADERS.items():
+            options.append(loader() if name in needed else lazyload(getattr(PartModel, name)))
+        return options
+
+
+class PartProjectionRepository:
+    """Batch queries behind the summary (grid) view"""
+
+    @staticmethod
+    def grid_rows(conn: Connection, parts: List[PartModel]) -> List[Dict[str, Any]]:
+        """
+        Grid rows for a page of parts loaded with the summary loader options: three batch
+        queries for the whole page, no per-part loads.
+        """
+        part_ids = [part.id for part in parts]
+        locations = PartProjectionRepository.primary_locations(conn, part_ids)
+        categories = PartProjectionRepository._named_links(conn, part_ids, _category_links, _categories, "category_id")
+        projects = PartProjectionRepository._named_links(conn, part_ids, _project_links, _projects, "project_id")
+
+        rows = []
+        for part in parts:
+            location = locations.get(part.id)
+            rows.append(
+                {
+                    "id": part.id,
+                    "part_name": part.part_name,
+                    "part_number": part.part_number,
+                    "image_url": part.image_url,
+                    "emoji": part.emoji,
+                    "quantity": part.cached_total_quantity,
+                    "location_count": part.cached_location_count,
+                    "location_id": location["id"] if location else None,
+                    "location": location,
+                    "categories": categories.get(part.id, []),
+                    "projects": projects.get(part.id, []),
+                    "supplier": part.supplier,
+                    "created_at": part.created_at.isoformat() if part.created_at else None,
+                }
+            )
+        return rows
+
+    @staticmethod
+    def primary_locations(conn: Connection, part_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Primary storage location of each part (any allocated location if none is primary)"""
+        locations: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunks(part_ids):
+            stmt = (
+                select(_allocations.c.part_id, _locations.c.id, _locations.c.name, _locations.c.path_names)
+                .select_from(_allocations.join(_locations, _locations.c.id == _allocations.c.location_id))
+                .where(_allocations.c.part_id.in_(chunk))
+                .order_by(_allocations.c.part_id, _allocations.c.is_primary_storage.desc())
+            )
+            for part_id, location_id, name, path_names in conn.execute(stmt):
+                if part_id not in locations:
+                    locations[part_id] = {
+                        "id": location_id,
+                        "name": name,
+                        "full_path": " > ".join(path_names) if path_names else name,
+                    }
+        return locations
+
+    @staticmethod
+    def _named_links(conn: Connection, part_ids: List[str], links, targets, target_key: str) -> Dict[str, List[Dict]]:
+        """(id, name) of the rows linked to each part through a link table, by name"""
+        linked: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in chunks(part_ids):
+            stmt = (
+                select(links.c.part_id, targets.c.id, targets.c.name)
+                .select_from(links.join(targets, targets.c.id == links.c[target_key]))
+                .where(links.c.part_id.in_(chunk))
+                .order_by(targets.c.name)
+            )
+            for part_id, target_id, name in conn.execute(stmt):
+                linked.setdefault(part_id, []).append({"id": target_id, "name": name})
+        return linked
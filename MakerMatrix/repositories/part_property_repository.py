@@ -0,0 +1,205 @@
+"""
+Part Property Repository
+
+Maintains the parametric property index (PartPropertyIndex) from
+PartModel.additional_properties and builds the typed filters that query it.
+
+The index is written by mapper events on PartModel, so every ORM part write
+(create, edit, import, enrichment) keeps it current inside the same transaction.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, inspect, select, delete, insert, cast, String, and_, or_
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+
+from MakerMatrix.models.part_models import PartModel, PropertyFilter
+from MakerMatrix.models.part_property_models import PartPropertyIndex
+from MakerMatrix.utils.unit_values import parse_value
+
+logger = logging.getLogger(__name__)
+
+# Relative tolerance when comparing normalized floats ("4.7uF" vs "4700nF")
+NUMERIC_TOLERANCE = 1e-9
+
+REBUILD_BATCH_SIZE = 500
+
+_parts = PartModel.__table__
+_index = PartPropertyIndex.__table__
+
+
+def normalize_key(key: Any) -> str:
+    """Normalize a property key the way SupplierDataMapper writes display keys"""
+    return str(key).strip().lower().replace(" ", "_")
+
+
+def build_property_rows(part_id: str, properties: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Index rows for the scalar entries of a part's additional_properties"""
+    rows: Dict[str, Dict[str, Any]] = {}
+    if not isinstance(properties, dict):
+        return []
+
+    for key, value in properties.items():
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        normalized_key = normalize_key(key)
+        if not normalized_key or normalized_key in rows:
+            continue
+
+        raw_value = str(value)
+        parsed = parse_value(value, normalized_key)
+        rows[normalized_key] = {
+            "part_id": part_id,
+            "key": normalized_key,
+            "raw_value": raw_value,
+            "text_value": raw_value.strip().lower(),
+            "numeric_value": parsed[0] if parsed else None,
+            "unit": parsed[1] if parsed else None,
+        }
+    return list(rows.values())
+
+
+class PartPropertyRepository:
+    """Static helpers for the parametric property index"""
+
+    @staticmethod
+    def replace_part_properties(conn: Connection, part_id: str, properties: Optional[Dict[str, Any]]) -> int:
+        """Replace the index rows of one part; returns the number of rows written"""
+        conn.execute(delete(_index).where(_index.c.part_id == part_id))
+        rows = build_property_rows(part_id, properties)
+        if rows:
+            conn.execute(insert(_index), rows)
+        return len(rows)
+
+    @staticmethod
+    def delete_part_properties(conn: Connection, part_id: str) -> None:
+        conn.execute(delete(_index).where(_index.c.part_id == part_id))
+
+    @staticmethod
+    def rebuild(conn: Connection) -> Dict[str, int]:
+        """Recreate the whole index from PartModel.additional_properties"""
+        conn.execute(delete(_index))
+        parts = 0
+        rows_written = 0
+        result = conn.execute(select(_parts.c.id, _parts.c.additional_properties))
+        while True:
+            batch = result.fetchmany(REBUILD_BATCH_SIZE)
+            if not batch:
+                break
+            rows = [row for part_id, properties in batch for row in build_property_rows(part_id, properties)]
+            if rows:
+                conn.execute(insert(_index), rows)
+            parts += len(batch)
+            rows_written += len(rows)
+        return {"parts": parts, "properties": rows_written}
+
+    @staticmethod
+    def needs_rebuild(conn: Connection) -> bool:
+        """
+        True if parts have properties but the index is empty (e.g. a database that predates it),
+        or if it was built when zero-padded codes such as "0603" were indexed as numbers.
+        """
+        if conn.execute(select(_index.c.part_id).limit(1)).first() is not None:
+            zero_padded = select(_index.c.part_id).where(
+                _index.c.numeric_value.isnot(None),
+                or_(_index.c.text_value.op("GLOB")("0[0-9]*"), _index.c.text_value.op("GLOB")("-0[0-9]*")),
+            )
+            return conn.execute(zero_padded.limit(1)).first() is not None
+        has_properties = select(_parts.c.id).where(
+            _parts.c.additional_properties.isnot(None),
+            cast(_parts.c.additional_properties, String).notin_(["{}", "null"]),
+        )
+        return conn.execute(has_properties.limit(1)).first() is not None
+
+    @staticmethod
+    def filter_clause(property_filter: PropertyFilter) -> ColumnElement:
+        """
+        Build a WHERE clause on PartModel.id for a typed property filter.
+
+        Raises:
+            ValueError: If a range bound is not a numeric value
+        """
+        key = normalize_key(property_filter.key)
+        conditions = [_index.c.key == key]
+
+        if property_filter.equals is not None:
+            text_match = _index.c.text_value == property_filter.equals.strip().lower()
+            parsed = parse_value(property_filter.equals, key)
+            if parsed:
+                number, unit = parsed
+                conditions.append(or_(text_match, and_(*_numeric_range(number, number, unit))))
+            else:
+                conditions.append(text_match)
+
+        bounds = {}
+        for name in ("min_value", "max_value"):
+            bound = getattr(property_filter, name)
+            if bound is None:
+                continue
+            parsed = parse_value(bound, key)
+            if parsed is None:
+                raise ValueError(f"Cannot parse '{bound}' as a value for property '{property_filter.key}'")
+            bounds[name] = parsed
+
+        if bounds:
+            units = {unit for _, unit in bounds.values() if unit}
+            if len(units) > 1:
+                raise ValueError(f"Conflicting units for property '{property_filter.key}': {', '.join(sorted(units))}")
+            low = bounds["min_value"][0] if "min_value" in bounds else None
+            high = bounds["max_value"][0] if "max_value" in bounds else None
+            conditions.extend(_numeric_range(low, high, units.pop() if units else None))
+
+        return PartModel.id.in_(select(_index.c.part_id).where(*conditions))
+
+
+def _numeric_range(low: Optional[float], high: Optional[float], unit: Optional[str]) -> List[ColumnElement]:
+    conditions = [_index.c.numeric_value.isnot(None)]
+    if low is not None:
+        conditions.append(_index.c.numeric_value >= low - abs(low) * NUMERIC_TOLERANCE)
+    if high is not None:
+        conditions.append(_index.c.numeric_value <= high + abs(high) * NUMERIC_TOLERANCE)
+    if unit:
+        conditions.append(_index.c.unit == unit)
+    return conditions
+
+
+# === PART WRITE HOOKS ===
+
+
+def _after_part_insert(mapper, connection, target: PartModel) -> None:
+    try:
+        PartPropertyRepository.replace_part_properties(connection, target.id, target.additional_properties)
+    except Exception as e:
+        logger.warning(f"Failed to index properties of part {target.id}: {e}")
+
+
+def _after_part_update(mapper, connection, target: PartModel) -> None:
+    if not inspect(target).attrs.additional_properties.history.has_changes():
+        return
+    try:
+        PartPropertyRepository.replace_part_properties(connection, target.id, target.additional_properties)
+    except Exception as e:
+        logger.warning(f"Failed to index properties of part {target.id}: {e}")
+
+
+def _after_part_delete(mapper, connection, target: PartModel) -> None:
+    try:
+        PartPropertyRepository.delete_part_properties(connection, target.id)
+    except Exception as e:
+        logger.warning(f"Failed to remove property index rows of part {target.id}: {e}")
+
+
+def register_property_hooks() -> None:
+    """Attach the index maintenance hooks to PartModel (idempotent)"""
+    for name, handler in (
+        ("after_insert", _after_part_insert),
+        ("after_update", _after_part_update),
+        ("after_delete", _after_part_delete),
+    ):
+        if not event.contains(PartModel, name, handler):
+            event.listen(PartModel, name, handler)
+
+
+register_property_hooks()
@@ -1,7 +1,9 @@
 import logging
+import re
 from typing import Optional, List, Dict, Any
 
-from sqlalchemy import func, or_, delete
+from sqlalchemy import func, or_, delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import joinedload, selectinload
 from sqlmodel import Session, select
 
@@ -10,13 +12,42 @@ from sqlmodel import Session, select
 # from MakerMatrix.repositories.base_repository import BaseRepository
 
 from MakerMatrix.models.models import PartModel, CategoryModel, AdvancedPartSearch
+from MakerMatrix.models.part_models import PartCategoryLink
+from MakerMatrix.models.part_models import PropertyFilter
 from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_metadata_models import PartSystemMetadata
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.repositories.location_path_repository import LocationPathRepository
+from MakerMatrix.repositories.part_property_repository import PartPropertyRepository
 from MakerMatrix.exceptions import ResourceNotFoundError, InvalidReferenceError
+from MakerMatrix.utils.batching import chunks
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+# A part detail view counts as much as this many appearances in search results
+POPULARITY_VIEW_WEIGHT = 5
+
+
+def _listing_options(options: Optional[list]) -> list:
+    """Loader options of a part listing: the caller's projection, or categories and allocations"""
+    if options is not None:
+        return options
+    return [joinedload(PartModel.categories), selectinload(PartModel.allocations)]
+
+
+def popularity_score():
+    """Weighted view and search counts of the part from PartSystemMetadata (0 without a row)"""
+    return func.coalesce(
+        select(PartSystemMetadata.view_count * POPULARITY_VIEW_WEIGHT + PartSystemMetadata.search_count)
+        .where(PartSystemMetadata.part_id == PartModel.id)
+        .correlate(PartModel)
+        .scalar_subquery(),
+        0,
+    )
+
+
 # noinspection PyTypeChecker
 def handle_categories(session: Session, category_names: List[str]) -> List[CategoryModel]:
     categories = []
@@ -44,21 +75,26 @@ class PartRepository:
 
         If recursive is True, it will also fetch parts associated with child locations.
         """
-        # Fetch parts via allocation table (join with PartLocationAllocation)
-        parts = session.exec(
-            select(PartModel)
-            .join(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
-            .where(PartLocationAllocation.location_id == location_id)
-            .options(selectinload(PartModel.allocations))
-        ).all()
-
+        location_ids = [location_id]
         if recursive:
-            # If recursive, find parts associated with all child locations
-            child_location_ids = PartRepository.get_child_location_ids(session, location_id)
-            for child_id in child_location_ids:
-                parts.extend(PartRepository.get_parts_by_location_id(session, child_id, recursive=True))
-
-        return parts
+            # If recursive, find parts associated with all child locations, from the materialized path
+            path_ids = session.exec(select(LocationModel.path_ids).where(LocationModel.id == location_id)).first()
+            if path_ids:
+                location_ids.extend(LocationPathRepository.get_descendant_ids(session.connection(), path_ids))
+
+        # Fetch parts via allocation table, one query for all locations rather than one per location
+        parts_by_location: Dict[str, List[PartModel]] = {}
+        for chunk in chunks(location_ids):
+            rows = session.exec(
+                select(PartModel, PartLocationAllocation.location_id)
+                .join(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
+                .where(PartLocationAllocation.location_id.in_(chunk))
+                .options(selectinload(PartModel.allocations))
+            ).all()
+            for part, part_location_id in rows:
+                parts_by_location.setdefault(part_location_id, []).append(part)
+
+        return [part for location in location_ids for part in parts_by_location.get(location, [])]
 
     @staticmethod
     def dynamic_search(session: Session, search_term: str) -> List[PartModel]:
@@ -239,14 +275,11 @@ class PartRepository:
             )
 
     @staticmethod
-    def get_all_parts(session: Session, page: int = 1, page_size: int = 10) -> List[PartModel]:
+    def get_all_parts(
+        session: Session, page: int = 1, page_size: int = 10, options: Optional[list] = None
+    ) -> List[PartModel]:
         offset = (page - 1) * page_size
-        results = session.exec(
-            select(PartModel)
-            .options(joinedload(PartModel.categories), selectinload(PartModel.allocations))
-            .offset(offset)
-            .limit(page_size)
-        )
+        results = session.exec(select(PartModel).options(*_listing_options(options)).offset(offset).limit(page_size))
         return results.unique().all()
 
     @staticmethod
@@ -322,13 +355,16 @@ class PartRepository:
             raise RuntimeError(f"Failed to update part with id '{part.id}': {str(e)}")
 
     @staticmethod
-    def advanced_search(session: Session, search_params: AdvancedPartSearch) -> tuple[List[PartModel], int]:
+    def advanced_search(
+        session: Session, search_params: AdvancedPartSearch, options: Optional[list] = None
+    ) -> tuple[List[PartModel], int]:
         """
         Perform an advanced search on parts with multiple filters and sorting options.
+        `options` replaces the default loader options (see PartProjection.loader_options).
         Returns a tuple of (results, total_count).
         """
         # Start with a base query
-        query = select(PartModel).options(joinedload(PartModel.categories), selectinload(PartModel.allocations))
+        query = select(PartModel).options(*_listing_options(options))
 
         # Start with a base count query
         count_query = select(func.count(PartModel.id.distinct())).select_from(PartModel)
@@ -354,13 +390,13 @@ class PartRepository:
                 query = query.where(search_filter)
                 count_query = count_query.where(search_filter)
 
-        # Apply quantity range filter - TEMPORARILY DISABLED
-        # Quantity is now computed from allocations, filtering requires aggregation
-        # TODO: Re-implement quantity filtering with allocation aggregation
+        # Apply quantity range filter on the denormalized allocation total
         if search_params.min_quantity is not None:
-            logger.warning("Quantity filtering temporarily disabled during allocation migration")
+            query = query.where(PartModel.cached_total_quantity >= search_params.min_quantity)
+            count_query = count_query.where(PartModel.cached_total_quantity >= search_params.min_quantity)
         if search_params.max_quantity is not None:
-            logger.warning("Quantity filtering temporarily disabled during allocation migration")
+            query = query.where(PartModel.cached_total_quantity <= search_params.max_quantity)
+            count_query = count_query.where(PartModel.cached_total_quantity <= search_params.max_quantity)
 
         # Apply category filter
         if search_params.category_names:
@@ -378,6 +414,12 @@ class PartRepository:
                 PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id
             ).where(PartLocationAllocation.location_id == search_params.location_id)
 
+        # Apply typed property filters via the parametric property index
+        for property_filter in search_params.property_filters or []:
+            property_clause = PartPropertyRepository.filter_clause(property_filter)
+            query = query.where(property_clause)
+            count_query = count_query.where(property_clause)
+
         # Apply supplier filter (exact match, case-insensitive)
         if search_params.supplier:
             # Use exact match with lowercase comparison instead of LIKE
@@ -388,21 +430,23 @@ class PartRepository:
 
         # Apply sorting
         if search_params.sort_by:
-            if search_params.sort_by == "quantity":
-                # Sort by total quantity from allocations using a subquery
-                quantity_subquery = (
-                    select(
-                        PartLocationAllocation.part_id,
-                        func.sum(PartLocationAllocation.quantity_at_location).label("total_qty"),
-                    )
-                    .group_by(PartLocationAllocation.part_id)
-                    .subquery()
+            if search_params.sort_by in ("quantity", "location_count"):
+                # Sort by the denormalized allocation totals
+                sort_column = (
+                    PartModel.cached_total_quantity
+                    if search_params.sort_by == "quantity"
+                    else PartModel.cached_location_count
                 )
-                query = query.outerjoin(quantity_subquery, PartModel.id == quantity_subquery.c.part_id)
                 if search_params.sort_order == "desc":
-                    query = query.order_by(quantity_subquery.c.total_qty.desc().nullslast())
+                    query = query.order_by(sort_column.desc(), PartModel.part_name)
                 else:
-                    query = query.order_by(quantity_subquery.c.total_qty.asc().nullslast())
+                    query = query.order_by(sort_column.asc(), PartModel.part_name)
+            elif search_params.sort_by == "popularity":
+                popularity = popularity_score()
+                if search_params.sort_order == "desc":
+                    query = query.order_by(popularity.desc(), PartModel.part_name)
+                else:
+                    query = query.order_by(popularity.asc(), PartModel.part_name)
             elif search_params.sort_by == "location":
                 # Sort by primary location name using a join
                 from MakerMatrix.models.location_models import LocationModel
@@ -469,7 +513,7 @@ class PartRepository:
 
     @staticmethod
     def search_parts_text(
-        session: Session, query: str, page: int = 1, page_size: int = 20
+        session: Session, query: str, page: int = 1, page_size: int = 20, options: Optional[list] = None
     ) -> tuple[List[PartModel], int]:
         """
         Advanced text search with field-specific and exact matching support.
@@ -480,14 +524,17 @@ class PartRepository:
         - pn:100k - Search part number only
         - name:resistor - Search part name only
         - prop:package 0603 - Search additional_properties (supports prop:key value or prop:key=value)
+        - prop:voltage_rating>=25V - Numeric range on the property index (>= or <=, units optional)
         - tag:missing - Find parts with no tags
         - resistor - Search all fields
 
+        `options` replaces the default loader options (see PartProjection.loader_options).
         Returns a tuple of (results, total_count).
         """
         # Parse search query for field-specific search
         field_specific = None
         prop_key = None
+        property_filter = None
         search_query = query.strip()
 
         # Check for tag:missing special syntax
@@ -499,11 +546,7 @@ class PartRepository:
             tagged_part_ids = select(PartTagLink.part_id).distinct()
 
             # Query for parts NOT in tagged_part_ids
-            base_query = (
-                select(PartModel)
-                .options(joinedload(PartModel.categories), selectinload(PartModel.allocations))
-                .where(~PartModel.id.in_(tagged_part_ids))
-            )
+            base_query = select(PartModel).options(*_listing_options(options)).where(~PartModel.id.in_(tagged_part_ids))
 
             count_query = (
                 select(func.count(PartModel.id.distinct()))
@@ -542,8 +585,15 @@ class PartRepository:
                     search_query = search_value
                 elif field_prefix in ["prop", "property", "add", "additional"]:
                     field_specific = "additional_properties"
-                    # Handle both "prop:package 0603" and "prop:package=0603" syntax
-                    if "=" in search_value:
+                    # Handle "prop:voltage_rating>=25V" range syntax via the property index,
+                    # and both "prop:package 0603" and "prop:package=0603" text syntax
+                    comparison = re.match(r"^([^=<>\s]+)\s*(>=|<=)\s*(\S.*)$", search_value)
+                    if comparison:
+                        prop_key, operator, bound = comparison.groups()
+                        bound_field = "min_value" if operator == ">=" else "max_value"
+                        property_filter = PropertyFilter(key=prop_key, **{bound_field: bound.strip()})
+                        search_query = bound.strip()
+                    elif "=" in search_value:
                         key_value = search_value.split("=", 1)
                         prop_key = key_value[0].strip()
                         search_query = key_value[1].strip() if len(key_value) > 1 else ""
@@ -571,7 +621,7 @@ class PartRepository:
         search_term = f"%{search_query}%"
 
         # Base query with eager loading
-        base_query = select(PartModel).options(joinedload(PartModel.categories), selectinload(PartModel.allocations))
+        base_query = select(PartModel).options(*_listing_options(options))
 
         # Count query
         count_query = select(func.count(PartModel.id.distinct())).select_from(PartModel)
@@ -579,7 +629,9 @@ class PartRepository:
         # Apply search filter based on field-specific or all fields
         if field_specific:
             # Field-specific search
-            if field_specific == "additional_properties" and prop_key:
+            if property_filter is not None:
+                search_filter = PartPropertyRepository.filter_clause(property_filter)
+            elif field_specific == "additional_properties" and prop_key:
                 # Search within JSON field for specific key
                 # SQLite JSON syntax: json_extract(additional_properties, '$.key')
                 from sqlalchemy import cast, String, JSON
@@ -624,9 +676,11 @@ class PartRepository:
         comparison_query = search_query if is_exact_match else query
         query_with_filter = query_with_filter.order_by(
             # Exact part name matches first
-            func.lower(PartModel.part_name) == comparison_query.lower(),
+            (func.lower(PartModel.part_name) == comparison_query.lower()).desc(),
             # Exact part number matches second
-            func.lower(PartModel.part_number) == comparison_query.lower(),
+            (func.lower(PartModel.part_number) == comparison_query.lower()).desc(),
+            # Then the most viewed and most often found parts
+            popularity_score().desc(),
             # Then by part name alphabetically
             PartModel.part_name,
         )
@@ -645,7 +699,8 @@ class PartRepository:
     def get_part_suggestions(session: Session, query: str, limit: int = 10) -> List[str]:
         """
         Get autocomplete suggestions for part names based on search query.
-        Returns part names that start with or contain the query.
+        Returns part names that start with or contain the query, popular parts first
+        within each group.
         """
         search_term = f"%{query}%"
 
@@ -654,10 +709,11 @@ class PartRepository:
         suggestions_query = (
             select(PartModel.part_name)
             .where(PartModel.part_name.ilike(search_term))
-            .distinct()
+            .group_by(PartModel.part_name)
             .order_by(
                 # Names starting with query come first
                 ~PartModel.part_name.ilike(f"{query}%"),
+                func.max(popularity_score()).desc(),
                 PartModel.part_name,
             )
             .limit(limit)
@@ -669,6 +725,23 @@ class PartRepository:
         # Filter out None values and return as list
         return [name for name in suggestions if name is not None]
 
+    @staticmethod
+    def get_most_viewed_parts(session: Session, limit: int = 10) -> List[tuple[PartModel, PartSystemMetadata]]:
+        """Parts with the most detail views, with their usage metadata"""
+        query = (
+            select(PartModel, PartSystemMetadata)
+            .join(PartSystemMetadata, PartSystemMetadata.part_id == PartModel.id)
+            .where(PartSystemMetadata.view_count > 0)
+            .options(selectinload(PartModel.categories), selectinload(PartModel.allocations))
+            .order_by(
+                PartSystemMetadata.view_count.desc(),
+                PartSystemMetadata.last_accessed.desc(),
+                PartModel.part_name,
+            )
+            .limit(limit)
+        )
+        return list(session.exec(query).all())
+
     # def add_part(self, part_data: dict, overwrite: bool) -> dict:
     #     # Check if a part with the same part_number or part_name already exists
     #     part_id = part_data.get('part_id')
@@ -851,6 +924,10 @@ class PartRepository:
             result = session.exec(text("DELETE FROM activitylogmodel WHERE entity_type = 'part'"))
             deleted_records["activity_logs"] = result.rowcount
 
+            # Delete the parametric property index
+            result = session.exec(text("DELETE FROM part_property_index"))
+            deleted_records["part_properties"] = result.rowcount
+
             # Finally, delete all parts
             session.exec(delete(PartModel))
 
@@ -859,6 +936,11 @@ class PartRepository:
 
             session.commit()
 
+            # Raw deletes bypass the flush hooks that maintain the dashboard aggregates
+            from MakerMatrix.repositories.inventory_aggregate_repository import set_stale
+
+            set_stale(True)
+
             # Verify deletion
             count_after = session.exec(select(func.count()).select_from(PartModel)).one()
 
@@ -919,3 +1001,100 @@ class PartRepository:
         # Execute query
         parts = session.exec(query).all()
         return list(parts)
+
+    # === SET-BASED BULK OPERATIONS ===
+
+    @staticmethod
+    def get_existing_part_ids(session: Session, part_ids: List[str]) -> set[str]:
+        """Return the subset of part_ids that exist, using one IN query per chunk."""
+        existing = set()
+        for chunk in chunks(part_ids):
+            existing.update(session.exec(select(PartModel.id).where(PartModel.id.in_(chunk))).all())
+        return existing
+
+    @staticmethod
+    def bulk_update_fields(session: Session, part_ids: List[str], values: Dict[str, Any]) -> int:
+        """Apply the same column values to every part in part_ids with UPDATE ... WHERE id IN (...)."""
+        updated = 0
+        for chunk in chunks(part_ids):
+            result = session.exec(update(PartModel).where(PartModel.id.in_(chunk)).values(**values))
+            updated += result.rowcount
+        return updated
+
+    @staticmethod
+    def bulk_add_categories(session: Session, part_ids: List[str], category_ids: List[str]) -> int:
+        """Link every part to every category, ignoring links that already exist."""
+        rows = [
+            {"part_id": part_id, "category_id": category_id} for part_id in part_ids for category_id in category_ids
+        ]
+        inserted = 0
+        for chunk in chunks(rows):
+            result = session.exec(sqlite_insert(PartCategoryLink.__table__).prefix_with("OR IGNORE"), params=chunk)
+            inserted += max(result.rowcount, 0)
+        return inserted
+
+    @staticmethod
+    def bulk_remove_categories(session: Session, part_ids: List[str], category_ids: List[str]) -> int:
+        """Remove links between any of part_ids and any of category_ids."""
+        if not category_ids:
+            return 0
+        removed = 0
+        for chunk in chunks(part_ids):
+            result = session.exec(
+                delete(PartCategoryLink).where(
+                    PartCategoryLink.part_id.in_(chunk), PartCategoryLink.category_id.in_(category_ids)
+                )
+            )
+            removed += result.rowcount
+        return removed
+
+    @staticmethod
+    def get_primary_allocations(session: Session, part_ids: List[str]) -> Dict[str, tuple[str, str]]:
+        """
+        Map each part id to (allocation_id, location_id) of its primary allocation, one query per chunk.
+
+        Falls back to the oldest allocation for parts that have none flagged as primary storage.
+        """
+        primary: Dict[str, tuple[str, str]] = {}
+        for chunk in chunks(part_ids):
+            rows = session.exec(
+                select(PartLocationAllocation.part_id, PartLocationAllocation.id, PartLocationAllocation.location_id)
+                .where(PartLocationAllocation.part_id.in_(chunk))
+                .order_by(
+                    PartLocationAllocation.part_id,
+                    PartLocationAllocation.is_primary_storage.desc(),
+                    PartLocationAllocation.allocated_at,
+                )
+            ).all()
+            for part_id, allocation_id, location_id in rows:
+                primary.setdefault(part_id, (allocation_id, location_id))
+        return primary
+
+    @staticmethod
+    def get_part_ids_allocated_at(session: Session, part_ids: List[str], location_id: str) -> set[str]:
+        """Return the subset of part_ids that already have an allocation at location_id."""
+        allocated = set()
+        for chunk in chunks(part_ids):
+            allocated.update(
+                session.exec(
+                    select(PartLocationAllocation.part_id).where(
+                        PartLocationAllocation.part_id.in_(chunk), PartLocationAllocation.location_id == location_id
+                    )
+                ).all()
+            )
+        return allocated
+
+    @staticmethod
+    def bulk_move_allocations(session: Session, allocation_ids: List[str], location_id: str) -> int:
+        """Point the given allocations at a new location with one UPDATE per chunk."""
+        from datetime import datetime
+
+        moved = 0
+        for chunk in chunks(allocation_ids):
+            result = session.exec(
+                update(PartLocationAllocation)
+                .where(PartLocationAllocation.id.in_(chunk))
+                .values(location_id=location_id, last_updated=datetime.utcnow())
+            )
+            moved += result.rowcount
+        return moved
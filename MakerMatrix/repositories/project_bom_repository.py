@@ -0,0 +1,179 @@
+"""
+Project BOM Repository
+
+Set-based bill-of-materials queries over part_project_link. Stock comes from the denormalized
+PartModel.cached_total_quantity column and prices from the current PartPricingHistory rows, so
+the availability of any number of projects is one aggregate query instead of a walk over every
+part and allocation in Python.
+
+Prices: the cheapest current unit price across suppliers is used for each part. Lines without a
+current price are counted as unpriced and left out of the cost totals.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Float, and_, case, cast, func, select
+from sqlalchemy.engine import Connection
+
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_metadata_models import PartPricingHistory
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.project_models import PartProjectLink, ProjectModel
+from MakerMatrix.utils.batching import chunks
+
+_links = PartProjectLink.__table__
+_parts = PartModel.__table__
+_projects = ProjectModel.__table__
+_pricing = PartPricingHistory.__table__
+_allocations = PartLocationAllocation.__table__
+_locations = LocationModel.__table__
+
+
+def _current_prices():
+    """Cheapest current unit price per part, with the supplier and currency of that price"""
+    unit_price = cast(_pricing.c.unit_price, Float)
+    # SQLite returns the other bare columns from the row that holds the MIN()
+    return (
+        select(
+            _pricing.c.part_id,
+            func.min(unit_price).label("unit_price"),
+            _pricing.c.supplier,
+            _pricing.c.currency,
+        )
+        .where(_pricing.c.is_current.is_(True), _pricing.c.unit_price.isnot(None))
+        .group_by(_pricing.c.part_id)
+        .subquery("current_price")
+    )
+
+
+def _bom_lines(project_ids: List[str], build_quantity: int):
+    """One row per BOM line with the stock, requirement and shortage for `build_quantity` units"""
+    price = _current_prices()
+    on_hand = _parts.c.cached_total_quantity
+    required = _links.c.quantity_required * build_quantity
+    shortage = case((on_hand < required, required - on_hand), else_=0)
+    return (
+        select(
+            _links.c.project_id,
+            _links.c.part_id,
+            _links.c.quantity_required,
+            _links.c.notes,
+            _parts.c.part_name,
+            _parts.c.part_number,
+            _parts.c.manufacturer_part_number,
+            on_hand.label("on_hand"),
+            required.label("required"),
+            shortage.label("shortage"),
+            # Units of the project this line alone could supply
+            (on_hand // _links.c.quantity_required).label("buildable"),
+            price.c.unit_price,
+            price.c.supplier.label("price_supplier"),
+            price.c.currency,
+            (shortage * price.c.unit_price).label("shortage_cost"),
+        )
+        .select_from(
+            _links.join(_parts, _parts.c.id == _links.c.part_id).outerjoin(price, price.c.part_id == _links.c.part_id)
+        )
+        .where(_links.c.project_id.in_(project_ids))
+        .subquery("bom_lines")
+    )
+
+
+class ProjectBomRepository:
+    """Read-only BOM availability queries"""
+
+    @staticmethod
+    def get_summaries(conn: Connection, project_ids: List[str], build_quantity: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Availability summary of each project, one aggregate query per chunk of projects.
+
+        Projects without BOM lines are included with zero lines and no buildable count.
+        """
+        summaries: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunks(project_ids):
+            lines = _bom_lines(chunk, build_quantity)
+            short = lines.c.shortage > 0
+            stmt = (
+                select(
+                    _projects.c.id,
+                    _projects.c.name,
+                    _projects.c.status,
+                    func.count(lines.c.part_id).label("line_count"),
+                    func.min(lines.c.buildable).label("buildable"),
+                    func.coalesce(func.sum(case((short, 1), else_=0)), 0).label("short_lines"),
+                    func.coalesce(func.sum(lines.c.shortage), 0).label("shortage_units"),
+                    func.coalesce(func.sum(lines.c.shortage_cost), 0.0).label("shortfall_cost"),
+                    func.coalesce(func.sum(case((and_(short, lines.c.unit_price.is_(None)), 1), else_=0)), 0).label(
+                        "unpriced_short_lines"
+                    ),
+                    func.coalesce(func.sum(lines.c.quantity_required * lines.c.unit_price), 0.0).label("unit_cost"),
+                    func.coalesce(func.sum(case((lines.c.unit_price.is_(None), 1), else_=0)), 0).label(
+                        "unpriced_lines"
+                    ),
+                )
+                .select_from(_projects.outerjoin(lines, lines.c.project_id == _projects.c.id))
+                .where(_projects.c.id.in_(chunk))
+                .group_by(_projects.c.id)
+            )
+            for row in conn.execute(stmt):
+                summary = dict(row._mapping)
+                project_id = summary.pop("id")
+                summary["project_id"] = project_id
+                summary["project_name"] = summary.pop("name")
+                summary["build_quantity"] = build_quantity
+                summary["can_build"] = summary["line_count"] > 0 and summary["short_lines"] == 0
+                summary["shortfall_cost"] = round(summary["shortfall_cost"], 4)
+                summary["unit_cost"] = round(summary["unit_cost"], 4)
+                summaries[project_id] = summary
+        return summaries
+
+    @staticmethod
+    def get_lines(conn: Connection, project_id: str, build_quantity: int = 1) -> List[Dict[str, Any]]:
+        """BOM lines of one project, shortest first"""
+        lines = _bom_lines([project_id], build_quantity)
+        stmt = select(lines).order_by(lines.c.shortage.desc(), lines.c.part_name)
+        return [dict(row._mapping) for row in conn.execute(stmt)]
+
+    @staticmethod
+    def get_sources(conn: Connection, part_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Where the stock of each part is, largest allocation first"""
+        sources: Dict[str, List[Dict[str, Any]]] = {part_id: [] for part_id in part_ids}
+        for chunk in chunks(part_ids):
+            stmt = (
+                select(
+                    _allocations.c.part_id,
+                    _allocations.c.location_id,
+                    _locations.c.name.label("location_name"),
+                    _locations.c.path_names,
+                    _allocations.c.quantity_at_location.label("quantity"),
+                    _allocations.c.is_primary_storage,
+                )
+                .select_from(_allocations.join(_locations, _locations.c.id == _allocations.c.location_id))
+                .where(_allocations.c.part_id.in_(chunk), _allocations.c.quantity_at_location > 0)
+                .order_by(_allocations.c.part_id, _allocations.c.quantity_at_location.desc())
+            )
+            for row in conn.execute(stmt):
+                source = dict(row._mapping)
+                part_id = source.pop("part_id")
+                path_names = source.pop("path_names")
+                source["location_path"] = " > ".join(path_names) if path_names else source["location_name"]
+                sources[part_id].append(source)
+        return sources
+
+    @staticmethod
+    def get_project_ids(conn: Connection, status: Optional[str] = None) -> List[str]:
+        stmt = select(_projects.c.id).order_by(_projects.c.name)
+        if status:
+            stmt = stmt.where(_projects.c.status == status)
+        return list(conn.execute(stmt).scalars())
+
+    @staticmethod
+    def get_project_ids_for_parts(conn: Connection, part_ids: Iterable[str]) -> List[str]:
+        """Projects with a BOM line for any of the given parts"""
+        project_ids = set()
+        for chunk in chunks(part_ids):
+            project_ids.update(
+                conn.execute(select(_links.c.project_id).where(_links.c.part_id.in_(chunk)).distinct()).scalars()
+            )
+        return list(project_ids)
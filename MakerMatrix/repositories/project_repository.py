@@ -221,7 +221,11 @@ class ProjectRepository:
 
     @staticmethod
     def associate_part_with_project(
-        session: Session, part_id: str, project_id: str, notes: Optional[str] = None
+        session: Session,
+        part_id: str,
+        project_id: str,
+        notes: Optional[str] = None,
+        quantity_required: Optional[int] = None,
     ) -> bool:
         """
         Associate a part with a project.
@@ -231,6 +235,7 @@ class ProjectRepository:
             part_id: The ID of the part to associate
             project_id: The ID of the project to associate with
             notes: Optional notes about this part's use in the project
+            quantity_required: Optional units needed per build (defaults to 1 for new links)
 
         Returns:
             bool: True if association was successful, False otherwise
@@ -257,14 +262,19 @@ class ProjectRepository:
 
             if existing_link:
                 logger.debug(f"[REPO] Part {part_id} already associated with project {project_id}")
-                # Update notes if provided
+                # Update notes and required quantity if provided
                 if notes is not None:
                     existing_link.notes = notes
+                if quantity_required is not None:
+                    existing_link.quantity_required = quantity_required
+                if notes is not None or quantity_required is not None:
                     session.commit()
                 return True
 
             # Create new association
-            link = PartProjectLink(part_id=part_id, project_id=project_id, notes=notes)
+            link = PartProjectLink(
+                part_id=part_id, project_id=project_id, notes=notes, quantity_required=quantity_required or 1
+            )
             session.add(link)
             session.commit()
 
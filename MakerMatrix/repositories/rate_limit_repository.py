@@ -8,14 +8,18 @@ Handles supplier API rate limit tracking and enforcement.
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta, timezone
-from sqlmodel import Session, select, func, and_, or_, delete
+from sqlmodel import Session, select, delete
 
 from MakerMatrix.models.rate_limiting_models import (
     SupplierUsageTrackingModel,
     SupplierRateLimitModel,
-    SupplierUsageSummaryModel,
 )
 from MakerMatrix.repositories.base_repository import BaseRepository
+from MakerMatrix.repositories.supplier_usage_bucket_repository import (
+    SupplierUsageBucketRepository,
+    latency_percentiles,
+    merge_aggregates,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +82,9 @@ class RateLimitRepository(BaseRepository[SupplierRateLimitModel]):
         """
         Get usage counts for different time windows.
 
+        Counts come from the usage buckets up to the rollup watermark and the raw
+        tracking rows after it, all windows in one query per table.
+
         Args:
             session: Database session
             supplier_name: Supplier name
@@ -86,20 +93,10 @@ class RateLimitRepository(BaseRepository[SupplierRateLimitModel]):
         Returns:
             Dictionary mapping window types to usage counts
         """
-        usage_counts = {}
-
-        for start_time, window_type in time_windows:
-            count = session.exec(
-                select(func.count(SupplierUsageTrackingModel.id)).where(
-                    and_(
-                        SupplierUsageTrackingModel.supplier_name == supplier_name,
-                        SupplierUsageTrackingModel.request_timestamp >= start_time,
-                    )
-                )
-            ).first()
-            usage_counts[window_type] = count or 0
-
-        return usage_counts
+        starts = {window_type: _naive_utc(start_time) for start_time, window_type in time_windows}
+        return SupplierUsageBucketRepository.window_counts(
+            session.connection(), supplier_name, starts, datetime.utcnow()
+        )
 
     def record_request(
         self,
@@ -162,32 +159,26 @@ class RateLimitRepository(BaseRepository[SupplierRateLimitModel]):
             end_time: End of time range
 
         Returns:
-            Dictionary containing usage summary
+            Dictionary containing usage summary; response times are in milliseconds
         """
-        # Get usage records
-        usage_records = session.exec(
-            select(SupplierUsageTrackingModel).where(
-                and_(
-                    SupplierUsageTrackingModel.supplier_name == supplier_name,
-                    SupplierUsageTrackingModel.request_timestamp >= start_time,
-                    SupplierUsageTrackingModel.request_timestamp <= end_time,
-                )
-            )
-        ).all()
+        per_endpoint = SupplierUsageBucketRepository.summary(
+            session.connection(), supplier_name, _naive_utc(start_time), _naive_utc(end_time), datetime.utcnow()
+        )
 
         # Calculate summary statistics
-        total_requests = len(usage_records)
-        successful_requests = sum(1 for r in usage_records if r.success)
-        failed_requests = total_requests - successful_requests
+        totals = None
+        for aggregates in per_endpoint.values():
+            totals = merge_aggregates(totals, aggregates)
+
+        total_requests = totals["total_requests"] if totals else 0
+        successful_requests = totals["successful_requests"] if totals else 0
+        failed_requests = totals["failed_requests"] if totals else 0
 
-        response_times = [r.response_time_ms for r in usage_records if r.response_time_ms is not None]
-        avg_response_time = sum(response_times) / len(response_times) if response_times else None
+        avg_response_time = None
+        if totals and totals["response_time_count"]:
+            avg_response_time = totals["response_time_total_ms"] / totals["response_time_count"]
 
-        # Group by endpoint type
-        endpoint_counts = {}
-        for record in usage_records:
-            endpoint_type = record.endpoint_type or "general"
-            endpoint_counts[endpoint_type] = endpoint_counts.get(endpoint_type, 0) + 1
+        endpoint_counts = {endpoint: aggregates["total_requests"] for endpoint, aggregates in per_endpoint.items()}
 
         return {
             "supplier_name": supplier_name,
@@ -197,6 +188,7 @@ class RateLimitRepository(BaseRepository[SupplierRateLimitModel]):
             "failed_requests": failed_requests,
             "success_rate": successful_requests / total_requests if total_requests > 0 else 0,
             "avg_response_time": avg_response_time,
+            "response_time_percentiles": latency_percentiles(totals) if totals else {},
             "endpoint_breakdown": endpoint_counts,
         }
 
@@ -269,3 +261,10 @@ class RateLimitRepository(BaseRepository[SupplierRateLimitModel]):
         session.refresh(rate_limit)
 
         return rate_limit
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Usage timestamps are stored as naive UTC"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
@@ -0,0 +1,414 @@
+"""
+Supplier Usage Bucket Repository
+
+Queries over supplier_usage_buckets, the minute/hour/day rollups of supplier_usage_tracking.
+
+Raw rows before the rollup watermark (supplier_usage_rollup_state.rolled_up_until) have been
+folded into the buckets; rows after it have not. A window [start, now] is therefore answered
+from the buckets up to the watermark plus the raw rows after it. Up to the watermark the window
+is split into the coarsest buckets that fit, with raw rows filling the partial minute at its
+start. Once raw rows and finer buckets have been pruned a window start is rounded down to the
+finest bucket still kept, so old windows are approximate at that bucket's granularity.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, false, func, literal_column, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from MakerMatrix.models.rate_limiting_models import (
+    SupplierUsageBucketModel,
+    SupplierUsageRollupStateModel,
+    SupplierUsageTrackingModel,
+)
+
+RAW_RETENTION_HOURS = int(os.getenv("SUPPLIER_USAGE_RAW_RETENTION_HOURS", "48"))
+MINUTE_RETENTION_DAYS = int(os.getenv("SUPPLIER_USAGE_MINUTE_RETENTION_DAYS", "7"))
+HOUR_RETENTION_DAYS = int(os.getenv("SUPPLIER_USAGE_HOUR_RETENTION_DAYS", "90"))
+DAY_RETENTION_DAYS = int(os.getenv("SUPPLIER_USAGE_DAY_RETENTION_DAYS", "730"))
+
+# Coarsest first
+RESOLUTIONS = {"day": timedelta(days=1), "hour": timedelta(hours=1), "minute": timedelta(minutes=1)}
+RAW = "raw"
+
+# Upper bounds (ms) of the response time histogram; the last bucket is everything above
+LATENCY_BOUNDS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+LATENCY_COLUMNS = tuple(f"latency_le_{bound}ms" for bound in LATENCY_BOUNDS_MS) + ("latency_over_10000ms",)
+
+# Raw rows folded per transaction
+FOLD_CHUNK = timedelta(days=1)
+PRUNE_BATCH_SIZE = 2000
+
+STATE_ID = "supplier_usage"
+
+_raw = SupplierUsageTrackingModel.__table__
+_buckets = SupplierUsageBucketModel.__table__
+_state = SupplierUsageRollupStateModel.__table__
+_rowid = literal_column("rowid")
+
+Segment = Tuple[str, datetime, datetime]  # (resolution or "raw", start, end)
+
+
+def floor_to(moment: datetime, resolution: str) -> datetime:
+    """Start of the bucket of `resolution` containing `moment`"""
+    if resolution == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+def ceil_to(moment: datetime, resolution: str) -> datetime:
+    start = floor_to(moment, resolution)
+    return start if start == moment else start + RESOLUTIONS[resolution]
+
+
+def retention_cutoffs(now: datetime) -> Dict[str, datetime]:
+    """
+    Oldest time still kept for raw rows and each bucket resolution (naive UTC). A coarser
+    resolution is never kept for less time than a finer one.
+    """
+    raw = now - timedelta(hours=RAW_RETENTION_HOURS)
+    minute = min(now - timedelta(days=MINUTE_RETENTION_DAYS), raw)
+    hour = min(now - timedelta(days=HOUR_RETENTION_DAYS), minute)
+    day = min(now - timedelta(days=DAY_RETENTION_DAYS), hour)
+    return {RAW: raw, "minute": minute, "hour": hour, "day": day}
+
+
+def plan_window(start: datetime, stop: datetime, watermark: datetime, cutoffs: Dict[str, datetime]) -> List[Segment]:
+    """
+    Split [start, stop) into bucket and raw segments; `stop` is at most the watermark.
+
+    A bucket is used whole when it starts inside the window and ends by `stop`, or when `stop`
+    is the watermark (buckets only hold rows before it). Raw rows fill up to the next minute
+    boundary while they are kept; after that the window is rounded down to a kept bucket.
+    """
+    segments: List[Segment] = []
+    p = start
+    while p < stop:
+        segment = None
+        for resolution, size in RESOLUTIONS.items():
+            if floor_to(p, resolution) == p and p >= cutoffs[resolution] and (p + size <= stop or stop == watermark):
+                segment = (resolution, p, min(p + size, stop))
+                break
+        if segment is None and p >= cutoffs[RAW]:
+            segment = (RAW, p, min(floor_to(p, "minute") + RESOLUTIONS["minute"], stop))
+        if segment is None:
+            for resolution in reversed(list(RESOLUTIONS)):
+                bucket_start = floor_to(p, resolution)
+                if bucket_start >= cutoffs[resolution]:
+                    segment = (resolution, bucket_start, min(bucket_start + RESOLUTIONS[resolution], watermark))
+                    break
+        if segment is None:
+            # Nothing kept this far back; skip to the oldest data that still exists
+            p = min([cutoffs[RAW]] + [ceil_to(cutoffs[resolution], resolution) for resolution in RESOLUTIONS])
+            continue
+
+        kind, segment_start, segment_end = segment
+        if segments and segments[-1][0] == kind and segments[-1][2] == segment_start:
+            segments[-1] = (kind, segments[-1][1], segment_end)
+        else:
+            segments.append(segment)
+        p = max(segment_end, p)
+        if segment_end >= watermark:
+            break
+    return segments
+
+
+def _covers(segments: List[Segment], tail: Optional[Tuple[datetime, Optional[datetime]]], table):
+    """Condition selecting the rows of `table` (buckets or raw) inside the planned segments"""
+    conditions = []
+    if table is _buckets:
+        for kind, start, end in segments:
+            if kind != RAW:
+                conditions.append(
+                    and_(_buckets.c.resolution == kind, _buckets.c.bucket_start >= start, _buckets.c.bucket_start < end)
+                )
+    else:
+        timestamp = _raw.c.request_timestamp
+        conditions.extend(and_(timestamp >= start, timestamp < end) for kind, start, end in segments if kind == RAW)
+        if tail is not None:
+            tail_start, tail_end = tail
+            conditions.append(
+                timestamp >= tail_start if tail_end is None else and_(timestamp >= tail_start, timestamp <= tail_end)
+            )
+    return or_(*conditions) if conditions else false()
+
+
+def plan_counts(start: datetime, end: Optional[datetime], watermark: Optional[datetime], now: datetime):
+    """Bucket segments of [start, end] up to the watermark and the raw tail after it"""
+    if watermark is None or start >= watermark:
+        return [], (start, end)
+    stop = watermark if end is None else min(end, watermark)
+    segments = plan_window(start, stop, watermark, retention_cutoffs(now))
+    if end is not None and end < watermark:
+        return segments, None
+    return segments, (watermark, end)
+
+
+def window_count_queries(supplier_name: str, starts: Dict[str, datetime], plans: Dict[str, Any], now: datetime):
+    """
+    The bucket query (None when no bucket is planned) and the raw query counting the
+    requests since each start, one column per key of `plans`.
+    """
+    bucket_sums = [
+        func.coalesce(func.sum(case((_covers(segments, None, _buckets), _buckets.c.total_requests), else_=0)), 0)
+        for segments, _ in plans.values()
+    ]
+    raw_sums = [
+        func.coalesce(func.sum(case((_covers(segments, tail, _raw), 1), else_=0)), 0)
+        for segments, tail in plans.values()
+    ]
+    # Bounds on the indexed time columns so neither query reads all the rows of the supplier;
+    # no planned segment starts before them
+    raw_from = min(starts.values(), default=now)
+    bucket_segments = [(kind, start) for segments, _ in plans.values() for kind, start, _ in segments if kind != RAW]
+    bucket_query = None
+    if bucket_segments:
+        bucket_query = select(*bucket_sums).where(
+            _buckets.c.supplier_name == supplier_name,
+            _buckets.c.resolution.in_(sorted({kind for kind, _ in bucket_segments})),
+            _buckets.c.bucket_start >= min(start for _, start in bucket_segments),
+        )
+    raw_query = select(*raw_sums).where(_raw.c.supplier_name == supplier_name, _raw.c.request_timestamp >= raw_from)
+    return bucket_query, raw_query
+
+
+def _raw_aggregates() -> List[Any]:
+    response_time = _raw.c.response_time_ms
+    columns = [
+        func.count().label("total_requests"),
+        func.coalesce(func.sum(case((_raw.c.success, 1), else_=0)), 0).label("successful_requests"),
+        func.coalesce(func.sum(case((_raw.c.success, 0), else_=1)), 0).label("failed_requests"),
+        func.coalesce(func.sum(response_time), 0).label("response_time_total_ms"),
+        func.count(response_time).label("response_time_count"),
+        func.max(response_time).label("max_response_time_ms"),
+    ]
+    lower = None
+    for bound, column in zip(LATENCY_BOUNDS_MS, LATENCY_COLUMNS):
+        in_bin = response_time <= bound if lower is None else and_(response_time > lower, response_time <= bound)
+        columns.append(func.coalesce(func.sum(case((in_bin, 1), else_=0)), 0).label(column))
+        lower = bound
+    columns.append(func.coalesce(func.sum(case((response_time > lower, 1), else_=0)), 0).label(LATENCY_COLUMNS[-1]))
+    return columns
+
+
+def _bucket_aggregates() -> List[Any]:
+    summed = ("total_requests", "successful_requests", "failed_requests", "response_time_total_ms")
+    columns = [func.coalesce(func.sum(_buckets.c[name]), 0).label(name) for name in summed]
+    columns.append(func.coalesce(func.sum(_buckets.c.response_time_count), 0).label("response_time_count"))
+    columns.append(func.max(_buckets.c.max_response_time_ms).label("max_response_time_ms"))
+    columns.extend(func.coalesce(func.sum(_buckets.c[name]), 0).label(name) for name in LATENCY_COLUMNS)
+    return columns
+
+
+def merge_aggregates(current: Optional[Dict[str, Any]], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Add two sets of usage aggregates (maximum response times take the larger)"""
+    if current is None:
+        return dict(delta)
+    merged = {key: current[key] + delta[key] for key in current if key != "max_response_time_ms"}
+    maxima = [m for m in (current["max_response_time_ms"], delta["max_response_time_ms"]) if m is not None]
+    merged["max_response_time_ms"] = max(maxima) if maxima else None
+    return merged
+
+
+def latency_percentiles(aggregates: Dict[str, Any], quantiles=(0.5, 0.95, 0.99)) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 (ms) interpolated within the histogram bins, capped at the slowest request"""
+    counts = [aggregates[column] for column in LATENCY_COLUMNS]
+    total = sum(counts)
+    maximum = aggregates["max_response_time_ms"]
+    result: Dict[str, Optional[float]] = {}
+    for quantile in quantiles:
+        key = f"p{round(quantile * 100)}"
+        if not total:
+            result[key] = None
+            continue
+        rank = quantile * total
+        seen = 0
+        lower = 0
+        for index, count in enumerate(counts):
+            upper = LATENCY_BOUNDS_MS[index] if index < len(LATENCY_BOUNDS_MS) else maximum
+            if maximum is not None:
+                upper = min(upper, maximum)
+            if count and seen + count >= rank:
+                result[key] = round(lower + (max(upper, lower) - lower) * (rank - seen) / count, 1)
+                break
+            seen += count
+            if index < len(LATENCY_BOUNDS_MS):
+                lower = LATENCY_BOUNDS_MS[index]
+    return result
+
+
+class SupplierUsageBucketRepository:
+    """Repository for the supplier usage rollups"""
+
+    @staticmethod
+    def watermark(conn: Connection) -> Optional[datetime]:
+        return conn.execute(select(_state.c.rolled_up_until).where(_state.c.id == STATE_ID)).scalar()
+
+    @staticmethod
+    def _plan(conn: Connection, start: datetime, end: Optional[datetime], now: datetime):
+        """Bucket segments up to the watermark and the raw tail after it"""
+        return plan_counts(start, end, SupplierUsageBucketRepository.watermark(conn), now)
+
+    @staticmethod
+    def window_counts(
+        conn: Connection, supplier_name: str, starts: Dict[str, datetime], now: datetime
+    ) -> Dict[str, int]:
+        """Requests since each start time, keyed like `starts`; at most one bucket and one raw query"""
+        plans = {key: SupplierUsageBucketRepository._plan(conn, start, None, now) for key, start in starts.items()}
+        bucket_query, raw_query = window_count_queries(supplier_name, starts, plans, now)
+        from_buckets = [0] * len(plans) if bucket_query is None else conn.execute(bucket_query).one()
+        from_raw = conn.execute(raw_query).one()
+        return {key: from_buckets[i] + from_raw[i] for i, key in enumerate(plans)}
+
+    @staticmethod
+    def summary(
+        conn: Connection, supplier_name: str, start: datetime, end: datetime, now: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """Aggregates per endpoint type for requests in [start, end]"""
+        segments, tail = SupplierUsageBucketRepository._plan(conn, start, end, now)
+        per_endpoint: Dict[str, Dict[str, Any]] = {}
+
+        queries = []
+        if segments:
+            queries.append(
+                select(_buckets.c.endpoint_type, *_bucket_aggregates())
+                .where(_buckets.c.supplier_name == supplier_name, _covers(segments, None, _buckets))
+                .group_by(_buckets.c.endpoint_type)
+            )
+        queries.append(
+            select(_raw.c.endpoint_type, *_raw_aggregates())
+            .where(_raw.c.supplier_name == supplier_name, _covers(segments, tail, _raw))
+            .group_by(_raw.c.endpoint_type)
+        )
+        for query in queries:
+            for row in conn.execute(query).mappings():
+                values = dict(row)
+                endpoint_type = values.pop("endpoint_type") or "general"
+                per_endpoint[endpoint_type] = merge_aggregates(per_endpoint.get(endpoint_type), values)
+        return per_endpoint
+
+    # === Rollup ===
+
+    @staticmethod
+    def fold(conn: Connection, until: datetime) -> Tuple[int, datetime]:
+        """
+        Fold the raw rows after the watermark into the buckets, at most FOLD_CHUNK of them and
+        none at or after `until` (a minute boundary), and advance the watermark past them.
+        Returns the raw rows folded and the new watermark. Runs in the caller's transaction,
+        so the buckets and the watermark change together.
+        """
+        watermark = SupplierUsageBucketRepository.watermark(conn)
+        if watermark is None:
+            first = conn.execute(select(func.min(_raw.c.request_timestamp))).scalar()
+            watermark = until if first is None else min(floor_to(_as_datetime(first), "minute"), until)
+        if watermark >= until:
+            SupplierUsageBucketRepository._set_watermark(conn, watermark)
+            return 0, watermark
+        until = min(until, watermark + FOLD_CHUNK)
+
+        minute = func.strftime("%Y-%m-%d %H:%M:00", _raw.c.request_timestamp).label("minute")
+        rows = conn.execute(
+            select(_raw.c.supplier_name, _raw.c.endpoint_type, minute, *_raw_aggregates())
+            .where(_raw.c.request_timestamp >= watermark, _raw.c.request_timestamp < until)
+            .group_by(_raw.c.supplier_name, _raw.c.endpoint_type, minute)
+        ).mappings()
+
+        deltas: Dict[Tuple[str, str, datetime, str], Dict[str, Any]] = {}
+        folded = 0
+        for row in rows:
+            values = dict(row)
+            supplier_name = values.pop("supplier_name")
+            endpoint_type = values.pop("endpoint_type") or "general"
+            minute_start = datetime.strptime(values.pop("minute"), "%Y-%m-%d %H:%M:%S")
+            folded += values["total_requests"]
+            for resolution in RESOLUTIONS:
+                key = (supplier_name, resolution, floor_to(minute_start, resolution), endpoint_type)
+                deltas[key] = merge_aggregates(deltas.get(key), values)
+
+        if deltas:
+            stmt = sqlite_insert(_buckets)
+            added = ("total_requests", "successful_requests", "failed_requests", "response_time_total_ms")
+            set_ = {name: _buckets.c[name] + stmt.excluded[name] for name in added + ("response_time_count",)}
+            set_.update({name: _buckets.c[name] + stmt.excluded[name] for name in LATENCY_COLUMNS})
+            set_["max_response_time_ms"] = func.max(
+                func.coalesce(_buckets.c.max_response_time_ms, stmt.excluded.max_response_time_ms),
+                func.coalesce(stmt.excluded.max_response_time_ms, _buckets.c.max_response_time_ms),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    _buckets.c.supplier_name,
+                    _buckets.c.resolution,
+                    _buckets.c.bucket_start,
+                    _buckets.c.endpoint_type,
+                ],
+                set_=set_,
+            )
+            conn.execute(
+                stmt,
+                [
+                    {
+                        "id": _bucket_id(supplier_name, resolution, bucket_start, endpoint_type),
+                        "supplier_name": supplier_name,
+                        "resolution": resolution,
+                        "bucket_start": bucket_start,
+                        "endpoint_type": endpoint_type,
+                        **values,
+                    }
+                    for (supplier_name, resolution, bucket_start, endpoint_type), values in deltas.items()
+                ],
+            )
+
+        SupplierUsageBucketRepository._set_watermark(conn, until)
+        return folded, until
+
+    @staticmethod
+    def _set_watermark(conn: Connection, until: datetime) -> None:
+        stmt = sqlite_insert(_state).values(id=STATE_ID, rolled_up_until=until, updated_at=datetime.utcnow())
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_state.c.id],
+            set_={"rolled_up_until": stmt.excluded.rolled_up_until, "updated_at": stmt.excluded.updated_at},
+        )
+        conn.execute(stmt)
+
+    @staticmethod
+    def prune(conn: Connection, now: datetime) -> Dict[str, int]:
+        """Delete raw rows and buckets past their retention; raw rows not yet folded are kept"""
+        cutoffs = retention_cutoffs(now)
+        watermark = SupplierUsageBucketRepository.watermark(conn)
+        deleted = {RAW: 0}
+        if watermark is not None:
+            raw_before = min(cutoffs[RAW], watermark)
+            deleted[RAW] = _delete_in_batches(conn, _raw, _raw.c.request_timestamp < raw_before)
+        for resolution in RESOLUTIONS:
+            deleted[resolution] = _delete_in_batches(
+                conn,
+                _buckets,
+                and_(_buckets.c.resolution == resolution, _buckets.c.bucket_start < cutoffs[resolution]),
+            )
+        return deleted
+
+
+def _delete_in_batches(conn: Connection, table, condition) -> int:
+    deleted = 0
+    while True:
+        batch = select(_rowid).select_from(table).where(condition).limit(PRUNE_BATCH_SIZE).scalar_subquery()
+        count = conn.execute(delete(table).where(_rowid.in_(batch))).rowcount
+        deleted += count
+        if count < PRUNE_BATCH_SIZE:
+            return deleted
+
+
+def _bucket_id(supplier_name: str, resolution: str, bucket_start: datetime, endpoint_type: str) -> str:
+    return f"{supplier_name}:{endpoint_type}:{resolution}:{bucket_start:%Y-%m-%dT%H:%M}"
+
+
+def _as_datetime(value: Any) -> datetime:
+    # func.min() over a DateTime column comes back as the stored string on SQLite
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.fromisoformat(str(value))
@@ -25,6 +25,7 @@ from . import (
     tag_routes,
     backup_routes,
     dashboard_routes,
+    metrics_routes,
 )
 
 __all__ = [
@@ -53,4 +54,5 @@ __all__ = [
     "tag_routes",
     "backup_routes",
     "dashboard_routes",
+    "metrics_routes",
 ]
@@ -439,7 +439,7 @@ async def update_backup_config(
         try:
             from MakerMatrix.services.system.backup_scheduler import backup_scheduler
 
-            await backup_scheduler.reload_schedule()
+            await backup_scheduler.request_reload()
         except Exception as e:
             # Log error but don't fail the update
             import logging
@@ -1,7 +1,8 @@
 """
 Dashboard API routes for inventory analytics.
 
-Provides a single endpoint for dashboard summary data.
+Provides a single endpoint for dashboard summary data, plus an admin endpoint
+to rebuild the materialized inventory aggregates behind it.
 """
 
 import logging
@@ -9,6 +10,7 @@ from typing import Dict, Any
 from fastapi import APIRouter, Depends
 
 from MakerMatrix.auth.dependencies import get_current_user_flexible
+from MakerMatrix.auth.guards import require_permission
 from MakerMatrix.models.models import UserModel
 from MakerMatrix.services.data.dashboard_service import dashboard_service
 from MakerMatrix.schemas.response import ResponseSchema
@@ -39,3 +41,21 @@ async def get_dashboard_summary(
     summary = dashboard_service.get_dashboard_summary()
 
     return base_router.build_success_response(message="Retrieved dashboard summary", data=summary)
+
+
+@router.post("/aggregates/rebuild", response_model=ResponseSchema)
+@standard_error_handling
+async def rebuild_dashboard_aggregates(
+    current_user: UserModel = Depends(require_permission("admin")),
+) -> ResponseSchema[Dict[str, Any]]:
+    """
+    Recompute the materialized inventory aggregates from scratch.
+
+    Only needed after parts or allocations were changed outside the application
+    (raw SQL, restored backups); normal writes keep the aggregates current.
+    """
+    logger.info(f"User {current_user.username} rebuilding dashboard aggregates")
+
+    result = dashboard_service.rebuild_aggregates()
+
+    return base_router.build_success_response(message="Rebuilt dashboard aggregates", data=result)
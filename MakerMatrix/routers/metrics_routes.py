@@ -0,0 +1,97 @@
+"""
+Metrics API routes.
+
+Serves the request metrics of this worker process in the Prometheus text format, the
+blocking calls found by the event loop monitor, the startup report and the index advisor.
+Scrape /metrics with an admin API key (Authorization: ApiKey <key>).
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+
+from MakerMatrix.auth.guards import require_permission
+from MakerMatrix.models.models import UserModel
+from MakerMatrix.routers.base import BaseRouter, standard_error_handling
+from MakerMatrix.schemas.response import ResponseSchema
+from MakerMatrix.services.system.event_loop_monitor import event_loop_monitor
+from MakerMatrix.services.system.index_advisor import IndexAdvisor
+from MakerMatrix.services.system.request_metrics import CONTENT_TYPE, request_metrics
+from MakerMatrix.services.system.startup import startup_report
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+base_router = BaseRouter()
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics(current_user: UserModel = Depends(require_permission("admin"))) -> Response:
+    """
+    Request latency, SQL and event loop histograms per route in the Prometheus format.
+
+    Every worker process keeps its own metrics; with several workers each scrape sees one of them.
+    """
+    return Response(
+        content=request_metrics.render() + event_loop_monitor.render() + startup_report.render(),
+        media_type=CONTENT_TYPE,
+    )
+
+
+@router.get("/api/metrics/startup", response_model=ResponseSchema)
+@standard_error_handling
+async def get_startup_report(
+    current_user: UserModel = Depends(require_permission("admin")),
+) -> ResponseSchema[Dict[str, Any]]:
+    """
+    How long this worker took to start: the import time, and the duration, offset and
+    outcome of every startup step.
+    """
+    return base_router.build_success_response(message="Retrieved startup report", data=startup_report.to_dict())
+
+
+@router.get("/api/metrics/event-loop", response_model=ResponseSchema)
+@standard_error_handling
+async def get_event_loop_report(
+    limit: Optional[int] = Query(50, ge=1, le=1000, description="Number of stall locations to return"),
+    current_user: UserModel = Depends(require_permission("admin")),
+) -> ResponseSchema[Dict[str, Any]]:
+    """
+    Code locations that blocked the event loop of this worker, longest total stall first.
+
+    Each location carries the number of stalls, their total and maximum duration, and the
+    stack sampled during the longest one. Requires LOOP_MONITOR_ENABLED=true.
+    """
+    return base_router.build_success_response(
+        message="Retrieved event loop stalls", data=event_loop_monitor.report(limit)
+    )
+
+
+@router.delete("/api/metrics/event-loop", response_model=ResponseSchema)
+@standard_error_handling
+async def reset_event_loop_report(
+    current_user: UserModel = Depends(require_permission("admin")),
+) -> ResponseSchema[Dict[str, Any]]:
+    """Forget the stalls recorded so far, e.g. before reproducing a freeze"""
+    logger.info(f"User {current_user.username} reset the event loop stall report")
+    event_loop_monitor.reset()
+    return base_router.build_success_response(message="Reset event loop stalls", data=event_loop_monitor.report(0))
+
+
+@router.get("/api/metrics/index-advisor", response_model=ResponseSchema)
+@standard_error_handling
+async def get_index_advisor_report(
+    current_user: UserModel = Depends(require_permission("admin")),
+) -> ResponseSchema[Dict[str, Any]]:
+    """
+    SQLite's plan for each of the application's known queries. Queries that read a whole
+    table are flagged, sorts in a temporary B-tree are marked, and indexes expected from
+    the migrations but missing from the database are listed.
+    """
+    report = IndexAdvisor().report()
+    return base_router.build_success_response(
+        message=f"{len(report['flagged'])} of {len(report['queries'])} known queries scan a full table",
+        data=report,
+    )
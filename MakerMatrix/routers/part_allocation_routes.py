@@ -17,6 +17,7 @@ from MakerMatrix.models.part_allocation_models import (
 )
 from MakerMatrix.services.data.part_allocation_service import PartAllocationService
 from MakerMatrix.auth.dependencies import get_current_user
+from MakerMatrix.auth.guards import require_permission
 from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.schemas.response import ResponseSchema
 
@@ -174,3 +175,33 @@ async def split_to_cassette(
     result = service.split_to_cassette(part_id, request)
 
     return ResponseSchema(status="success" if result.success else "error", message=result.message, data=result.data)
+
+
+@router.get(
+    "/allocations/consistency", response_model=ResponseSchema, summary="Check part quantities against allocations"
+)
+async def check_quantity_consistency(
+    current_user: UserModel = Depends(require_permission("admin")),
+    service: PartAllocationService = Depends(get_allocation_service),
+):
+    """
+    Report parts whose stored total quantity or location count disagrees with their allocations.
+    """
+    result = service.check_quantity_consistency()
+
+    return ResponseSchema(status="success" if result.success else "error", message=result.message, data=result.data)
+
+
+@router.post(
+    "/allocations/consistency/repair", response_model=ResponseSchema, summary="Repair part quantities from allocations"
+)
+async def repair_quantity_consistency(
+    current_user: UserModel = Depends(require_permission("admin")),
+    service: PartAllocationService = Depends(get_allocation_service),
+):
+    """
+    Recompute the stored total quantity and location count of every inconsistent part.
+    """
+    result = service.check_quantity_consistency(repair=True)
+
+    return ResponseSchema(status="success" if result.success else "error", message=result.message, data=result.data)
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from starlette import status
 
 from MakerMatrix.models.models import AdvancedPartSearch
+from MakerMatrix.repositories.part_projection_repository import PartProjection
 from MakerMatrix.repositories.custom_exceptions import PartAlreadyExistsError, ResourceNotFoundError
 from MakerMatrix.schemas.part_create import PartCreate, PartUpdate
 from MakerMatrix.schemas.part_response import PartResponse
@@ -16,6 +17,7 @@ from MakerMatrix.auth.guards import require_permission
 from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
 from MakerMatrix.suppliers.registry import get_available_suppliers
 from MakerMatrix.services.system.task_service import task_service
+from MakerMatrix.services.system.part_usage_counters import part_usage_counters
 from MakerMatrix.models.task_models import CreateTaskRequest, TaskType, TaskPriority
 from MakerMatrix.dependencies import get_part_service
 from MakerMatrix.services.system.enrichment_requirement_validator import EnrichmentRequirementValidator
@@ -163,18 +165,36 @@ async def delete_part(
 ###
 
 
-@router.get("/get_all_parts", response_model=ResponseSchema[List[PartResponse]])
+VIEW_QUERY = Query(
+    default="full", description="full: complete part records; summary: compact rows with the parts grid columns"
+)
+FIELDS_QUERY = Query(
+    default=None, description="Comma-separated top-level part fields to return (e.g. id,part_name,quantity,location)"
+)
+
+
+def _part_items(items: List[Dict[str, Any]], projection: PartProjection) -> List[Any]:
+    """Full records are validated against PartResponse; projected ones are returned as built"""
+    if projection.is_default:
+        return [PartResponse.model_validate(part) for part in items]
+    return items
+
+
+@router.get("/get_all_parts", response_model=ResponseSchema[List[Dict[str, Any]]])
 @standard_error_handling
 async def get_all_parts(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1),
+    view: str = VIEW_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
     part_service: PartService = Depends(get_part_service),
-) -> ResponseSchema[List[PartResponse]]:
-    service_response = part_service.get_all_parts(page, page_size)
+) -> ResponseSchema[List[Dict[str, Any]]]:
+    projection = PartProjection.parse(view, fields)
+    service_response = part_service.get_all_parts(page, page_size, projection=projection)
     data = validate_service_response(service_response)
 
     return BaseRouter.build_success_response(
-        data=[PartResponse.model_validate(part) for part in data["items"]],
+        data=_part_items(data["items"], projection),
         message=service_response.message,
         page=data["page"],
         page_size=data["page_size"],
@@ -211,6 +231,7 @@ async def get_part(
         service_response = part_service.get_part_by_part_name(part_name, include=include_list)
 
     data = validate_service_response(service_response)
+    part_usage_counters.record_view(data.get("id"))
     return BaseRouter.build_success_response(data=PartResponse.model_validate(data), message=service_response.message)
 
 
@@ -308,33 +329,42 @@ async def update_part(
 @router.post("/search", response_model=ResponseSchema[Dict[str, Any]])
 @standard_error_handling
 async def advanced_search(
-    search_params: AdvancedPartSearch, part_service: PartService = Depends(get_part_service)
+    search_params: AdvancedPartSearch,
+    view: str = VIEW_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    part_service: PartService = Depends(get_part_service),
 ) -> ResponseSchema[Dict[str, Any]]:
     """
     Perform an advanced search on parts with multiple filters and sorting options.
     """
-    service_response = part_service.advanced_search(search_params)
+    projection = PartProjection.parse(view, fields)
+    service_response = part_service.advanced_search(search_params, projection=projection)
     data = validate_service_response(service_response)
+    part_usage_counters.record_search_hits(part.get("id") for part in data["items"])
 
     return BaseRouter.build_success_response(data=data, message=service_response.message)
 
 
-@router.get("/search_text", response_model=ResponseSchema[List[PartResponse]])
+@router.get("/search_text", response_model=ResponseSchema[List[Dict[str, Any]]])
 @standard_error_handling
 async def search_parts_text(
     query: str = Query(..., min_length=1, description="Search term"),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
-) -> ResponseSchema[List[PartResponse]]:
+    view: str = VIEW_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+) -> ResponseSchema[List[Dict[str, Any]]]:
     """
     Simple text search across part names, numbers, and descriptions.
     """
+    projection = PartProjection.parse(view, fields)
     part_service = PartService()
-    service_response = part_service.search_parts_text(query, page, page_size)
+    service_response = part_service.search_parts_text(query, page, page_size, projection=projection)
     data = validate_service_response(service_response)
+    part_usage_counters.record_search_hits(part.get("id") for part in data["items"])
 
     return BaseRouter.build_success_response(
-        data=[PartResponse.model_validate(part) for part in data["items"]],
+        data=_part_items(data["items"], projection),
         message=service_response.message,
         page=data["page"],
         page_size=data["page_size"],
@@ -342,6 +372,21 @@ async def search_parts_text(
     )
 
 
+@router.get("/most_viewed", response_model=ResponseSchema[List[Dict[str, Any]]])
+@standard_error_handling
+async def get_most_viewed_parts(
+    limit: int = Query(default=10, ge=1, le=100),
+    part_service: PartService = Depends(get_part_service),
+) -> ResponseSchema[List[Dict[str, Any]]]:
+    """
+    Get the parts with the most detail views, with their view and search counts.
+    """
+    service_response = part_service.get_most_viewed_parts(limit)
+    data = validate_service_response(service_response)
+
+    return BaseRouter.build_success_response(data=data, message=service_response.message)
+
+
 @router.get("/suggestions", response_model=ResponseSchema[List[str]])
 @standard_error_handling
 async def get_part_suggestions(
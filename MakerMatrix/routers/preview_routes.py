@@ -3,9 +3,11 @@ Preview routes for generating label previews without printing.
 """
 
 import base64
+import hashlib
 import re
-from typing import Optional, Dict, Any, List
-from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional, Dict, Any, List, Union
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from MakerMatrix.repositories.parts_repositories import PartRepository
@@ -62,6 +64,28 @@ class AdvancedPreviewRequest(BaseModel):
     printer_id: Optional[str] = None
 
 
+def _preview_response(http_request: Request, result) -> Union[Response, PreviewResponse]:
+    """
+    The preview as a PNG when the client accepts image/png (ETag is a hash of the image,
+    304 when unchanged), otherwise the base64 JSON response.
+    """
+    if "image/png" in http_request.headers.get("accept", "") and result.format == "png":
+        etag = f'"{hashlib.sha256(result.image_data).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+        if etag in http_request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=result.image_data, media_type="image/png", headers=headers)
+
+    return PreviewResponse(
+        success=True,
+        preview_data=base64.b64encode(result.image_data).decode("utf-8"),
+        format=result.format,
+        width_px=result.width_px,
+        height_px=result.height_px,
+        message=result.message,
+    )
+
+
 # Global preview manager instance
 preview_manager = PreviewManager()
 
@@ -162,7 +186,9 @@ async def get_label_sizes(printer_id: Optional[str] = None) -> ResponseSchema[Di
 
 @router.post("/part/qr_code/{part_id}", response_model=PreviewResponse)
 @standard_error_handling
-async def preview_part_qr_code(part_id: str, label_size: str = "12", printer_id: Optional[str] = None):
+async def preview_part_qr_code(
+    part_id: str, http_request: Request, label_size: str = "12", printer_id: Optional[str] = None
+):
     """Generate preview of a part QR code label."""
     # Get part from database
     with engine.begin() as session:
@@ -176,22 +202,14 @@ async def preview_part_qr_code(part_id: str, label_size: str = "12", printer_id:
 
     result = await service.preview_part_qr_code(part, label_size)
 
-    # Encode image data as base64
-    preview_data = base64.b64encode(result.image_data).decode("utf-8")
-
-    return PreviewResponse(
-        success=True,
-        preview_data=preview_data,
-        format=result.format,
-        width_px=result.width_px,
-        height_px=result.height_px,
-        message=result.message,
-    )
+    return _preview_response(http_request, result)
 
 
 @router.post("/part/name/{part_id}", response_model=PreviewResponse)
 @standard_error_handling
-async def preview_part_name(part_id: str, label_size: str = "12", printer_id: Optional[str] = None):
+async def preview_part_name(
+    part_id: str, http_request: Request, label_size: str = "12", printer_id: Optional[str] = None
+):
     """Generate preview of a part name label."""
     # Get part from database
     with engine.begin() as session:
@@ -205,22 +223,12 @@ async def preview_part_name(part_id: str, label_size: str = "12", printer_id: Op
 
     result = await service.preview_part_name(part, label_size)
 
-    # Encode image data as base64
-    preview_data = base64.b64encode(result.image_data).decode("utf-8")
-
-    return PreviewResponse(
-        success=True,
-        preview_data=preview_data,
-        format=result.format,
-        width_px=result.width_px,
-        height_px=result.height_px,
-        message=result.message,
-    )
+    return _preview_response(http_request, result)
 
 
 @router.post("/text", response_model=PreviewResponse)
 @standard_error_handling
-async def preview_text_label(request: TextPreviewRequest):
+async def preview_text_label(request: TextPreviewRequest, http_request: Request):
     """Generate preview of a custom text label."""
     # Generate preview
     manager = get_preview_manager()
@@ -228,23 +236,17 @@ async def preview_text_label(request: TextPreviewRequest):
 
     result = await service.preview_text_label(request.text, request.label_size)
 
-    # Encode image data as base64
-    preview_data = base64.b64encode(result.image_data).decode("utf-8")
-
-    return PreviewResponse(
-        success=True,
-        preview_data=preview_data,
-        format=result.format,
-        width_px=result.width_px,
-        height_px=result.height_px,
-        message=result.message,
-    )
+    return _preview_response(http_request, result)
 
 
 @router.post("/part/combined/{part_id}", response_model=PreviewResponse)
 @standard_error_handling
 async def preview_combined_label(
-    part_id: str, custom_text: Optional[str] = None, label_size: str = "12", printer_id: Optional[str] = None
+    part_id: str,
+    http_request: Request,
+    custom_text: Optional[str] = None,
+    label_size: str = "12",
+    printer_id: Optional[str] = None,
 ):
     """Generate preview of a combined QR code + text label."""
     # Get part from database
@@ -259,17 +261,7 @@ async def preview_combined_label(
 
     result = await service.preview_combined_label(part, custom_text, label_size)
 
-    # Encode image data as base64
-    preview_data = base64.b64encode(result.image_data).decode("utf-8")
-
-    return PreviewResponse(
-        success=True,
-        preview_data=preview_data,
-        format=result.format,
-        width_px=result.width_px,
-        height_px=result.height_px,
-        message=result.message,
-    )
+    return _preview_response(http_request, result)
 
 
 @router.get("/validate/size/{label_size}", response_model=ResponseSchema)
@@ -404,7 +396,7 @@ async def preview_system_health() -> ResponseSchema[Dict[str, Any]]:
 
 @router.post("/advanced", response_model=PreviewResponse)
 @standard_error_handling
-async def preview_advanced_label(request: AdvancedPreviewRequest):
+async def preview_advanced_label(request: AdvancedPreviewRequest, http_request: Request):
     """Generate preview of an advanced label with template processing."""
     try:
         print(f"[DEBUG] Received preview_advanced_label request: {request}")
@@ -560,26 +552,8 @@ async def preview_advanced_label(request: AdvancedPreviewRequest):
                 success=False, error=f"Preview generation failed: {str(e)}", message="Failed to generate preview image"
             )
 
-        # Encode image data as base64
-        print(f"[DEBUG] Encoding image data to base64...")
-        try:
-            preview_data = base64.b64encode(result.image_data).decode("utf-8")
-            print(f"[DEBUG] Base64 encoding successful, length: {len(preview_data)}")
-        except Exception as e:
-            print(f"[ERROR] Failed to encode image data: {e}")
-            return PreviewResponse(
-                success=False, error=f"Image encoding failed: {str(e)}", message="Failed to encode preview image"
-            )
-
         print(f"[DEBUG] Returning successful preview response")
-        return PreviewResponse(
-            success=True,
-            preview_data=preview_data,
-            format=result.format,
-            width_px=result.width_px,
-            height_px=result.height_px,
-            message=result.message,
-        )
+        return _preview_response(http_request, result)
 
     except Exception as e:
         print(f"[ERROR] Unexpected error in preview_advanced_label: {e}")
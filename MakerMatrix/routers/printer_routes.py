@@ -1,9 +1,10 @@
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, File, UploadFile, Body, Query, Request, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from MakerMatrix.services.printer.printer_manager_service import printer_manager
+from MakerMatrix.services.printer.label_preview_cache import CachedPreview, label_preview_cache
 from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.auth.dependencies import get_current_user
 from MakerMatrix.schemas.response import ResponseSchema
@@ -961,6 +962,62 @@ async def preview_template_draft(request: TemplateDraftPreviewRequest):
     else:
         return BaseRouter.build_error_response(error=result.error, message="Failed to generate draft preview")
 
+
+def _png_response(request: Request, preview: CachedPreview, cached: bool) -> Response:
+    """PNG preview with its content hash as ETag; 304 when the client already has it"""
+    headers = {
+        "ETag": preview.etag,
+        "Cache-Control": "private, max-age=3600",
+        "X-Preview-Cache": "hit" if cached else "miss",
+    }
+    if preview.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=preview.png, media_type="image/png", headers=headers)
+
+
+@router.post("/preview/template.png", response_class=Response)
+@standard_error_handling
+async def preview_template_label_png(request: TemplatePreviewRequest, http_request: Request):
+    """Preview a label using a saved template, as a PNG image."""
+    try:
+        rendered = await printer_manager.render_template_preview(request.template_id, request.data)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to preview template label: {str(e)}")
+    if rendered is None:
+        raise HTTPException(status_code=404, detail=f"Template {request.template_id} not found")
+    return _png_response(http_request, *rendered)
+
+
+@router.post("/preview/template/draft.png", response_class=Response)
+@standard_error_handling
+async def preview_template_draft_png(request: TemplateDraftPreviewRequest, http_request: Request):
+    """Preview a label from inline template config (unsaved draft), as a PNG image."""
+    try:
+        preview, cached = await printer_manager.render_draft_preview(request.template_config, request.data)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to preview draft template: {str(e)}")
+    return _png_response(http_request, preview, cached)
+
+
+@router.get("/preview/image/{key}", response_class=Response)
+@standard_error_handling
+async def get_cached_preview(key: str, http_request: Request):
+    """A previously rendered preview by its key (the ETag of the preview responses)."""
+    preview = label_preview_cache.get(key)
+    if preview is None:
+        raise HTTPException(status_code=404, detail="Preview not in cache, request it again")
+    return _png_response(http_request, preview, True)
+
+
+@router.get("/preview/cache/stats", response_model=ResponseSchema)
+@standard_error_handling
+async def get_preview_cache_stats():
+    """Hit, miss and size statistics of the label preview cache."""
+    return BaseRouter.build_success_response(
+        data=label_preview_cache.get_stats(), message="Preview cache statistics retrieved"
+    )
+
+
 @router.post("/print/advanced", response_model=ResponseSchema)
 @standard_error_handling
 @log_activity("advanced_label_printed", "User {username} printed advanced label")
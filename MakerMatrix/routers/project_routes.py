@@ -1,7 +1,7 @@
 from typing import Optional
 import logging
 
-from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi import APIRouter, HTTPException, Request, Depends, Query
 
 from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.exceptions import ProjectAlreadyExistsError, ProjectNotFoundError, ResourceNotFoundError
@@ -15,6 +15,7 @@ from MakerMatrix.schemas.project_schemas import (
 )
 from MakerMatrix.schemas.response import ResponseSchema
 from MakerMatrix.services.data.project_service import ProjectService
+from MakerMatrix.services.data.project_bom_service import ProjectBomService
 from MakerMatrix.auth.dependencies import get_current_user
 from MakerMatrix.auth.guards import require_permission
 
@@ -284,21 +285,24 @@ async def add_part_to_project(
     part_id: str,
     request: Request,
     notes: Optional[str] = None,
+    quantity_required: Optional[int] = Query(None, ge=1),
     current_user: UserModel = Depends(require_permission("projects:update")),
 ) -> ResponseSchema[dict]:
     """
-    Add a part to a project.
+    Add a part to a project. Calling it again for the same part updates the notes
+    and/or the required quantity of the BOM line.
 
     Args:
         project_id: The ID of the project
         part_id: The ID of the part to add
         notes: Optional notes about this part's use in the project
+        quantity_required: Units of the part needed per build (default 1)
 
     Returns:
         ResponseSchema: Success response with association details
     """
     project_service = ProjectService()
-    service_response = project_service.add_part_to_project(part_id, project_id, notes)
+    service_response = project_service.add_part_to_project(part_id, project_id, notes, quantity_required)
     data = validate_service_response(service_response)
 
     # Log activity
@@ -313,7 +317,7 @@ async def add_part_to_project(
             entity_name=data.get("project_name", ""),
             user=current_user,
             request=request,
-            details={"part_id": part_id, "notes": notes},
+            details={"part_id": part_id, "notes": notes, "quantity_required": quantity_required},
         )
     except Exception as e:
         logger.warning(f"Failed to log part addition activity: {e}")
@@ -399,3 +403,47 @@ async def get_part_projects(part_id: str) -> ResponseSchema[dict]:
     data = validate_service_response(service_response)
 
     return BaseRouter.build_success_response(data=data, message=service_response.message)
+
+
+# === BOM Availability Endpoints ===
+
+
+@router.get("/bom/buildable", response_model=ResponseSchema[dict])
+@standard_error_handling
+async def get_buildable_projects(
+    status: Optional[str] = None,
+    build_quantity: int = Query(1, ge=1),
+) -> ResponseSchema[dict]:
+    """
+    Availability of every project (or every project with `status`) from the current stock.
+
+    Args:
+        status: Only include projects with this status (e.g. "active")
+        build_quantity: Number of units of each project to plan for
+
+    Returns:
+        ResponseSchema: Buildable count, shortage totals and shortfall cost per project
+    """
+    service_response = ProjectBomService().get_buildable(status=status, build_quantity=build_quantity)
+    data = validate_service_response(service_response)
+
+    return BaseRouter.build_success_response(data=data, message=service_response.message)
+
+
+@router.get("/{project_id}/bom", response_model=ResponseSchema[dict])
+@standard_error_handling
+async def get_project_bom(project_id: str, build_quantity: int = Query(1, ge=1)) -> ResponseSchema[dict]:
+    """
+    Bill of materials of a project with stock, shortages, stock locations and the cost of the shortfall.
+
+    Args:
+        project_id: The ID of the project
+        build_quantity: Number of units of the project to plan for
+
+    Returns:
+        ResponseSchema: BOM summary and lines
+    """
+    service_response = ProjectBomService().get_project_bom(project_id, build_quantity)
+    data = validate_service_response(service_response)
+
+    return BaseRouter.build_success_response(data=data, message=service_response.message)
@@ -27,6 +27,7 @@ from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.auth.dependencies import get_current_user
 from MakerMatrix.auth.guards import require_permission
 from MakerMatrix.routers.base import BaseRouter, standard_error_handling, validate_service_response
+from MakerMatrix.services.system.websocket_service import websocket_manager
 
 import logging
 
@@ -356,9 +357,32 @@ async def bulk_tag_operation(
     tag_service: TagService = Depends(get_tag_service),
 ) -> ResponseSchema[Dict[str, Any]]:
     """Perform bulk tag operations on multiple items"""
-    service_response = tag_service.bulk_tag_operation(operation)
+    service_response = tag_service.bulk_tag_operation(operation, user_id=current_user.id)
     result = validate_service_response(service_response)
 
+    # One summarized event for the whole batch instead of one per (item, tag) pair
+    try:
+        updated_items = {entry["item_id"] for entry in result["successful"]}
+        failed_items = {entry["item_id"] for entry in result["failed"]}
+        change_key = "tags_added" if operation.operation == "add" else "tags_removed"
+
+        await websocket_manager.broadcast_crud_event(
+            action="bulk_updated",
+            entity_type=operation.item_type,
+            entity_id="bulk",  # Special ID for bulk operations
+            entity_name=f"{len(updated_items)} {operation.item_type}s",
+            user_id=current_user.id,
+            username=current_user.username,
+            details={
+                f"{operation.item_type}_ids": sorted(updated_items),
+                "updated_count": len(updated_items),
+                "failed_count": len(failed_items),
+                "changes": {change_key: operation.tag_ids},
+            },
+        )
+    except Exception as e:
+        logger.warning(f"Failed to broadcast bulk tag operation: {e}")
+
     return BaseRouter.build_success_response(data=result, message=service_response.message)
 
 
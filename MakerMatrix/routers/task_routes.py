@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from MakerMatrix.services.system.task_service import task_service
 from MakerMatrix.services.system.task_security_service import task_security_service
+from MakerMatrix.services.system.event_bus import get_event_bus
 from MakerMatrix.models.task_models import (
     TaskModel,
     TaskStatus,
@@ -208,9 +209,10 @@ async def stop_task_worker(current_user: UserModel = Depends(require_permission(
 
 
 @router.get("/worker/status", response_model=Dict[str, Any])
-async def get_worker_status(current_user: UserModel = Depends(require_permission("tasks:read"))):
-    """Get task worker status"""
+async def get_worker_status(request: Request, current_user: UserModel = Depends(require_permission("tasks:read"))):
+    """Get task worker status; with several worker processes only the leader runs the worker"""
     try:
+        leader_elector = getattr(request.app.state, "leader_elector", None)
         return {
             "status": "success",
             "data": {
@@ -218,6 +220,8 @@ async def get_worker_status(current_user: UserModel = Depends(require_permission
                 "running_tasks_count": len(task_service.running_tasks),
                 "running_task_ids": list(task_service.running_tasks.keys()),
                 "registered_handlers": len(task_service.task_instances),
+                "leader": leader_elector.get_status() if leader_elector else None,
+                "event_bus": get_event_bus().get_status(),
             },
         }
     except Exception as e:
@@ -524,6 +528,23 @@ async def get_task(task_id: str, current_user: UserModel = Depends(require_permi
         raise HTTPException(status_code=500, detail=f"Failed to get task: {str(e)}")
 
 
+@router.get("/{task_id}/logs", response_model=Dict[str, Any])
+async def get_task_logs(task_id: str, current_user: UserModel = Depends(require_permission("tasks:read"))):
+    """Get the log lines of a task (live while it runs, persisted once it finishes)"""
+    try:
+        entries = await task_service.get_task_logs(task_id)
+
+        if entries is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        return {"status": "success", "data": {"task_id": task_id, "entries": entries}}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get logs for task {task_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get task logs: {str(e)}")
+
+
 @router.put("/{task_id}", response_model=Dict[str, Any])
 async def update_task(
     task_id: str,
@@ -1,7 +1,6 @@
 import os
 import shutil
 import uuid
-import json
 from datetime import datetime
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
@@ -9,20 +8,17 @@ from fastapi.responses import FileResponse, StreamingResponse
 from starlette.responses import JSONResponse
 from pathlib import Path
 import logging
-import httpx
 from urllib.parse import urlparse
 
-from MakerMatrix.services.data.category_service import CategoryService
-from MakerMatrix.services.data.location_service import LocationService
-from MakerMatrix.services.data.part_service import PartService
 from MakerMatrix.schemas.response import ResponseSchema
 from MakerMatrix.database.db import DATABASE_URL
 from MakerMatrix.auth.dependencies import get_current_user
 from MakerMatrix.auth.guards import require_permission
 from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.services.activity_service import get_activity_service
+from MakerMatrix.services.system.pdf_proxy_cache import UpstreamError, get_pdf_proxy_cache
 from MakerMatrix.models.models import *
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, select
 from MakerMatrix.models.models import engine
 from MakerMatrix.routers.base import BaseRouter, standard_error_handling, log_activity
 
@@ -351,28 +347,36 @@ async def list_available_backups(current_user: UserModel = Depends(require_permi
 
 @router.get("/backup/export")
 @standard_error_handling
-async def export_data_json():
-    """Export all data as JSON"""
-    # Get all data
-    parts_data = PartService.get_all_parts()
-    locations_data = LocationService.get_all_locations()
-    categories_data = CategoryService.get_all_categories()
-
-    export_data = {
-        "export_date": datetime.now().isoformat(),
-        "parts": parts_data.get("data", []),
-        "locations": locations_data,
-        "categories": categories_data.get("data", {}).get("categories", []),
-    }
+async def export_data(
+    entity: str = Query("all", description="parts, locations, categories, allocations, or all"),
+    format: str = Query("ndjson", description="ndjson or csv (csv requires a single entity)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include (single entity only)"),
+    since: Optional[datetime] = Query(
+        None,
+        description="Only parts/allocations inserted or updated at or after this time; deleted rows are not reported",
+    ),
+    compress: bool = Query(False, description="Gzip the response body"),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Stream an export of the inventory as NDJSON or CSV.
 
-    # Create temporary file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    temp_file = f"temp_export_{timestamp}.json"
+    An incremental export (`since`) covers inserts and updates only; rows deleted since then
+    are not in it, so a synced copy needs a full export from time to time to drop them.
+    """
+    from MakerMatrix.services.data.export_service import DataExportService, EXPORT_MEDIA_TYPES
 
-    with open(temp_file, "w") as f:
-        json.dump(export_data, f, indent=2, default=str)
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    chunks = DataExportService().stream_export(
+        entity=entity, export_format=format, fields=field_list, since=since, compress=compress
+    )
 
-    return FileResponse(path=temp_file, filename=f"makermatrix_export_{timestamp}.json", media_type="application/json")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"makermatrix_{entity}_{timestamp}.{format}" + (".gz" if compress else "")
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    media_type = "application/gzip" if compress else EXPORT_MEDIA_TYPES[format]
+
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
 
 
 @router.get("/backup/status", response_model=ResponseSchema)
@@ -445,6 +449,7 @@ async def clear_suppliers_data(
         "supplier_credentials": 0,
         "supplier_usage_tracking": 0,
         "supplier_usage_summary": 0,
+        "supplier_usage_buckets": 0,
         "supplier_rate_limits": 0,
         "enrichment_profiles": 0,
         "parts_supplier_cleared": 0,
@@ -477,6 +482,10 @@ async def clear_suppliers_data(
             session.delete(summary)
         result["supplier_usage_summary"] = len(usage_summary)
 
+        # Clear supplier usage rollups and their watermark
+        result["supplier_usage_buckets"] = session.exec(delete(SupplierUsageBucketModel)).rowcount
+        session.exec(delete(SupplierUsageRollupStateModel))
+
         # Clear supplier rate limits
         rate_limits = session.exec(select(SupplierRateLimitModel)).all()
         for limit in rate_limits:
@@ -534,15 +543,33 @@ async def serve_datasheet(filename: str):
     return FileResponse(path=str(file_path), media_type="application/pdf", filename=filename)
 
 
+class _CachedPdfResponse(FileResponse):
+    """Sends a PDF cache file and releases its entry afterwards, also when the client disconnects"""
+
+    def __init__(self, cache, key: str, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+        self._key = key
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._cache.release(self._key)
+
+
 @router.get("/static/proxy-pdf")
 @standard_error_handling
 async def proxy_pdf(url: str = Query(..., description="URL of the PDF to proxy")):
     """
     Proxy external PDF URLs to avoid CORS issues.
 
-    This endpoint fetches PDFs from external sources and streams them
-    to the client, bypassing browser CORS restrictions.
+    This endpoint fetches PDFs from external sources and serves them to the
+    client, bypassing browser CORS restrictions. Fetched PDFs are kept in a
+    local LRU cache and revalidated with the origin once they are stale.
     """
+    import httpx
+
     # Validate URL
     parsed_url = urlparse(url)
     if not parsed_url.scheme or not parsed_url.netloc:
@@ -617,34 +644,36 @@ async def proxy_pdf(url: str = Query(..., description="URL of the PDF to proxy")
         logger.warning(f"Attempted to proxy PDF from unauthorized domain: {parsed_url.netloc}")
         raise HTTPException(status_code=403, detail="Domain not allowed for PDF proxying")
 
-    logger.info(f"Proxying PDF from: {url}")
+    cache = get_pdf_proxy_cache()
+    try:
+        entry = await cache.acquire(url)
+    except UpstreamError as e:
+        logger.error(f"Failed to fetch PDF from {url}: {e}")
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to fetch PDF from {url}: {e}")
+        raise HTTPException(status_code=502, detail=f"Failed to fetch PDF: {e}")
+
+    # Served from the local cache; FileResponse answers Range requests from the PDF viewer
+    return _CachedPdfResponse(
+        cache,
+        entry.key,
+        path=str(cache.path_for(entry.key)),
+        media_type="application/pdf",
+        headers={"Content-Disposition": "inline", "Cache-Control": "public, max-age=3600"},  # Cache for 1 hour
+    )
 
-    async with httpx.AsyncClient(
-        timeout=30.0,
-        follow_redirects=True,
-        headers={"User-Agent": "MakerMatrix/1.0.0 (Component Management System)", "Accept": "application/pdf,*/*"},
-    ) as client:
-        response = await client.get(url)
 
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch PDF: HTTP {response.status_code}")
-            raise HTTPException(
-                status_code=response.status_code, detail=f"Failed to fetch PDF: HTTP {response.status_code}"
-            )
+@router.get("/static/proxy-pdf/stats", response_model=ResponseSchema)
+@standard_error_handling
+async def get_pdf_proxy_cache_stats(current_user: UserModel = Depends(require_permission("admin"))):
+    """Hit rate, size and entry count of the proxied PDF cache (Admin only)"""
+    return base_router.build_success_response(message="PDF proxy cache statistics", data=get_pdf_proxy_cache().stats())
 
-        # Check if response is actually a PDF
-        content_type = response.headers.get("content-type", "").lower()
-        if "pdf" not in content_type and "application/octet-stream" not in content_type:
-            logger.warning(f"Response doesn't appear to be a PDF: {content_type}")
-            # Still proceed as some servers don't set correct content-type
-
-        # Stream the PDF content
-        def iter_content():
-            for chunk in response.iter_bytes(chunk_size=8192):
-                yield chunk
-
-        return StreamingResponse(
-            iter_content(),
-            media_type="application/pdf",
-            headers={"Content-Disposition": "inline", "Cache-Control": "public, max-age=3600"},  # Cache for 1 hour
-        )
+
+@router.delete("/static/proxy-pdf/cache", response_model=ResponseSchema)
+@standard_error_handling
+async def clear_pdf_proxy_cache(current_user: UserModel = Depends(require_permission("admin"))):
+    """Remove all cached proxied PDFs (Admin only)"""
+    removed = get_pdf_proxy_cache().clear()
+    return base_router.build_success_response(message=f"Removed {removed} cached PDFs", data={"removed": removed})
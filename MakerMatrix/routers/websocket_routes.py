@@ -10,6 +10,8 @@ from MakerMatrix.services.system.websocket_service import websocket_manager
 from MakerMatrix.auth.dependencies import get_current_user_from_token
 from MakerMatrix.models.user_models import UserModel
 from MakerMatrix.routers.base import BaseRouter
+from MakerMatrix.services.printer.live_label_preview import LivePreviewSession
+from MakerMatrix.services.printer.printer_manager_service import printer_manager
 import logging
 
 logger = logging.getLogger(__name__)
@@ -150,6 +152,75 @@ async def websocket_admin_endpoint(websocket: WebSocket, token: Optional[str] =
         websocket_manager.disconnect(websocket)
 
 
+@router.websocket("/ws/label-preview")
+async def websocket_label_preview_endpoint(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    WebSocket endpoint for live label previews in the template designer.
+
+    Client messages:
+        {"type": "preview", "request_id": "...", "template_config": {...} | "template_id": "...", "data": {...}}
+        {"type": "cancel"}
+        {"type": "ping"}
+
+    A preview request replaces the pending one and is rendered after a short debounce.
+    Each result is a JSON "preview" message (key, etag, size) followed by a binary frame
+    with the PNG, or a "preview_error" message.
+    """
+    if not token:
+        await websocket.close(code=4001, reason="Authentication required")
+        return
+
+    try:
+        user = await get_current_user_from_token(token)
+        if not user:
+            await websocket.close(code=4001, reason="Authentication failed")
+            return
+    except Exception as e:
+        logger.warning(f"Label preview WebSocket authentication failed: {e}")
+        await websocket.close(code=4001, reason="Authentication failed")
+        return
+
+    await websocket.accept()
+    session = LivePreviewSession(render_live_preview, websocket.send_json, websocket.send_bytes)
+
+    try:
+        while True:
+            data = await websocket.receive_text()
+
+            try:
+                message = json.loads(data)
+            except json.JSONDecodeError:
+                await websocket.send_json({"type": "error", "message": "Invalid JSON format"})
+                continue
+
+            message_type = message.get("type")
+            if message_type == "preview":
+                session.submit(message)
+            elif message_type == "cancel":
+                await websocket.send_json({"type": "cancelled", "pending": session.cancel()})
+            elif message_type == "ping":
+                await websocket.send_json({"type": "pong", "timestamp": message.get("timestamp")})
+            else:
+                await websocket.send_json({"type": "error", "message": f"Unknown message type: {message_type}"})
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Label preview WebSocket error: {e}")
+    finally:
+        await session.close()
+
+
+async def render_live_preview(message: dict):
+    """Render the template or draft of a live preview request"""
+    data = message.get("data") or {}
+    if message.get("template_id"):
+        return await printer_manager.render_template_preview(message["template_id"], data)
+    if isinstance(message.get("template_config"), dict):
+        return await printer_manager.render_draft_preview(message["template_config"], data)
+    raise ValueError("A preview request needs template_config or template_id")
+
+
 async def handle_task_websocket_message(websocket: WebSocket, message: dict, user: UserModel = None):
     """Handle incoming task WebSocket messages"""
     message_type = message.get("type")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Check the stored part quantities against part_location_allocations.
+
+PartModel.cached_total_quantity and cached_location_count are maintained automatically by
+the application. Run this after editing allocations directly in the database; pass
+--repair to recompute the columns of any inconsistent part.
+"""
+
+import argparse
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from MakerMatrix.database.db import apply_schema_upgrades
+from MakerMatrix.services.data.part_allocation_service import PartAllocationService
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Check part quantities against allocations")
+    parser.add_argument("--repair", action="store_true", help="Recompute inconsistent parts")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PART QUANTITY CONSISTENCY CHECK")
+    print("=" * 60)
+
+    # Add the stock columns on databases that predate them
+    apply_schema_upgrades()
+
+    result = PartAllocationService().check_quantity_consistency(repair=args.repair)
+    if not result.success:
+        print(f"Check failed: {result.message}")
+        return 1
+
+    for row in result.data["mismatches"]:
+        print(
+            f"  {row['part_name']}: stored {row['cached_total_quantity']} units in "
+            f"{row['cached_location_count']} locations, allocations have {row['actual_total_quantity']} units in "
+            f"{row['actual_location_count']} locations"
+        )
+    print(result.message)
+    return 0 if result.data["consistent"] or args.repair else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
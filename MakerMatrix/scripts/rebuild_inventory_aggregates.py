@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized inventory aggregates used by the dashboard.
+
+The aggregates are kept current automatically by the application. Run this after
+editing parts or allocations directly in the database, or to verify the tables.
+"""
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from MakerMatrix.models.models import engine
+from sqlmodel import SQLModel
+from MakerMatrix.services.data.dashboard_service import DashboardService
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("INVENTORY AGGREGATE REBUILD")
+    print("=" * 60)
+
+    # Create the aggregate tables on databases that predate them
+    SQLModel.metadata.create_all(engine)
+
+    result = DashboardService().rebuild_aggregates()
+    print(f"Part aggregates: {result['parts']}")
+    print(f"Rollup rows:     {result['rollups']}")
+    print(f"Duration:        {result['duration_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
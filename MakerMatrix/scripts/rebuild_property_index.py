@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Rebuild the parametric property index used by property range searches.
+
+The index is kept current automatically by the application. Run this after editing
+additional_properties directly in the database or after changing the unit parser.
+"""
+
+import sys
+import os
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from MakerMatrix.models.models import engine
+from sqlmodel import SQLModel
+from MakerMatrix.repositories.part_property_repository import PartPropertyRepository
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("PART PROPERTY INDEX REBUILD")
+    print("=" * 60)
+
+    # Create the index table on databases that predate it
+    SQLModel.metadata.create_all(engine)
+
+    started = time.monotonic()
+    with engine.begin() as conn:
+        result = PartPropertyRepository.rebuild(conn)
+    print(f"Parts scanned:     {result['parts']}")
+    print(f"Properties stored: {result['properties']}")
+    print(f"Duration:          {round((time.monotonic() - started) * 1000, 1)} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,97 @@
 """
 Dashboard Service - Provides inventory analytics for the dashboard.
 
-Focused, lightweight service for dashboard data only.
+Focused, lightweight service for dashboard data only. Reads come from the materialized
+inventory aggregates (see InventoryAggregateRepository) instead of aggregating every
+allocation per request, and the complete summary is cached for a few seconds.
 """
 
 import logging
-from typing import Dict, Any, List
-from sqlalchemy import func, select
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import func, select, or_
 from sqlmodel import Session
 
 from MakerMatrix.services.base_service import BaseService
+from MakerMatrix.services.system.event_bus import on_cache_invalidation, publish_cache_invalidation
 from MakerMatrix.models.models import (
     PartModel,
     CategoryModel,
     LocationModel,
 )
+from MakerMatrix.models.inventory_aggregate_models import PartInventoryAggregate, InventoryRollup
 from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.repositories.inventory_aggregate_repository import (
+    InventoryAggregateRepository,
+    LOW_STOCK_THRESHOLD,
+    UNCATEGORIZED_KEY,
+    is_stale,
+    set_stale,
+)
+from MakerMatrix.utils.batching import chunks
 
 logger = logging.getLogger(__name__)
 
+# How long a computed dashboard summary is served before it is rebuilt
+SUMMARY_CACHE_TTL_SECONDS = 10
+SUMMARY_CACHE_NAME = "dashboard_summary"
+
 
 class DashboardService(BaseService):
     """Service for dashboard analytics data."""
 
-    def get_inventory_summary(self) -> Dict[str, Any]:
-        """Get overall inventory summary statistics."""
-        with self.get_session() as session:
-            total_parts = session.exec(select(func.count()).select_from(PartModel)).one()[0]
+    def __init__(self, engine_override=None):
+        super().__init__(engine_override)
+        self._summary_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._cache_lock = threading.Lock()
 
-            # Get total units from allocations
-            total_units = session.exec(select(func.sum(PartLocationAllocation.quantity_at_location))).one()[0] or 0
+    # === AGGREGATE MAINTENANCE ===
 
-            total_categories = session.exec(select(func.count()).select_from(CategoryModel)).one()[0]
-            total_locations = session.exec(select(func.count()).select_from(LocationModel)).one()[0]
+    def rebuild_aggregates(self) -> Dict[str, Any]:
+        """Recompute all materialized inventory aggregates from the source tables."""
+        started = time.monotonic()
+        with self.get_session() as session:
+            counts = InventoryAggregateRepository.rebuild(session.connection())
+        set_stale(False)
+        self.invalidate_cache()
+        publish_cache_invalidation(SUMMARY_CACHE_NAME)
+
+        counts["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        logger.info(f"Rebuilt inventory aggregates: {counts}")
+        return counts
+
+    def ensure_aggregates(self) -> None:
+        """Rebuild the aggregates if maintenance failed or they were never populated."""
+        if is_stale():
+            logger.warning("Inventory aggregates marked stale, rebuilding")
+            self.rebuild_aggregates()
+            return
 
-            # Count parts with allocations (have locations)
-            parts_with_location = session.exec(select(func.count(func.distinct(PartLocationAllocation.part_id)))).one()[
-                0
-            ]
+        with self.get_session() as session:
+            has_parts = session.exec(select(PartModel.id).limit(1)).first() is not None
+            has_aggregates = session.exec(select(PartInventoryAggregate.part_id).limit(1)).first() is not None
 
-            parts_without_location = total_parts - parts_with_location
+        if has_parts and not has_aggregates:
+            logger.info("Inventory aggregates are empty, building them")
+            self.rebuild_aggregates()
 
-            # Count low stock parts (< 10 units total across all locations)
-            low_stock_subquery = (
-                select(
-                    PartLocationAllocation.part_id,
-                    func.sum(PartLocationAllocation.quantity_at_location).label("total_quantity"),
-                )
-                .group_by(PartLocationAllocation.part_id)
-                .subquery()
-            )
+    def invalidate_cache(self) -> None:
+        """Drop the cached dashboard summary."""
+        with self._cache_lock:
+            self._summary_cache = None
+
+    # === QUERIES ===
 
-            low_stock_count = session.exec(
-                select(func.count()).select_from(low_stock_subquery).where(low_stock_subquery.c.total_quantity < 10)
-            ).one()[0]
+    def get_inventory_summary(self) -> Dict[str, Any]:
+        """Get overall inventory summary statistics."""
+        with self.get_session() as session:
+            total_parts = session.exec(select(func.count()).select_from(PartModel)).one()[0]
+            total_categories = session.exec(select(func.count()).select_from(CategoryModel)).one()[0]
+            total_locations = session.exec(select(func.count()).select_from(LocationModel)).one()[0]
 
-            # Count zero stock parts
-            zero_stock_count = session.exec(
-                select(func.count()).select_from(low_stock_subquery).where(low_stock_subquery.c.total_quantity == 0)
-            ).one()[0]
+            stock = InventoryAggregateRepository.get_rollups(session.connection(), "stock")
+            parts_with_location, total_units = stock.get("allocated", (0, 0))
 
             return {
                 "total_parts": total_parts,
@@ -66,9 +99,9 @@ class DashboardService(BaseService):
                 "total_categories": total_categories,
                 "total_locations": total_locations,
                 "parts_with_location": parts_with_location,
-                "parts_without_location": parts_without_location,
-                "low_stock_count": low_stock_count,
-                "zero_stock_count": zero_stock_count,
+                "parts_without_location": total_parts - parts_with_location,
+                "low_stock_count": stock.get("low", (0, 0))[0],
+                "zero_stock_count": stock.get("zero", (0, 0))[0],
             }
 
     def get_parts_by_category(self) -> List[Dict[str, Any]]:
@@ -77,21 +110,14 @@ class DashboardService(BaseService):
             stmt = (
                 select(
                     CategoryModel.name.label("category"),
-                    func.count(PartModel.id).label("part_count"),
-                    func.coalesce(
-                        func.sum(
-                            select(func.sum(PartLocationAllocation.quantity_at_location))
-                            .where(PartLocationAllocation.part_id == PartModel.id)
-                            .correlate(PartModel)
-                            .scalar_subquery()
-                        ),
-                        0,
-                    ).label("total_quantity"),
+                    InventoryRollup.part_count,
+                    InventoryRollup.total_quantity,
                 )
-                .select_from(PartModel)
-                .outerjoin(PartModel.categories)
-                .group_by(CategoryModel.name)
-                .order_by(func.count(PartModel.id).desc())
+                .select_from(InventoryRollup)
+                .outerjoin(CategoryModel, CategoryModel.id == InventoryRollup.key)
+                .where(InventoryRollup.dimension == "category")
+                .where(or_(InventoryRollup.key == UNCATEGORIZED_KEY, CategoryModel.id.isnot(None)))
+                .order_by(InventoryRollup.part_count.desc())
             )
 
             results = session.exec(stmt).all()
@@ -111,42 +137,50 @@ class DashboardService(BaseService):
             stmt = (
                 select(
                     LocationModel.name.label("location"),
-                    func.count(func.distinct(PartLocationAllocation.part_id)).label("part_count"),
-                    func.sum(PartLocationAllocation.quantity_at_location).label("total_quantity"),
+                    InventoryRollup.part_count,
+                    InventoryRollup.total_quantity,
                 )
-                .select_from(PartLocationAllocation)
-                .join(LocationModel, PartLocationAllocation.location_id == LocationModel.id)
-                .group_by(LocationModel.name)
-                .order_by(func.count(func.distinct(PartLocationAllocation.part_id)).desc())
+                .select_from(InventoryRollup)
+                .join(LocationModel, LocationModel.id == InventoryRollup.key)
+                .where(InventoryRollup.dimension == "location")
             )
 
-            results = session.exec(stmt).all()
+            # Rollups are kept per location id; the dashboard groups by name
+            by_name: Dict[str, Dict[str, Any]] = {}
+            shared_names = set()
+            for r in session.exec(stmt).all():
+                if r.location in by_name:
+                    shared_names.add(r.location)
+                entry = by_name.setdefault(r.location, {"location": r.location, "part_count": 0, "total_quantity": 0})
+                entry["part_count"] += r.part_count
+                entry["total_quantity"] += int(r.total_quantity)
+
+            # Names are only unique per parent ("Drawer 1" in each cabinet); a part stored in
+            # several locations of one name counts once, so those names count distinct parts
+            for names in chunks(sorted(shared_names)):
+                distinct_parts = (
+                    select(LocationModel.name, func.count(func.distinct(PartLocationAllocation.part_id)))
+                    .select_from(PartLocationAllocation)
+                    .join(LocationModel, PartLocationAllocation.location_id == LocationModel.id)
+                    .where(LocationModel.name.in_(names))
+                    .group_by(LocationModel.name)
+                )
+                for name, part_count in session.exec(distinct_parts).all():
+                    by_name[name]["part_count"] = part_count
 
-            return [
-                {"location": r.location, "part_count": r.part_count, "total_quantity": int(r.total_quantity)}
-                for r in results
-            ]
+            return sorted(by_name.values(), key=lambda entry: entry["part_count"], reverse=True)
 
     def get_parts_by_supplier(self) -> List[Dict[str, Any]]:
         """Get parts distribution by supplier."""
         with self.get_session() as session:
             stmt = (
                 select(
-                    PartModel.supplier.label("supplier"),
-                    func.count(PartModel.id).label("part_count"),
-                    func.coalesce(
-                        func.sum(
-                            select(func.sum(PartLocationAllocation.quantity_at_location))
-                            .where(PartLocationAllocation.part_id == PartModel.id)
-                            .correlate(PartModel)
-                            .scalar_subquery()
-                        ),
-                        0,
-                    ).label("total_quantity"),
+                    InventoryRollup.key.label("supplier"),
+                    InventoryRollup.part_count,
+                    InventoryRollup.total_quantity,
                 )
-                .where(PartModel.supplier.isnot(None))
-                .group_by(PartModel.supplier)
-                .order_by(func.count(PartModel.id).desc())
+                .where(InventoryRollup.dimension == "supplier")
+                .order_by(InventoryRollup.part_count.desc())
             )
 
             results = session.exec(stmt).all()
@@ -156,41 +190,25 @@ class DashboardService(BaseService):
                 for r in results
             ]
 
+    def _stocked_parts_query(self):
+        """Base select over parts that have at least one allocation"""
+        return (
+            select(
+                PartModel.id,
+                PartModel.part_name,
+                PartModel.part_number,
+                PartModel.supplier,
+                PartInventoryAggregate.total_quantity.label("quantity"),
+                PartInventoryAggregate.location_names.label("location"),
+            )
+            .join(PartInventoryAggregate, PartInventoryAggregate.part_id == PartModel.id)
+            .where(PartInventoryAggregate.location_count > 0)
+        )
+
     def get_most_stocked_parts(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get parts with highest stock quantities."""
         with self.get_session() as session:
-            # Subquery for total quantity per part
-            qty_subquery = (
-                select(
-                    PartLocationAllocation.part_id,
-                    func.sum(PartLocationAllocation.quantity_at_location).label("total_qty"),
-                )
-                .group_by(PartLocationAllocation.part_id)
-                .subquery()
-            )
-
-            stmt = (
-                select(
-                    PartModel.id,
-                    PartModel.part_name,
-                    PartModel.part_number,
-                    PartModel.supplier,
-                    qty_subquery.c.total_qty.label("quantity"),
-                    func.group_concat(LocationModel.name, ", ").label("location"),
-                )
-                .join(qty_subquery, PartModel.id == qty_subquery.c.part_id)
-                .outerjoin(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
-                .outerjoin(LocationModel, PartLocationAllocation.location_id == LocationModel.id)
-                .group_by(
-                    PartModel.id,
-                    PartModel.part_name,
-                    PartModel.part_number,
-                    PartModel.supplier,
-                    qty_subquery.c.total_qty,
-                )
-                .order_by(qty_subquery.c.total_qty.desc())
-                .limit(limit)
-            )
+            stmt = self._stocked_parts_query().order_by(PartInventoryAggregate.total_quantity.desc()).limit(limit)
 
             results = session.exec(stmt).all()
 
@@ -209,44 +227,12 @@ class DashboardService(BaseService):
     def get_least_stocked_parts(self, limit: int = 10, exclude_zero: bool = True) -> List[Dict[str, Any]]:
         """Get parts with lowest stock quantities."""
         with self.get_session() as session:
-            # Subquery for total quantity per part
-            qty_subquery = (
-                select(
-                    PartLocationAllocation.part_id,
-                    func.sum(PartLocationAllocation.quantity_at_location).label("total_qty"),
-                )
-                .group_by(PartLocationAllocation.part_id)
-                .subquery()
-            )
-
-            stmt = (
-                select(
-                    PartModel.id,
-                    PartModel.part_name.label("part_name"),
-                    PartModel.part_number,
-                    PartModel.supplier,
-                    qty_subquery.c.total_qty.label("quantity"),
-                    func.group_concat(LocationModel.name, ", ").label("location"),
-                )
-                .join(qty_subquery, PartModel.id == qty_subquery.c.part_id)
-                .outerjoin(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
-                .outerjoin(LocationModel, PartLocationAllocation.location_id == LocationModel.id)
-            )
+            stmt = self._stocked_parts_query()
 
             if exclude_zero:
-                stmt = stmt.where(qty_subquery.c.total_qty > 0)
+                stmt = stmt.where(PartInventoryAggregate.total_quantity > 0)
 
-            stmt = (
-                stmt.group_by(
-                    PartModel.id,
-                    PartModel.part_name,
-                    PartModel.part_number,
-                    PartModel.supplier,
-                    qty_subquery.c.total_qty,
-                )
-                .order_by(qty_subquery.c.total_qty.asc())
-                .limit(limit)
-            )
+            stmt = stmt.order_by(PartInventoryAggregate.total_quantity.asc()).limit(limit)
 
             results = session.exec(stmt).all()
 
@@ -262,40 +248,17 @@ class DashboardService(BaseService):
                 for r in results
             ]
 
-    def get_low_stock_parts(self, threshold: int = 10, include_zero: bool = False) -> List[Dict[str, Any]]:
+    def get_low_stock_parts(
+        self, threshold: int = LOW_STOCK_THRESHOLD, include_zero: bool = False
+    ) -> List[Dict[str, Any]]:
         """Get parts that are low in stock."""
         with self.get_session() as session:
-            # Subquery for total quantity per part
-            qty_subquery = (
-                select(
-                    PartLocationAllocation.part_id,
-                    func.sum(PartLocationAllocation.quantity_at_location).label("total_qty"),
-                )
-                .group_by(PartLocationAllocation.part_id)
-                .subquery()
-            )
-
-            stmt = (
-                select(
-                    PartModel.id,
-                    PartModel.part_name.label("part_name"),
-                    PartModel.part_number,
-                    PartModel.supplier,
-                    qty_subquery.c.total_qty.label("quantity"),
-                    func.group_concat(LocationModel.name, ", ").label("location_name"),
-                )
-                .join(qty_subquery, PartModel.id == qty_subquery.c.part_id)
-                .outerjoin(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
-                .outerjoin(LocationModel, PartLocationAllocation.location_id == LocationModel.id)
-                .where(qty_subquery.c.total_qty < threshold)
-            )
+            stmt = self._stocked_parts_query().where(PartInventoryAggregate.total_quantity < threshold)
 
             if not include_zero:
-                stmt = stmt.where(qty_subquery.c.total_qty > 0)
+                stmt = stmt.where(PartInventoryAggregate.total_quantity > 0)
 
-            stmt = stmt.group_by(
-                PartModel.id, PartModel.part_name, PartModel.part_number, PartModel.supplier, qty_subquery.c.total_qty
-            ).order_by(qty_subquery.c.total_qty.asc())
+            stmt = stmt.order_by(PartInventoryAggregate.total_quantity.asc())
 
             results = session.exec(stmt).all()
 
@@ -306,23 +269,37 @@ class DashboardService(BaseService):
                     "part_number": r.part_number,
                     "supplier": r.supplier or "Unknown",
                     "quantity": int(r.quantity),
-                    "location_name": r.location_name or "No Location",
+                    "location_name": r.location or "No Location",
                 }
                 for r in results
             ]
 
-    def get_dashboard_summary(self) -> Dict[str, Any]:
+    def get_dashboard_summary(self, use_cache: bool = True) -> Dict[str, Any]:
         """Get complete dashboard summary (all data at once)."""
-        return {
+        if use_cache:
+            with self._cache_lock:
+                cached = self._summary_cache
+            if cached and time.monotonic() - cached[0] < SUMMARY_CACHE_TTL_SECONDS:
+                return cached[1]
+
+        self.ensure_aggregates()
+
+        summary = {
             "summary": self.get_inventory_summary(),
             "parts_by_category": self.get_parts_by_category(),
             "parts_by_location": self.get_parts_by_location(),
             "parts_by_supplier": self.get_parts_by_supplier(),
             "most_stocked_parts": self.get_most_stocked_parts(limit=10),
             "least_stocked_parts": self.get_least_stocked_parts(limit=10, exclude_zero=True),
-            "low_stock_parts": self.get_low_stock_parts(threshold=10, include_zero=False)[:10],
+            "low_stock_parts": self.get_low_stock_parts(threshold=LOW_STOCK_THRESHOLD, include_zero=False)[:10],
         }
 
+        with self._cache_lock:
+            self._summary_cache = (time.monotonic(), summary)
+
+        return summary
+
 
 # Global service instance
 dashboard_service = DashboardService()
+on_cache_invalidation(SUMMARY_CACHE_NAME, lambda key: dashboard_service.invalidate_cache())
@@ -0,0 +1,234 @@
+"""
+Data Export Service - Streams inventory data as NDJSON or CSV.
+
+Rows are read through a server-side cursor in fixed-size batches and encoded as they
+arrive, so memory use stays flat regardless of inventory size. Parts and allocations
+can be exported incrementally with a `since` timestamp. An incremental export only covers
+rows inserted or updated since then: deleted rows leave no trace to export, so a copy kept
+in sync this way needs a periodic full export to drop them.
+"""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from MakerMatrix.services.base_service import BaseService
+from MakerMatrix.models.models import PartModel, CategoryModel, LocationModel
+from MakerMatrix.models.part_models import PartCategoryLink
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the cursor (and encoded) per batch
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Entity exported by entity="all", in output order (reference data first)
+ALL_ENTITIES = ("categories", "locations", "parts", "allocations")
+
+_parts = PartModel.__table__
+_categories = CategoryModel.__table__
+_locations = LocationModel.__table__
+_allocations = PartLocationAllocation.__table__
+_part_categories = PartCategoryLink.__table__
+
+# Export field name -> column, per entity. Parts expose their denormalized stock columns
+# under the names used by the API.
+_PART_COLUMNS = {
+    **{name: column for name, column in _parts.c.items() if not name.startswith("cached_")},
+    "total_quantity": _parts.c.cached_total_quantity,
+    "location_count": _parts.c.cached_location_count,
+}
+_ENTITY_COLUMNS = {
+    "parts": _PART_COLUMNS,
+    "locations": dict(_locations.c.items()),
+    "categories": dict(_categories.c.items()),
+    "allocations": dict(_allocations.c.items()),
+}
+
+# Part fields resolved from related tables once per batch
+_PART_RELATION_FIELDS = ("categories", "primary_location")
+
+EXPORT_FIELDS = {
+    entity: tuple(columns) + (_PART_RELATION_FIELDS if entity == "parts" else ())
+    for entity, columns in _ENTITY_COLUMNS.items()
+}
+
+# Column used for incremental exports; entities without one are always exported in full
+_SINCE_COLUMNS = {"parts": _parts.c.updated_at, "allocations": _allocations.c.last_updated}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _gzip(chunks: Iterator[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class DataExportService(BaseService):
+    """Service for streaming exports of parts, locations, categories and allocations."""
+
+    def __init__(self, engine_override=None):
+        super().__init__(engine_override)
+
+    def resolve_fields(self, entity: str, fields: Optional[List[str]] = None) -> List[str]:
+        """Validate a field selection for `entity`; no selection means every field."""
+        if entity not in EXPORT_FIELDS:
+            raise ValueError(f"Unknown export entity '{entity}'. Expected one of: {', '.join(EXPORT_FIELDS)}, all")
+        if not fields:
+            return list(EXPORT_FIELDS[entity])
+
+        unknown = [field for field in fields if field not in EXPORT_FIELDS[entity]]
+        if unknown:
+            raise ValueError(f"Unknown {entity} fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(fields))
+
+    def stream_export(
+        self,
+        entity: str = "all",
+        export_format: str = "ndjson",
+        fields: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """
+        Validate the export parameters and return an iterator of encoded chunks.
+
+        Args:
+            entity: parts, locations, categories, allocations, or all (NDJSON only)
+            export_format: ndjson or csv
+            fields: Field selection for a single-entity export
+            since: Only include parts/allocations inserted or updated at or after this time;
+                deletions are not reported
+            compress: Gzip the output
+
+        Raises:
+            ValueError: If the parameters are invalid. Raised here rather than while
+                streaming so the caller can still return an error response.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format '{export_format}'. Expected one of: {', '.join(EXPORT_FORMATS)}")
+
+        if entity == "all":
+            if export_format == "csv":
+                raise ValueError("CSV exports require a single entity")
+            if fields:
+                raise ValueError("Field selection requires a single entity")
+            plan = [(name, self.resolve_fields(name)) for name in ALL_ENTITIES]
+        else:
+            plan = [(entity, self.resolve_fields(entity, fields))]
+
+        if since is not None and since.tzinfo is not None:
+            # Timestamps are stored as naive UTC
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+        if export_format == "csv":
+            chunks = self._encode_csv(*plan[0], since)
+        else:
+            chunks = self._encode_ndjson(plan, since, tag_entity=entity == "all")
+        if compress:
+            return _gzip(chunks)
+        return (chunk.encode("utf-8") for chunk in chunks)
+
+    def iter_batches(
+        self, entity: str, fields: List[str], since: Optional[datetime] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield lists of export records, reading `entity` through a server-side cursor."""
+        columns = _ENTITY_COLUMNS[entity]
+        wanted = [field for field in fields if field in columns]
+        selected = [columns[field].label(field) for field in dict.fromkeys(["id", *wanted])]
+
+        stmt = select(*selected)
+        since_column = _SINCE_COLUMNS.get(entity)
+        if since is not None and since_column is not None:
+            stmt = stmt.where(since_column >= since).order_by(since_column, columns["id"])
+        else:
+            stmt = stmt.order_by(columns["id"])
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE).execute(stmt)
+            for partition in result.mappings().partitions():
+                records = [dict(row) for row in partition]
+                if entity == "parts":
+                    self._add_part_relations(conn, records, fields)
+                yield [{field: record[field] for field in fields} for record in records]
+
+        logger.debug(f"Finished streaming {entity} export")
+
+    @staticmethod
+    def _add_part_relations(conn, records: List[Dict[str, Any]], fields: List[str]) -> None:
+        """Fill the category names and primary location of a batch of parts with one query each"""
+        part_ids = [record["id"] for record in records]
+
+        if "categories" in fields:
+            names: Dict[str, List[str]] = {part_id: [] for part_id in part_ids}
+            rows = conn.execute(
+                select(_part_categories.c.part_id, _categories.c.name)
+                .join(_categories, _categories.c.id == _part_categories.c.category_id)
+                .where(_part_categories.c.part_id.in_(part_ids))
+                .order_by(_categories.c.name)
+            )
+            for part_id, name in rows:
+                names[part_id].append(name)
+            for record in records:
+                record["categories"] = names[record["id"]]
+
+        if "primary_location" in fields:
+            # Primary storage wins; otherwise the first allocation, matching PartModel.primary_location
+            primary: Dict[str, str] = {}
+            rows = conn.execute(
+                select(_allocations.c.part_id, _locations.c.name)
+                .join(_locations, _locations.c.id == _allocations.c.location_id)
+                .where(_allocations.c.part_id.in_(part_ids))
+                .order_by(_allocations.c.part_id, _allocations.c.is_primary_storage.desc(), _allocations.c.allocated_at)
+            )
+            for part_id, name in rows:
+                primary.setdefault(part_id, name)
+            for record in records:
+                record["primary_location"] = primary.get(record["id"])
+
+    def _encode_ndjson(self, plan, since: Optional[datetime], tag_entity: bool) -> Iterator[str]:
+        for entity, fields in plan:
+            for batch in self.iter_batches(entity, fields, since):
+                if tag_entity:
+                    batch = [{"_entity": entity, **record} for record in batch]
+                yield "".join(json.dumps(record, default=_json_default) + "\n" for record in batch)
+
+    def _encode_csv(self, entity: str, fields: List[str], since: Optional[datetime]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for batch in self.iter_batches(entity, fields, since):
+            for record in batch:
+                writer.writerow([_csv_value(record[field]) for field in fields])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
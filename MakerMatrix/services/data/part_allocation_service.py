@@ -21,6 +21,7 @@ from MakerMatrix.models.part_allocation_models import (
 from MakerMatrix.models.part_models import PartModel
 from MakerMatrix.models.location_models import LocationModel
 from MakerMatrix.repositories.part_allocation_repository import PartAllocationRepository
+from MakerMatrix.repositories.inventory_aggregate_repository import InventoryAggregateRepository
 from MakerMatrix.services.base_service import BaseService, ServiceResponse
 from MakerMatrix.repositories.custom_exceptions import ResourceNotFoundError, InvalidReferenceError
 
@@ -30,8 +31,8 @@ logger = logging.getLogger(__name__)
 class PartAllocationService(BaseService):
     """Service for managing part-location allocations"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, engine_override=None):
+        super().__init__(engine_override)
         self.entity_name = "PartAllocation"
 
     def get_allocations_for_part(self, part_id: str) -> ServiceResponse[Dict[str, Any]]:
@@ -489,3 +490,43 @@ class PartAllocationService(BaseService):
 
         except Exception as e:
             return self.handle_exception(e, f"split to cassette for part {part_id}")
+
+    def check_quantity_consistency(self, repair: bool = False) -> ServiceResponse[Dict[str, Any]]:
+        """
+        Compare the denormalized part stock columns against the allocation rows.
+
+        Args:
+            repair: Recompute the columns of every mismatched part
+
+        Returns:
+            ServiceResponse with the mismatches found and the number of parts repaired
+        """
+        try:
+            self.log_operation("check_quantity_consistency", "Part")
+
+            with self.get_session() as session:
+                conn = session.connection()
+                mismatches = InventoryAggregateRepository.find_stock_column_mismatches(conn)
+                repaired = 0
+                if repair and mismatches:
+                    repaired = InventoryAggregateRepository.repair_stock_columns(
+                        conn, [row["id"] for row in mismatches]
+                    )
+
+                response_data = {
+                    "consistent": not mismatches,
+                    "mismatch_count": len(mismatches),
+                    "mismatches": mismatches,
+                    "repaired_count": repaired,
+                }
+
+                if not mismatches:
+                    return self.success_response("Part quantities are consistent with allocations", response_data)
+                if repair:
+                    return self.success_response(f"Repaired quantities for {repaired} parts", response_data)
+                return self.success_response(
+                    f"Found {len(mismatches)} parts with inconsistent quantities", response_data
+                )
+
+        except Exception as e:
+            return self.handle_exception(e, "check part quantity consistency")
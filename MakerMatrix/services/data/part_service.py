@@ -10,6 +10,8 @@ from MakerMatrix.models.models import CategoryModel, LocationQueryModel, Advance
 from MakerMatrix.models.part_allocation_models import PartLocationAllocation
 from MakerMatrix.exceptions import ResourceNotFoundError, PartAlreadyExistsError
 from MakerMatrix.repositories.parts_repositories import PartRepository, handle_categories
+from MakerMatrix.repositories.location_path_repository import LocationPathRepository
+from MakerMatrix.repositories.part_projection_repository import PartProjection, PartProjectionRepository
 from MakerMatrix.models.models import PartModel
 from MakerMatrix.models.models import engine  # Import the engine from db.py
 from MakerMatrix.database.db import get_session
@@ -250,7 +252,7 @@ class PartService(BaseService):
                 self.logger.info(f"Deleting part: '{part_name}' (ID: {part_id}) with categories: {part_categories}")
 
                 # Clean up associated files before deleting the part record
-                files_deleted = self._cleanup_part_files(part)
+                files_deleted = self._cleanup_part_files(part, session)
                 if files_deleted:
                     self.logger.info(f"Deleted {files_deleted} file(s) for part '{part_name}' (ID: {part_id})")
 
@@ -264,21 +266,32 @@ class PartService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"delete {self.entity_name}")
 
-    def _cleanup_part_files(self, part: "PartModel") -> int:
+    def _cleanup_part_files(self, part: "PartModel", session: Session = None) -> int:
         """
         Clean up image and datasheet files associated with a part.
 
+        Datasheet files are content-addressed and may be shared with other parts; a
+        file is only removed when no other part's datasheet record references it.
+
         Args:
             part: The part model to clean up files for
+            session: Session used to check datasheet references from other parts
 
         Returns:
             Number of files deleted
         """
         import os
         from pathlib import Path
+        from MakerMatrix.repositories.datasheet_repository import DatasheetRepository
 
         deleted_count = 0
         static_dir = Path(__file__).parent.parent / "static"
+        datasheet_repo = DatasheetRepository()
+
+        def datasheet_shared(filename: str) -> bool:
+            if session is None:
+                return False
+            return datasheet_repo.count_file_references(session, filename, exclude_part_id=part.id) > 0
 
         # Clean up image file
         if part.image_url:
@@ -295,35 +308,24 @@ class PartService(BaseService):
             except Exception as e:
                 self.logger.warning(f"Failed to delete image file for part {part.part_name}: {e}")
 
-        # Clean up datasheet files from PartDatasheet records
-        if hasattr(part, "datasheets") and part.datasheets:
-            for datasheet in part.datasheets:
-                try:
-                    if hasattr(datasheet, "file_url") and datasheet.file_url:
-                        # Extract filename from URL
-                        if "/static/datasheets/" in datasheet.file_url:
-                            filename = datasheet.file_url.split("/static/datasheets/")[-1]
-                            datasheet_path = static_dir / "datasheets" / filename
-
-                            if datasheet_path.exists() and datasheet_path.is_file():
-                                os.remove(datasheet_path)
-                                deleted_count += 1
-                                self.logger.debug(f"Deleted datasheet file: {datasheet_path}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to delete datasheet file for part {part.part_name}: {e}")
-
-        # Clean up enriched datasheet file from additional_properties
+        # Datasheet files from DatasheetModel records and the enriched datasheet in additional_properties
+        filenames = {datasheet.filename for datasheet in part.datasheets or [] if datasheet.filename}
         if part.additional_properties and part.additional_properties.get("datasheet_filename"):
+            filenames.add(part.additional_properties["datasheet_filename"])
+
+        for filename in filenames:
             try:
-                filename = part.additional_properties["datasheet_filename"]
-                datasheet_path = static_dir / "datasheets" / filename
+                datasheet_path = static_dir / "datasheets" / Path(filename).name
+                if datasheet_shared(datasheet_path.name):
+                    self.logger.debug(f"Keeping datasheet file still used by other parts: {datasheet_path}")
+                    continue
 
                 if datasheet_path.exists() and datasheet_path.is_file():
                     os.remove(datasheet_path)
                     deleted_count += 1
-                    self.logger.debug(f"Deleted enriched datasheet file: {datasheet_path}")
+                    self.logger.debug(f"Deleted datasheet file: {datasheet_path}")
             except Exception as e:
-                self.logger.warning(f"Failed to delete enriched datasheet file for part {part.part_name}: {e}")
+                self.logger.warning(f"Failed to delete datasheet file for part {part.part_name}: {e}")
 
         return deleted_count
 
@@ -757,10 +759,34 @@ class PartService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"get {self.entity_name} counts")
 
-    def get_all_parts(self, page: int = 1, page_size: int = 10) -> ServiceResponse[Dict[str, Any]]:
+    @staticmethod
+    def _serialize_parts(
+        session: Session, parts: List[PartModel], projection: Optional[PartProjection] = None
+    ) -> List[Dict[str, Any]]:
+        """Serialize a page of parts with their locations' parent and capacity data batch-loaded"""
+        if projection is not None and projection.is_summary:
+            return PartProjectionRepository.grid_rows(session.connection(), parts)
+
+        fields = projection.fields if projection is not None else None
+        location_batch = None
+        if fields is None or "location" in fields:
+            location_batch = LocationPathRepository.load_batch(
+                session.connection(), [part.primary_location for part in parts]
+            )
+        return [part.to_dict(location_batch=location_batch, fields=fields) for part in parts]
+
+    @staticmethod
+    def _loader_options(projection: Optional[PartProjection]) -> Optional[list]:
+        return projection.loader_options() if projection is not None else None
+
+    def get_all_parts(
+        self, page: int = 1, page_size: int = 10, projection: Optional[PartProjection] = None
+    ) -> ServiceResponse[Dict[str, Any]]:
         """
         Get all parts with pagination.
 
+        `projection` selects the fields (and with them the relationships loaded) per item.
+
         CONSOLIDATED SESSION MANAGEMENT: Migrated from static method with manual session
         management to BaseService pattern for consistency.
         """
@@ -769,11 +795,13 @@ class PartService(BaseService):
 
             with self.get_session() as session:
                 # Fetch parts using the repository
-                parts = self.part_repo.get_all_parts(session=session, page=page, page_size=page_size)
+                parts = self.part_repo.get_all_parts(
+                    session=session, page=page, page_size=page_size, options=self._loader_options(projection)
+                )
                 total_parts = self.part_repo.get_part_counts(session)
 
                 parts_data = {
-                    "items": [part.to_dict() for part in parts],
+                    "items": self._serialize_parts(session, parts, projection),
                     "page": page,
                     "page_size": page_size,
                     "total": total_parts,
@@ -1034,7 +1062,9 @@ class PartService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"update {self.entity_name}")
 
-    def advanced_search(self, search_params: AdvancedPartSearch) -> ServiceResponse[Dict[str, Any]]:
+    def advanced_search(
+        self, search_params: AdvancedPartSearch, projection: Optional[PartProjection] = None
+    ) -> ServiceResponse[Dict[str, Any]]:
         """
         Perform an advanced search on parts with multiple filters and sorting options.
         Returns a dictionary containing the search results and metadata.
@@ -1043,10 +1073,12 @@ class PartService(BaseService):
             self.log_operation("advanced_search", "parts", f"filters: {search_params.search_term}")
 
             with self.get_session() as session:
-                results, total_count = self.part_repo.advanced_search(session, search_params)
+                results, total_count = self.part_repo.advanced_search(
+                    session, search_params, options=self._loader_options(projection)
+                )
 
                 search_data = {
-                    "items": [part.to_dict() for part in results],
+                    "items": self._serialize_parts(session, results, projection),
                     "total": total_count,
                     "page": search_params.page,
                     "page_size": search_params.page_size,
@@ -1058,7 +1090,9 @@ class PartService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"advanced search with filters")
 
-    def search_parts_text(self, query: str, page: int = 1, page_size: int = 20) -> ServiceResponse[Dict[str, Any]]:
+    def search_parts_text(
+        self, query: str, page: int = 1, page_size: int = 20, projection: Optional[PartProjection] = None
+    ) -> ServiceResponse[Dict[str, Any]]:
         """
         Simple text search across part names, part numbers, and descriptions.
         """
@@ -1066,10 +1100,12 @@ class PartService(BaseService):
             self.log_operation("search", "parts", f"text query: {query}")
 
             with self.get_session() as session:
-                results, total_count = self.part_repo.search_parts_text(session, query, page, page_size)
+                results, total_count = self.part_repo.search_parts_text(
+                    session, query, page, page_size, options=self._loader_options(projection)
+                )
 
                 search_data = {
-                    "items": [part.to_dict() for part in results],
+                    "items": self._serialize_parts(session, results, projection),
                     "total": total_count,
                     "page": page,
                     "page_size": page_size,
@@ -1096,6 +1132,27 @@ class PartService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"get part suggestions for query '{query}'")
 
+    def get_most_viewed_parts(self, limit: int = 10) -> ServiceResponse[List[Dict[str, Any]]]:
+        """
+        Parts with the most detail views. Counts are written by the usage counters every few
+        seconds, so the most recent views may not be included yet.
+        """
+        try:
+            self.log_operation("get", "most viewed parts", f"limit: {limit}")
+
+            with self.get_session() as session:
+                rows = self.part_repo.get_most_viewed_parts(session, limit)
+                items = self._serialize_parts(session, [part for part, _ in rows])
+                for item, (_, metadata) in zip(items, rows):
+                    item["view_count"] = metadata.view_count
+                    item["search_count"] = metadata.search_count
+                    item["last_accessed"] = metadata.last_accessed.isoformat() if metadata.last_accessed else None
+
+                return self.success_response(f"Found {len(items)} most viewed parts", items)
+
+        except Exception as e:
+            return self.handle_exception(e, "get most viewed parts")
+
     # def get_part_by_details(part_id: Optional[str] = None, part_number: Optional[str] = None,
     #                         part_name: Optional[str] = None) -> Optional[dict]:
     #     # Determine which parameter is provided and call the appropriate repo method
@@ -1345,6 +1402,9 @@ class PartService(BaseService):
         """
         Bulk update multiple parts with shared field values.
 
+        Runs set-based: part ids are validated with IN queries, shared fields are written with a
+        single UPDATE ... WHERE id IN (...), and category links are inserted/deleted in bulk.
+
         Args:
             update_request: Dictionary containing:
                 - part_ids: List of part IDs to update
@@ -1357,79 +1417,85 @@ class PartService(BaseService):
         Returns:
             ServiceResponse with update summary
         """
+        from datetime import datetime
+        from MakerMatrix.models.models import LocationModel
+        from MakerMatrix.repositories.inventory_aggregate_repository import InventoryAggregateRepository
+
         try:
-            part_ids = update_request.get("part_ids", [])
+            part_ids = list(dict.fromkeys(update_request.get("part_ids", [])))
             supplier = update_request.get("supplier")
             location_id = update_request.get("location_id")
             minimum_quantity = update_request.get("minimum_quantity")
-            add_categories = update_request.get("add_categories", [])
-            remove_categories = update_request.get("remove_categories", [])
+            add_categories = update_request.get("add_categories") or []
+            remove_categories = update_request.get("remove_categories") or []
+
+            if minimum_quantity is not None:
+                # PartModel has no minimum_quantity column; accepted for API compatibility only
+                logger.warning("bulk_update_parts: minimum_quantity is not stored on parts and was ignored")
 
-            updated_count = 0
-            failed_count = 0
             errors = []
 
             with self.get_session() as session:
-                for part_id in part_ids:
-                    try:
-                        # Get the part
-                        part = self.part_repo.get_part_by_id(session, part_id)
-                        if not part:
-                            failed_count += 1
-                            errors.append({"part_id": part_id, "error": "Part not found"})
-                            continue
-
-                        # Update simple fields
-                        if supplier is not None:
-                            part.supplier = supplier
-
-                        if minimum_quantity is not None:
-                            part.minimum_quantity = minimum_quantity
-
-                        # Update location (primary allocation)
-                        if location_id is not None:
-                            from MakerMatrix.models.part_allocation_models import PartLocationAllocation
-                            from datetime import datetime
+                existing_ids = self.part_repo.get_existing_part_ids(session, part_ids)
+                errors.extend(
+                    {"part_id": pid, "error": "Part not found"} for pid in part_ids if pid not in existing_ids
+                )
+                target_ids = [pid for pid in part_ids if pid in existing_ids]
+
+                allocations_to_move = []
+                if location_id is not None and target_ids:
+                    if not session.get(LocationModel, location_id):
+                        return self.error_response(f"Location with ID '{location_id}' not found")
+
+                    primary = self.part_repo.get_primary_allocations(session, target_ids)
+                    movable = {pid for pid, (_, current) in primary.items() if current != location_id}
+
+                    # A part can only hold one allocation per location
+                    conflicting = self.part_repo.get_part_ids_allocated_at(session, list(movable), location_id)
+                    errors.extend(
+                        {"part_id": pid, "error": "Part already has an allocation at this location"}
+                        for pid in target_ids
+                        if pid in conflicting
+                    )
+                    target_ids = [pid for pid in target_ids if pid not in conflicting]
+                    allocations_to_move = [primary[pid][0] for pid in target_ids if pid in movable]
 
-                            # Find or create primary allocation
-                            primary_alloc = next(
-                                (alloc for alloc in part.allocations if alloc.is_primary_storage),
-                                part.allocations[0] if part.allocations else None,
-                            )
+                if not target_ids:
+                    result = {"updated_count": 0, "failed_count": len(errors), "errors": errors}
+                    return self.success_response(f"Bulk update completed: 0 succeeded, {len(errors)} failed", result)
 
-                            if primary_alloc:
-                                primary_alloc.location_id = location_id
-                                primary_alloc.last_updated = datetime.utcnow()
-                                session.add(primary_alloc)
+                # Category changes bypass the ORM, so keep the dashboard aggregates in step explicitly
+                conn = session.connection()
+                before = InventoryAggregateRepository.load_part_states(conn, set(target_ids))
 
-                        # Handle categories
-                        if add_categories:
-                            from MakerMatrix.repositories.parts_repositories import handle_categories
+                values = {"updated_at": datetime.utcnow()}
+                if supplier is not None:
+                    values["supplier"] = supplier
+                self.part_repo.bulk_update_fields(session, target_ids, values)
 
-                            categories_to_add = handle_categories(session, add_categories)
-                            for category in categories_to_add:
-                                if category not in part.categories:
-                                    part.categories.append(category)
+                if allocations_to_move:
+                    self.part_repo.bulk_move_allocations(session, allocations_to_move, location_id)
 
-                        if remove_categories:
-                            part.categories = [cat for cat in part.categories if cat.name not in remove_categories]
+                if add_categories:
+                    categories = handle_categories(session, add_categories)
+                    self.part_repo.bulk_add_categories(session, target_ids, [c.id for c in categories])
 
-                        # Save the part
-                        session.add(part)
-                        updated_count += 1
+                if remove_categories:
+                    remove_ids = session.exec(
+                        select(CategoryModel.id).where(CategoryModel.name.in_(remove_categories))
+                    ).all()
+                    self.part_repo.bulk_remove_categories(session, target_ids, [row[0] for row in remove_ids])
 
-                    except Exception as e:
-                        failed_count += 1
-                        errors.append({"part_id": part_id, "error": str(e)})
-                        logger.error(f"Failed to update part {part_id}: {e}")
+                after = InventoryAggregateRepository.load_part_states(conn, set(target_ids))
+                InventoryAggregateRepository.apply_part_changes(conn, before, after, set(target_ids))
 
-                # Commit all updates
                 session.commit()
 
-            result = {"updated_count": updated_count, "failed_count": failed_count, "errors": errors}
+            updated_count = len(target_ids)
+            result = {"updated_count": updated_count, "failed_count": len(errors), "errors": errors}
 
             return self.success_response(
-                f"Bulk update completed: {updated_count} succeeded, {failed_count} failed", result
+                f"Bulk update completed: {updated_count} succeeded, {len(errors)} failed", result
             )
 
         except Exception as e:
@@ -1467,7 +1533,7 @@ class PartService(BaseService):
                         part_name = part.part_name
 
                         # Clean up associated files
-                        files_deleted = self._cleanup_part_files(part)
+                        files_deleted = self._cleanup_part_files(part, session)
                         total_files_deleted += files_deleted
 
                         # Delete the part
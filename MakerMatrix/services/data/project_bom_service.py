@@ -0,0 +1,252 @@
+"""
+Project BOM Service - what can be built from the current stock.
+
+Buildable counts, shortages, stock sources and the cost of the shortfall come from the
+set-based queries in ProjectBomRepository. Results are cached per project and build quantity;
+flush hooks drop the entries of every project whose lines, allocations or current prices
+changed once the transaction commits, and other worker processes are told through the event
+bus. Writes that bypass the ORM are covered by the cache TTL.
+"""
+
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_metadata_models import PartPricingHistory
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.project_models import PartProjectLink, ProjectModel
+from MakerMatrix.repositories.inventory_aggregate_repository import history_values
+from MakerMatrix.repositories.project_bom_repository import ProjectBomRepository
+from MakerMatrix.services.base_service import BaseService, ServiceResponse
+from MakerMatrix.services.system.event_bus import on_cache_invalidation, publish_cache_invalidation
+
+logger = logging.getLogger(__name__)
+
+BOM_CACHE_TTL_SECONDS = float(os.getenv("BOM_CACHE_TTL_SECONDS", "300"))
+BOM_CACHE_NAME = "project_bom"
+
+# Above this many projects in one commit the whole cache is dropped instead
+MAX_INVALIDATION_KEYS = 50
+
+_TOUCHED_KEY = "project_bom_touched"
+
+CacheKey = Tuple[str, str, int]  # (kind, project_id, build_quantity)
+
+
+class BomCache:
+    """Results per (kind, project, build quantity) with a TTL"""
+
+    # Every live cache, so commits invalidate all of them
+    instances: "weakref.WeakSet[BomCache]" = weakref.WeakSet()
+
+    def __init__(self, ttl_seconds: float = BOM_CACHE_TTL_SECONDS):
+        BomCache.instances.add(self)
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[CacheKey, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; results computed before one are not stored
+        self.generation = 0
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: CacheKey, value: Any, generation: int) -> None:
+        """Store a result computed when the cache was at `generation`"""
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, project_ids: Optional[Iterable[str]] = None) -> None:
+        """Drop the entries of the given projects, or everything"""
+        with self._lock:
+            self.generation += 1
+            self.stats["invalidations"] += 1
+            if project_ids is None:
+                self._entries.clear()
+                return
+            project_ids = set(project_ids)
+            for key in [key for key in self._entries if key[1] in project_ids]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+bom_cache = BomCache()
+
+
+class ProjectBomService(BaseService):
+    """Service for project BOM availability"""
+
+    def __init__(self, engine_override=None, cache: Optional[BomCache] = None):
+        super().__init__(engine_override)
+        self.cache = cache if cache is not None else bom_cache
+        self.entity_name = "Project BOM"
+
+    def get_project_bom(self, project_id: str, build_quantity: int = 1) -> ServiceResponse[Dict[str, Any]]:
+        """
+        Full BOM of one project: summary, lines with shortages and the locations holding each part.
+        """
+        try:
+            if build_quantity < 1:
+                return self.error_response("build_quantity must be at least 1")
+
+            key = ("bom", project_id, build_quantity)
+            generation = self.cache.generation
+            bom = self.cache.get(key)
+            if bom is None:
+                self.log_operation("get_bom", self.entity_name, project_id)
+                with self.get_session() as session:
+                    conn = session.connection()
+                    summary = ProjectBomRepository.get_summaries(conn, [project_id], build_quantity).get(project_id)
+                    if summary is None:
+                        return self.error_response(f"Project with ID '{project_id}' not found")
+                    lines = ProjectBomRepository.get_lines(conn, project_id, build_quantity)
+                    sources = ProjectBomRepository.get_sources(conn, [line["part_id"] for line in lines])
+                for line in lines:
+                    line["sources"] = sources.get(line["part_id"], [])
+                bom = {"summary": summary, "lines": lines}
+                self.cache.put(key, bom, generation)
+                self.cache.put(("summary", project_id, build_quantity), summary, generation)
+
+            return self.success_response(f"BOM for project '{bom['summary']['project_name']}'", bom)
+
+        except Exception as e:
+            return self.handle_exception(e, f"get {self.entity_name}")
+
+    def get_buildable(
+        self, project_ids: Optional[List[str]] = None, status: Optional[str] = None, build_quantity: int = 1
+    ) -> ServiceResponse[Dict[str, Any]]:
+        """
+        Availability summary of many projects at once ("what can we build today").
+
+        Each project is evaluated against the full stock on its own; projects sharing a part
+        are not netted against each other.
+        """
+        try:
+            if build_quantity < 1:
+                return self.error_response("build_quantity must be at least 1")
+
+            generation = self.cache.generation
+            with self.get_session() as session:
+                conn = session.connection()
+                if project_ids is None:
+                    project_ids = ProjectBomRepository.get_project_ids(conn, status)
+
+                summaries: Dict[str, Dict[str, Any]] = {}
+                missing = []
+                for project_id in project_ids:
+                    cached = self.cache.get(("summary", project_id, build_quantity))
+                    if cached is None:
+                        missing.append(project_id)
+                    else:
+                        summaries[project_id] = cached
+
+                if missing:
+                    self.log_operation("get_buildable", self.entity_name, f"{len(missing)} projects")
+                    computed = ProjectBomRepository.get_summaries(conn, missing, build_quantity)
+                    for project_id, summary in computed.items():
+                        self.cache.put(("summary", project_id, build_quantity), summary, generation)
+                    summaries.update(computed)
+
+            projects = [summaries[project_id] for project_id in project_ids if project_id in summaries]
+            return self.success_response(
+                f"Availability for {len(projects)} projects",
+                {
+                    "build_quantity": build_quantity,
+                    "projects": projects,
+                    "buildable_count": sum(1 for project in projects if project["can_build"]),
+                    "total_shortfall_cost": round(sum(project["shortfall_cost"] for project in projects), 4),
+                },
+            )
+
+        except Exception as e:
+            return self.handle_exception(e, "get buildable projects")
+
+
+# === Cache invalidation ===
+
+
+def invalidate_projects(project_ids: Optional[Iterable[str]] = None) -> None:
+    """Drop cached BOMs in this and every other worker process"""
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if len(project_ids) > MAX_INVALIDATION_KEYS:
+            project_ids = None
+    _invalidate_local(project_ids)
+    if project_ids is None:
+        publish_cache_invalidation(BOM_CACHE_NAME)
+    else:
+        for project_id in project_ids:
+            publish_cache_invalidation(BOM_CACHE_NAME, project_id)
+
+
+def _invalidate_local(project_ids: Optional[List[str]]) -> None:
+    for cache in list(BomCache.instances):
+        cache.invalidate(project_ids)
+
+
+def _after_flush(session: OrmSession, _flush_context) -> None:
+    """Collect the projects whose BOM results the flushed changes affect"""
+    part_ids: Set[str] = set()
+    project_ids: Set[str] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (PartLocationAllocation, PartPricingHistory)):
+            part_ids.update(history_values(obj, "part_id"))
+        elif isinstance(obj, PartProjectLink):
+            project_ids.update(history_values(obj, "project_id"))
+        elif isinstance(obj, ProjectModel):
+            project_ids.add(obj.id)
+        elif isinstance(obj, PartModel) and obj in session.deleted:
+            part_ids.add(obj.id)
+    if not (part_ids or project_ids):
+        return
+
+    try:
+        project_ids.update(ProjectBomRepository.get_project_ids_for_parts(session.connection(), part_ids))
+    except Exception as e:
+        logger.warning(f"Could not resolve projects for BOM cache invalidation, dropping all: {e}")
+        project_ids = None
+    touched = session.info.setdefault(_TOUCHED_KEY, set())
+    if project_ids is None or touched is None:
+        session.info[_TOUCHED_KEY] = None
+    else:
+        touched.update(project_ids)
+
+
+def _after_commit(session: OrmSession) -> None:
+    if _TOUCHED_KEY not in session.info:
+        return
+    touched = session.info.pop(_TOUCHED_KEY)
+    if touched is None or touched:
+        invalidate_projects(touched)
+
+
+def _after_soft_rollback(session: OrmSession, _previous_transaction) -> None:
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_bom_cache_hooks() -> None:
+    """Install the session hooks that invalidate cached BOMs (idempotent)"""
+    if not event.contains(OrmSession, "after_flush", _after_flush):
+        event.listen(OrmSession, "after_flush", _after_flush)
+        event.listen(OrmSession, "after_commit", _after_commit)
+        event.listen(OrmSession, "after_soft_rollback", _after_soft_rollback)
+
+
+register_bom_cache_hooks()
+on_cache_invalidation(BOM_CACHE_NAME, lambda key: _invalidate_local(None if key is None else [key]))
@@ -3,13 +3,14 @@ import re
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
-from sqlmodel import Session
-from MakerMatrix.models.project_models import ProjectModel
+from sqlmodel import Session, select
+from MakerMatrix.models.project_models import ProjectModel, PartProjectLink
 from MakerMatrix.models.models import engine
 from MakerMatrix.repositories.project_repository import ProjectRepository
 from MakerMatrix.database.db import get_session
 from MakerMatrix.exceptions import ProjectAlreadyExistsError, ProjectNotFoundError, ResourceNotFoundError
 from MakerMatrix.services.base_service import BaseService, ServiceResponse
+from MakerMatrix.services.data.project_bom_service import invalidate_projects
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -165,6 +166,8 @@ class ProjectService(BaseService):
         try:
             session = next(get_session())
             count = ProjectRepository.delete_all_projects(session)
+            # Bulk deletes bypass the flush hooks that keep cached BOMs current
+            invalidate_projects()
 
             logger.warning(f"Successfully deleted all {count} projects from the system")
             return {
@@ -241,14 +244,17 @@ class ProjectService(BaseService):
         except Exception as e:
             return self.handle_exception(e, f"update {self.entity_name}")
 
-    def add_part_to_project(self, part_id: str, project_id: str, notes: Optional[str] = None) -> ServiceResponse[dict]:
+    def add_part_to_project(
+        self, part_id: str, project_id: str, notes: Optional[str] = None, quantity_required: Optional[int] = None
+    ) -> ServiceResponse[dict]:
         """
-        Add a part to a project.
+        Add a part to a project, or update the notes/required quantity of an existing BOM line.
 
         Args:
             part_id: The ID of the part to add
             project_id: The ID of the project
             notes: Optional notes about this part's use in the project
+            quantity_required: Optional units needed per build (defaults to 1 for new lines)
 
         Returns:
             ServiceResponse[dict]: Service response indicating success or failure
@@ -256,11 +262,15 @@ class ProjectService(BaseService):
         try:
             if not part_id or not project_id:
                 return self.error_response("Both part_id and project_id are required")
+            if quantity_required is not None and quantity_required < 1:
+                return self.error_response("quantity_required must be at least 1")
 
             self.log_operation("add_part", self.entity_name, f"part={part_id}, project={project_id}")
 
             with self.get_session() as session:
-                success = ProjectRepository.associate_part_with_project(session, part_id, project_id, notes)
+                success = ProjectRepository.associate_part_with_project(
+                    session, part_id, project_id, notes, quantity_required
+                )
 
                 if not success:
                     return self.error_response("Failed to add part to project")
@@ -275,6 +285,7 @@ class ProjectService(BaseService):
                         "project_name": project.name,
                         "part_id": part_id,
                         "notes": notes,
+                        "quantity_required": quantity_required,
                         "parts_count": project.parts_count,
                     },
                 )
@@ -344,6 +355,13 @@ class ProjectService(BaseService):
                     return self.error_response(f"Project with ID '{project_id}' not found")
 
                 parts = ProjectRepository.get_parts_for_project(session, project_id)
+                required = dict(
+                    session.exec(
+                        select(PartProjectLink.part_id, PartProjectLink.quantity_required).where(
+                            PartProjectLink.project_id == project_id
+                        )
+                    ).all()
+                )
 
                 # Convert parts to dict with complete information
                 parts_list = [
@@ -353,6 +371,7 @@ class ProjectService(BaseService):
                         "part_number": part.part_number,
                         "description": part.description,
                         "quantity": part.total_quantity,  # Use computed property
+                        "quantity_required": required.get(part.id, 1),
                         "supplier": part.supplier,
                         "supplier_url": part.supplier_url,
                         "image_url": part.image_url,
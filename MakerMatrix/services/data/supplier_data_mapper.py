@@ -311,6 +311,10 @@ class SupplierDataMapper:
                 "mounting_type": "Mounting Type",
                 "voltage_rating": "Voltage Rating",
                 "capacitance": "Capacitance",
+                "resistance": "Resistance",
+                "inductance": "Inductance",
+                "power_rating": "Power Rating",
+                "current_rating": "Current Rating",
                 "tolerance": "Tolerance",
                 "temperature_coefficient": "Temperature Coefficient",
                 "rohs_compliant": "RoHS Compliant",
@@ -9,12 +9,15 @@ import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from sqlmodel import Session, select, func
-from sqlalchemy import or_, and_, desc, asc
+from sqlalchemy import or_, and_, desc, asc, delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from MakerMatrix.models.tag_models import TagModel, PartTagLink, ToolTagLink
 from MakerMatrix.models.part_models import PartModel
 from MakerMatrix.models.tool_models import ToolModel
+from MakerMatrix.repositories.location_path_repository import LocationPathRepository
 from MakerMatrix.services.base_service import BaseService, ServiceResponse
+from MakerMatrix.utils.batching import chunks
 from MakerMatrix.schemas.tag_schemas import (
     TagCreate,
     TagUpdate,
@@ -589,8 +592,11 @@ class TagService(BaseService):
                 offset = (page - 1) * page_size
                 parts = tag.parts[offset : offset + page_size] if hasattr(tag, "parts") else []
 
+                location_batch = LocationPathRepository.load_batch(
+                    session.connection(), [part.primary_location for part in parts]
+                )
                 parts_data = {
-                    "parts": [part.to_dict() for part in parts],
+                    "parts": [part.to_dict(location_batch=location_batch) for part in parts],
                     "total": total,
                     "page": page,
                     "page_size": page_size,
@@ -649,12 +655,19 @@ class TagService(BaseService):
 
     # === BULK OPERATIONS ===
 
-    def bulk_tag_operation(self, operation_data: TagBulkOperation) -> ServiceResponse[Dict[str, Any]]:
+    def bulk_tag_operation(
+        self, operation_data: TagBulkOperation, user_id: Optional[str] = None
+    ) -> ServiceResponse[Dict[str, Any]]:
         """
         Perform bulk tag operations on multiple items.
 
+        All (item, tag) pairs are handled in one transaction: ids are validated with IN queries,
+        link rows are inserted (INSERT OR IGNORE) or deleted in bulk and the tag statistics are
+        recomputed with a single UPDATE.
+
         Args:
             operation_data: TagBulkOperation schema with operation details
+            user_id: User performing the operation (recorded on new links)
 
         Returns:
             ServiceResponse with operation results
@@ -662,41 +675,93 @@ class TagService(BaseService):
         try:
             self.log_operation("bulk_operation", self.entity_name, operation_data.operation)
 
+            if operation_data.operation not in ("add", "remove"):
+                return self.error_response(f"Unsupported bulk operation '{operation_data.operation}'")
+            if operation_data.item_type not in ("part", "tool"):
+                return self.error_response(f"Unsupported item type '{operation_data.item_type}'")
+
+            if operation_data.item_type == "part":
+                item_model, link_model, link_item_column = PartModel, PartTagLink, "part_id"
+            else:
+                item_model, link_model, link_item_column = ToolModel, ToolTagLink, "tool_id"
+            item_label = operation_data.item_type.capitalize()
+
+            item_ids = list(dict.fromkeys(operation_data.item_ids))
+            tag_ids = list(dict.fromkeys(operation_data.tag_ids))
+            link_item = getattr(link_model, link_item_column)
+
             with self.get_session() as session:
                 results = {"successful": [], "failed": [], "skipped": []}
 
                 # Verify all tags exist
-                tags = session.exec(select(TagModel).where(TagModel.id.in_(operation_data.tag_ids))).all()
-
-                if len(tags) != len(operation_data.tag_ids):
+                found_tags = session.exec(select(TagModel.id).where(TagModel.id.in_(tag_ids))).all()
+                if len(found_tags) != len(tag_ids):
                     return self.error_response("One or more tags not found")
 
-                # Process each item
-                for item_id in operation_data.item_ids:
-                    for tag in tags:
-                        try:
-                            if operation_data.item_type == "part":
-                                if operation_data.operation == "add":
-                                    result = self.assign_tag_to_part(tag.id, item_id)
-                                else:
-                                    result = self.remove_tag_from_part(tag.id, item_id)
-                            else:  # tool
-                                if operation_data.operation == "add":
-                                    result = self.assign_tag_to_tool(tag.id, item_id)
-                                else:
-                                    result = self.remove_tag_from_tool(tag.id, item_id)
-
-                            if result.success:
-                                results["successful"].append({"item_id": item_id, "tag_id": tag.id})
-                            else:
-                                results["failed"].append(
-                                    {"item_id": item_id, "tag_id": tag.id, "error": result.message}
-                                )
+                # Verify items exist
+                found_items = set()
+                for chunk in chunks(item_ids):
+                    found_items.update(session.exec(select(item_model.id).where(item_model.id.in_(chunk))).all())
 
-                        except Exception as e:
-                            results["failed"].append({"item_id": item_id, "tag_id": tag.id, "error": str(e)})
+                valid_items = []
+                for item_id in item_ids:
+                    if item_id in found_items:
+                        valid_items.append(item_id)
+                    else:
+                        results["failed"].extend(
+                            {
+                                "item_id": item_id,
+                                "tag_id": tag_id,
+                                "error": f"{item_label} with ID '{item_id}' not found",
+                            }
+                            for tag_id in tag_ids
+                        )
 
-                summary = f"Bulk {operation_data.operation} completed: {len(results['successful'])} successful, {len(results['failed'])} failed"
+                # Existing links between the valid items and the requested tags
+                existing = set()
+                for chunk in chunks(valid_items):
+                    existing.update(
+                        tuple(row)
+                        for row in session.exec(
+                            select(link_item, link_model.tag_id).where(
+                                link_item.in_(chunk), link_model.tag_id.in_(tag_ids)
+                            )
+                        ).all()
+                    )
+
+                now = datetime.utcnow()
+                if operation_data.operation == "add":
+                    new_pairs = [(i, t) for i in valid_items for t in tag_ids if (i, t) not in existing]
+                    rows = [
+                        {link_item_column: item_id, "tag_id": tag_id, "added_at": now, "added_by": user_id}
+                        for item_id, tag_id in new_pairs
+                    ]
+                    for chunk in chunks(rows):
+                        session.exec(sqlite_insert(link_model.__table__).prefix_with("OR IGNORE"), params=chunk)
+
+                    applied = new_pairs
+                    skip_reason = f"Tag is already assigned to this {operation_data.item_type}"
+                    skipped = [(i, t) for i in valid_items for t in tag_ids if (i, t) in existing]
+                else:
+                    for chunk in chunks(valid_items):
+                        session.exec(delete(link_model).where(link_item.in_(chunk), link_model.tag_id.in_(tag_ids)))
+
+                    applied = [(i, t) for i in valid_items for t in tag_ids if (i, t) in existing]
+                    skip_reason = f"Tag is not assigned to this {operation_data.item_type}"
+                    skipped = [(i, t) for i in valid_items for t in tag_ids if (i, t) not in existing]
+
+                results["successful"] = [{"item_id": i, "tag_id": t} for i, t in applied]
+                results["skipped"] = [{"item_id": i, "tag_id": t, "reason": skip_reason} for i, t in skipped]
+
+                self._refresh_tag_statistics(
+                    session, tag_ids, touched=operation_data.operation == "add" and bool(applied)
+                )
+                session.commit()
+
+                summary = (
+                    f"Bulk {operation_data.operation} completed: {len(results['successful'])} successful, "
+                    f"{len(results['skipped'])} skipped, {len(results['failed'])} failed"
+                )
                 self.logger.info(summary)
 
                 return self.success_response(summary, results)
@@ -704,6 +769,24 @@ class TagService(BaseService):
         except Exception as e:
             return self.handle_exception(e, "bulk tag operation")
 
+    def _refresh_tag_statistics(self, session: Session, tag_ids: List[str], touched: bool = False) -> None:
+        """Recompute parts/tools/usage counts for the given tags from the link tables in one UPDATE."""
+        parts_count = (
+            select(func.count()).select_from(PartTagLink).where(PartTagLink.tag_id == TagModel.id).scalar_subquery()
+        )
+        tools_count = (
+            select(func.count()).select_from(ToolTagLink).where(ToolTagLink.tag_id == TagModel.id).scalar_subquery()
+        )
+        values = {
+            "parts_count": parts_count,
+            "tools_count": tools_count,
+            "usage_count": parts_count + tools_count,
+        }
+        if touched:
+            values["last_used_at"] = datetime.utcnow()
+
+        session.exec(update(TagModel).where(TagModel.id.in_(tag_ids)).values(**values))
+
     # === TAG MANAGEMENT OPERATIONS ===
 
     def merge_tags(self, merge_request: TagMergeRequest) -> ServiceResponse[Dict[str, Any]]:
@@ -5,9 +5,11 @@ Provides standardized column mapping across all suppliers for consistent
 data extraction from CSV, XLS, and other file formats.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 import logging
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -117,7 +119,7 @@ class UnifiedColumnMapper:
             return False
         return True
 
-    def extract_row_data(self, row: pd.Series, mapped_columns: Dict[str, str]) -> Dict[str, Any]:
+    def extract_row_data(self, row: "pd.Series", mapped_columns: Dict[str, str]) -> Dict[str, Any]:
         """
         Extract data from a pandas row using mapped column names
 
@@ -128,6 +130,8 @@ class UnifiedColumnMapper:
         Returns:
             Dict with extracted data using standard field names
         """
+        import pandas as pd
+
         extracted_data = {}
 
         for field, column_name in mapped_columns.items():
@@ -19,7 +19,7 @@ from sqlalchemy.orm import Session
 
 from MakerMatrix.database.db import engine
 from MakerMatrix.services.rate_limit_service import RateLimitService
-from MakerMatrix.services.system.enrichment_queue_manager import EnrichmentQueueManager, EnrichmentPriority
+from MakerMatrix.services.system.enrichment_queue_manager import get_enrichment_queue_manager, EnrichmentPriority
 from MakerMatrix.schemas.websocket_schemas import (
     create_import_progress_message,
     create_enrichment_progress_message,
@@ -43,7 +43,7 @@ class EnhancedImportService:
 
     def __init__(self):
         self.rate_limit_service = RateLimitService(engine)
-        self.enrichment_queue = EnrichmentQueueManager(self.rate_limit_service)
+        self.enrichment_queue = get_enrichment_queue_manager()
         self.part_service = PartService()
         self.part_repository = PartRepository(engine)
 
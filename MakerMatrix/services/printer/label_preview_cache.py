@@ -0,0 +1,159 @@
+"""
+Label Preview Cache - content-addressed cache of rendered label previews.
+
+A preview is identified by a hash of everything that affects the rendered image: the
+template's layout, text, QR and font settings, the data filled into it and the render
+settings (label size, DPI). Saving a template under another name, bumping its usage count
+or previewing the same draft twice therefore hits the same entry, while any edit that
+changes the output produces a new key. The key doubles as the ETag of the PNG.
+
+Renders run in a worker thread so the event loop keeps serving requests while a label is
+drawn. Concurrent requests for the same key share one render. The cache is bounded by
+entry count and total bytes and evicts the least recently used preview first.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_ENTRIES = int(os.getenv("LABEL_PREVIEW_CACHE_ENTRIES", "256"))
+MAX_BYTES = int(os.getenv("LABEL_PREVIEW_CACHE_MB", "32")) * 1024 * 1024
+
+# Template fields that do not change the rendered image
+NON_RENDER_FIELDS = {
+    "id",
+    "name",
+    "display_name",
+    "description",
+    "category",
+    "is_system_template",
+    "is_active",
+    "created_by_user_id",
+    "is_public",
+    "usage_count",
+    "last_used_at",
+    "created_at",
+    "updated_at",
+    "is_validated",
+    "validation_errors",
+}
+
+
+@dataclass(frozen=True)
+class CachedPreview:
+    """A rendered label preview"""
+
+    key: str
+    png: bytes
+    width: int
+    height: int
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key}"'
+
+
+def template_render_config(template: Any) -> Dict[str, Any]:
+    """The fields of a LabelTemplateModel that affect its rendered image"""
+    return {name: getattr(template, name) for name in type(template).model_fields if name not in NON_RENDER_FIELDS}
+
+
+def preview_key(template_config: Dict[str, Any], data: Dict[str, Any], render_settings: Dict[str, Any]) -> str:
+    """Hash of the inputs of a render; equal inputs always give the same key"""
+    payload = {"template": template_config, "data": data, "render": render_settings}
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    # Enums hash like the strings a draft config holds
+    return getattr(value, "value", str(value))
+
+
+class LabelPreviewCache:
+    """In-memory LRU of rendered previews bounded by entries and bytes"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedPreview]" = OrderedDict()  # Least recently used first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._rendering: Dict[str, "asyncio.Future[CachedPreview]"] = {}
+        self.stats = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[CachedPreview]:
+        with self._lock:
+            preview = self._entries.get(key)
+            if preview is not None:
+                self._entries.move_to_end(key)
+            return preview
+
+    def put(self, preview: CachedPreview) -> None:
+        size = len(preview.png)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(preview.key, None)
+            if previous is not None:
+                self._bytes -= len(previous.png)
+            self._entries[preview.key] = preview
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.png)
+                self.stats["evictions"] += 1
+
+    async def get_or_render(self, key: str, render: Callable[[], Tuple[bytes, int, int]]) -> Tuple[CachedPreview, bool]:
+        """
+        The cached preview for `key`, rendering it with `render` (PNG bytes, width, height)
+        in a worker thread on a miss. Returns the preview and whether it came from the cache.
+
+        Cancelling the caller does not stop a render other callers may be waiting for; its
+        result is still cached.
+        """
+        preview = self.get(key)
+        if preview is not None:
+            self.stats["hits"] += 1
+            return preview, True
+
+        self.stats["misses"] += 1
+        future = self._rendering.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._render(key, render))
+            self._rendering[key] = future
+            future.add_done_callback(lambda done: self._render_finished(key, done))
+        return await asyncio.shield(future), False
+
+    async def _render(self, key: str, render: Callable[[], Tuple[bytes, int, int]]) -> CachedPreview:
+        png, width, height = await asyncio.to_thread(render)
+        self.stats["renders"] += 1
+        preview = CachedPreview(key=key, png=png, width=width, height=height)
+        self.put(preview)
+        return preview
+
+    def _render_finished(self, key: str, future: "asyncio.Future[CachedPreview]") -> None:
+        self._rendering.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            # Retrieved here so a failure nobody waits for any more is not reported as unhandled
+            logger.debug(f"Label preview render failed: {future.exception()}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "bytes": self._bytes}
+
+
+label_preview_cache = LabelPreviewCache()
@@ -0,0 +1,103 @@
+"""
+Live Label Preview - debounced preview renders for one label designer connection.
+
+The designer sends a preview request on every edit. A session waits LABEL_PREVIEW_DEBOUNCE_MS
+after the latest request before rendering, so a burst of keystrokes costs one render. A new
+request or a cancel message drops the one waiting or rendering; a superseded render that is
+already running in its worker thread finishes into the preview cache but is never sent.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from MakerMatrix.services.printer.label_preview_cache import CachedPreview
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_SECONDS = int(os.getenv("LABEL_PREVIEW_DEBOUNCE_MS", "150")) / 1000
+
+
+class LivePreviewSession:
+    """Renders the latest preview request of a connection and sends the result"""
+
+    def __init__(
+        self,
+        render: Callable[[Dict[str, Any]], Awaitable[Optional[Tuple[CachedPreview, bool]]]],
+        send_json: Callable[[Dict[str, Any]], Awaitable[None]],
+        send_bytes: Callable[[bytes], Awaitable[None]],
+        debounce_seconds: float = DEBOUNCE_SECONDS,
+    ):
+        self._render = render
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self.debounce_seconds = debounce_seconds
+        self._task: Optional[asyncio.Task] = None
+        # Sent previews stay ordered: a result is only sent by the request that is still current
+        self._current: Optional[str] = None
+        self.stats = {"requests": 0, "rendered": 0, "superseded": 0}
+
+    def submit(self, request: Dict[str, Any]) -> None:
+        """Replace any pending request with this one"""
+        self.stats["requests"] += 1
+        self.cancel()
+        request_id = str(request.get("request_id") or self.stats["requests"])
+        self._current = request_id
+        self._task = asyncio.create_task(self._run(request_id, request))
+
+    def cancel(self) -> bool:
+        """Drop the pending request; True if there was one"""
+        task, self._task = self._task, None
+        self._current = None
+        if task is None or task.done():
+            return False
+        task.cancel()
+        self.stats["superseded"] += 1
+        return True
+
+    async def close(self) -> None:
+        task = self._task
+        self.cancel()
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self, request_id: str, request: Dict[str, Any]) -> None:
+        await asyncio.sleep(self.debounce_seconds)
+        try:
+            rendered = await self._render(request)
+            error = None if rendered is not None else "Template not found"
+        except Exception as e:
+            logger.warning(f"Live label preview failed: {e}")
+            rendered, error = None, str(e)
+
+        if self._current != request_id:
+            return
+        try:
+            if error:
+                await self._send_json({"type": "preview_error", "request_id": request_id, "error": error})
+                return
+            preview, cached = rendered
+            self.stats["rendered"] += 1
+            await self._send_json(_preview_message(request_id, preview, cached))
+            # The PNG follows its description as a binary frame
+            await self._send_bytes(preview.png)
+        except Exception as e:
+            # The connection closed while the preview was rendering
+            logger.debug(f"Could not send live label preview: {e}")
+
+
+def _preview_message(request_id: str, preview: CachedPreview, cached: bool) -> Dict[str, Any]:
+    return {
+        "type": "preview",
+        "request_id": request_id,
+        "key": preview.key,
+        "etag": preview.etag,
+        "width": preview.width,
+        "height": preview.height,
+        "size_bytes": len(preview.png),
+        "cached": cached,
+    }
@@ -4,9 +4,11 @@ Printer manager service for managing multiple printers and routing print jobs.
 
 import uuid
 import asyncio
+import base64
+import io
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -29,6 +31,15 @@ from MakerMatrix.services.printer.template_processor import TemplateProcessor
 from MakerMatrix.lib.print_settings import PrintSettings
 from MakerMatrix.models.label_template_models import LabelTemplateModel
 from MakerMatrix.repositories.label_template_repository import LabelTemplateRepository
+from MakerMatrix.services.printer.label_preview_cache import (
+    CachedPreview,
+    label_preview_cache,
+    preview_key,
+    template_render_config,
+)
+
+# Template previews are rendered at the resolution labels are printed at
+PREVIEW_DPI = 300
 
 
 def get_bundled_font_path() -> str:
@@ -392,41 +403,10 @@ class PrinterManagerService:
     async def preview_template_label(self, template_id: str, data: dict) -> PreviewResult:
         """Preview a label using a saved template - uses TemplateProcessor for full rendering."""
         try:
-            from sqlmodel import Session
-            from MakerMatrix.models.models import engine
-
-            with Session(engine) as session:
-                template = self.template_repository.get_by_id(session, template_id)
-                if not template:
-                    return PreviewResult(success=False, error=f"Template {template_id} not found")
-
-                # Use TemplateProcessor for full template rendering (QR, layout, rotation, etc.)
-                label_size_mm = template.label_height_mm  # tape width
-                label_len_mm = template.label_width_mm  # label length
-
-                print_settings = PrintSettings(
-                    label_size=label_size_mm,
-                    label_len=label_len_mm / 25.4 if label_len_mm else None,  # convert mm to inches
-                    dpi=300,
-                    qr_scale=template.qr_scale,
-                )
-
-                preview_image = self.template_processor.process_template(template, data, print_settings)
-
-                # Convert image to base64 for preview
-                import io
-                import base64
-
-                buffer = io.BytesIO()
-                preview_image.save(buffer, format="PNG")
-                image_data = base64.b64encode(buffer.getvalue()).decode()
-
-                return PreviewResult(
-                    success=True,
-                    preview_url=f"data:image/png;base64,{image_data}",
-                    width=preview_image.width,
-                    height=preview_image.height,
-                )
+            rendered = await self.render_template_preview(template_id, data)
+            if rendered is None:
+                return PreviewResult(success=False, error=f"Template {template_id} not found")
+            return _preview_result(rendered[0])
 
         except Exception as e:
             return PreviewResult(success=False, error=f"Failed to preview template label: {str(e)}")
@@ -434,63 +414,83 @@ class PrinterManagerService:
     async def preview_template_draft(self, template_config: dict, data: dict) -> "PreviewResult":
         """Preview a label from inline template config (unsaved template)."""
         try:
-            import io
-            import base64
-
-            # Build an in-memory LabelTemplateModel from the provided config
-            # Default font_config to DejaVu Sans Bold to match the print page
-            default_font_config = {
-                "family": "DejaVu Sans Bold",
-                "weight": "bold",
-                "style": "normal",
-                "min_size": 8,
-                "max_size": 72,
-                "auto_size": True,
-            }
-            template = LabelTemplateModel(
-                id="draft-preview",
-                name=template_config.get("name", "draft"),
-                display_name=template_config.get("display_name", "Draft"),
-                text_template=template_config.get("text_template", ""),
-                label_width_mm=template_config.get("label_width_mm", 39.0),
-                label_height_mm=template_config.get("label_height_mm", 12.0),
-                text_rotation=template_config.get("text_rotation", "NONE"),
-                text_alignment=template_config.get("text_alignment", "LEFT"),
-                qr_enabled=template_config.get("qr_enabled", False),
-                qr_position=template_config.get("qr_position", "LEFT"),
-                qr_scale=template_config.get("qr_scale", 0.95),
-                enable_multiline=template_config.get("enable_multiline", True),
-                enable_auto_sizing=template_config.get("enable_auto_sizing", True),
-                category=template_config.get("category", "CUSTOM"),
-                font_config=template_config.get("font_config", default_font_config),
-            )
+            preview, _ = await self.render_draft_preview(template_config, data)
+            return _preview_result(preview)
 
-            # Determine label dimensions for print settings
-            label_size_mm = template.label_height_mm  # tape width
-            label_len_mm = template.label_width_mm  # label length
+        except Exception as e:
+            return PreviewResult(success=False, error=f"Failed to preview draft template: {str(e)}")
 
-            print_settings = PrintSettings(
-                label_size=label_size_mm,
-                label_len=label_len_mm / 25.4 if label_len_mm else None,  # convert mm to inches
-                dpi=300,
-                qr_scale=template.qr_scale,
-            )
+    async def render_template_preview(self, template_id: str, data: dict) -> Optional[Tuple[CachedPreview, bool]]:
+        """
+        PNG preview of a saved template, from the preview cache when it was rendered before.
+        Returns the preview and whether it was cached, or None if the template does not exist.
+        """
+        from sqlmodel import Session
+        from MakerMatrix.models.models import engine
+
+        with Session(engine) as session:
+            template = self.template_repository.get_by_id(session, template_id)
+            if not template:
+                return None
+        return await self._render_preview(template, data)
 
-            preview_image = self.template_processor.process_template(template, data, print_settings)
+    async def render_draft_preview(self, template_config: dict, data: dict) -> Tuple[CachedPreview, bool]:
+        """PNG preview of an unsaved template config, from the preview cache when possible"""
+        return await self._render_preview(self._draft_template(template_config), data)
 
+    async def _render_preview(self, template: LabelTemplateModel, data: dict) -> Tuple[CachedPreview, bool]:
+        key = preview_key(template_render_config(template), data, {"dpi": PREVIEW_DPI})
+
+        def render():
+            # Use TemplateProcessor for full template rendering (QR, layout, rotation, etc.)
+            image = self.template_processor.process_template(template, data, self._template_print_settings(template))
             buffer = io.BytesIO()
-            preview_image.save(buffer, format="PNG")
-            image_data = base64.b64encode(buffer.getvalue()).decode()
-
-            return PreviewResult(
-                success=True,
-                preview_url=f"data:image/png;base64,{image_data}",
-                width=preview_image.width,
-                height=preview_image.height,
-            )
+            image.save(buffer, format="PNG")
+            return buffer.getvalue(), image.width, image.height
 
-        except Exception as e:
-            return PreviewResult(success=False, error=f"Failed to preview draft template: {str(e)}")
+        return await label_preview_cache.get_or_render(key, render)
+
+    @staticmethod
+    def _template_print_settings(template: LabelTemplateModel) -> PrintSettings:
+        label_size_mm = template.label_height_mm  # tape width
+        label_len_mm = template.label_width_mm  # label length
+
+        return PrintSettings(
+            label_size=label_size_mm,
+            label_len=label_len_mm / 25.4 if label_len_mm else None,  # convert mm to inches
+            dpi=PREVIEW_DPI,
+            qr_scale=template.qr_scale,
+        )
+
+    @staticmethod
+    def _draft_template(template_config: dict) -> LabelTemplateModel:
+        """Build an in-memory LabelTemplateModel from the provided config"""
+        # Default font_config to DejaVu Sans Bold to match the print page
+        default_font_config = {
+            "family": "DejaVu Sans Bold",
+            "weight": "bold",
+            "style": "normal",
+            "min_size": 8,
+            "max_size": 72,
+            "auto_size": True,
+        }
+        return LabelTemplateModel(
+            id="draft-preview",
+            name=template_config.get("name", "draft"),
+            display_name=template_config.get("display_name", "Draft"),
+            text_template=template_config.get("text_template", ""),
+            label_width_mm=template_config.get("label_width_mm", 39.0),
+            label_height_mm=template_config.get("label_height_mm", 12.0),
+            text_rotation=template_config.get("text_rotation", "NONE"),
+            text_alignment=template_config.get("text_alignment", "LEFT"),
+            qr_enabled=template_config.get("qr_enabled", False),
+            qr_position=template_config.get("qr_position", "LEFT"),
+            qr_scale=template_config.get("qr_scale", 0.95),
+            enable_multiline=template_config.get("enable_multiline", True),
+            enable_auto_sizing=template_config.get("enable_auto_sizing", True),
+            category=template_config.get("category", "CUSTOM"),
+            font_config=template_config.get("font_config", default_font_config),
+        )
 
     async def _create_advanced_label_image(
         self, template: str, data: dict, label_size: str, label_length: int = None, options: dict = None
@@ -1094,6 +1094,16 @@ class PrinterManagerService:
 
 
 # Global printer manager instance
+def _preview_result(preview: CachedPreview) -> PreviewResult:
+    """PreviewResult carrying the PNG as a data URL (JSON preview endpoints)"""
+    return PreviewResult(
+        success=True,
+        preview_url=f"data:image/png;base64,{base64.b64encode(preview.png).decode()}",
+        width=preview.width,
+        height=preview.height,
+    )
+
+
 printer_manager = PrinterManagerService()
 
 
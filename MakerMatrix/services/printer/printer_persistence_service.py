@@ -10,9 +10,13 @@ from datetime import datetime
 from MakerMatrix.models.models import PrinterModel, engine
 from MakerMatrix.repositories.printer_db_repository import PrinterDatabaseRepository
 from MakerMatrix.services.printer.printer_manager_service import get_printer_manager
+from MakerMatrix.services.system.event_bus import get_event_bus
 
 # Import will be done dynamically when needed
 
+# Event bus channel for printer registry changes made in another worker process
+PRINTER_CHANNEL = "printers"
+
 
 class PrinterPersistenceService:
     """Service for managing printer database persistence and restoration."""
@@ -60,24 +64,8 @@ class PrinterPersistenceService:
 
             for printer_model in saved_printers:
                 try:
-                    # Convert database model to printer registration data
-                    printer_data = {
-                        "printer_id": printer_model.printer_id,
-                        "name": printer_model.name,
-                        "driver_type": printer_model.driver_type,
-                        "model": printer_model.model,
-                        "backend": printer_model.backend,
-                        "identifier": printer_model.identifier,
-                        "dpi": printer_model.dpi,
-                        "scaling_factor": printer_model.scaling_factor,
-                    }
-
-                    # Additional config if available
-                    if printer_model.config:
-                        printer_data.update(printer_model.config)
-
                     # Create printer instance and register with the printer manager
-                    printer = self._create_printer_instance(printer_data)
+                    printer = self._create_printer_instance(self._printer_data(printer_model))
                     success = await self.printer_manager.register_printer(printer)
 
                     if success:
@@ -96,6 +84,24 @@ class PrinterPersistenceService:
 
         return restored_printer_ids
 
+    def _printer_data(self, printer_model: PrinterModel) -> Dict[str, Any]:
+        """Convert database model to printer registration data"""
+        printer_data = {
+            "printer_id": printer_model.printer_id,
+            "name": printer_model.name,
+            "driver_type": printer_model.driver_type,
+            "model": printer_model.model,
+            "backend": printer_model.backend,
+            "identifier": printer_model.identifier,
+            "dpi": printer_model.dpi,
+            "scaling_factor": printer_model.scaling_factor,
+        }
+
+        # Additional config if available
+        if printer_model.config:
+            printer_data.update(printer_model.config)
+        return printer_data
+
     async def register_printer_with_persistence(self, printer_data: Dict[str, Any]) -> Dict[str, Any]:
         """Register a printer both in memory and database."""
         try:
@@ -125,6 +131,7 @@ class PrinterPersistenceService:
                 db_printer = self.save_printer_to_database(printer_data)
                 print(f"[DEBUG] Saved to database with ID: {db_printer.id}")
                 result = {"success": True, "database_id": db_printer.id, "persisted": True}
+                await self._notify_other_workers("registered", printer_data["printer_id"])
             except Exception as db_error:
                 # Registration succeeded but database save failed
                 result = {"success": True, "persisted": False, "persistence_error": str(db_error)}
@@ -170,6 +177,7 @@ class PrinterPersistenceService:
             # Remove from database
             database_removed = self.db_repo.delete_printer(printer_id)
             result["database_removed"] = database_removed
+            await self._notify_other_workers("removed", printer_id)
 
             # Consider it successful if either removal worked
             result["success"] = result["memory_removed"] or result["database_removed"]
@@ -182,6 +190,25 @@ class PrinterPersistenceService:
 
         return result
 
+    async def _notify_other_workers(self, action: str, printer_id: str) -> None:
+        """Let the other worker processes update their in-memory printer registry"""
+        await get_event_bus().publish(PRINTER_CHANNEL, {"action": action, "printer_id": printer_id}, local=False)
+
+    async def _on_printer_event(self, payload: Dict[str, Any]) -> None:
+        printer_id = payload["printer_id"]
+        await self.printer_manager.unregister_printer(printer_id)
+        if payload["action"] != "registered":
+            return
+
+        printer_model = self.db_repo.get_printer_by_id(printer_id)
+        if printer_model is None:
+            return
+        try:
+            printer = self._create_printer_instance(self._printer_data(printer_model))
+            await self.printer_manager.register_printer(printer)
+        except Exception as e:
+            print(f"Error registering printer {printer_id} added by another worker: {str(e)}")
+
     def get_persistent_printers(self) -> List[Dict[str, Any]]:
         """Get all printers stored in the database."""
         try:
@@ -218,4 +245,5 @@ def get_printer_persistence_service() -> PrinterPersistenceService:
     global _printer_persistence_service
     if _printer_persistence_service is None:
         _printer_persistence_service = PrinterPersistenceService()
+        get_event_bus().subscribe(PRINTER_CHANNEL, _printer_persistence_service._on_printer_event)
     return _printer_persistence_service
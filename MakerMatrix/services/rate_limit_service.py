@@ -215,9 +215,8 @@ class RateLimitService(BaseService):
                 "successful_requests": usage_summary["successful_requests"],
                 "failed_requests": usage_summary["failed_requests"],
                 "success_rate": usage_summary["success_rate"] * 100,  # Convert to percentage
-                "avg_response_time_ms": (
-                    usage_summary["avg_response_time"] * 1000 if usage_summary["avg_response_time"] else None
-                ),
+                "avg_response_time_ms": usage_summary["avg_response_time"],
+                "response_time_percentiles_ms": usage_summary["response_time_percentiles"],
                 "endpoint_breakdown": usage_summary["endpoint_breakdown"],
             }
 
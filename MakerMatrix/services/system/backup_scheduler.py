@@ -1,7 +1,7 @@
 """
 Backup Scheduler Service
 
-Manages scheduled backups and retention cleanup using APScheduler.
+Manages scheduled backups, retention cleanup and database maintenance using APScheduler.
 Integrates with the task-based backup system.
 """
 
@@ -11,14 +11,24 @@ from datetime import datetime, timedelta
 from typing import Optional
 from sqlmodel import Session, select
 import logging
+import os
 
 from MakerMatrix.models.backup_models import BackupConfigModel
 from MakerMatrix.models.task_models import CreateTaskRequest, TaskType, TaskPriority
 from MakerMatrix.database.db import engine
 from MakerMatrix.services.system.task_service import task_service
+from MakerMatrix.services.system.event_bus import get_event_bus
 
 logger = logging.getLogger(__name__)
 
+# Event bus channel asking the process that runs the scheduler to reload it
+SCHEDULE_CHANNEL = "backup_schedule"
+
+# Cron expression (minute hour day month day_of_week) for database maintenance; empty disables it
+DB_MAINTENANCE_CRON = os.getenv("DB_MAINTENANCE_CRON", "30 3 * * *")
+# A first run on a large database converts it to incremental auto_vacuum with a full VACUUM
+DB_MAINTENANCE_TIMEOUT_SECONDS = 3 * 3600
+
 
 class BackupScheduler:
     """Manages scheduled backup operations"""
@@ -27,6 +37,7 @@ class BackupScheduler:
         self.scheduler = AsyncIOScheduler()
         self.backup_job_id = "scheduled_backup"
         self.retention_job_id = "backup_retention"
+        self.maintenance_job_id = "database_maintenance"
 
     async def start(self):
         """Start the backup scheduler"""
@@ -38,6 +49,7 @@ class BackupScheduler:
             # Load configuration and schedule backups
             # This must be done after starting the scheduler so next_run_time is available
             await self.reload_schedule()
+            self._schedule_database_maintenance()
 
             logger.info("Backup scheduler started successfully")
         except Exception as e:
@@ -51,6 +63,17 @@ class BackupScheduler:
         except Exception as e:
             logger.error(f"Failed to stop backup scheduler: {e}", exc_info=True)
 
+    async def request_reload(self):
+        """Reload the schedule in whichever worker process runs the scheduler"""
+        if self.scheduler.running:
+            await self.reload_schedule()
+        await get_event_bus().publish(SCHEDULE_CHANNEL, {}, local=False)
+
+    async def _on_reload_event(self, payload):
+        # Configuration changed in another worker process
+        if self.scheduler.running:
+            await self.reload_schedule()
+
     async def reload_schedule(self):
         """Reload backup schedule from configuration"""
         try:
@@ -124,16 +147,7 @@ class BackupScheduler:
 
             elif config.schedule_type == "custom" and config.schedule_cron:
                 # Custom cron expression
-                # Parse cron: minute hour day month day_of_week
-                parts = config.schedule_cron.split()
-
-                if len(parts) == 5:
-                    return CronTrigger(
-                        minute=parts[0], hour=parts[1], day=parts[2], month=parts[3], day_of_week=parts[4]
-                    )
-                else:
-                    logger.error(f"Invalid cron expression: {config.schedule_cron}")
-                    return None
+                return self._parse_cron(config.schedule_cron)
 
             else:
                 logger.error(f"Unknown schedule type: {config.schedule_type}")
@@ -143,6 +157,37 @@ class BackupScheduler:
             logger.error(f"Failed to create trigger from config: {e}", exc_info=True)
             return None
 
+    @staticmethod
+    def _parse_cron(expression: str) -> Optional[CronTrigger]:
+        """Trigger for a cron expression: minute hour day month day_of_week"""
+        parts = expression.split()
+
+        if len(parts) == 5:
+            return CronTrigger(minute=parts[0], hour=parts[1], day=parts[2], month=parts[3], day_of_week=parts[4])
+        else:
+            logger.error(f"Invalid cron expression: {expression}")
+            return None
+
+    def _schedule_database_maintenance(self):
+        """Schedule the database cleanup task from DB_MAINTENANCE_CRON"""
+        if not DB_MAINTENANCE_CRON.strip():
+            logger.info("Database maintenance schedule disabled")
+            return
+
+        try:
+            trigger = self._parse_cron(DB_MAINTENANCE_CRON)
+            if trigger:
+                self.scheduler.add_job(
+                    self._run_database_maintenance,
+                    trigger=trigger,
+                    id=self.maintenance_job_id,
+                    name="Database Maintenance",
+                    replace_existing=True,
+                )
+                logger.info(f"Database maintenance scheduled: {DB_MAINTENANCE_CRON}")
+        except Exception as e:
+            logger.error(f"Failed to schedule database maintenance: {e}", exc_info=True)
+
     async def _create_scheduled_backup(self):
         """Create a scheduled backup task"""
         try:
@@ -233,6 +278,29 @@ class BackupScheduler:
         except Exception as e:
             logger.error(f"Failed to run retention cleanup: {e}", exc_info=True)
 
+    async def _run_database_maintenance(self):
+        """Run the database cleanup task"""
+        try:
+            logger.info("Running database maintenance...")
+
+            task_request = CreateTaskRequest(
+                task_type=TaskType.DATABASE_CLEANUP,
+                name="Scheduled Database Maintenance",
+                description="Remove expired and orphaned records, update statistics and reclaim free pages",
+                priority=TaskPriority.LOW,
+                input_data={"cleanup_type": "full"},
+                timeout_seconds=DB_MAINTENANCE_TIMEOUT_SECONDS,
+                related_entity_type="system",
+                related_entity_id="database_maintenance",
+            )
+
+            task = await task_service.create_task(task_request)
+            logger.info(f"Database maintenance task created: {task.id}")
+
+        except Exception as e:
+            logger.error(f"Failed to run database maintenance: {e}", exc_info=True)
+
 
 # Global scheduler instance
 backup_scheduler = BackupScheduler()
+get_event_bus().subscribe(SCHEDULE_CHANNEL, backup_scheduler._on_reload_event)
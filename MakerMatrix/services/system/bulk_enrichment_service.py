@@ -12,7 +12,9 @@ from MakerMatrix.models.task_models import TaskModel, TaskType, TaskStatus
 from MakerMatrix.models.models import PartModel
 from MakerMatrix.repositories.parts_repositories import PartRepository
 from MakerMatrix.services.system.part_enrichment_service import PartEnrichmentService
+from MakerMatrix.services.system.enrichment_engine import enrichment_engine
 from MakerMatrix.services.base_service import BaseService
+from sqlmodel import select
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +81,38 @@ class BulkEnrichmentService(BaseService):
             logger.error(f"💥 [BULK ENRICHMENT] Task failed with error: {e}", exc_info=True)
             raise
 
+    async def _prefetch_supplier_data(self, part_ids: List[str], supplier_filter: Optional[str]) -> None:
+        """
+        Resolve a whole batch through each supplier's bulk lookup before per-part enrichment.
+
+        Suppliers with native batch support answer the batch in a handful of requests; the
+        per-part enrichment that follows then reuses the prefetched data. Failures here are
+        not fatal - per-part enrichment simply falls back to its own lookup.
+        """
+        try:
+            with self.get_session() as session:
+                rows = session.exec(
+                    select(PartModel.supplier, PartModel.supplier_part_number, PartModel.part_number).where(
+                        PartModel.id.in_(part_ids)
+                    )
+                ).all()
+        except Exception as e:
+            logger.warning(f"⚠️ [BULK ENRICHMENT] Could not load parts for bulk lookup prefetch: {e}")
+            return
+
+        identifiers_by_supplier: Dict[str, List[str]] = {}
+        for supplier, supplier_part_number, part_number in rows:
+            supplier_name = supplier_filter or supplier
+            identifier = supplier_part_number or part_number
+            if supplier_name and identifier:
+                identifiers_by_supplier.setdefault(supplier_name.lower(), []).append(identifier)
+
+        for supplier_name, identifiers in identifiers_by_supplier.items():
+            try:
+                await enrichment_engine.prefetch_part_details(supplier_name, identifiers)
+            except Exception as e:
+                logger.warning(f"⚠️ [BULK ENRICHMENT] Bulk lookup prefetch failed for {supplier_name}: {e}")
+
     async def _handle_bulk_enrichment_specific(
         self,
         part_ids: List[str],
@@ -106,6 +140,7 @@ class BulkEnrichmentService(BaseService):
                 logger.info(
                     f"📦 [BULK ENRICHMENT] Starting batch {batch_number}/{total_batches} with {len(batch)} parts"
                 )
+                await self._prefetch_supplier_data(batch, supplier_filter)
                 batch_tasks = []
 
                 for j, part_id in enumerate(batch):
@@ -258,6 +293,7 @@ class BulkEnrichmentService(BaseService):
                     )
 
                     # Create enrichment tasks for this batch
+                    await self._prefetch_supplier_data([part.id for part in batch_parts], supplier_filter)
                     batch_tasks = []
                     for part in batch_parts:
                         enrichment_data = {"part_id": part.id, "capabilities": requested_capabilities}
@@ -0,0 +1,308 @@
+"""
+Coordination Store - state shared by the worker processes of one deployment.
+
+When MakerMatrix runs with several worker processes (uvicorn --workers N, gunicorn),
+each process has its own WebSocket connections, caches and rate-limit counters. This
+store keeps the little state they need to agree on in a separate SQLite file next to
+the main database, so polling and lease renewals never take the main database's write
+lock:
+
+- events: cross-process messages for the SQLite event bus
+- leases: leader election for background services
+- shared_values: small values with an expiry (e.g. supplier access tokens)
+- rate_limit_hits: moving-window rate-limit entries
+
+Coordination is enabled when WEB_CONCURRENCY > 1 or EVENT_BUS_BACKEND is set to
+something other than "local". A single-process deployment never touches the file.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process in leases and events
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    origin TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_created_at ON events (created_at);
+
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    acquired_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS shared_values (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS rate_limit_hits (
+    key TEXT NOT NULL,
+    hit_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_rate_limit_hits_key ON rate_limit_hits (key, hit_at);
+CREATE INDEX IF NOT EXISTS ix_rate_limit_hits_expires_at ON rate_limit_hits (expires_at);
+"""
+
+
+def worker_count() -> int:
+    try:
+        return max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+    except ValueError:
+        return 1
+
+
+def event_bus_backend() -> str:
+    """Configured event bus backend: local, sqlite or redis"""
+    backend = os.getenv("EVENT_BUS_BACKEND", "").strip().lower()
+    if backend:
+        return backend
+    return "sqlite" if worker_count() > 1 else "local"
+
+
+def coordination_enabled() -> bool:
+    return event_bus_backend() != "local"
+
+
+def default_coordination_path() -> Path:
+    """COORDINATION_DB_PATH, or <main database>.coordination.db next to the main database"""
+    configured = os.getenv("COORDINATION_DB_PATH")
+    if configured:
+        return Path(configured)
+
+    database = make_url(os.getenv("DATABASE_URL", "sqlite:///makermatrix.db")).database
+    if not database or database == ":memory:":
+        return Path(tempfile.gettempdir()) / "makermatrix.coordination.db"
+    path = Path(database)
+    return path.with_name(f"{path.stem}.coordination.db")
+
+
+class CoordinationStore:
+    """SQLite file shared by all worker processes; one connection per thread"""
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # === Events ===
+
+    def append_event(self, channel: str, payload: Dict[str, Any], origin: str = PROCESS_ID) -> int:
+        cursor = self.connect().execute(
+            "INSERT INTO events (channel, origin, payload, created_at) VALUES (?, ?, ?, ?)",
+            (channel, origin, json.dumps(payload, default=str), time.time()),
+        )
+        return cursor.lastrowid
+
+    def read_events(
+        self, after_id: int, exclude_origin: str = PROCESS_ID, limit: int = 500
+    ) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """Events newer than after_id published by other processes, oldest first"""
+        rows = (
+            self.connect()
+            .execute(
+                "SELECT id, channel, payload FROM events WHERE id > ? AND origin != ? ORDER BY id LIMIT ?",
+                (after_id, exclude_origin, limit),
+            )
+            .fetchall()
+        )
+        return [(row[0], row[1], json.loads(row[2])) for row in rows]
+
+    def last_event_id(self) -> int:
+        row = self.connect().execute("SELECT MAX(id) FROM events").fetchone()
+        return row[0] or 0
+
+    def prune(self, event_retention_seconds: float) -> Dict[str, int]:
+        """Delete old events, expired shared values and rate-limit entries"""
+        now = time.time()
+        conn = self.connect()
+        return {
+            "events": conn.execute(
+                "DELETE FROM events WHERE created_at < ?", (now - event_retention_seconds,)
+            ).rowcount,
+            "shared_values": conn.execute("DELETE FROM shared_values WHERE expires_at < ?", (now,)).rowcount,
+            "rate_limit_hits": conn.execute("DELETE FROM rate_limit_hits WHERE expires_at < ?", (now,)).rowcount,
+        }
+
+    # === Leases ===
+
+    def acquire_lease(self, name: str, holder: str, ttl_seconds: float) -> bool:
+        """Take or renew the lease; succeeds if it is free, expired or already ours"""
+        now = time.time()
+        cursor = self.connect().execute(
+            """
+            INSERT INTO leases (name, holder, acquired_at, expires_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                acquired_at = CASE WHEN leases.holder = excluded.holder THEN leases.acquired_at ELSE excluded.acquired_at END,
+                holder = excluded.holder,
+                expires_at = excluded.expires_at
+            WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+            """,
+            (name, holder, now, now + ttl_seconds, now),
+        )
+        return cursor.rowcount == 1
+
+    def release_lease(self, name: str, holder: str) -> bool:
+        cursor = self.connect().execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+        return cursor.rowcount == 1
+
+    def get_lease(self, name: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.connect()
+            .execute("SELECT holder, acquired_at, expires_at FROM leases WHERE name = ?", (name,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return {"name": name, "holder": row[0], "acquired_at": row[1], "expires_at": row[2]}
+
+    # === Shared values ===
+
+    def set_value(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds is not None else None
+        self.connect().execute(
+            "INSERT OR REPLACE INTO shared_values (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, default=str), expires_at),
+        )
+
+    def get_value(self, key: str) -> Optional[Any]:
+        row = (
+            self.connect()
+            .execute(
+                "SELECT value FROM shared_values WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def get_value_expiry(self, key: str) -> Optional[float]:
+        row = self.connect().execute("SELECT expires_at FROM shared_values WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def increment_value(self, key: str, ttl_seconds: float, amount: int = 1) -> int:
+        """Add to a counter; an expired or missing counter restarts at `amount` with a new expiry"""
+        now = time.time()
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM shared_values WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                value, expires_at = amount, now + ttl_seconds
+            else:
+                value, expires_at = json.loads(row[0]) + amount, row[1]
+            conn.execute(
+                "INSERT OR REPLACE INTO shared_values (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            conn.execute("COMMIT")
+            return value
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete_value(self, key: str) -> None:
+        self.connect().execute("DELETE FROM shared_values WHERE key = ?", (key,))
+
+    # === Rate limit entries ===
+
+    def acquire_rate_limit_entry(self, key: str, limit: int, window_seconds: float, amount: int = 1) -> bool:
+        """Record `amount` hits unless that would exceed `limit` hits within the window"""
+        if amount > limit:
+            return False
+
+        now = time.time()
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM rate_limit_hits WHERE key = ? AND hit_at <= ?", (key, now - window_seconds))
+            count = conn.execute(
+                "SELECT COUNT(*) FROM rate_limit_hits WHERE key = ? AND hit_at > ?", (key, now - window_seconds)
+            ).fetchone()[0]
+            if count + amount > limit:
+                conn.execute("COMMIT")
+                return False
+            conn.executemany(
+                "INSERT INTO rate_limit_hits (key, hit_at, expires_at) VALUES (?, ?, ?)",
+                [(key, now, now + window_seconds)] * amount,
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_rate_limit_window(self, key: str, window_seconds: float) -> Tuple[float, int]:
+        """(oldest hit in the window, number of hits in the window)"""
+        now = time.time()
+        row = (
+            self.connect()
+            .execute(
+                "SELECT MIN(hit_at), COUNT(*) FROM rate_limit_hits WHERE key = ? AND hit_at > ?",
+                (key, now - window_seconds),
+            )
+            .fetchone()
+        )
+        return (row[0] or now, row[1])
+
+    def clear_rate_limit(self, key: Optional[str] = None) -> int:
+        if key is None:
+            cursor = self.connect().execute("DELETE FROM rate_limit_hits")
+        else:
+            cursor = self.connect().execute("DELETE FROM rate_limit_hits WHERE key = ?", (key,))
+        return cursor.rowcount
+
+
+_coordination_store: Optional[CoordinationStore] = None
+
+
+def get_coordination_store() -> CoordinationStore:
+    """Shared store instance for this process"""
+    global _coordination_store
+    if _coordination_store is None:
+        _coordination_store = CoordinationStore(default_coordination_path())
+    return _coordination_store
@@ -0,0 +1,272 @@
+"""
+Database Maintenance - the work behind DatabaseCleanupTask.
+
+Steps, each returning its own stats (duration and rows deleted or bytes reclaimed):
+
+- analyze: PRAGMA optimize, or a sampled ANALYZE when the planner has no statistics yet
+- activity_logs / supplier_usage / finished_tasks: delete rows older than their retention
+  period (DB_*_RETENTION_DAYS, 0 keeps everything)
+- orphaned_links: delete link table rows whose part, category, tag, ... no longer exists
+- vacuum: return free pages to the filesystem with PRAGMA incremental_vacuum. A database
+  created without auto_vacuum=INCREMENTAL is converted first, which takes one full VACUUM
+- wal_checkpoint: checkpoint and truncate the write-ahead log (WAL databases only)
+
+Deletes and incremental vacuum run in batches of their own short transactions with a pause
+in between, so request handlers can write while maintenance is running. The conversion
+VACUUM is the exception: it rewrites the whole file and blocks writers until it finishes.
+"""
+
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, exists, literal_column, or_, select
+from sqlalchemy.engine import Connection
+
+from MakerMatrix.models.order_models import PartOrderLink
+from MakerMatrix.models.part_models import PartCategoryLink
+from MakerMatrix.models.project_models import PartProjectLink
+from MakerMatrix.models.rate_limiting_models import SupplierUsageTrackingModel
+from MakerMatrix.models.system_models import ActivityLogModel
+from MakerMatrix.models.tag_models import PartTagLink, ToolTagLink
+from MakerMatrix.models.task_models import TaskModel, TaskStatus
+from MakerMatrix.models.tool_models import ToolCategoryLink
+from MakerMatrix.models.user_models import UserRoleLink
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_LOG_RETENTION_DAYS = int(os.getenv("DB_ACTIVITY_LOG_RETENTION_DAYS", "90"))
+SUPPLIER_USAGE_RETENTION_DAYS = int(os.getenv("DB_SUPPLIER_USAGE_RETENTION_DAYS", "30"))
+FINISHED_TASK_RETENTION_DAYS = int(os.getenv("DB_FINISHED_TASK_RETENTION_DAYS", "30"))
+DELETE_BATCH_SIZE = int(os.getenv("DB_MAINTENANCE_BATCH_SIZE", "2000"))
+VACUUM_BATCH_PAGES = int(os.getenv("DB_MAINTENANCE_VACUUM_PAGES", "4096"))
+BATCH_PAUSE_SECONDS = float(os.getenv("DB_MAINTENANCE_PAUSE_SECONDS", "0.05"))
+
+# Rows ANALYZE samples per index; keeps the first ANALYZE of a large database fast
+ANALYSIS_LIMIT = 1000
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+LINK_TABLES = (
+    PartCategoryLink.__table__,
+    PartTagLink.__table__,
+    PartProjectLink.__table__,
+    PartOrderLink.__table__,
+    ToolTagLink.__table__,
+    ToolCategoryLink.__table__,
+    UserRoleLink.__table__,
+)
+
+FINISHED_TASK_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+_activity_logs = ActivityLogModel.__table__
+_supplier_usage = SupplierUsageTrackingModel.__table__
+_tasks = TaskModel.__table__
+_rowid = literal_column("rowid")
+
+
+class DatabaseMaintenance:
+    """Maintenance steps for the SQLite database"""
+
+    def __init__(
+        self,
+        engine=None,
+        batch_size: int = DELETE_BATCH_SIZE,
+        vacuum_batch_pages: int = VACUUM_BATCH_PAGES,
+        pause_seconds: float = BATCH_PAUSE_SECONDS,
+    ):
+        if engine is None:
+            from MakerMatrix.models.models import engine as default_engine
+
+            engine = default_engine
+        self.engine = engine
+        self.batch_size = batch_size
+        self.vacuum_batch_pages = vacuum_batch_pages
+        self.pause_seconds = pause_seconds
+
+    # === Statistics ===
+
+    def analyze(self) -> Dict[str, Any]:
+        """Refresh the query planner statistics"""
+        started = time.perf_counter()
+        with self._autocommit() as conn:
+            has_stats = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).first()
+            if has_stats:
+                # Re-analyzes only the tables whose statistics are out of date
+                conn.exec_driver_sql("PRAGMA optimize")
+                mode = "optimize"
+            else:
+                conn.exec_driver_sql(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+                conn.exec_driver_sql("ANALYZE")
+                mode = "analyze"
+        return {"mode": mode, "duration_ms": _elapsed_ms(started)}
+
+    # === Retention ===
+
+    def delete_old_activity_logs(self, retention_days: int = ACTIVITY_LOG_RETENTION_DAYS) -> Dict[str, Any]:
+        return self._delete_older_than(_activity_logs, _activity_logs.c.timestamp, retention_days)
+
+    def delete_old_supplier_usage(self, retention_days: int = SUPPLIER_USAGE_RETENTION_DAYS) -> Dict[str, Any]:
+        return self._delete_older_than(_supplier_usage, _supplier_usage.c.request_timestamp, retention_days)
+
+    def delete_finished_tasks(self, retention_days: int = FINISHED_TASK_RETENTION_DAYS) -> Dict[str, Any]:
+        """Completed, failed and cancelled tasks; pending and running tasks are never removed"""
+        if retention_days <= 0:
+            return {"rows_deleted": 0, "skipped": "retention disabled", "duration_ms": 0}
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        finished_before = and_(
+            _tasks.c.status.in_(FINISHED_TASK_STATUSES),
+            or_(
+                _tasks.c.completed_at < cutoff,
+                and_(_tasks.c.completed_at.is_(None), _tasks.c.created_at < cutoff),
+            ),
+        )
+        return self._delete_in_batches(_tasks, finished_before)
+
+    def _delete_older_than(self, table, column, retention_days: int) -> Dict[str, Any]:
+        if retention_days <= 0:
+            return {"rows_deleted": 0, "skipped": "retention disabled", "duration_ms": 0}
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        return self._delete_in_batches(table, column < cutoff)
+
+    def delete_orphaned_links(self) -> Dict[str, Any]:
+        """Link rows pointing at a deleted row (left behind while foreign keys were not enforced)"""
+        started = time.perf_counter()
+        per_table = {}
+        for table in LINK_TABLES:
+            dangling = [
+                ~exists().where(fk.column == fk.parent) for fk in table.foreign_keys if fk.column.table is not table
+            ]
+            deleted = self._delete_in_batches(table, or_(*dangling))["rows_deleted"]
+            if deleted:
+                per_table[table.name] = deleted
+        return {"rows_deleted": sum(per_table.values()), "tables": per_table, "duration_ms": _elapsed_ms(started)}
+
+    def _delete_in_batches(self, table, condition) -> Dict[str, Any]:
+        """Delete matching rows one short transaction at a time"""
+        started = time.perf_counter()
+        freelist_before = self._pragma("freelist_count")
+        deleted = 0
+        while True:
+            batch = select(_rowid).select_from(table).where(condition).limit(self.batch_size).scalar_subquery()
+            with self.engine.begin() as conn:
+                count = conn.execute(delete(table).where(_rowid.in_(batch))).rowcount
+            deleted += count
+            if count < self.batch_size:
+                break
+            time.sleep(self.pause_seconds)
+
+        pages_freed = max(self._pragma("freelist_count") - freelist_before, 0)
+        return {
+            "rows_deleted": deleted,
+            "bytes_freed": pages_freed * self._pragma("page_size"),
+            "duration_ms": _elapsed_ms(started),
+        }
+
+    # === Space ===
+
+    def vacuum(self, convert: bool = True) -> Dict[str, Any]:
+        """
+        Return free pages to the filesystem. Converts the database to incremental auto_vacuum
+        first when `convert` is set; without it a non-incremental database is left alone.
+        """
+        started = time.perf_counter()
+        page_size = self._pragma("page_size")
+        pages_before = self._pragma("page_count")
+        free_pages = self._pragma("freelist_count")
+
+        if self._pragma("auto_vacuum") != AUTO_VACUUM_INCREMENTAL:
+            if not convert:
+                return {"skipped": "auto_vacuum is not incremental", "free_bytes": free_pages * page_size}
+            reason = self._full_vacuum_blocker(pages_before * page_size)
+            if reason:
+                logger.warning(f"Skipping auto_vacuum conversion: {reason}")
+                return {"skipped": reason, "free_bytes": free_pages * page_size, "duration_ms": _elapsed_ms(started)}
+            logger.info("Converting database to incremental auto_vacuum (full VACUUM)")
+            with self._autocommit() as conn:
+                conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+            mode = "converted"
+        else:
+            remaining = free_pages
+            while remaining > 0:
+                with self._autocommit() as conn:
+                    conn.exec_driver_sql(f"PRAGMA incremental_vacuum({self.vacuum_batch_pages})")
+                left = self._pragma("freelist_count")
+                if left >= remaining:
+                    # Stop rather than spin if a step frees nothing
+                    break
+                remaining = left
+                time.sleep(self.pause_seconds)
+            mode = "incremental"
+
+        pages_after = self._pragma("page_count")
+        return {
+            "mode": mode,
+            "bytes_reclaimed": (pages_before - pages_after) * page_size,
+            "database_size_bytes": pages_after * page_size,
+            "duration_ms": _elapsed_ms(started),
+        }
+
+    def _full_vacuum_blocker(self, database_bytes: int) -> Optional[str]:
+        """Why a full VACUUM cannot run now, if anything"""
+        path = self.database_path
+        if path is None:
+            return None
+        # VACUUM writes a complete copy of the database before replacing it
+        free_disk = shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free
+        if free_disk < database_bytes * 2:
+            return f"not enough free disk space ({free_disk} bytes free, {database_bytes * 2} needed)"
+        return None
+
+    def wal_checkpoint(self) -> Dict[str, Any]:
+        """Copy the write-ahead log into the database and truncate it"""
+        started = time.perf_counter()
+        with self._autocommit() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            if str(journal_mode).lower() != "wal":
+                return {"skipped": f"journal_mode is {journal_mode}", "duration_ms": 0}
+            wal_before = self._wal_size()
+            busy, log_frames, checkpointed = conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+        return {
+            "busy": bool(busy),
+            "frames_checkpointed": checkpointed,
+            "bytes_reclaimed": max(wal_before - self._wal_size(), 0),
+            "duration_ms": _elapsed_ms(started),
+        }
+
+    # === Helpers ===
+
+    @property
+    def database_path(self) -> Optional[str]:
+        database = self.engine.url.database
+        if not database or database == ":memory:":
+            return None
+        return database
+
+    def database_size(self) -> int:
+        """Size of the database and its write-ahead log in bytes"""
+        return self._pragma("page_count") * self._pragma("page_size") + self._wal_size()
+
+    def _wal_size(self) -> int:
+        path = self.database_path
+        if path is None or not os.path.exists(f"{path}-wal"):
+            return 0
+        return os.path.getsize(f"{path}-wal")
+
+    def _pragma(self, name: str) -> int:
+        with self.engine.connect() as conn:
+            return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+    def _autocommit(self) -> Connection:
+        # VACUUM and some pragmas cannot run inside a transaction
+        return self.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
@@ -148,7 +148,7 @@ class DatasheetHandlerService(BaseService):
             await progress_callback(80, "Downloading datasheet file...")
 
         # Download the datasheet file
-        download_result = file_download_service.download_datasheet(
+        download_result = await file_download_service.download_datasheet_async(
             url=result.datasheet_url, part_number=part_number, supplier=supplier
         )
 
@@ -198,50 +198,15 @@ class DatasheetHandlerService(BaseService):
             download_result: The download result or None if failed
         """
         with self.get_session() as session:
-            # Check if datasheet already exists for this part and URL
-            existing_datasheet = self.datasheet_repository.get_datasheet_by_part_and_url(
-                session, part.id, result.datasheet_url
-            )
-
-            if not existing_datasheet:
-                # Create new datasheet record
-                datasheet_data = {
-                    "part_id": part.id,
-                    "source_url": result.datasheet_url,
-                    "supplier": supplier,
-                    "title": f"{supplier} Datasheet - {part_number}",
-                    "description": f"Datasheet for {part.part_name or part_number}",
-                    "is_downloaded": download_result is not None,
-                    "download_error": None if download_result else "Failed to download datasheet file",
-                }
-
-                # Add download details if successful
-                if download_result:
-                    datasheet_data.update(
-                        {
-                            "file_uuid": download_result["file_uuid"],
-                            "original_filename": download_result["original_filename"],
-                            "file_extension": download_result["extension"],
-                            "file_size": download_result["size"],
-                        }
-                    )
-
-                self.datasheet_repository.create_datasheet(session, datasheet_data)
-            else:
-                # Update existing datasheet record
-                if download_result:
-                    self.datasheet_repository.mark_download_successful(
-                        session,
-                        existing_datasheet.id,
-                        download_result["file_uuid"],
-                        download_result["size"],
-                        download_result["original_filename"],
-                        download_result["extension"],
-                    )
-                else:
-                    self.datasheet_repository.mark_download_failed(
-                        session, existing_datasheet.id, "Failed to download datasheet file"
-                    )
+            # Only downloaded files get a row; a failed download is recorded on the part
+            if download_result:
+                self.datasheet_repository.record_download(
+                    session,
+                    part.id,
+                    download_result,
+                    supplier=supplier,
+                    title=f"{supplier} Datasheet - {part_number}",
+                )
 
             # Update the part record
             PartRepository.update_part(session, part)
@@ -0,0 +1,372 @@
+"""
+Download Manager - asyncio downloads for datasheets and images.
+
+- Concurrency is bounded per host and overall, so a 1,000 part import cannot open
+  1,000 connections (or hammer one manufacturer's site).
+- Bodies are streamed to a temp file in the target directory and moved into place
+  with an atomic rename, so readers never see a partial file.
+- Failed transfers are retried with backoff; when the server supports ranges an
+  interrupted body is resumed instead of restarted.
+- Known files are revalidated with ETag/Last-Modified conditional requests.
+- ContentStore names files by the SHA-256 of their content, so identical files
+  downloaded from different URLs are stored once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_TOTAL_LIMIT = 16
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_TIMEOUT_SECONDS = 30
+CHUNK_SIZE = 64 * 1024
+
+# Statuses worth retrying; anything else is reported immediately
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+_HASH_NAME_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DownloadError(Exception):
+    """Raised when a download fails permanently"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a download"""
+
+    url: str
+    path: Path
+    content_hash: str
+    size: int
+    content_type: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # Server answered 304; `path` is the existing file
+    deduplicated: bool = False  # Identical content was already stored
+
+    @property
+    def filename(self) -> str:
+        return self.path.name
+
+
+class ContentStore:
+    """A directory of files named <sha256><extension>"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def temp_path(self) -> Path:
+        return self.directory / f".{uuid.uuid4().hex}.part"
+
+    def path_for(self, content_hash: str, extension: str) -> Path:
+        return self.directory / f"{content_hash}{extension}"
+
+    def commit(self, temp_path: Path, content_hash: str, extension: str) -> Tuple[Path, bool]:
+        """
+        Move a completed temp file to its content address.
+
+        Returns (final path, created). If identical content is already stored the
+        temp file is discarded and created is False.
+        """
+        final_path = self.path_for(content_hash, extension)
+        if final_path.exists():
+            temp_path.unlink(missing_ok=True)
+            return final_path, False
+        os.replace(temp_path, final_path)
+        return final_path, True
+
+    def remove(self, content_hash: str, extension: str) -> bool:
+        path = self.path_for(content_hash, extension)
+        if path.exists():
+            path.unlink()
+            return True
+        return False
+
+    @staticmethod
+    def is_content_addressed(filename: str) -> bool:
+        return bool(_HASH_NAME_RE.match(Path(filename).stem))
+
+
+class NamedStore(ContentStore):
+    """Commits to a caller-chosen file name instead of the content hash"""
+
+    def __init__(self, directory: Path, stem: str):
+        super().__init__(directory)
+        self.stem = stem
+
+    def path_for(self, content_hash: str, extension: str) -> Path:
+        return self.directory / f"{self.stem}{extension}"
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManager:
+    """
+    Bounded-concurrency downloader shared by datasheet and image downloads.
+
+    Limits, the HTTP session and in-flight requests are tied to the running event
+    loop and recreated if the manager is used from a different loop.
+    """
+
+    def __init__(
+        self,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        total_limit: int = DEFAULT_TOTAL_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        retry_backoff_seconds: float = 1.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.max_retries = max_retries
+        self.timeout_seconds = timeout_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.headers = headers or {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._total_semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._session = None
+        self._total_semaphore = asyncio.Semaphore(self.total_limit)
+        self._host_semaphores = {}
+        self._in_flight = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(
+                total=None, sock_connect=self.timeout_seconds, sock_read=self.timeout_seconds
+            )
+            self._session = aiohttp.ClientSession(headers=self.headers, timeout=timeout)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def download(
+        self,
+        url: str,
+        store: ContentStore,
+        extension_for: Callable[[str], Optional[str]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        existing_path: Optional[Path] = None,
+        min_size: int = 0,
+        existing_hash: Optional[str] = None,
+    ) -> DownloadResult:
+        """
+        Download `url` into `store`.
+
+        Args:
+            url: URL to fetch
+            store: Content store the file is committed to
+            extension_for: Maps the response content type to a file extension, or
+                returns None to reject the response (e.g. an HTML error page)
+            etag, last_modified: Validators from a previous download of `url`
+            existing_path: The file from that previous download; validators are only
+                sent if it still exists
+            min_size: Bodies smaller than this are rejected as error pages
+            existing_hash: Stored content hash of existing_path, reported on a 304; the
+                file is hashed when it is not given (e.g. files named by a URL-based UUID)
+
+        Concurrent calls for the same URL and store share one transfer.
+
+        Raises:
+            DownloadError: If the download fails after all retries
+        """
+        self._bind_loop()
+        key = (url, str(store.directory))
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+
+        future = self._loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._download_with_retries(
+                url, store, extension_for, etag, last_modified, existing_path, existing_hash, min_size
+            )
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Only waiters should see the exception; don't log "never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _download_with_retries(
+        self, url, store, extension_for, etag, last_modified, existing_path, existing_hash, min_size
+    ) -> DownloadResult:
+        if existing_path is None or not Path(existing_path).exists():
+            etag = last_modified = None
+            existing_path = existing_hash = None
+
+        temp_path = store.temp_path()
+        validator = None  # ETag/Last-Modified of the partial body in temp_path
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    async with self._total_semaphore, self._host_semaphore(url):
+                        return await self._attempt(
+                            url,
+                            store,
+                            extension_for,
+                            etag,
+                            last_modified,
+                            existing_path,
+                            existing_hash,
+                            min_size,
+                            temp_path,
+                            validator,
+                        )
+                except _PartialBody as partial:
+                    validator = partial.validator
+                    error = partial.error
+                except DownloadError as e:
+                    if e.status not in RETRY_STATUSES:
+                        raise
+                    error = e
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+
+                if attempt > self.max_retries:
+                    raise DownloadError(f"Download failed after {attempt} attempts: {error}")
+                delay = self.retry_backoff_seconds * (2 ** (attempt - 1))
+                logger.info(f"Retrying download of {url} in {delay:.1f}s (attempt {attempt}): {error}")
+                await asyncio.sleep(delay)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    async def _attempt(
+        self,
+        url,
+        store,
+        extension_for,
+        etag,
+        last_modified,
+        existing_path,
+        existing_hash,
+        min_size,
+        temp_path,
+        validator,
+    ) -> DownloadResult:
+        session = await self._get_session()
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        offset = temp_path.stat().st_size if temp_path.exists() else 0
+        if offset and validator:
+            # Resume only if the resource is unchanged, otherwise the server sends it whole
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304 and existing_path is not None:
+                return DownloadResult(
+                    url=url,
+                    path=Path(existing_path),
+                    content_hash=existing_hash or await asyncio.to_thread(hash_file, Path(existing_path)),
+                    size=Path(existing_path).stat().st_size,
+                    content_type=response.headers.get("Content-Type", ""),
+                    etag=response.headers.get("ETag", etag),
+                    last_modified=response.headers.get("Last-Modified", last_modified),
+                    not_modified=True,
+                )
+            if response.status not in (200, 206):
+                raise DownloadError(f"HTTP {response.status} for {url}", status=response.status)
+
+            content_type = response.headers.get("Content-Type", "").lower()
+            extension = extension_for(content_type)
+            if extension is None:
+                raise DownloadError(f"Unexpected content type '{content_type}' for {url}")
+
+            response_etag = response.headers.get("ETag")
+            response_last_modified = response.headers.get("Last-Modified")
+            resumable = response.headers.get("Accept-Ranges", "").lower() == "bytes" or response.status == 206
+            mode = "ab" if response.status == 206 else "wb"
+
+            try:
+                with open(temp_path, mode) as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        f.write(chunk)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                strong_validator = response_etag if response_etag and not response_etag.startswith("W/") else None
+                if resumable and (strong_validator or response_last_modified):
+                    raise _PartialBody(e, strong_validator or response_last_modified)
+                temp_path.unlink(missing_ok=True)
+                raise
+
+        size = temp_path.stat().st_size
+        if size < min_size:
+            raise DownloadError(f"Downloaded body is only {size} bytes, probably an error page: {url}")
+
+        content_hash = await asyncio.to_thread(hash_file, temp_path)
+        final_path, created = store.commit(temp_path, content_hash, extension)
+        return DownloadResult(
+            url=url,
+            path=final_path,
+            content_hash=content_hash,
+            size=size,
+            content_type=content_type,
+            etag=response_etag,
+            last_modified=response_last_modified,
+            deduplicated=not created,
+        )
+
+
+class _PartialBody(Exception):
+    """Transfer broke off but the partial body in the temp file can be resumed"""
+
+    def __init__(self, error: Exception, validator: str):
+        super().__init__(str(error))
+        self.error = error
+        self.validator = validator
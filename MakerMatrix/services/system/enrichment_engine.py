@@ -13,8 +13,9 @@ Architecture:
 Both paths use this SAME engine with the SAME logic for maximum code reuse.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import logging
+import time
 from datetime import datetime
 
 from MakerMatrix.suppliers.base import PartSearchResult, EnrichmentResult, SupplierCapability
@@ -33,8 +34,101 @@ class EnrichmentEngine:
     ensuring maximum code reuse and consistency.
     """
 
+    # How long a bulk-prefetched part stays usable before enrich_part() looks it up again
+    PREFETCH_TTL_SECONDS = 600
+
     def __init__(self):
         self.mapper = SupplierDataMapper()
+        self._prefetched: Dict[Tuple[str, str], Tuple[PartSearchResult, float]] = {}
+
+    def _get_configured_supplier(self, supplier_name: str):
+        """Get a supplier instance from the registry configured with credentials from the database"""
+        supplier = get_supplier(supplier_name)
+        if not supplier:
+            raise ValueError(f"Supplier '{supplier_name}' not found in registry")
+
+        try:
+            from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
+
+            config_service = SupplierConfigService()
+
+            # Get supplier config and credentials
+            supplier_config = config_service.get_supplier_config(supplier_name)
+            credentials = config_service.get_supplier_credentials(supplier_name)
+
+            # Build config dict
+            config_dict = {
+                "base_url": supplier_config.get("base_url", ""),
+                "request_timeout": supplier_config.get("timeout_seconds", 30),
+                "max_retries": supplier_config.get("max_retries", 3),
+                "rate_limit_per_minute": supplier_config.get("rate_limit_per_minute", 60),
+            }
+
+            # Add custom parameters if available
+            custom_params = supplier_config.get("custom_parameters", {})
+            if custom_params:
+                config_dict.update(custom_params)
+
+            # Configure the supplier
+            supplier.configure(credentials or {}, config_dict)
+            logger.info(f"Configured {supplier_name} supplier with credentials from database")
+
+        except Exception as e:
+            logger.warning(f"Could not load credentials for {supplier_name}: {e}")
+            # Continue anyway - some suppliers may work without credentials via scraping
+
+        return supplier
+
+    async def prefetch_part_details(self, supplier_name: str, part_identifiers: List[str]) -> int:
+        """
+        Resolve many parts with the supplier's batch lookup ahead of per-part enrichment.
+
+        Bulk enrichment calls this once per batch; subsequent enrich_part() calls for the same
+        identifiers reuse the prefetched data instead of issuing one API request each. Only the
+        API path is prefetched - scraping suppliers without credentials are skipped.
+
+        Returns:
+            Number of parts that were found and cached
+        """
+        identifiers = [pid for pid in dict.fromkeys(part_identifiers) if pid]
+        if not identifiers:
+            return 0
+
+        supplier = self._get_configured_supplier(supplier_name)
+        try:
+            # Scraping suppliers enrich from product URLs, which are not batchable
+            if supplier.supports_scraping() or not supplier.is_configured():
+                return 0
+
+            results = await supplier.bulk_get_part_details(identifiers)
+        finally:
+            await supplier.close()
+
+        now = time.monotonic()
+        self._prune_prefetched(now)
+        found = 0
+        for identifier, part in results.items():
+            if part is not None:
+                self._prefetched[(supplier_name.lower(), identifier)] = (part, now)
+                found += 1
+
+        logger.info(f"Prefetched {found}/{len(identifiers)} parts from {supplier_name} via bulk lookup")
+        return found
+
+    def _take_prefetched(self, supplier_name: str, part_identifier: str) -> Optional[PartSearchResult]:
+        """Pop a prefetched result if it is still fresh"""
+        entry = self._prefetched.pop((supplier_name.lower(), part_identifier), None)
+        if entry and time.monotonic() - entry[1] <= self.PREFETCH_TTL_SECONDS:
+            return entry[0]
+        return None
+
+    def _prune_prefetched(self, now: float) -> None:
+        """Drop prefetched results that were never consumed"""
+        expired = [
+            key for key, (_, fetched_at) in self._prefetched.items() if now - fetched_at > self.PREFETCH_TTL_SECONDS
+        ]
+        for key in expired:
+            del self._prefetched[key]
 
     async def enrich_part(
         self,
@@ -68,44 +162,14 @@ class EnrichmentEngine:
             Exception: If enrichment fails
         """
         try:
-            # Get supplier instance from registry
-            supplier = get_supplier(supplier_name)
-            if not supplier:
-                raise ValueError(f"Supplier '{supplier_name}' not found in registry")
-
+            supplier = self._get_configured_supplier(supplier_name)
             supplier_info = supplier.get_supplier_info()
             logger.info(f"Starting enrichment for {supplier_info.display_name} part: {part_identifier}")
 
-            # Configure supplier with credentials from database
-            try:
-                from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
-
-                config_service = SupplierConfigService()
-
-                # Get supplier config and credentials
-                supplier_config = config_service.get_supplier_config(supplier_name)
-                credentials = config_service.get_supplier_credentials(supplier_name)
-
-                # Build config dict
-                config_dict = {
-                    "base_url": supplier_config.get("base_url", ""),
-                    "request_timeout": supplier_config.get("timeout_seconds", 30),
-                    "max_retries": supplier_config.get("max_retries", 3),
-                    "rate_limit_per_minute": supplier_config.get("rate_limit_per_minute", 60),
-                }
-
-                # Add custom parameters if available
-                custom_params = supplier_config.get("custom_parameters", {})
-                if custom_params:
-                    config_dict.update(custom_params)
-
-                # Configure the supplier
-                supplier.configure(credentials or {}, config_dict)
-                logger.info(f"Configured {supplier_name} supplier with credentials from database")
-
-            except Exception as e:
-                logger.warning(f"Could not load credentials for {supplier_name}: {e}")
-                # Continue anyway - some suppliers may work without credentials via scraping
+            # Hand over any result from an earlier bulk lookup so the API path skips the per-part request
+            prefetched = self._take_prefetched(supplier_name, part_identifier)
+            if prefetched:
+                supplier.prime_part_details({part_identifier: prefetched})
 
             # Check supplier capabilities and credentials
             supports_scraping = supplier.supports_scraping()
@@ -3,16 +3,37 @@ Enrichment Queue Manager
 
 Manages intelligent queuing and processing of part enrichment tasks with
 supplier-aware rate limiting and real-time progress updates.
+
+Tasks live in the enrichment_queue_items table rather than in memory, so queued and
+interrupted work survives a restart:
+
+- workers claim the next ready item of a supplier atomically (EnrichmentQueueRepository);
+- retries and rate-limited items go back to pending with a not_before time instead of
+  holding a worker while they wait;
+- a worker refreshes the heartbeat of the item it holds after every capability; items
+  whose heartbeat is older than ENRICHMENT_QUEUE_CLAIM_TIMEOUT_SECONDS are released
+  (a crashed or redeployed process) by resume() and periodically by the processing loops,
+  and picked up again;
+- a supplier loop that stops, whatever the reason, returns the item it holds to pending;
+- the queue table is only read and written from worker threads, never on the event loop;
+- finished items are pruned after ENRICHMENT_QUEUE_RETENTION_HOURS, keeping at most
+  ENRICHMENT_QUEUE_MAX_FINISHED of them;
+- the per-process task status cache is a bounded LRU of ENRICHMENT_STATUS_CACHE_SIZE
+  entries.
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple, Set
+import os
+import socket
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
-from contextlib import asynccontextmanager
 
+from MakerMatrix.repositories.enrichment_queue_repository import EnrichmentQueueRepository, FINISHED_STATUSES
 from MakerMatrix.suppliers.registry import get_supplier, get_available_suppliers
 from MakerMatrix.services.rate_limit_service import RateLimitService, RateLimitExceeded
 from MakerMatrix.schemas.websocket_schemas import (
@@ -25,6 +46,20 @@ from MakerMatrix.schemas.websocket_schemas import (
 
 logger = logging.getLogger(__name__)
 
+CLAIM_TIMEOUT_SECONDS = float(os.getenv("ENRICHMENT_QUEUE_CLAIM_TIMEOUT_SECONDS", "300"))
+RETENTION_HOURS = float(os.getenv("ENRICHMENT_QUEUE_RETENTION_HOURS", "24"))
+MAX_FINISHED_ITEMS = int(os.getenv("ENRICHMENT_QUEUE_MAX_FINISHED", "10000"))
+STATUS_CACHE_SIZE = int(os.getenv("ENRICHMENT_STATUS_CACHE_SIZE", "1000"))
+
+# Base delay before a failed task is retried; doubles with every retry
+RETRY_BACKOFF_SECONDS = 30
+# How often the processing loop prunes finished items
+PRUNE_INTERVAL_SECONDS = 300
+# How often the processing loop releases items of workers that stopped reporting
+STALE_CHECK_INTERVAL_SECONDS = 60
+# Longest a supplier loop sleeps before checking for deferred items again
+MAX_IDLE_WAIT_SECONDS = 60
+
 
 class EnrichmentPriority(str, Enum):
     """Priority levels for enrichment tasks"""
@@ -35,6 +70,14 @@ class EnrichmentPriority(str, Enum):
     URGENT = "urgent"
 
 
+PRIORITY_RANKS = {
+    EnrichmentPriority.LOW: 0,
+    EnrichmentPriority.NORMAL: 1,
+    EnrichmentPriority.HIGH: 2,
+    EnrichmentPriority.URGENT: 3,
+}
+
+
 class EnrichmentStatus(str, Enum):
     """Status of enrichment tasks"""
 
@@ -80,17 +123,75 @@ class EnrichmentTask:
         """Get capabilities that still need to be processed"""
         return [cap for cap in self.capabilities if cap not in self.completed_capabilities]
 
+    @classmethod
+    def from_row(cls, row) -> "EnrichmentTask":
+        """Build a task from an enrichment_queue_items row"""
+
+        def aware(value: Optional[datetime]) -> Optional[datetime]:
+            return value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+
+        return cls(
+            id=row.id,
+            part_id=row.part_id,
+            part_name=row.part_name,
+            supplier_name=row.supplier_name,
+            capabilities=list(row.capabilities or []),
+            priority=EnrichmentPriority(row.priority),
+            status=EnrichmentStatus(row.status),
+            created_at=aware(row.created_at),
+            started_at=aware(row.started_at),
+            completed_at=aware(row.completed_at),
+            completed_capabilities=list(row.completed_capabilities or []),
+            failed_capabilities=list(row.failed_capabilities or []),
+            error_message=row.error_message,
+            retry_count=row.retry_count,
+            max_retries=row.max_retries,
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status.value in FINISHED_STATUSES
+
+
+def _utcnow() -> datetime:
+    """Naive UTC, as stored in the queue table"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class TaskStatusCache:
+    """Least-recently-used cache of the tasks this process has seen, bounded in size"""
+
+    def __init__(self, max_size: int = STATUS_CACHE_SIZE):
+        self.max_size = max_size
+        self._tasks: "OrderedDict[str, EnrichmentTask]" = OrderedDict()
+
+    def put(self, task: EnrichmentTask) -> None:
+        self._tasks[task.id] = task
+        self._tasks.move_to_end(task.id)
+        while len(self._tasks) > self.max_size:
+            self._tasks.popitem(last=False)
+
+    def get(self, task_id: str) -> Optional[EnrichmentTask]:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._tasks.move_to_end(task_id)
+        return task
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
 
 class SupplierQueue:
-    """Queue for a specific supplier with rate limiting"""
+    """Queue for a specific supplier with rate limiting, stored in enrichment_queue_items"""
 
-    def __init__(self, supplier_name: str, rate_limit_service: RateLimitService):
+    def __init__(self, supplier_name: str, rate_limit_service: RateLimitService, engine, worker_id: str):
         self.supplier_name = supplier_name
         self.rate_limit_service = rate_limit_service
-        self.pending_tasks: List[EnrichmentTask] = []
-        self.running_tasks: Set[str] = set()
-        self.completed_tasks: List[EnrichmentTask] = []
-        self.failed_tasks: List[EnrichmentTask] = []
+        self.engine = engine
+        self.worker_id = worker_id
         self.is_processing = False
         self.last_request_time: Optional[datetime] = None
 
@@ -105,74 +206,139 @@ class SupplierQueue:
 
     def add_task(self, task: EnrichmentTask):
         """Add a task to the queue"""
-        # Insert based on priority
-        if task.priority == EnrichmentPriority.URGENT:
-            self.pending_tasks.insert(0, task)
-        elif task.priority == EnrichmentPriority.HIGH:
-            # Insert after any urgent tasks
-            urgent_count = sum(1 for t in self.pending_tasks if t.priority == EnrichmentPriority.URGENT)
-            self.pending_tasks.insert(urgent_count, task)
-        else:
-            # Normal and low priority go to the end
-            self.pending_tasks.append(task)
+        with self.engine.begin() as conn:
+            EnrichmentQueueRepository.enqueue(
+                conn,
+                {
+                    "id": task.id,
+                    "part_id": task.part_id,
+                    "part_name": task.part_name,
+                    "supplier_name": self.supplier_name,
+                    "capabilities": task.capabilities,
+                    "completed_capabilities": task.completed_capabilities,
+                    "failed_capabilities": task.failed_capabilities,
+                    "priority": task.priority.value,
+                    "priority_rank": PRIORITY_RANKS[task.priority],
+                    "status": EnrichmentStatus.PENDING.value,
+                    "retry_count": task.retry_count,
+                    "max_retries": task.max_retries,
+                    "created_at": task.created_at.astimezone(timezone.utc).replace(tzinfo=None),
+                },
+            )
 
         logger.info(f"Added {task.priority} priority task for {task.part_name} to {self.supplier_name} queue")
 
     def get_next_task(self) -> Optional[EnrichmentTask]:
-        """Get the next task to process"""
-        if not self.pending_tasks:
-            return None
-        return self.pending_tasks.pop(0)
+        """Claim the next task to process (marks it running for this worker)"""
+        with self.engine.begin() as conn:
+            row = EnrichmentQueueRepository.claim_next(conn, self.supplier_name, self.worker_id, _utcnow())
+        return EnrichmentTask.from_row(row) if row is not None else None
 
     def mark_task_running(self, task: EnrichmentTask):
-        """Mark a task as currently running"""
+        """Mark a claimed task as running"""
         task.status = EnrichmentStatus.RUNNING
-        task.started_at = datetime.now(timezone.utc)
-        self.running_tasks.add(task.id)
+        task.started_at = task.started_at or datetime.now(timezone.utc)
+
+    def record_progress(self, task: EnrichmentTask) -> bool:
+        """Persist the finished capabilities; False if the task was cancelled or taken away"""
+        with self.engine.begin() as conn:
+            return EnrichmentQueueRepository.heartbeat(
+                conn, task.id, self.worker_id, _utcnow(), task.completed_capabilities, task.failed_capabilities
+            )
 
     def mark_task_completed(self, task: EnrichmentTask):
         """Mark a task as completed"""
         task.status = EnrichmentStatus.COMPLETED
         task.completed_at = datetime.now(timezone.utc)
-        self.running_tasks.discard(task.id)
-        self.completed_tasks.append(task)
+        with self.engine.begin() as conn:
+            EnrichmentQueueRepository.finish(
+                conn,
+                task.id,
+                self.worker_id,
+                task.status.value,
+                _utcnow(),
+                completed_capabilities=task.completed_capabilities,
+                failed_capabilities=task.failed_capabilities,
+            )
 
     def mark_task_failed(self, task: EnrichmentTask, error_message: str):
         """Mark a task as failed"""
-        task.status = EnrichmentStatus.FAILED
         task.error_message = error_message
-        task.completed_at = datetime.now(timezone.utc)
-        self.running_tasks.discard(task.id)
-
-        # Retry logic
-        if task.retry_count < task.max_retries:
-            task.retry_count += 1
-            task.status = EnrichmentStatus.PENDING
-            task.started_at = None
-            task.completed_at = None
-            self.add_task(task)  # Re-queue for retry
-            logger.info(f"Re-queued task {task.id} for retry ({task.retry_count}/{task.max_retries})")
-        else:
-            self.failed_tasks.append(task)
-            logger.error(f"Task {task.id} failed permanently after {task.max_retries} retries")
+
+        with self.engine.begin() as conn:
+            # Retry logic
+            if task.retry_count < task.max_retries:
+                task.retry_count += 1
+                task.status = EnrichmentStatus.PENDING
+                task.started_at = None
+                task.completed_at = None
+                delay = RETRY_BACKOFF_SECONDS * 2 ** (task.retry_count - 1)
+                EnrichmentQueueRepository.requeue(
+                    conn,
+                    task.id,
+                    self.worker_id,
+                    _utcnow() + timedelta(seconds=delay),
+                    retry_count=task.retry_count,
+                    error_message=error_message,
+                    started_at=None,
+                )
+                logger.info(f"Re-queued task {task.id} for retry in {delay}s ({task.retry_count}/{task.max_retries})")
+            else:
+                task.status = EnrichmentStatus.FAILED
+                task.completed_at = datetime.now(timezone.utc)
+                EnrichmentQueueRepository.finish(
+                    conn, task.id, self.worker_id, task.status.value, _utcnow(), error_message=error_message
+                )
+                logger.error(f"Task {task.id} failed permanently after {task.max_retries} retries")
+
+    def defer_task(self, task: EnrichmentTask, delay_seconds: float):
+        """Put a rate-limited task back, claimable again after the delay"""
+        task.status = EnrichmentStatus.PENDING
+        with self.engine.begin() as conn:
+            EnrichmentQueueRepository.requeue(
+                conn,
+                task.id,
+                self.worker_id,
+                _utcnow() + timedelta(seconds=delay_seconds),
+                completed_capabilities=task.completed_capabilities,
+                failed_capabilities=task.failed_capabilities,
+            )
+
+    def release_held(self) -> int:
+        """Return the tasks this worker holds for the supplier to pending"""
+        with self.engine.begin() as conn:
+            return EnrichmentQueueRepository.release_worker(conn, self.worker_id, self.supplier_name)
+
+    def seconds_until_ready(self) -> Optional[float]:
+        """Seconds until a deferred task can be claimed, or None if nothing is pending"""
+        with self.engine.connect() as conn:
+            ready_at = EnrichmentQueueRepository.next_ready_at(conn, self.supplier_name)
+        if ready_at is None:
+            return None
+        return max((ready_at - _utcnow()).total_seconds(), 0.0)
+
+    def status_counts(self) -> Dict[str, int]:
+        with self.engine.connect() as conn:
+            return EnrichmentQueueRepository.status_counts(conn, self.supplier_name).get(self.supplier_name, {})
 
     @property
     def queue_size(self) -> int:
         """Get current queue size"""
-        return len(self.pending_tasks)
+        return self.status_counts().get(EnrichmentStatus.PENDING.value, 0)
 
     @property
     def running_count(self) -> int:
         """Get number of running tasks"""
-        return len(self.running_tasks)
+        return self.status_counts().get(EnrichmentStatus.RUNNING.value, 0)
 
     def estimate_completion_time(self) -> Optional[datetime]:
         """Estimate when queue will be completed"""
-        if not self.pending_tasks:
+        with self.engine.connect() as conn:
+            total_capabilities = EnrichmentQueueRepository.remaining_capabilities(conn, self.supplier_name)
+        if not total_capabilities:
             return None
 
         # Estimate based on rate limit delay and queue size
-        total_capabilities = sum(len(task.remaining_capabilities) for task in self.pending_tasks)
         estimated_seconds = total_capabilities * self.rate_limit_delay
 
         return datetime.now(timezone.utc) + timedelta(seconds=estimated_seconds)
@@ -185,10 +351,12 @@ class EnrichmentQueueManager:
         self.engine = engine
         self.rate_limit_service = rate_limit_service
         self.websocket_manager = websocket_manager
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
         self.supplier_queues: Dict[str, SupplierQueue] = {}
-        self.task_registry: Dict[str, EnrichmentTask] = {}
+        self.task_registry = TaskStatusCache()
         self.is_running = False
-        self.processing_tasks: Set[str] = set()
+        self._last_prune: Optional[datetime] = None
+        self._last_stale_check: Optional[datetime] = None
 
         # Initialize queues for available suppliers
         self._initialize_supplier_queues()
@@ -199,7 +367,7 @@ class EnrichmentQueueManager:
             available_suppliers = get_available_suppliers()
             for supplier_name in available_suppliers:
                 self.supplier_queues[supplier_name.upper()] = SupplierQueue(
-                    supplier_name.upper(), self.rate_limit_service
+                    supplier_name.upper(), self.rate_limit_service, self.engine, self.worker_id
                 )
             logger.info(f"Initialized enrichment queues for {len(available_suppliers)} suppliers")
         except Exception as e:
@@ -215,8 +383,6 @@ class EnrichmentQueueManager:
         task_id: Optional[str] = None,
     ) -> str:
         """Queue a part for enrichment"""
-        import uuid
-
         if task_id is None:
             task_id = str(uuid.uuid4())
 
@@ -236,9 +402,10 @@ class EnrichmentQueueManager:
             priority=priority,
         )
 
-        # Add to registry and queue
-        self.task_registry[task_id] = task
-        self.supplier_queues[supplier_name].add_task(task)
+        # Persist to the queue and remember the task locally
+        queue = self.supplier_queues[supplier_name]
+        await asyncio.to_thread(queue.add_task, task)
+        self.task_registry.put(task)
 
         logger.info(f"Queued enrichment task {task_id} for part {part_name} with {supplier_name}")
 
@@ -249,12 +416,84 @@ class EnrichmentQueueManager:
             except Exception as e:
                 logger.warning(f"Failed to broadcast queue update: {e}")
 
-        # Start processing if not already running
-        if not self.is_running:
-            asyncio.create_task(self.start_processing())
+        # Start processing this supplier's queue if it is idle
+        if not queue.is_processing:
+            asyncio.create_task(self._process_supplier_queue(supplier_name))
 
         return task_id
 
+    async def resume(self) -> int:
+        """
+        Pick up work left by a previous run: release items whose worker stopped reporting
+        and start processing every supplier with pending items. Returns the number released.
+        """
+        released = await asyncio.to_thread(self.release_stale)
+        await asyncio.to_thread(self.prune)
+        asyncio.create_task(self.start_processing())
+        return released
+
+    async def stop(self) -> None:
+        """Hand the tasks this worker holds back to the queue so another run resumes them"""
+
+        def release() -> int:
+            with self.engine.begin() as conn:
+                return EnrichmentQueueRepository.release_worker(conn, self.worker_id)
+
+        released = await asyncio.to_thread(release)
+        if released:
+            logger.info(f"Returned {released} running enrichment tasks to the queue")
+
+    def release_stale(self) -> int:
+        """Return items whose worker stopped reporting to pending"""
+        self._last_stale_check = _utcnow()
+        with self.engine.begin() as conn:
+            released = EnrichmentQueueRepository.release_stale(
+                conn, _utcnow() - timedelta(seconds=CLAIM_TIMEOUT_SECONDS)
+            )
+        if released:
+            logger.info(f"Released {released} enrichment tasks abandoned by a stopped worker")
+        return released
+
+    def prune(self) -> int:
+        """Delete finished items past the retention period or beyond the size bound"""
+        self._last_prune = _utcnow()
+        with self.engine.begin() as conn:
+            deleted = EnrichmentQueueRepository.prune(
+                conn, _utcnow() - timedelta(hours=RETENTION_HOURS), MAX_FINISHED_ITEMS
+            )
+        if deleted:
+            logger.info(f"Pruned {deleted} finished enrichment queue items")
+        return deleted
+
+    @staticmethod
+    def _due(last: Optional[datetime], interval_seconds: float) -> bool:
+        return last is None or (_utcnow() - last).total_seconds() >= interval_seconds
+
+    async def _maintain(self):
+        """Prune finished items and release stale ones once their intervals have passed"""
+        if self._due(self._last_prune, PRUNE_INTERVAL_SECONDS):
+            try:
+                await asyncio.to_thread(self.prune)
+            except Exception as e:
+                logger.warning(f"Failed to prune enrichment queue: {e}")
+        if self._due(self._last_stale_check, STALE_CHECK_INTERVAL_SECONDS):
+            try:
+                if await asyncio.to_thread(self.release_stale):
+                    await self._start_idle_suppliers()
+            except Exception as e:
+                logger.warning(f"Failed to release stale enrichment tasks: {e}")
+
+    def _suppliers_with_pending(self) -> List[str]:
+        with self.engine.connect() as conn:
+            return EnrichmentQueueRepository.suppliers_with_pending(conn)
+
+    async def _start_idle_suppliers(self):
+        """Start a loop for every supplier with pending items that is not being processed"""
+        for name in await asyncio.to_thread(self._suppliers_with_pending):
+            queue = self.supplier_queues.get(name)
+            if queue is not None and not queue.is_processing:
+                asyncio.create_task(self._process_supplier_queue(name))
+
     async def start_processing(self):
         """Start processing all supplier queues"""
         if self.is_running:
@@ -264,11 +503,9 @@ class EnrichmentQueueManager:
         logger.info("Starting enrichment queue processing")
 
         try:
-            # Start processing tasks for each supplier
-            tasks = []
-            for supplier_name, queue in self.supplier_queues.items():
-                if queue.queue_size > 0:
-                    tasks.append(self._process_supplier_queue(supplier_name))
+            # Start processing tasks for each supplier with pending work
+            suppliers = await asyncio.to_thread(self._suppliers_with_pending)
+            tasks = [self._process_supplier_queue(name) for name in suppliers if name in self.supplier_queues]
 
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
@@ -287,23 +524,35 @@ class EnrichmentQueueManager:
         logger.info(f"Starting processing queue for {supplier_name}")
 
         try:
-            while queue.queue_size > 0:
-                task = queue.get_next_task()
+            while True:
+                await self._maintain()
+                task = await asyncio.to_thread(queue.get_next_task)
                 if not task:
-                    break
-
+                    # Wait for deferred (retrying or rate-limited) tasks, stop when none are left
+                    wait = await asyncio.to_thread(queue.seconds_until_ready)
+                    if wait is None:
+                        break
+                    await asyncio.sleep(min(wait, MAX_IDLE_WAIT_SECONDS))
+                    continue
+
+                self.task_registry.put(task)
                 try:
                     await self._process_enrichment_task(task, queue)
                 except RateLimitExceeded as e:
-                    # Re-queue task and wait
+                    # Defer the task instead of holding it while the limit resets
                     task.status = EnrichmentStatus.RATE_LIMITED
-                    queue.add_task(task)
-                    logger.warning(f"Rate limit exceeded for {supplier_name}, waiting {e.retry_after} seconds")
-                    await asyncio.sleep(e.retry_after)
+                    await asyncio.to_thread(queue.defer_task, task, e.retry_after)
+                    logger.warning(f"Rate limit exceeded for {supplier_name}, deferring task {e.retry_after} seconds")
                 except Exception as e:
                     logger.error(f"Error processing task {task.id}: {e}")
-                    queue.mark_task_failed(task, str(e))
         finally:
+            # A loop cancelled or failing mid-task would otherwise hold its task until it goes stale
+            try:
+                released = await asyncio.to_thread(queue.release_held)
+                if released:
+                    logger.info(f"Returned {released} running {supplier_name} enrichment tasks to the queue")
+            except Exception as e:
+                logger.warning(f"Failed to return {supplier_name} enrichment tasks to the queue: {e}")
             queue.is_processing = False
             logger.info(f"Finished processing queue for {supplier_name}")
 
@@ -316,6 +565,9 @@ class EnrichmentQueueManager:
             from MakerMatrix.services.system.enrichment_coordinator_service import EnrichmentCoordinatorService
             from MakerMatrix.repositories.parts_repositories import PartRepository
             from MakerMatrix.services.data.part_service import PartService
+            from MakerMatrix.models.part_models import PartModel
+            from MakerMatrix.models.task_models import TaskModel, TaskStatus, TaskType
+            from sqlmodel import Session
 
             # Create services
             part_repository = PartRepository(self.engine)
@@ -323,17 +575,16 @@ class EnrichmentQueueManager:
             enrichment_handler = EnrichmentCoordinatorService(part_repository, part_service)
 
             # Get the part
-            part = await part_repository.get_by_id(task.part_id)
+            def load_part():
+                with Session(self.engine) as session:
+                    return session.get(PartModel, task.part_id)
+
+            part = await asyncio.to_thread(load_part)
             if not part:
                 raise ValueError(f"Part {task.part_id} not found")
 
             # Process each capability with rate limiting
             for capability in task.remaining_capabilities:
-                if task.id in self.processing_tasks:
-                    # Task was cancelled
-                    task.status = EnrichmentStatus.CANCELLED
-                    return
-
                 # Check rate limit
                 rate_status = await self.rate_limit_service.check_rate_limit(task.supplier_name, capability)
 
@@ -352,13 +603,17 @@ class EnrichmentQueueManager:
                 # Perform enrichment
                 start_time = datetime.now(timezone.utc)
                 try:
-                    # Use the new enrichment handler
-                    result = await enrichment_handler.handle_part_enrichment(
-                        task_id=task.id,
-                        part_id=task.part_id,
-                        supplier=task.supplier_name,
-                        requested_capabilities=[capability],
+                    # The enrichment handler takes its parameters from a (transient) task model
+                    part_task = TaskModel(
+                        id=task.id,
+                        task_type=TaskType.PART_ENRICHMENT,
+                        name=f"Part Enrichment - {task.part_name}",
+                        status=TaskStatus.RUNNING,
+                    )
+                    part_task.set_input_data(
+                        {"part_id": task.part_id, "supplier": task.supplier_name, "capabilities": [capability]}
                     )
+                    result = await enrichment_handler.handle_part_enrichment(part_task)
 
                     # Record successful request
                     response_time = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
@@ -394,8 +649,14 @@ class EnrichmentQueueManager:
                     task.failed_capabilities.append(capability)
                     logger.warning(f"Failed to enrich {capability} for part {task.part_name}: {e}")
 
+                # Persist progress; stop if the task was cancelled meanwhile
+                if not await asyncio.to_thread(queue.record_progress, task):
+                    task.status = EnrichmentStatus.CANCELLED
+                    logger.info(f"Enrichment task {task.id} was cancelled")
+                    return
+
             # Mark task as completed
-            queue.mark_task_completed(task)
+            await asyncio.to_thread(queue.mark_task_completed, task)
 
             # Send completion notification
             if self.websocket_manager:
@@ -422,8 +683,10 @@ class EnrichmentQueueManager:
                 except Exception as e:
                     logger.warning(f"Failed to broadcast completion notification: {e}")
 
+        except RateLimitExceeded:
+            raise
         except Exception as e:
-            queue.mark_task_failed(task, str(e))
+            await asyncio.to_thread(queue.mark_task_failed, task, str(e))
             raise
 
     async def _broadcast_queue_status(self, supplier_name: str):
@@ -444,13 +707,26 @@ class EnrichmentQueueManager:
                 current_usage=rate_status.get("current_usage", {}),
                 limits=rate_status.get("limits", {}),
                 next_reset=rate_status.get("next_reset", {}),
-                queue_size=queue.queue_size,
+                queue_size=await asyncio.to_thread(lambda: queue.queue_size),
             )
 
             await self.websocket_manager.broadcast_to_all(message.model_dump())
         except Exception as e:
             logger.warning(f"Failed to broadcast queue status: {e}")
 
+    @staticmethod
+    def _queue_summary(queue: SupplierQueue, counts: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "queue_size": counts.get(EnrichmentStatus.PENDING.value, 0),
+            "running_count": counts.get(EnrichmentStatus.RUNNING.value, 0),
+            "completed_count": counts.get(EnrichmentStatus.COMPLETED.value, 0),
+            "failed_count": counts.get(EnrichmentStatus.FAILED.value, 0),
+            "estimated_completion": (
+                queue.estimate_completion_time() if counts.get(EnrichmentStatus.PENDING.value) else None
+            ),
+            "is_processing": queue.is_processing,
+        }
+
     def get_queue_status(self, supplier_name: Optional[str] = None) -> Dict[str, Any]:
         """Get status of enrichment queues"""
         if supplier_name:
@@ -459,32 +735,32 @@ class EnrichmentQueueManager:
                 return {}
 
             queue = self.supplier_queues[supplier_name]
+            return {"supplier_name": supplier_name, **self._queue_summary(queue, queue.status_counts())}
+        else:
+            # Return status for all queues from one grouped count
+            with self.engine.connect() as conn:
+                counts = EnrichmentQueueRepository.status_counts(conn)
             return {
-                "supplier_name": supplier_name,
-                "queue_size": queue.queue_size,
-                "running_count": queue.running_count,
-                "completed_count": len(queue.completed_tasks),
-                "failed_count": len(queue.failed_tasks),
-                "estimated_completion": queue.estimate_completion_time(),
-                "is_processing": queue.is_processing,
+                name: self._queue_summary(queue, counts.get(name, {})) for name, queue in self.supplier_queues.items()
             }
-        else:
-            # Return status for all queues
-            status = {}
-            for name, queue in self.supplier_queues.items():
-                status[name] = {
-                    "queue_size": queue.queue_size,
-                    "running_count": queue.running_count,
-                    "completed_count": len(queue.completed_tasks),
-                    "failed_count": len(queue.failed_tasks),
-                    "estimated_completion": queue.estimate_completion_time(),
-                    "is_processing": queue.is_processing,
-                }
-            return status
+
+    def _load_task(self, task_id: str) -> Optional[EnrichmentTask]:
+        """The task from the local cache if it is finished, otherwise from the queue table"""
+        task = self.task_registry.get(task_id)
+        if task is not None and task.is_finished:
+            return task
+
+        with self.engine.connect() as conn:
+            row = EnrichmentQueueRepository.get(conn, task_id)
+        if row is None:
+            return None
+        task = EnrichmentTask.from_row(row)
+        self.task_registry.put(task)
+        return task
 
     def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a specific task"""
-        task = self.task_registry.get(task_id)
+        task = self._load_task(task_id)
         if not task:
             return None
 
@@ -506,39 +782,47 @@ class EnrichmentQueueManager:
         }
 
     async def cancel_task(self, task_id: str) -> bool:
-        """Cancel a pending or running task"""
-        task = self.task_registry.get(task_id)
-        if not task:
-            return False
+        """Cancel a pending or running task (a running task stops after its current capability)"""
 
-        if task.status in [EnrichmentStatus.COMPLETED, EnrichmentStatus.FAILED, EnrichmentStatus.CANCELLED]:
-            return False
+        def cancel() -> bool:
+            with self.engine.begin() as conn:
+                return EnrichmentQueueRepository.cancel(conn, task_id, _utcnow())
 
-        task.status = EnrichmentStatus.CANCELLED
-        self.processing_tasks.discard(task_id)
+        if not await asyncio.to_thread(cancel):
+            return False
 
-        # Remove from supplier queue if still pending
-        if task.supplier_name in self.supplier_queues:
-            queue = self.supplier_queues[task.supplier_name]
-            queue.pending_tasks = [t for t in queue.pending_tasks if t.id != task_id]
-            queue.running_tasks.discard(task_id)
+        task = self.task_registry.get(task_id)
+        if task is not None:
+            task.status = EnrichmentStatus.CANCELLED
+            task.completed_at = datetime.now(timezone.utc)
 
         logger.info(f"Cancelled enrichment task {task_id}")
         return True
 
     async def get_queue_statistics(self) -> Dict[str, Any]:
         """Get comprehensive queue statistics"""
-        total_pending = sum(queue.queue_size for queue in self.supplier_queues.values())
-        total_running = sum(queue.running_count for queue in self.supplier_queues.values())
-        total_completed = sum(len(queue.completed_tasks) for queue in self.supplier_queues.values())
-        total_failed = sum(len(queue.failed_tasks) for queue in self.supplier_queues.values())
+        queue_details = await asyncio.to_thread(self.get_queue_status)
 
         return {
-            "total_pending": total_pending,
-            "total_running": total_running,
-            "total_completed": total_completed,
-            "total_failed": total_failed,
+            "total_pending": sum(details["queue_size"] for details in queue_details.values()),
+            "total_running": sum(details["running_count"] for details in queue_details.values()),
+            "total_completed": sum(details["completed_count"] for details in queue_details.values()),
+            "total_failed": sum(details["failed_count"] for details in queue_details.values()),
             "total_queues": len(self.supplier_queues),
             "active_queues": len([q for q in self.supplier_queues.values() if q.is_processing]),
-            "queue_details": self.get_queue_status(),
+            "queue_details": queue_details,
         }
+
+
+_queue_manager: Optional[EnrichmentQueueManager] = None
+
+
+def get_enrichment_queue_manager() -> EnrichmentQueueManager:
+    """The process-wide queue manager on the application database"""
+    global _queue_manager
+    if _queue_manager is None:
+        from MakerMatrix.models.models import engine
+        from MakerMatrix.services.system.websocket_service import websocket_manager
+
+        _queue_manager = EnrichmentQueueManager(engine, RateLimitService(engine, websocket_manager), websocket_manager)
+    return _queue_manager
@@ -0,0 +1,260 @@
+"""
+Event Bus - fans events out to every worker process.
+
+Handlers subscribe to a channel in each process. publish() runs the local handlers
+first and then forwards the event to the other processes, whose handlers run when it
+arrives. WebSocketManager uses this so a client connected to one worker sees task
+updates produced by another, and caches use it to drop stale entries everywhere.
+
+Backends (EVENT_BUS_BACKEND):
+- local: single process, nothing is forwarded (default for one worker)
+- sqlite: events table in the coordination store, polled every EVENT_BUS_POLL_SECONDS
+  (default when WEB_CONCURRENCY > 1)
+- redis: Redis pub/sub at REDIS_URL; requires the optional `redis` package
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from MakerMatrix.services.system.coordination import (
+    PROCESS_ID,
+    CoordinationStore,
+    event_bus_backend,
+    get_coordination_store,
+)
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = float(os.getenv("EVENT_BUS_POLL_SECONDS", "0.25"))
+EVENT_RETENTION_SECONDS = float(os.getenv("EVENT_BUS_RETENTION_SECONDS", "60"))
+
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+
+Handler = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class EventBus:
+    """In-process dispatch; subclasses forward events to other processes"""
+
+    backend = "local"
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+        self.stats = {"published": 0, "received": 0, "handler_errors": 0}
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        """Run `handler(payload)` for every event on `channel`, local or remote"""
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def publish(self, channel: str, payload: Dict[str, Any], local: bool = True) -> None:
+        """Deliver to the handlers of every process; local=False skips this process"""
+        self.stats["published"] += 1
+        if local:
+            await self._dispatch(channel, payload)
+        try:
+            await self._forward(channel, payload)
+        except Exception as e:
+            logger.warning(f"Failed to forward event on '{channel}' to other workers: {e}")
+
+    def publish_nowait(self, channel: str, payload: Dict[str, Any]) -> None:
+        """publish() from synchronous code; dropped when no event loop is running"""
+        try:
+            asyncio.get_running_loop().create_task(self.publish(channel, payload))
+        except RuntimeError:
+            logger.debug(f"No running event loop, event on '{channel}' not published")
+
+    async def _dispatch(self, channel: str, payload: Dict[str, Any]) -> None:
+        for handler in list(self._handlers.get(channel, [])):
+            try:
+                result = handler(payload)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.stats["handler_errors"] += 1
+                logger.error(f"Event handler for '{channel}' failed: {e}")
+
+    async def _forward(self, channel: str, payload: Dict[str, Any]) -> None:
+        """Deliver to the other processes"""
+
+    async def start(self) -> None:
+        """Begin receiving events from other processes"""
+
+    async def stop(self) -> None:
+        pass
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "process_id": PROCESS_ID, "channels": sorted(self._handlers), **self.stats}
+
+
+class LocalEventBus(EventBus):
+    """Single-process bus"""
+
+
+class SQLiteEventBus(EventBus):
+    """Forwards events through the coordination store's events table"""
+
+    backend = "sqlite"
+
+    def __init__(
+        self,
+        store: CoordinationStore,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        retention_seconds: float = EVENT_RETENTION_SECONDS,
+        origin: str = PROCESS_ID,
+    ):
+        super().__init__()
+        self.store = store
+        self.origin = origin
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._poll_task: Optional[asyncio.Task] = None
+
+    async def _forward(self, channel: str, payload: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.store.append_event, channel, payload, self.origin)
+
+    async def start(self) -> None:
+        if self._poll_task is not None and not self._poll_task.done():
+            return
+        # Only events published after startup are delivered
+        self._last_id = await asyncio.to_thread(self.store.last_event_id)
+        self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+    async def poll(self) -> int:
+        """Deliver pending events from other processes; returns how many were handled"""
+        events = await asyncio.to_thread(self.store.read_events, self._last_id, self.origin)
+        for event_id, channel, payload in events:
+            self._last_id = event_id
+            self.stats["received"] += 1
+            await self._dispatch(channel, payload)
+
+        now = time.monotonic()
+        if now - self._last_prune >= self.retention_seconds:
+            self._last_prune = now
+            await asyncio.to_thread(self.store.prune, self.retention_seconds)
+        return len(events)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                if not await self.poll():
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event bus poll failed: {e}")
+                await asyncio.sleep(max(self.poll_interval, 1.0))
+
+
+class RedisEventBus(EventBus):
+    """Forwards events over Redis pub/sub"""
+
+    backend = "redis"
+
+    def __init__(self, url: str, prefix: str = "makermatrix:events:"):
+        super().__init__()
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("EVENT_BUS_BACKEND=redis requires the redis package: pip install redis") from e
+
+        self.url = url
+        self.prefix = prefix
+        self._redis = redis_asyncio.from_url(url)
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def _forward(self, channel: str, payload: Dict[str, Any]) -> None:
+        message = json.dumps({"origin": PROCESS_ID, "payload": payload}, default=str)
+        await self._redis.publish(f"{self.prefix}{channel}", message)
+
+    async def start(self) -> None:
+        if self._listen_task is None or self._listen_task.done():
+            self._listen_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+            self._listen_task = None
+        await self._redis.aclose()
+
+    async def _listen(self) -> None:
+        pubsub = self._redis.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                event = json.loads(message["data"])
+                if event.get("origin") == PROCESS_ID:
+                    continue
+                self.stats["received"] += 1
+                await self._dispatch(channel[len(self.prefix) :], event["payload"])
+        finally:
+            await pubsub.aclose()
+
+
+def create_event_bus(backend: Optional[str] = None) -> EventBus:
+    backend = backend or event_bus_backend()
+    if backend == "sqlite":
+        return SQLiteEventBus(get_coordination_store())
+    if backend == "redis":
+        return RedisEventBus(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend != "local":
+        logger.warning(f"Unknown EVENT_BUS_BACKEND '{backend}', using the local event bus")
+    return LocalEventBus()
+
+
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Event bus of this process, created from EVENT_BUS_BACKEND on first use"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = create_event_bus()
+    return _event_bus
+
+
+# === Cache invalidation ===
+
+
+def on_cache_invalidation(cache_name: str, callback: Callable[[Optional[str]], None]) -> None:
+    """Call `callback(key)` whenever any process invalidates `cache_name`"""
+
+    def handler(payload: Dict[str, Any]) -> None:
+        if payload.get("cache") == cache_name:
+            callback(payload.get("key"))
+
+    get_event_bus().subscribe(CACHE_INVALIDATION_CHANNEL, handler)
+
+
+def publish_cache_invalidation(cache_name: str, key: Optional[str] = None) -> None:
+    """Tell every process (this one included) to drop `key` of `cache_name`, or all of it"""
+    get_event_bus().publish_nowait(CACHE_INVALIDATION_CHANNEL, {"cache": cache_name, "key": key})
@@ -0,0 +1,246 @@
+"""
+Event Loop Monitor - continuous event loop lag measurement and blocking call attribution.
+
+A heartbeat coroutine sleeps for LOOP_MONITOR_INTERVAL_MS at a time and records how late it
+wakes up; the delay is the event loop lag. A watchdog thread checks the heartbeat: once it
+is more than LOOP_MONITOR_BLOCK_MS late, whatever the event loop thread is running is
+blocking it, so the watchdog samples that thread's stack. When the heartbeat runs again the
+stall is attributed, with its full duration, to the innermost MakerMatrix frame of the
+sample (the application code that made the blocking call) and aggregated per code location.
+
+Enable with LOOP_MONITOR_ENABLED=true. The findings are served by /api/metrics/event-loop
+and, as histograms and counters, by /metrics. Each worker process monitors its own loop.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from MakerMatrix.services.system.request_metrics import Counter, Histogram, LAG_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "50"))
+BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_MONITOR_BLOCK_MS", "250"))
+MAX_LOCATIONS = int(os.getenv("LOOP_MONITOR_MAX_LOCATIONS", "200"))
+
+# Frames kept of each sampled stack
+MAX_STACK_DEPTH = 40
+
+# Stalls whose stack has no frame under this directory are grouped by their innermost frame
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MONITOR_FILE = os.path.abspath(__file__)
+
+# Stalls attributed to locations beyond MAX_LOCATIONS
+OTHER_LOCATION = "other"
+
+
+class BlockingLocation:
+    """Stalls attributed to one code location"""
+
+    def __init__(self, location: str):
+        self.location = location
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seen: Optional[datetime] = None
+        self.blocking_call: Optional[str] = None
+        self.stack: List[str] = []
+
+    def add(self, seconds: float, blocking_call: str, stack: List[str]) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.max_seconds:
+            # Keep the stack of the longest stall
+            self.max_seconds = seconds
+            self.blocking_call = blocking_call
+            self.stack = stack
+        self.last_seen = datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "location": self.location,
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 1),
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "blocking_call": self.blocking_call,
+            "stack": self.stack,
+        }
+
+
+class EventLoopMonitor:
+    """Event loop lag histogram and blocking stalls per code location of one event loop"""
+
+    def __init__(
+        self,
+        interval_ms: float = INTERVAL_MS,
+        block_threshold_ms: float = BLOCK_THRESHOLD_MS,
+        max_locations: int = MAX_LOCATIONS,
+    ):
+        self.interval = interval_ms / 1000
+        self.block_threshold = block_threshold_ms / 1000
+        self.max_locations = max_locations
+
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        # perf_counter() at which the heartbeat is due to wake up next
+        self._due: Optional[float] = None
+        # (location, blocking call, stack) sampled during the current stall
+        self._sample: Optional[Tuple[str, str, List[str]]] = None
+
+        self.started_at: Optional[datetime] = None
+        self.max_lag = 0.0
+        self.locations: Dict[str, BlockingLocation] = {}
+        self.lag = Histogram(
+            "makermatrix_event_loop_lag_seconds", "Delay of the event loop monitor heartbeat", LAG_BUCKETS, ()
+        )
+        self.stalls = Counter(
+            "makermatrix_event_loop_stalls_total", "Event loop stalls longer than LOOP_MONITOR_BLOCK_MS", ("location",)
+        )
+        self.stall_seconds = Counter(
+            "makermatrix_event_loop_stall_seconds_total", "Time the event loop was stalled", ("location",)
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # === Lifecycle ===
+
+    async def start(self) -> None:
+        """Monitor the running event loop until stop()"""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stopping.clear()
+        self._due = time.perf_counter() + self.interval
+        self.started_at = datetime.utcnow()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval * 1000:.0f} ms, "
+            f"block threshold {self.block_threshold * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join, 1.0)
+            self._watchdog = None
+        self._due = None
+
+    def reset(self) -> None:
+        """Forget the stalls and lag recorded so far"""
+        with self._lock:
+            self.locations = {}
+            self.max_lag = 0.0
+            self.lag = Histogram(self.lag.name, self.lag.documentation, LAG_BUCKETS, ())
+            self.stalls = Counter(self.stalls.name, self.stalls.documentation, ("location",))
+            self.stall_seconds = Counter(self.stall_seconds.name, self.stall_seconds.documentation, ("location",))
+
+    # === Measuring ===
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            with self._lock:
+                lag = max(now - self._due, 0.0)
+                self._due = now + self.interval
+                sample, self._sample = self._sample, None
+            self._record(lag, sample)
+
+    def _watch(self) -> None:
+        # Poll often enough to catch a stall shortly after it crosses the threshold
+        poll = min(self.interval, self.block_threshold / 4)
+        while not self._stopping.wait(poll):
+            with self._lock:
+                due = self._due
+                stalled = due is not None and self._sample is None and time.perf_counter() - due > self.block_threshold
+            if stalled:
+                sample = self._sample_loop_stack()
+                with self._lock:
+                    # The heartbeat may have caught up while the stack was being sampled
+                    if self._due == due:
+                        self._sample = sample
+
+    def _sample_loop_stack(self) -> Tuple[str, str, List[str]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return OTHER_LOCATION, "unknown", []
+        summary = traceback.extract_stack(frame, limit=MAX_STACK_DEPTH)
+        stack = [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in summary]
+        blocking_call = stack[-1] if stack else "unknown"
+        location = blocking_call
+        for entry in reversed(summary):
+            filename = os.path.abspath(entry.filename)
+            if filename.startswith(_PACKAGE_DIR) and filename != _MONITOR_FILE:
+                location = f"{os.path.relpath(filename, os.path.dirname(_PACKAGE_DIR))}:{entry.lineno} in {entry.name}"
+                break
+        return location, blocking_call, stack
+
+    def _record(self, lag: float, sample: Optional[Tuple[str, str, List[str]]]) -> None:
+        with self._lock:
+            self.lag.observe((), lag)
+            self.max_lag = max(self.max_lag, lag)
+            if sample is None or lag < self.block_threshold:
+                return
+            location, blocking_call, stack = sample
+            entry = self.locations.get(location)
+            if entry is None:
+                if len(self.locations) >= self.max_locations:
+                    location = OTHER_LOCATION
+                    entry = self.locations.get(location)
+                if entry is None:
+                    entry = self.locations[location] = BlockingLocation(location)
+            entry.add(lag, blocking_call, stack)
+            self.stalls.inc((location,))
+            self.stall_seconds.inc((location,), lag)
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms at {location} (blocking call: {blocking_call})")
+
+    # === Reporting ===
+
+    def report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Stall locations ordered by the total time they blocked the loop"""
+        with self._lock:
+            locations = sorted(self.locations.values(), key=lambda entry: entry.total_seconds, reverse=True)
+            return {
+                "enabled": self.running,
+                "started_at": self.started_at.isoformat() if self.started_at else None,
+                "interval_ms": self.interval * 1000,
+                "block_threshold_ms": self.block_threshold * 1000,
+                "max_lag_ms": round(self.max_lag * 1000, 1),
+                "stalls": sum(entry.count for entry in locations),
+                "locations": [entry.to_dict() for entry in locations[:limit]],
+            }
+
+    def render(self) -> str:
+        """Lag histogram and stall counters in the Prometheus text format (empty when not running)"""
+        if self.started_at is None:
+            return ""
+        with self._lock:
+            lines = self.lag.render() + self.stalls.render() + self.stall_seconds.render()
+        return "\n".join(lines) + "\n"
+
+
+event_loop_monitor = EventLoopMonitor()
@@ -1,6 +1,5 @@
 import os
 import requests
-import hashlib
 import uuid
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -8,13 +7,56 @@ import logging
 from urllib.parse import urlparse, unquote
 import re
 
+from sqlmodel import Session
+
+from MakerMatrix.services.system.download_manager import (
+    ContentStore,
+    DownloadError,
+    DownloadManager,
+    DownloadResult,
+    NamedStore,
+    hash_file,
+)
+
 logger = logging.getLogger(__name__)
 
+# Bodies smaller than these are treated as error pages
+MIN_DATASHEET_SIZE = 1024
+MIN_IMAGE_SIZE = 100
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp")
+
+
+def _datasheet_extension(content_type: str) -> Optional[str]:
+    """Datasheets are stored as PDF; HTML means the URL is a landing page, not the file"""
+    if "html" in content_type:
+        return None
+    return ".pdf"
+
+
+def _image_extension(content_type: str, url: str = "") -> Optional[str]:
+    if "image" not in content_type:
+        return None
+    if "jpeg" in content_type:
+        return ".jpg"
+    for name in ("png", "gif", "webp"):
+        if name in content_type:
+            return f".{name}"
+
+    # Fall back to the URL
+    path = unquote(urlparse(url).path).lower()
+    if path.endswith(IMAGE_EXTENSIONS):
+        return Path(path).suffix
+    for name in ("png", "gif", "webp"):
+        if name in url.lower():
+            return f".{name}"
+    return ".jpg"
+
 
 class FileDownloadService:
     """Service for downloading and managing datasheets and component images"""
 
-    def __init__(self, download_config=None):
+    def __init__(self, download_config=None, engine_override=None):
         # Use environment variable if set (Docker), otherwise default path
         static_files_path = os.getenv("STATIC_FILES_PATH")
         if static_files_path:
@@ -24,6 +66,7 @@ class FileDownloadService:
         self.datasheets_path = self.base_path / "datasheets"
         # Use images directory within static folder
         self.uploaded_images_path = self.base_path / "images"
+        self.engine_override = engine_override
 
         # Store download configuration
         self.download_config = download_config or {}
@@ -32,6 +75,9 @@ class FileDownloadService:
         self.datasheets_path.mkdir(parents=True, exist_ok=True)
         self.uploaded_images_path.mkdir(parents=True, exist_ok=True)
 
+        # Datasheets are stored by content hash so a PDF shared by many parts is kept once
+        self.datasheet_store = ContentStore(self.datasheets_path)
+
         # Common headers for requests
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -43,198 +89,277 @@ class FileDownloadService:
             "Upgrade-Insecure-Requests": "1",
         }
 
-    def download_datasheet(
-        self, url: str, part_number: str, supplier: str = "", file_uuid: str = None
-    ) -> Optional[Dict[str, Any]]:
-        """Download datasheet and return file info with UUID-based filename"""
+        # aiohttp negotiates its own encodings and manages connections itself
+        async_headers = {
+            key: value
+            for key, value in self.headers.items()
+            if key not in ("Accept-Encoding", "Connection", "Upgrade-Insecure-Requests")
+        }
+        self.download_manager = DownloadManager(
+            per_host_limit=self.download_config.get("max_concurrent_downloads_per_host", 4),
+            total_limit=self.download_config.get("max_concurrent_downloads", 16),
+            max_retries=self.download_config.get("download_retries", 3),
+            timeout_seconds=self.download_config.get("download_timeout_seconds", 30),
+            headers=async_headers,
+        )
+
+    def download_datasheet(self, url: str, part_number: str, supplier: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Download datasheet and return file info (blocking).
+
+        The file is named by the SHA-256 of its content. Prefer download_datasheet_async
+        from async code.
+        """
         try:
             logger.info(f"Downloading datasheet for {part_number} from {url}")
 
-            # Generate UUID for filename if not provided - use URL-based UUID for consistency
-            if not file_uuid:
-                file_uuid = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
-
-            # Determine file extension
-            parsed_url = urlparse(url)
-            path = unquote(parsed_url.path)
-
-            # Try to determine extension from URL
-            if path.lower().endswith(".pdf"):
-                extension = ".pdf"
-            elif "pdf" in url.lower() or "datasheet" in url.lower():
-                extension = ".pdf"
-            else:
-                extension = ".pdf"  # Default to PDF for datasheets
-
-            # Use UUID-based filename
-            filename = f"{file_uuid}{extension}"
-            file_path = self.datasheets_path / filename
-
-            # Generate original filename for reference
-            safe_part_number = self._sanitize_filename(part_number)
-            safe_supplier = self._sanitize_filename(supplier) if supplier else "unknown"
-            original_filename = f"{safe_supplier}_{safe_part_number}_datasheet{extension}"
-
-            # Check if file already exists
-            if file_path.exists():
-                logger.info(f"Datasheet already exists: {filename}")
-                return {
-                    "filename": filename,
-                    "file_path": str(file_path),
-                    "original_filename": original_filename,
-                    "file_uuid": file_uuid,
-                    "url": url,
-                    "size": file_path.stat().st_size,
-                    "extension": extension,
-                    "exists": True,
-                }
+            existing = self._find_known_datasheet(url)
+            if existing:
+                logger.info(f"Datasheet already exists: {existing.name}")
+                return self._datasheet_info(url, part_number, supplier, existing, exists=True)
 
-            # Download the file with configurable timeout
             timeout = self.download_config.get("download_timeout_seconds", 30)
             response = requests.get(url, headers=self.headers, timeout=timeout, stream=True)
             response.raise_for_status()
 
-            # Check content type
             content_type = response.headers.get("content-type", "").lower()
-            if "pdf" in content_type:
-                extension = ".pdf"
-            elif "html" in content_type:
-                # This might be a webpage, not a direct PDF link
+            extension = _datasheet_extension(content_type)
+            if extension is None:
                 logger.warning(f"Datasheet URL appears to be HTML page, not direct PDF: {url}")
                 return None
 
-            # Update filename with correct extension
-            filename = f"{file_uuid}{extension}"
-            file_path = self.datasheets_path / filename
-            original_filename = f"{safe_supplier}_{safe_part_number}_datasheet{extension}"
-
-            # Save the file
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            file_size = file_path.stat().st_size
-
-            # Verify it's not an error page (very small files are suspicious)
-            if file_size < 1024:  # Less than 1KB
-                logger.warning(f"Downloaded file is very small ({file_size} bytes), might be an error page")
-                file_path.unlink()  # Delete the small file
+            result = self._save_response(response, self.datasheet_store, extension, MIN_DATASHEET_SIZE)
+            if result is None:
                 return None
+            result.url = url
+            result.etag = response.headers.get("ETag")
+            result.last_modified = response.headers.get("Last-Modified")
 
-            logger.info(f"Successfully downloaded datasheet: {filename} ({file_size} bytes)")
+            logger.info(f"Successfully downloaded datasheet: {result.filename} ({result.size} bytes)")
+            return self._datasheet_info(
+                url, part_number, supplier, result.path, exists=result.deduplicated, result=result
+            )
 
-            return {
-                "filename": filename,
-                "file_path": str(file_path),
-                "original_filename": original_filename,
-                "file_uuid": file_uuid,
-                "url": url,
-                "size": file_size,
-                "extension": extension,
-                "exists": False,
-            }
+        except Exception as e:
+            logger.error(f"Error downloading datasheet from {url}: {e}")
+            return None
 
+    async def download_datasheet_async(
+        self, url: str, part_number: str, supplier: str = "", revalidate: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Download a datasheet without blocking the event loop.
+
+        Downloads share the bounded per-host connection pool of the download manager.
+        A URL that was downloaded before is served from disk; with revalidate=True the
+        server is asked (If-None-Match/If-Modified-Since) whether it changed.
+        """
+        known = self._find_known_datasheet_record(url)
+        existing_path = self.datasheets_path / known["filename"] if known else None
+        if existing_path is not None and existing_path.exists() and not revalidate:
+            logger.info(f"Datasheet already exists: {existing_path.name}")
+            return self._datasheet_info(url, part_number, supplier, existing_path, exists=True, record=known)
+
+        logger.info(f"Downloading datasheet for {part_number} from {url}")
+        try:
+            result = await self.download_manager.download(
+                url,
+                self.datasheet_store,
+                _datasheet_extension,
+                etag=known.get("etag") if known else None,
+                last_modified=known.get("last_modified") if known else None,
+                existing_path=existing_path,
+                min_size=MIN_DATASHEET_SIZE,
+                existing_hash=known.get("content_hash") if known else None,
+            )
+        except DownloadError as e:
+            logger.warning(f"Error downloading datasheet from {url}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error downloading datasheet from {url}: {e}")
             return None
 
+        if result.not_modified:
+            logger.info(f"Datasheet unchanged on server: {result.filename}")
+        else:
+            logger.info(f"Successfully downloaded datasheet: {result.filename} ({result.size} bytes)")
+        return self._datasheet_info(
+            url, part_number, supplier, result.path, exists=result.not_modified or result.deduplicated, result=result
+        )
+
     def download_image(self, url: str, part_number: str, supplier: str = "") -> Optional[Dict[str, Any]]:
         """Download component image and return file info with UUID-based storage"""
         try:
             logger.info(f"Downloading image for {part_number} from {url}")
 
-            # Determine file extension from URL
-            parsed_url = urlparse(url)
-            path = unquote(parsed_url.path)
-
-            # Extract extension
-            extension = ".jpg"  # Default
-            if path.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp")):
-                extension = Path(path).suffix.lower()
-            elif "jpg" in url.lower() or "jpeg" in url.lower():
-                extension = ".jpg"
-            elif "png" in url.lower():
-                extension = ".png"
-            elif "gif" in url.lower():
-                extension = ".gif"
-            elif "webp" in url.lower():
-                extension = ".webp"
-
-            # Sanitize names for reference
-            safe_part_number = self._sanitize_filename(part_number)
-            safe_supplier = self._sanitize_filename(supplier) if supplier else "unknown"
-
             # Generate consistent UUID based on URL to avoid re-downloading
-            url_hash = hashlib.md5(url.encode()).hexdigest()
             image_uuid = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
-            filename = f"{image_uuid}{extension}"
-            file_path = self.uploaded_images_path / filename
-
-            # Check if file already exists
-            if file_path.exists():
-                logger.info(f"Image already exists: {filename}")
-                return {
-                    "filename": filename,
-                    "file_path": str(file_path),
-                    "image_uuid": image_uuid,
-                    "url": url,
-                    "size": file_path.stat().st_size,
-                    "exists": True,
-                }
+            existing = self._find_image(image_uuid)
+            if existing:
+                logger.info(f"Image already exists: {existing.name}")
+                return self._image_info(url, image_uuid, existing, exists=True)
 
             # Download the file with configurable timeout
             timeout = self.download_config.get("download_timeout_seconds", 30)
             response = requests.get(url, headers=self.headers, timeout=timeout, stream=True)
             response.raise_for_status()
 
-            # Check content type
             content_type = response.headers.get("content-type", "").lower()
-            if "image" not in content_type:
+            extension = _image_extension(content_type, url)
+            if extension is None:
                 logger.warning(f"URL doesn't appear to be an image: {url} (content-type: {content_type})")
                 return None
 
-            # Update extension based on content type
-            if "jpeg" in content_type:
-                extension = ".jpg"
-            elif "png" in content_type:
-                extension = ".png"
-            elif "gif" in content_type:
-                extension = ".gif"
-            elif "webp" in content_type:
-                extension = ".webp"
-
-            # Update filename with correct extension (but keep UUID-based naming)
-            filename = f"{image_uuid}{extension}"
-            file_path = self.uploaded_images_path / filename
-
-            # Save the file
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            store = NamedStore(self.uploaded_images_path, image_uuid)
+            result = self._save_response(response, store, extension, MIN_IMAGE_SIZE)
+            if result is None:
+                return None
 
-            file_size = file_path.stat().st_size
+            logger.info(f"Successfully downloaded image: {result.filename} ({result.size} bytes)")
+            return self._image_info(url, image_uuid, result.path, exists=False)
 
-            # Verify it's a valid image (very small files are suspicious)
-            if file_size < 100:  # Less than 100 bytes
-                logger.warning(f"Downloaded image is very small ({file_size} bytes), might be invalid")
-                file_path.unlink()  # Delete the small file
-                return None
+        except Exception as e:
+            logger.error(f"Error downloading image from {url}: {e}")
+            return None
+
+    async def download_image_async(self, url: str, part_number: str, supplier: str = "") -> Optional[Dict[str, Any]]:
+        """Download a component image without blocking the event loop"""
+        image_uuid = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+        existing = self._find_image(image_uuid)
+        if existing:
+            logger.info(f"Image already exists: {existing.name}")
+            return self._image_info(url, image_uuid, existing, exists=True)
+
+        logger.info(f"Downloading image for {part_number} from {url}")
+        try:
+            result = await self.download_manager.download(
+                url,
+                NamedStore(self.uploaded_images_path, image_uuid),
+                lambda content_type: _image_extension(content_type, url),
+                min_size=MIN_IMAGE_SIZE,
+            )
+        except Exception as e:
+            logger.warning(f"Error downloading image from {url}: {e}")
+            return None
 
-            logger.info(f"Successfully downloaded image: {filename} ({file_size} bytes)")
+        logger.info(f"Successfully downloaded image: {result.filename} ({result.size} bytes)")
+        return self._image_info(url, image_uuid, result.path, exists=False)
 
-            return {
-                "filename": filename,
-                "file_path": str(file_path),
-                "image_uuid": image_uuid,
-                "url": url,
-                "size": file_size,
-                "exists": False,
-            }
+    def _save_response(self, response, store: ContentStore, extension: str, min_size: int) -> Optional[DownloadResult]:
+        """Stream a requests response to a temp file and commit it to `store`"""
+        temp_path = store.temp_path()
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
+
+            size = temp_path.stat().st_size
+            if size < min_size:
+                logger.warning(f"Downloaded file is very small ({size} bytes), might be an error page")
+                return None
 
+            content_hash = hash_file(temp_path)
+            final_path, created = store.commit(temp_path, content_hash, extension)
+            return DownloadResult(
+                url=response.url,
+                path=final_path,
+                content_hash=content_hash,
+                size=size,
+                content_type=response.headers.get("content-type", ""),
+                deduplicated=not created,
+            )
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _find_known_datasheet_record(self, url: str) -> Optional[Dict[str, Any]]:
+        """Filename and validators of the last datasheet downloaded from `url`"""
+        from MakerMatrix.repositories.datasheet_repository import DatasheetRepository
+
+        try:
+            with Session(self._get_engine()) as session:
+                datasheet = DatasheetRepository().get_latest_by_url(session, url)
+                if datasheet is None:
+                    return None
+                return {
+                    "filename": datasheet.filename,
+                    "content_hash": datasheet.content_hash,
+                    "etag": datasheet.etag,
+                    "last_modified": datasheet.last_modified,
+                }
         except Exception as e:
-            logger.error(f"Error downloading image from {url}: {e}")
+            logger.debug(f"Could not look up datasheet record for {url}: {e}")
             return None
 
+    def _find_known_datasheet(self, url: str) -> Optional[Path]:
+        known = self._find_known_datasheet_record(url)
+        if known:
+            path = self.datasheets_path / known["filename"]
+            if path.exists():
+                return path
+
+        # Files downloaded before content addressing were named by a URL-based UUID
+        legacy_path = self.datasheets_path / f"{uuid.uuid5(uuid.NAMESPACE_URL, url)}.pdf"
+        return legacy_path if legacy_path.exists() else None
+
+    def _find_image(self, image_uuid: str) -> Optional[Path]:
+        for extension in IMAGE_EXTENSIONS:
+            path = self.uploaded_images_path / f"{image_uuid}{extension}"
+            if path.exists():
+                return path
+        return None
+
+    def _get_engine(self):
+        if self.engine_override is not None:
+            return self.engine_override
+        from MakerMatrix.models.models import engine
+
+        return engine
+
+    def _datasheet_info(
+        self,
+        url: str,
+        part_number: str,
+        supplier: str,
+        path: Path,
+        exists: bool,
+        result: Optional[DownloadResult] = None,
+        record: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        extension = path.suffix or ".pdf"
+        safe_part_number = self._sanitize_filename(part_number)
+        safe_supplier = self._sanitize_filename(supplier) if supplier else "unknown"
+        record = record or {}
+
+        if result is not None:
+            content_hash = result.content_hash
+        else:
+            content_hash = record.get("content_hash") or path.stem
+
+        return {
+            "filename": path.name,
+            "file_path": str(path),
+            "original_filename": f"{safe_supplier}_{safe_part_number}_datasheet{extension}",
+            "file_uuid": content_hash,
+            "content_hash": content_hash,
+            "url": url,
+            "size": result.size if result is not None else path.stat().st_size,
+            "extension": extension,
+            "etag": result.etag if result is not None else record.get("etag"),
+            "last_modified": result.last_modified if result is not None else record.get("last_modified"),
+            "exists": exists,
+        }
+
+    @staticmethod
+    def _image_info(url: str, image_uuid: str, path: Path, exists: bool) -> Dict[str, Any]:
+        return {
+            "filename": path.name,
+            "file_path": str(path),
+            "image_uuid": image_uuid,
+            "url": url,
+            "size": path.stat().st_size,
+            "exists": exists,
+        }
+
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem compatibility"""
         # Remove or replace invalid characters
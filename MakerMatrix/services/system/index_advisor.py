@@ -0,0 +1,257 @@
+"""
+Index Advisor - EXPLAIN QUERY PLAN over the queries the application runs most.
+
+Each entry of QUERY_CATALOG builds a query with the same shape (tables, filters, order)
+as one in a repository or service. The advisor asks SQLite for its plan and flags:
+
+- full_scan: every row of a table, or every entry of one of its indexes, is read (SCAN
+  rather than SEARCH), so the query slows down linearly with the table
+- temp_sort: the rows are sorted in a temporary B-tree instead of read in index order
+
+It also lists the indexes of the add_query_indexes migration missing from the database,
+e.g. when it was restored from an older backup. Only plans are computed; no query is run.
+Keep the catalog in step with the queries it mirrors when their filters change.
+"""
+
+import enum
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.engine import Connection
+
+from MakerMatrix.migrations.add_query_indexes import INDEXES
+from MakerMatrix.models.enrichment_queue_models import EnrichmentQueueItemModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.system_models import ActivityLogModel
+from MakerMatrix.models.tag_models import PartTagLink, TagModel
+from MakerMatrix.models.task_models import TaskModel, TaskStatus
+from MakerMatrix.repositories.supplier_usage_bucket_repository import floor_to, plan_counts, window_count_queries
+
+logger = logging.getLogger(__name__)
+
+# A parameter value for the plans; SQLite plans do not depend on the values
+_SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@dataclass
+class KnownQuery:
+    """A query shape the application runs, and where it comes from"""
+
+    name: str
+    source: str
+    build: Callable[[], Any]
+    # Queries that read every row by design (e.g. a full listing) are not flagged
+    scan_expected: bool = False
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    source: str
+    plan: List[str] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+    temp_sort: bool = False
+    error: Optional[str] = None
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self.full_scans) or self.error is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "source": self.source,
+            "flagged": self.flagged,
+            "full_scans": self.full_scans,
+            "temp_sort": self.temp_sort,
+            "plan": self.plan,
+            "error": self.error,
+        }
+
+
+def _pending_tasks():
+    return (
+        select(TaskModel)
+        .where(
+            and_(
+                TaskModel.status == TaskStatus.PENDING,
+                or_(TaskModel.scheduled_at.is_(None), TaskModel.scheduled_at <= datetime.utcnow()),
+            )
+        )
+        .order_by(TaskModel.priority.desc(), TaskModel.created_at)
+    )
+
+
+def _rate_limit_window(bucketed: bool):
+    """The bucket or raw query of window_counts for the rate limiter's minute/hour/day windows"""
+    now = datetime.utcnow()
+    # A watermark a few minutes back, as between two rollup runs
+    watermark = floor_to(now - timedelta(minutes=5), "minute")
+    starts = {
+        "per_minute": now - timedelta(minutes=1),
+        "per_hour": now - timedelta(hours=1),
+        "per_day": now - timedelta(days=1),
+    }
+    plans = {key: plan_counts(start, None, watermark, now) for key, start in starts.items()}
+    bucket_query, raw_query = window_count_queries("MOUSER", starts, plans, now)
+    return bucket_query if bucketed else raw_query
+
+
+def _enrichment_claim():
+    items = EnrichmentQueueItemModel
+    return (
+        select(items.id)
+        .where(
+            items.supplier_name == "lcsc",
+            items.status == "pending",
+            or_(items.not_before.is_(None), items.not_before <= datetime.utcnow()),
+        )
+        .order_by(items.priority_rank.desc(), items.created_at)
+        .limit(1)
+    )
+
+
+QUERY_CATALOG: List[KnownQuery] = [
+    KnownQuery(
+        "rate_limit.window_buckets",
+        "SupplierUsageBucketRepository.window_counts",
+        lambda: _rate_limit_window(bucketed=True),
+    ),
+    KnownQuery(
+        "rate_limit.window_raw",
+        "SupplierUsageBucketRepository.window_counts",
+        lambda: _rate_limit_window(bucketed=False),
+    ),
+    KnownQuery("tasks.pending_ready", "TaskRepository.get_pending_tasks_ready_to_run", _pending_tasks),
+    KnownQuery(
+        "parts.search_supplier",
+        "PartRepository.advanced_search",
+        lambda: select(PartModel).where(func.lower(PartModel.supplier) == "lcsc").limit(20),
+    ),
+    KnownQuery(
+        "parts.by_name",
+        "PartRepository.get_part_by_name",
+        lambda: select(PartModel).where(PartModel.part_name == "R1"),
+    ),
+    KnownQuery(
+        "parts.page",
+        "PartRepository.get_all_parts",
+        lambda: select(PartModel).offset(0).limit(20),
+        scan_expected=True,
+    ),
+    KnownQuery(
+        "allocations.primary",
+        "PartAllocationRepository.get_primary_allocation",
+        lambda: select(PartLocationAllocation).where(
+            PartLocationAllocation.part_id == _SAMPLE_ID, PartLocationAllocation.is_primary_storage == True
+        ),
+    ),
+    KnownQuery(
+        "allocations.by_location",
+        "PartRepository.get_parts_by_location_id",
+        lambda: select(PartModel)
+        .join(PartLocationAllocation, PartModel.id == PartLocationAllocation.part_id)
+        .where(PartLocationAllocation.location_id == _SAMPLE_ID),
+    ),
+    KnownQuery(
+        "tags.by_name",
+        "TagService.get_tag_by_name",
+        lambda: select(TagModel).where(TagModel.name_lower == "smd"),
+    ),
+    KnownQuery(
+        "tags.parts",
+        "TagService.get_parts_by_tag",
+        lambda: select(PartModel)
+        .join(PartTagLink, PartModel.id == PartTagLink.part_id)
+        .where(PartTagLink.tag_id == _SAMPLE_ID),
+    ),
+    KnownQuery(
+        "locations.children",
+        "PartRepository.get_child_location_ids",
+        lambda: select(LocationModel).where(LocationModel.parent_id == _SAMPLE_ID),
+    ),
+    KnownQuery(
+        "locations.subtree",
+        "LocationPathRepository.get_descendant_ids",
+        lambda: select(LocationModel.id).where(
+            LocationModel.path_ids >= f"{_SAMPLE_ID}/", LocationModel.path_ids < f"{_SAMPLE_ID}0"
+        ),
+    ),
+    KnownQuery("enrichment_queue.claim", "EnrichmentQueueRepository.claim_next", _enrichment_claim),
+    KnownQuery(
+        "activity.recent",
+        "ActivityRepository.get_recent_activities",
+        lambda: select(ActivityLogModel)
+        .where(ActivityLogModel.timestamp >= datetime.utcnow() - timedelta(hours=24))
+        .order_by(ActivityLogModel.timestamp.desc())
+        .limit(50),
+    ),
+]
+
+
+def _plain(value: Any) -> Any:
+    """A parameter value sqlite3 accepts without adapters"""
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+class IndexAdvisor:
+    """Plans of the known queries against the application database"""
+
+    def __init__(self, engine=None, catalog: Optional[List[KnownQuery]] = None):
+        if engine is None:
+            from MakerMatrix.models.models import engine as default_engine
+
+            engine = default_engine
+        self.engine = engine
+        self.catalog = QUERY_CATALOG if catalog is None else catalog
+
+    def explain(self, conn: Connection, known: KnownQuery) -> QueryPlan:
+        result = QueryPlan(name=known.name, source=known.source)
+        try:
+            compiled = known.build().compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+            parameters = tuple(_plain(compiled.params[name]) for name in compiled.positiontup)
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", parameters).all()
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        for row in rows:
+            detail = row[-1]
+            result.plan.append(detail)
+            words = detail.split()
+            # SEARCH looks rows up by key; SCAN reads all of them, through an index or not
+            if words[0] == "SCAN" and not known.scan_expected:
+                result.full_scans.append(words[1])
+            if detail.startswith("USE TEMP B-TREE"):
+                result.temp_sort = True
+        return result
+
+    def missing_indexes(self, conn: Connection) -> List[str]:
+        """Indexes of the add_query_indexes migration absent from the database"""
+        # Read sqlite_master directly; reflection skips expression indexes
+        rows = conn.exec_driver_sql("SELECT type, name FROM sqlite_master WHERE type IN ('table', 'index')").all()
+        tables = {name for kind, name in rows if kind == "table"}
+        indexes = {name for kind, name in rows if kind == "index"}
+        return [name for name, (table, _) in INDEXES.items() if table in tables and name not in indexes]
+
+    def report(self) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            plans = [self.explain(conn, known) for known in self.catalog]
+            missing = self.missing_indexes(conn)
+        flagged = [plan.name for plan in plans if plan.flagged]
+        if flagged:
+            logger.info(f"Index advisor flagged {len(flagged)} queries: {', '.join(flagged)}")
+        return {
+            "queries": [plan.to_dict() for plan in plans],
+            "flagged": flagged,
+            "missing_indexes": missing,
+        }
@@ -0,0 +1,121 @@
+"""
+Leader Election - runs background services in exactly one worker process.
+
+The task worker and backup scheduler must not run once per worker: pending tasks would
+be picked up twice and scheduled backups would be created N times. Every process runs
+a LeaderElector for the same lease; the holder starts the services, the others keep
+trying to take the lease over. A lease that is not renewed within LEADER_LEASE_SECONDS
+(a crashed or hung leader) is taken over by the next process that asks.
+
+Without a coordination store (single-process deployment) the elector is always leader.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from MakerMatrix.services.system.coordination import PROCESS_ID, CoordinationStore
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "30"))
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class LeaderElector:
+    """Holds a named lease and starts/stops services when leadership changes"""
+
+    def __init__(
+        self,
+        name: str,
+        store: Optional[CoordinationStore],
+        on_elected: Callback,
+        on_demoted: Callback,
+        lease_seconds: float = LEASE_SECONDS,
+        holder: str = PROCESS_ID,
+    ):
+        self.name = name
+        self.store = store
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lease_seconds = lease_seconds
+        self.renew_interval = lease_seconds / 3
+        self.holder = holder
+
+        self.is_leader = False
+        self._lease_expires_at = 0.0
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Try to become leader now, then keep renewing or retrying in the background"""
+        await self.check()
+        if self.store is not None and (self._loop_task is None or self._loop_task.done()):
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the services if leader and hand the lease over"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        if self.is_leader:
+            await self._set_leader(False)
+            if self.store is not None:
+                try:
+                    await asyncio.to_thread(self.store.release_lease, self.name, self.holder)
+                except Exception as e:
+                    logger.warning(f"Failed to release lease '{self.name}': {e}")
+
+    async def check(self) -> bool:
+        """Acquire or renew the lease once; returns whether this process is leader"""
+        if self.store is None:
+            if not self.is_leader:
+                await self._set_leader(True)
+            return True
+
+        try:
+            acquired = await asyncio.to_thread(self.store.acquire_lease, self.name, self.holder, self.lease_seconds)
+        except Exception as e:
+            # A busy coordination file is not a lost lease, as long as ours has not run out
+            logger.warning(f"Failed to renew lease '{self.name}': {e}")
+            acquired = self.is_leader and time.time() < self._lease_expires_at
+
+        if acquired:
+            self._lease_expires_at = time.time() + self.lease_seconds
+        if acquired != self.is_leader:
+            await self._set_leader(acquired)
+        return acquired
+
+    async def _set_leader(self, leader: bool) -> None:
+        self.is_leader = leader
+        if leader:
+            logger.info(f"Process {self.holder} is now leader for '{self.name}'")
+            callback = self.on_elected
+        else:
+            logger.info(f"Process {self.holder} is no longer leader for '{self.name}'")
+            callback = self.on_demoted
+        try:
+            await callback()
+        except Exception as e:
+            logger.error(f"Leadership change handler for '{self.name}' failed: {e}", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            await self.check()
+
+    def get_status(self) -> Dict[str, Any]:
+        status = {"name": self.name, "process_id": self.holder, "is_leader": self.is_leader, "lease": None}
+        if self.store is not None:
+            try:
+                status["lease"] = self.store.get_lease(self.name)
+            except Exception as e:
+                logger.debug(f"Failed to read lease '{self.name}': {e}")
+        return status
@@ -416,6 +416,7 @@ class PartEnrichmentService(BaseService):
             "get_part_details": SupplierCapability.GET_PART_DETAILS,  # Frontend sends this
             "fetch_pricing_stock": SupplierCapability.FETCH_PRICING_STOCK,
             "import_orders": SupplierCapability.IMPORT_ORDERS,
+            "bulk_search": SupplierCapability.BULK_SEARCH,
         }
 
         supplier_capabilities = []
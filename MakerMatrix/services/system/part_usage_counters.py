@@ -0,0 +1,217 @@
+"""
+Part Usage Counters - write-behind view and search counters for PartSystemMetadata.
+
+Counting a part detail view or a search hit with its own UPDATE would put a write
+transaction on every read request. Instead the counters are aggregated in memory and the
+deltas are written every PART_USAGE_FLUSH_SECONDS with one batched UPSERT, which adds to
+the stored counts (creating the metadata row on first use). Because the UPSERT adds rather
+than overwrites, every worker process can flush its own deltas independently.
+
+A flush that fails puts its deltas back, and more than PART_USAGE_MAX_PENDING pending parts
+trigger an early flush. Counts recorded since the last flush are lost if the process dies;
+these are ranking signals, not an audit log.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from MakerMatrix.models.part_metadata_models import PartSystemMetadata
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.utils.batching import chunks
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("PART_USAGE_FLUSH_SECONDS", "30"))
+MAX_PENDING_PARTS = int(os.getenv("PART_USAGE_MAX_PENDING", "5000"))
+
+_metadata = PartSystemMetadata.__table__
+_parts = PartModel.__table__
+
+Delta = Tuple[int, int, Optional[datetime]]  # (views, search hits, last viewed)
+
+
+class PartUsageCounters:
+    """In-memory view/search deltas per part, flushed in batches"""
+
+    def __init__(
+        self,
+        engine=None,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_pending: int = MAX_PENDING_PARTS,
+    ):
+        self._engine = engine
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending: Dict[str, Delta] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so deltas put back by a failed flush are not written twice
+        self._flush_lock = threading.Lock()
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.stats = {"views": 0, "search_hits": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from MakerMatrix.models.models import engine
+
+            self._engine = engine
+        return self._engine
+
+    # === Recording ===
+
+    def record_view(self, part_id: Optional[str]) -> None:
+        """Count one detail view of a part"""
+        if part_id:
+            self._add({part_id: (1, 0, datetime.utcnow())})
+            self.stats["views"] += 1
+
+    def record_search_hits(self, part_ids: Iterable[Optional[str]]) -> None:
+        """Count one search hit for each part in a result page"""
+        hits = {part_id: (0, 1, None) for part_id in part_ids if part_id}
+        if hits:
+            self._add(hits)
+            self.stats["search_hits"] += len(hits)
+
+    def _add(self, deltas: Dict[str, Delta]) -> None:
+        with self._lock:
+            for part_id, delta in deltas.items():
+                self._pending[part_id] = _merge(self._pending.get(part_id), delta)
+            over_limit = len(self._pending) >= self.max_pending
+        if over_limit:
+            self._request_flush()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # === Flushing ===
+
+    def flush(self) -> int:
+        """Write the pending deltas with one batched UPSERT; returns the number of parts written"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                written = self._write(pending)
+            except Exception as e:
+                self.stats["failed_flushes"] += 1
+                logger.warning(f"Failed to flush usage counters of {len(pending)} parts, will retry: {e}")
+                with self._lock:
+                    for part_id, delta in pending.items():
+                        self._pending[part_id] = _merge(self._pending.get(part_id), delta)
+                return 0
+
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += written
+            return written
+
+    def _write(self, pending: Dict[str, Delta]) -> int:
+        now = datetime.utcnow()
+        with self.engine.begin() as conn:
+            # Parts deleted since they were counted would fail the foreign key
+            existing = set()
+            part_ids = list(pending)
+            for chunk in chunks(part_ids):
+                existing.update(conn.execute(select(_parts.c.id).where(_parts.c.id.in_(chunk))).scalars())
+            if not existing:
+                return 0
+
+            stmt = sqlite_insert(_metadata)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[_metadata.c.part_id],
+                set_={
+                    "view_count": _metadata.c.view_count + stmt.excluded.view_count,
+                    "search_count": _metadata.c.search_count + stmt.excluded.search_count,
+                    "last_accessed": func.coalesce(stmt.excluded.last_accessed, _metadata.c.last_accessed),
+                },
+            )
+            conn.execute(
+                stmt,
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "part_id": part_id,
+                        "view_count": views,
+                        "search_count": hits,
+                        "last_accessed": last_viewed,
+                        "needs_review": False,
+                        "is_favorite": False,
+                        "is_obsolete": False,
+                        "tags": [],
+                        "auto_reorder_enabled": False,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for part_id, (views, hits, last_viewed) in pending.items()
+                    if part_id in existing
+                ],
+            )
+        return len(existing)
+
+    # === Background loop ===
+
+    async def start(self) -> None:
+        """Start flushing on the interval in this event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and write whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._loop = None
+        await asyncio.to_thread(self.flush)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Usage counter flush loop error: {e}")
+
+    def _request_flush(self) -> None:
+        loop = self._loop
+        if loop is not None and self._wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # Loop already closed during shutdown
+                pass
+
+
+def _merge(current: Optional[Delta], delta: Delta) -> Delta:
+    if current is None:
+        return delta
+    last_viewed = max((t for t in (current[2], delta[2]) if t is not None), default=None)
+    return current[0] + delta[0], current[1] + delta[1], last_viewed
+
+
+part_usage_counters = PartUsageCounters()
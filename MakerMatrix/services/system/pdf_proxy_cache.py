@@ -0,0 +1,399 @@
+"""
+PDF Proxy Cache - disk-backed LRU cache for /static/proxy-pdf.
+
+Remote datasheets are downloaded once, stored under the static files directory and
+served from disk (with Range support) on later views. Entries older than max_age are
+revalidated with If-None-Match/If-Modified-Since; when the upstream site is down a
+stale copy is served instead of an error. The cache is bounded by total size and
+evicts the least recently used files first. Files being served (acquire() until
+release()) are not evicted or cleared; the cache may exceed its size until they finish.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+if TYPE_CHECKING:
+    # httpx also loads its command line client (rich, pygments); imported on first fetch
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+CHUNK_SIZE = 64 * 1024
+# A cache hit only moves the entry in the LRU order; its last_access is written to disk
+# in the background at most this often, and on close()
+ACCESS_FLUSH_SECONDS = 300
+
+REQUEST_HEADERS = {"User-Agent": "MakerMatrix/1.0.0 (Component Management System)", "Accept": "application/pdf,*/*"}
+
+
+class UpstreamError(Exception):
+    """The remote server did not return the PDF"""
+
+    def __init__(self, message: str, status_code: int = 502):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class CacheEntry:
+    """A cached PDF and the validators it was served with"""
+
+    key: str
+    url: str
+    size: int
+    content_type: str = "application/pdf"
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0  # Last time the upstream copy was fetched or confirmed unchanged
+    last_access: float = 0.0
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys: lowercase scheme/host, no default port, sorted query, no fragment"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port is None or (scheme, port) in (("http", 80), ("https", 443)):
+        netloc = host
+    else:
+        netloc = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+class PdfProxyCache:
+    """Size-bounded LRU cache of proxied PDFs, persisted in a directory"""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        timeout_seconds: float = 30.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.timeout_seconds = timeout_seconds
+        self._transport = transport
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()  # Least recently used first
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}  # Key -> get() calls holding or waiting for its lock
+        self._readers: Dict[str, int] = {}  # Key -> responses still sending its file
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._accessed: set = set()  # Keys whose last_access is not on disk yet
+        self._last_flush = time.monotonic()
+        self._flush_task: Optional[asyncio.Future] = None
+        self._stats = {
+            "hits": 0,  # Served from disk without contacting upstream
+            "revalidated": 0,  # Upstream confirmed the cached copy (304)
+            "stale_served": 0,  # Upstream failed; served the cached copy
+            "misses": 0,  # Not cached; downloaded
+            "refreshed": 0,  # Cached copy was outdated; downloaded again
+            "evictions": 0,
+            "bytes_served_from_cache": 0,
+            "bytes_downloaded": 0,
+        }
+        self._load()
+
+    # === Paths and persistence ===
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load(self) -> None:
+        """Rebuild the index from the metadata files of a previous run"""
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                entry = CacheEntry(**json.loads(meta_path.read_text()))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Discarding unreadable PDF cache entry {meta_path.name}: {e}")
+                meta_path.unlink(missing_ok=True)
+                continue
+            if self.path_for(entry.key).exists():
+                entries.append(entry)
+            else:
+                meta_path.unlink(missing_ok=True)
+
+        # Interrupted downloads and metadata writes
+        for temp_path in [*self.directory.glob(".*.part"), *self.directory.glob(".*.json.tmp")]:
+            temp_path.unlink(missing_ok=True)
+
+        for entry in sorted(entries, key=lambda e: e.last_access):
+            self._entries[entry.key] = entry
+        self._evict()
+
+    def _save_meta(self, entry: CacheEntry) -> None:
+        self._accessed.discard(entry.key)
+        self._write_metas([asdict(entry)])
+
+    def _write_metas(self, entries: List[Dict[str, Any]]) -> None:
+        for data in entries:
+            temp_path = self.directory / f".{data['key']}.{uuid.uuid4().hex}.json.tmp"
+            try:
+                temp_path.write_text(json.dumps(data))
+                os.replace(temp_path, self._meta_path(data["key"]))
+            except OSError as e:
+                logger.warning(f"Could not save PDF cache entry {data['key']}: {e}")
+                temp_path.unlink(missing_ok=True)
+
+    def _take_accessed(self) -> List[Dict[str, Any]]:
+        entries = [asdict(self._entries[key]) for key in self._accessed if key in self._entries]
+        self._accessed.clear()
+        return entries
+
+    def _schedule_flush(self) -> None:
+        """Write the pending last_access values in a thread, at most every ACCESS_FLUSH_SECONDS"""
+        if time.monotonic() - self._last_flush < ACCESS_FLUSH_SECONDS:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._last_flush = time.monotonic()
+        self._flush_task = asyncio.ensure_future(asyncio.to_thread(self._write_metas, self._take_accessed()))
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._accessed.discard(key)
+        self.path_for(key).unlink(missing_ok=True)
+        self._meta_path(key).unlink(missing_ok=True)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        total = sum(entry.size for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep or self._readers.get(key):
+                continue
+            total -= self._entries[key].size
+            self._remove(key)
+            self._stats["evictions"] += 1
+
+    # === Lookup ===
+
+    @asynccontextmanager
+    async def _key_lock(self, key: str) -> AsyncIterator[None]:
+        """Serializes get() per key; the lock is dropped once no call holds or waits for it"""
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                follow_redirects=True,
+                headers=REQUEST_HEADERS,
+                transport=self._transport,
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def close(self) -> None:
+        """Write the pending last_access values and close the HTTP client"""
+        if self._flush_task is not None:
+            await self._flush_task
+        await asyncio.to_thread(self._write_metas, self._take_accessed())
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def get(self, url: str) -> CacheEntry:
+        """
+        Return the cache entry for `url`, downloading or revalidating it as needed.
+
+        The file is at path_for(entry.key) when this returns.
+
+        Raises:
+            UpstreamError: If the PDF is not cached and cannot be fetched
+        """
+        import httpx
+
+        key = cache_key(url)
+        async with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and not self.path_for(key).exists():
+                self._remove(key)
+                entry = None
+
+            cached = entry
+            changed = True
+            if entry is None:
+                self._stats["misses"] += 1
+                entry = await self._fetch(url, key, None)
+            elif time.time() - entry.fetched_at >= self.max_age_seconds:
+                try:
+                    entry = await self._fetch(url, key, entry)
+                except (UpstreamError, httpx.HTTPError) as e:
+                    logger.warning(f"Serving stale cached PDF for {url}: {e}")
+                    self._stats["stale_served"] += 1
+                    changed = False
+            else:
+                self._stats["hits"] += 1
+                changed = False
+
+            if entry is cached:
+                self._stats["bytes_served_from_cache"] += entry.size
+            entry.last_access = time.time()
+            self._entries.move_to_end(key)
+            # No await from here on: acquire() takes the entry before anything can evict it
+            if changed:
+                self._save_meta(entry)
+            else:
+                self._accessed.add(key)
+                self._schedule_flush()
+            return entry
+
+    async def acquire(self, url: str) -> CacheEntry:
+        """get(), keeping the file from eviction until release(entry.key)"""
+        entry = await self.get(url)
+        # No await between get() returning and this, so nothing can evict the entry first
+        self._readers[entry.key] = self._readers.get(entry.key, 0) + 1
+        return entry
+
+    def release(self, key: str) -> None:
+        """End one acquire(); evicts whatever it kept the cache from evicting"""
+        count = self._readers.pop(key, 0) - 1
+        if count > 0:
+            self._readers[key] = count
+        self._evict()
+
+    async def _fetch(self, url: str, key: str, entry: Optional[CacheEntry]) -> CacheEntry:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        temp_path = self.directory / f".{uuid.uuid4().hex}.part"
+        try:
+            async with self._get_client().stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and entry is not None:
+                    entry.fetched_at = time.time()
+                    entry.etag = response.headers.get("etag", entry.etag)
+                    entry.last_modified = response.headers.get("last-modified", entry.last_modified)
+                    self._stats["revalidated"] += 1
+                    return entry
+
+                if response.status_code != 200:
+                    raise UpstreamError(
+                        f"Failed to fetch PDF: HTTP {response.status_code}", status_code=response.status_code
+                    )
+
+                content_type = response.headers.get("content-type", "").lower()
+                if "pdf" not in content_type and "application/octet-stream" not in content_type:
+                    # Still cached; some servers don't set the content type correctly
+                    logger.warning(f"Response doesn't appear to be a PDF: {content_type}")
+
+                with open(temp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        f.write(chunk)
+
+            size = temp_path.stat().st_size
+            os.replace(temp_path, self.path_for(key))
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        if entry is not None:
+            self._stats["refreshed"] += 1
+        self._stats["bytes_downloaded"] += size
+
+        new_entry = CacheEntry(
+            key=key,
+            url=url,
+            size=size,
+            content_type=content_type or "application/pdf",
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            fetched_at=time.time(),
+        )
+        self._entries[key] = new_entry
+        self._evict(keep=key)
+        return new_entry
+
+    # === Maintenance ===
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters plus current size; hit_rate counts every request answered from disk"""
+        served_from_cache = self._stats["hits"] + self._stats["revalidated"] + self._stats["stale_served"]
+        requests = served_from_cache + self._stats["misses"] + self._stats["refreshed"]
+        return {
+            **self._stats,
+            "requests": requests,
+            "hit_rate": round(served_from_cache / requests, 4) if requests else 0.0,
+            "entries": len(self._entries),
+            "size_bytes": sum(entry.size for entry in self._entries.values()),
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+    def clear(self) -> int:
+        """Remove every cached file not being served; returns the number of entries removed"""
+        removed = [key for key in self._entries if not self._readers.get(key)]
+        for key in removed:
+            self._remove(key)
+        return len(removed)
+
+
+def _default_cache_directory() -> Path:
+    # Same static root as FileDownloadService
+    static_files_path = os.getenv("STATIC_FILES_PATH")
+    base_path = Path(static_files_path) if static_files_path else Path(__file__).parent.parent / "static"
+    return base_path / "pdf_cache"
+
+
+_pdf_proxy_cache: Optional[PdfProxyCache] = None
+
+
+def get_pdf_proxy_cache() -> PdfProxyCache:
+    """Shared cache instance, configured from PDF_PROXY_CACHE_MAX_MB and PDF_PROXY_CACHE_MAX_AGE_SECONDS"""
+    global _pdf_proxy_cache
+    if _pdf_proxy_cache is None:
+        _pdf_proxy_cache = PdfProxyCache(
+            _default_cache_directory(),
+            max_bytes=int(os.getenv("PDF_PROXY_CACHE_MAX_MB", DEFAULT_MAX_BYTES // (1024 * 1024))) * 1024 * 1024,
+            max_age_seconds=float(os.getenv("PDF_PROXY_CACHE_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS)),
+        )
+    return _pdf_proxy_cache
+
+
+async def close_pdf_proxy_cache() -> None:
+    """Save the access times of the shared cache and close its client, if it was used"""
+    if _pdf_proxy_cache is not None:
+        await _pdf_proxy_cache.close()
@@ -0,0 +1,235 @@
+"""
+Request Metrics - per-route latency, database and event loop histograms in Prometheus format.
+
+The request metrics middleware records every HTTP request under its method and route
+template (/api/parts/get_part/{part_id}, not the concrete path), so the number of series
+stays bounded. Each request records its wall time, its database time, statement count and
+fetched rows (MakerMatrix.database.query_stats), and the event loop lag it saw on arrival.
+render() returns all histograms in the Prometheus text format for the /metrics endpoint.
+
+Requests slower than SLOW_REQUEST_MS are logged together with their most expensive SQL
+statements, with the bound parameters redacted.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from MakerMatrix.database.query_stats import QueryStats, query_totals
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "false").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+ROW_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Requests that matched no route (404s, scanners) share one label value
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination"""
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float], labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.labelnames = tuple(labelnames)
+        # labels -> [count per bucket..., sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _label_text(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with one series per label combination"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class RequestMetrics:
+    """Request histograms of this worker process"""
+
+    def __init__(self, slow_request_ms: float = SLOW_REQUEST_MS, server_timing: bool = SERVER_TIMING_HEADER):
+        self.slow_request_ms = slow_request_ms
+        self.server_timing = server_timing
+        self.started_at = time.time()
+        self.in_progress = 0
+        self._lock = threading.Lock()
+
+        route = ("method", "route")
+        self.requests = Counter("makermatrix_http_requests_total", "HTTP requests handled", route + ("status",))
+        self.slow_requests = Counter(
+            "makermatrix_http_slow_requests_total", "HTTP requests slower than SLOW_REQUEST_MS", route
+        )
+        self.duration = Histogram(
+            "makermatrix_http_request_duration_seconds",
+            "Wall time of HTTP requests, until the last byte of the body is sent",
+            SECONDS_BUCKETS,
+            route,
+        )
+        self.db_time = Histogram(
+            "makermatrix_http_request_db_seconds", "Time spent in SQL statements per request", SECONDS_BUCKETS, route
+        )
+        self.db_statements = Histogram(
+            "makermatrix_http_request_db_statements", "SQL statements executed per request", STATEMENT_BUCKETS, route
+        )
+        self.db_rows = Histogram(
+            "makermatrix_http_request_db_rows", "Rows returned by SQL statements per request", ROW_BUCKETS, route
+        )
+        self.loop_lag = Histogram(
+            "makermatrix_http_request_event_loop_lag_seconds",
+            "Event loop delay a request saw when it arrived",
+            LAG_BUCKETS,
+            route,
+        )
+        self._metrics = [
+            self.requests,
+            self.slow_requests,
+            self.duration,
+            self.db_time,
+            self.db_statements,
+            self.db_rows,
+            self.loop_lag,
+        ]
+
+    def record(
+        self,
+        method: str,
+        route: Optional[str],
+        status: int,
+        seconds: float,
+        stats: QueryStats,
+        loop_lag: Optional[float] = None,
+    ) -> None:
+        """Add one finished request to the histograms and log it if it was slow"""
+        labels = (method, route or UNMATCHED_ROUTE)
+        with self._lock:
+            self.requests.inc(labels + (str(status),))
+            self.duration.observe(labels, seconds)
+            self.db_time.observe(labels, stats.db_seconds)
+            self.db_statements.observe(labels, stats.statements)
+            self.db_rows.observe(labels, stats.rows)
+            if loop_lag is not None:
+                self.loop_lag.observe(labels, loop_lag)
+            slow = 0 < self.slow_request_ms <= seconds * 1000
+            if slow:
+                self.slow_requests.inc(labels)
+        if slow:
+            self._log_slow_request(labels, status, seconds, stats, loop_lag)
+
+    def _log_slow_request(
+        self, labels: Labels, status: int, seconds: float, stats: QueryStats, loop_lag: Optional[float]
+    ) -> None:
+        method, route = labels
+        lines = [
+            f"Slow request {method} {route} -> {status}: {seconds * 1000:.1f} ms "
+            f"(db {stats.db_seconds * 1000:.1f} ms in {stats.statements} statements, {stats.rows} rows"
+            + (f", event loop lag {loop_lag * 1000:.1f} ms)" if loop_lag is not None else ")")
+        ]
+        for entry in stats.top_statements():
+            lines.append(
+                f"  {entry['seconds'] * 1000:8.1f} ms  x{entry['executions']:<4} {entry['statement']}"
+                f"  -- params {entry['parameters']}"
+            )
+        logger.warning("\n".join(lines))
+
+    @staticmethod
+    def server_timing_value(seconds: float, stats: QueryStats) -> str:
+        return (
+            f"app;dur={seconds * 1000:.1f}, "
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} statements, {stats.rows} rows"'
+        )
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = []
+            for metric in self._metrics:
+                lines.extend(metric.render())
+            in_progress = self.in_progress
+
+        lines.append("# HELP makermatrix_http_requests_in_progress HTTP requests being handled")
+        lines.append("# TYPE makermatrix_http_requests_in_progress gauge")
+        lines.append(f"makermatrix_http_requests_in_progress {in_progress}")
+
+        totals = query_totals()
+        lines.append("# HELP makermatrix_db_statements_total SQL statements executed, inside and outside requests")
+        lines.append("# TYPE makermatrix_db_statements_total counter")
+        for scope, values in totals.items():
+            lines.append(f'makermatrix_db_statements_total{{scope="{scope}"}} {values["statements"]}')
+        lines.append("# HELP makermatrix_db_seconds_total Time spent in SQL statements, inside and outside requests")
+        lines.append("# TYPE makermatrix_db_seconds_total counter")
+        for scope, values in totals.items():
+            lines.append(f'makermatrix_db_seconds_total{{scope="{scope}"}} {_format_value(values["seconds"])}')
+
+        lines.append("# HELP makermatrix_process_start_time_seconds Start time of the worker process")
+        lines.append("# TYPE makermatrix_process_start_time_seconds gauge")
+        lines.append(f"makermatrix_process_start_time_seconds {_format_value(self.started_at)}")
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,202 @@
+"""
+Startup - timed, partly concurrent application initialization and the startup report.
+
+The lifespan runs its setup as named steps through startup_report.run(): blocking steps run
+in worker threads, so steps that do not depend on each other (default printers, rate limits,
+supplier configurations, ...) overlap, and every step records its duration. The report is
+printed once the API is ready, served by /api/metrics/startup and exported to /metrics.
+
+Most of the setup only creates what is missing (tables, default roles, default supplier
+configurations). With FAST_START=true a fingerprint of everything that setup depends on is
+kept in the database header (PRAGMA user_version) after a complete run; while the
+fingerprint is unchanged, later starts skip those steps. It covers the application and
+schema versions, the tables, columns and indexes of the models, the migrations, the
+registered suppliers and the supplier credentials found in the environment. A database
+restored from a backup carries its own fingerprint, so an older one is set up again.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+FAST_START = os.getenv("FAST_START", "false").lower() == "true"
+
+_MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+
+class StartupStep:
+    """Duration and outcome of one startup step"""
+
+    def __init__(self, name: str, offset: float, seconds: float, status: str, error: Optional[str] = None):
+        self.name = name
+        self.offset = offset  # Seconds since the start of the lifespan
+        self.seconds = seconds
+        self.status = status  # ok, failed or skipped
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "offset_ms": round(self.offset * 1000, 1),
+            "duration_ms": round(self.seconds * 1000, 1),
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class StartupReport:
+    """Startup steps of this worker process"""
+
+    def __init__(self):
+        self.steps: List[StartupStep] = []
+        self.fast_start = False
+        self.import_seconds: Optional[float] = None
+        self.started_at: Optional[datetime] = None
+        self.ready_seconds: Optional[float] = None
+        self._started = time.perf_counter()
+
+    def record_imports(self, started: float) -> None:
+        """Record the time spent importing the application, from perf_counter() value `started`"""
+        self.import_seconds = time.perf_counter() - started
+
+    def begin(self) -> None:
+        """Mark the start of the lifespan; step offsets are relative to it"""
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    def record(self, name: str, started: float, status: str = "ok", error: Optional[str] = None) -> StartupStep:
+        """Record a step that began at perf_counter() value `started` and has just ended"""
+        now = time.perf_counter()
+        step = StartupStep(name, started - self._started, now - started, status, error)
+        self.steps.append(step)
+        return step
+
+    def skip(self, name: str) -> None:
+        self.record(name, time.perf_counter(), "skipped")
+
+    async def run(self, name: str, func: Callable, *args, required: bool = False) -> Any:
+        """
+        Run one step and record its duration; blocking functions run in a worker thread.
+
+        A failing step is logged and returns None, unless it is required for the application
+        to work, in which case the exception propagates and startup fails.
+        """
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(func):
+                result = await func(*args)
+            else:
+                result = await asyncio.to_thread(func, *args)
+        except Exception as e:
+            self.record(name, started, "failed", str(e))
+            if required:
+                raise
+            print(f"Startup step '{name}' failed: {e}")
+            return None
+        self.record(name, started)
+        return result
+
+    def ready(self) -> None:
+        """Mark the application as ready to answer requests"""
+        self.ready_seconds = time.perf_counter() - self._started
+
+    @property
+    def failed(self) -> bool:
+        return any(step.status == "failed" for step in self.steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "fast_start": self.fast_start,
+            "import_ms": round(self.import_seconds * 1000, 1) if self.import_seconds is not None else None,
+            "ready_ms": round(self.ready_seconds * 1000, 1) if self.ready_seconds is not None else None,
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+    def summary(self) -> str:
+        """The steps as a table, slowest first"""
+        report = self.to_dict()
+        lines = [
+            f"Startup ready in {report['ready_ms']} ms after {report['import_ms']} ms of imports"
+            + (" (fast start)" if self.fast_start else "")
+        ]
+        for step in sorted(self.steps, key=lambda step: step.seconds, reverse=True):
+            lines.append(f"  {step.seconds * 1000:9.1f} ms  {step.status:<7}  {step.name}")
+        return "\n".join(lines)
+
+    def render(self) -> str:
+        """Step durations in the Prometheus text format (empty before the lifespan ran)"""
+        if self.ready_seconds is None:
+            return ""
+        lines = [
+            "# HELP makermatrix_startup_seconds Time from the start of the lifespan until the API was ready",
+            "# TYPE makermatrix_startup_seconds gauge",
+            f"makermatrix_startup_seconds {self.ready_seconds!r}",
+            "# HELP makermatrix_startup_import_seconds Time spent importing the application modules",
+            "# TYPE makermatrix_startup_import_seconds gauge",
+            f"makermatrix_startup_import_seconds {self.import_seconds or 0.0!r}",
+            "# HELP makermatrix_startup_step_seconds Duration of each startup step",
+            "# TYPE makermatrix_startup_step_seconds gauge",
+        ]
+        for step in self.steps:
+            name = step.name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'makermatrix_startup_step_seconds{{step="{name}",status="{step.status}"}} {step.seconds!r}')
+        return "\n".join(lines) + "\n"
+
+
+# === Fast start ===
+
+
+def setup_fingerprint() -> int:
+    """A positive 31-bit checksum of everything the idempotent setup depends on"""
+    from sqlmodel import SQLModel
+
+    from MakerMatrix import __schema_version__, __version__
+    from MakerMatrix.suppliers.registry import get_available_suppliers
+    from MakerMatrix.utils.env_credentials import list_available_env_credentials
+
+    parts = [__version__, __schema_version__]
+    for table in sorted(SQLModel.metadata.tables.values(), key=lambda table: table.name):
+        columns = ",".join(sorted(column.name for column in table.columns))
+        indexes = ",".join(sorted(index.name or "" for index in table.indexes))
+        parts.append(f"{table.name}:{columns}:{indexes}")
+    parts.append(",".join(sorted(path.name for path in _MIGRATIONS_DIR.glob("*.py"))))
+    parts.append(",".join(get_available_suppliers()))
+    credentials = list_available_env_credentials()
+    parts.append(",".join(f"{name}={sorted(fields)}" for name, fields in sorted(credentials.items())))
+    # PRAGMA user_version is a signed 32-bit integer and 0 means "never set up"
+    return (zlib.crc32("\n".join(parts).encode()) & 0x7FFFFFFF) or 1
+
+
+def read_setup_fingerprint(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def write_setup_fingerprint(engine: Engine, fingerprint: int) -> None:
+    with engine.begin() as conn:
+        # PRAGMA values cannot be bound parameters
+        conn.execute(text(f"PRAGMA user_version = {int(fingerprint)}"))
+
+
+def setup_is_current(engine: Engine, fingerprint: int) -> bool:
+    """True when a previous start completed the setup for the same fingerprint"""
+    try:
+        return read_setup_fingerprint(engine) == fingerprint
+    except Exception as e:
+        logger.warning(f"Could not read the setup fingerprint, running the full setup: {e}")
+        return False
+
+
+startup_report = StartupReport()
@@ -7,6 +7,7 @@ Provides CRUD operations, validation, and integration with encryption service.
 
 import logging
 import json
+from functools import cached_property
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import os
@@ -43,8 +44,10 @@ class SupplierConfigService(BaseService):
         self.supplier_config_repo = SupplierConfigRepository()
         self.credentials_repo = SupplierCredentialsRepository()
 
-        # Load default supplier configurations from config files
-        self.default_suppliers = self._load_default_supplier_configs()
+    @cached_property
+    def default_suppliers(self) -> Dict[str, Dict[str, Any]]:
+        """Default supplier configurations, built on first use (this instantiates every supplier)"""
+        return self._load_default_supplier_configs()
 
     def _load_default_supplier_configs(self) -> Dict[str, Dict[str, Any]]:
         """Load default supplier configurations from new supplier registry"""
@@ -0,0 +1,96 @@
+"""
+Supplier Usage Rollup - folds supplier_usage_tracking into minute/hour/day buckets.
+
+Every SUPPLIER_USAGE_ROLLUP_SECONDS the raw request rows older than ROLLUP_LAG_SECONDS are
+added to supplier_usage_buckets and the rollup watermark moves past them, one day of rows
+per transaction. The lag leaves room for requests recorded a little after they were made.
+Each run then prunes raw rows past SUPPLIER_USAGE_RAW_RETENTION_HOURS (only once folded)
+and buckets past their own retention.
+
+Rate-limit checks and usage statistics read the buckets up to the watermark and the raw rows
+after it (see SupplierUsageBucketRepository), so they stay correct whether or not the rollup
+has caught up. The rollup runs in the background-services worker only.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from MakerMatrix.repositories.supplier_usage_bucket_repository import SupplierUsageBucketRepository, floor_to
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_INTERVAL_SECONDS = float(os.getenv("SUPPLIER_USAGE_ROLLUP_SECONDS", "60"))
+ROLLUP_LAG_SECONDS = 120
+
+
+class SupplierUsageRollup:
+    """Periodic fold and prune of the supplier usage tables"""
+
+    def __init__(self, engine=None, interval: float = ROLLUP_INTERVAL_SECONDS, lag_seconds: int = ROLLUP_LAG_SECONDS):
+        self._engine = engine
+        self.interval = interval
+        self.lag = timedelta(seconds=lag_seconds)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"runs": 0, "rows_folded": 0, "rows_pruned": 0, "failed_runs": 0}
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from MakerMatrix.models.models import engine
+
+            self._engine = engine
+        return self._engine
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fold everything older than the lag, then prune"""
+        now = now or datetime.utcnow()
+        until = floor_to(now - self.lag, "minute")
+
+        folded = 0
+        while True:
+            with self.engine.begin() as conn:
+                rows, watermark = SupplierUsageBucketRepository.fold(conn, until)
+            folded += rows
+            if watermark >= until:
+                break
+
+        with self.engine.begin() as conn:
+            pruned = SupplierUsageBucketRepository.prune(conn, now)
+
+        self.stats["runs"] += 1
+        self.stats["rows_folded"] += folded
+        self.stats["rows_pruned"] += sum(pruned.values())
+        return {"rows_folded": folded, "rolled_up_until": watermark.isoformat(), "rows_pruned": pruned}
+
+    # === Background loop ===
+
+    async def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await asyncio.to_thread(self.run_once)
+                if result["rows_folded"]:
+                    logger.debug(f"Supplier usage rollup: {result}")
+            except Exception as e:
+                self.stats["failed_runs"] += 1
+                logger.error(f"Supplier usage rollup failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+supplier_usage_rollup = SupplierUsageRollup()
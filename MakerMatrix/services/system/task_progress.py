@@ -0,0 +1,190 @@
+"""
+Task Progress Channel - coalesces progress updates and log lines of a running task.
+
+Tasks report progress far more often than anyone needs it persisted (per file copied,
+per part enriched). A channel keeps the latest progress in memory and:
+
+- persists it to TaskModel at most once per TASK_PROGRESS_PERSIST_SECONDS, plus a
+  trailing write so the last value is never lost;
+- broadcasts in-memory progress over WebSocket at most once per
+  TASK_PROGRESS_BROADCAST_SECONDS between persists;
+- collects log lines in a ring buffer of TASK_LOG_BUFFER_SIZE entries, broadcasts the
+  lines of each TASK_PROGRESS_BROADCAST_SECONDS interval as one message and hands them
+  to TaskService to persist with the final state.
+
+TaskService owns one channel per running task and closes it on every status
+transition, folding the pending progress and the log buffer into that write. Once a
+task has finished, reports that still arrive go to a closed channel and are dropped.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from MakerMatrix.models.task_models import TaskModel, UpdateTaskRequest
+
+logger = logging.getLogger(__name__)
+
+PERSIST_INTERVAL_SECONDS = float(os.getenv("TASK_PROGRESS_PERSIST_SECONDS", "2.0"))
+BROADCAST_INTERVAL_SECONDS = float(os.getenv("TASK_PROGRESS_BROADCAST_SECONDS", "0.25"))
+LOG_BUFFER_SIZE = int(os.getenv("TASK_LOG_BUFFER_SIZE", "500"))
+
+
+@dataclass
+class PendingState:
+    """State of a closed channel, to be written with the status transition"""
+
+    progress: int
+    step: Optional[str]
+    log_entries: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class TaskProgressChannel:
+    """In-memory progress and log buffer for one running task"""
+
+    def __init__(
+        self,
+        task_service,
+        task: TaskModel,
+        persist_interval: float = PERSIST_INTERVAL_SECONDS,
+        broadcast_interval: float = BROADCAST_INTERVAL_SECONDS,
+        log_capacity: int = LOG_BUFFER_SIZE,
+    ):
+        self.task_service = task_service
+        self.task_id = task.id
+        self.persist_interval = persist_interval
+        self.broadcast_interval = broadcast_interval
+
+        self.progress = task.progress_percentage or 0
+        self.step = task.current_step
+        self._snapshot = task.to_dict()
+        self._persisted = (self.progress, self.step)
+        self._last_persist = 0.0
+        self._last_broadcast = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self._logs: deque = deque(task.get_log_entries(), maxlen=log_capacity)
+        self._pending_logs: deque = deque(maxlen=log_capacity)
+        self._log_task: Optional[asyncio.Task] = None
+        self._last_log_broadcast = 0.0
+
+        self.closed = False
+        self.stats = {"updates": 0, "persists": 0, "broadcasts": 0, "log_lines": 0}
+
+    # === Progress ===
+
+    async def update(self, progress: Optional[int] = None, step: Optional[str] = None) -> None:
+        """Record new progress; persists or broadcasts only when the intervals allow"""
+        if self.closed:
+            return
+        if progress is not None:
+            self.progress = progress
+        if step is not None:
+            self.step = step
+        self.stats["updates"] += 1
+
+        now = time.monotonic()
+        if now - self._last_persist >= self.persist_interval:
+            await self.flush()
+            return
+
+        if now - self._last_broadcast >= self.broadcast_interval:
+            self._broadcast_progress(now)
+        self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Persist the current progress if it changed since the last write"""
+        self._cancel(self._flush_task)
+        self._flush_task = None
+        if self.closed or (self.progress, self.step) == self._persisted:
+            return
+
+        self._persisted = (self.progress, self.step)
+        self._last_persist = self._last_broadcast = time.monotonic()
+        self.stats["persists"] += 1
+        # update_task broadcasts the persisted state itself
+        await self.task_service.update_task(
+            self.task_id, UpdateTaskRequest(progress_percentage=self.progress, current_step=self.step)
+        )
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._deferred_flush())
+
+    async def _deferred_flush(self) -> None:
+        delay = self.persist_interval - (time.monotonic() - self._last_persist)
+        await asyncio.sleep(max(delay, 0))
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist progress of task {self.task_id}: {e}")
+
+    def _broadcast_progress(self, now: float) -> None:
+        from MakerMatrix.services.system.websocket_service import websocket_manager
+
+        self._last_broadcast = now
+        self.stats["broadcasts"] += 1
+        data = {**self._snapshot, "progress_percentage": self.progress, "current_step": self.step}
+        asyncio.create_task(websocket_manager.broadcast_task_update(data))
+
+    # === Logs ===
+
+    def log(self, level: str, message: str) -> None:
+        """Buffer a log line; lines are broadcast in batches"""
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "level": level,
+            "message": message,
+            "step": self.step,
+        }
+        self._logs.append(entry)
+        self.stats["log_lines"] += 1
+        if self.closed:
+            return
+
+        self._pending_logs.append(entry)
+        if self._log_task is None or self._log_task.done():
+            try:
+                self._log_task = asyncio.get_running_loop().create_task(self._broadcast_logs())
+            except RuntimeError:
+                pass  # No event loop; the lines are still persisted with the task
+
+    async def _broadcast_logs(self) -> None:
+        from MakerMatrix.services.system.websocket_service import websocket_manager
+
+        # One message per interval; lines logged while it is sent go out with the next one
+        while self._pending_logs:
+            delay = self.broadcast_interval - (time.monotonic() - self._last_log_broadcast)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_log_broadcast = time.monotonic()
+
+            entries = list(self._pending_logs)
+            self._pending_logs.clear()
+            try:
+                await websocket_manager.broadcast_task_logs(self.task_id, entries)
+            except Exception as e:
+                logger.debug(f"Failed to broadcast log lines of task {self.task_id}: {e}")
+
+    def log_entries(self) -> List[Dict[str, Any]]:
+        return list(self._logs)
+
+    # === Lifecycle ===
+
+    def close(self) -> PendingState:
+        """Stop timers and return the unpersisted state; pending log broadcasts still go out"""
+        self.closed = True
+        self._cancel(self._flush_task)
+        self._flush_task = None
+        return PendingState(progress=self.progress, step=self.step, log_entries=self.log_entries())
+
+    @staticmethod
+    def _cancel(task: Optional[asyncio.Task]) -> None:
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Callable
 from MakerMatrix.database.db import get_session
@@ -15,11 +16,18 @@ from MakerMatrix.models.task_models import (
 from MakerMatrix.repositories.task_repository import TaskRepository
 from MakerMatrix.tasks import get_task_class, get_all_task_types, list_available_tasks
 from MakerMatrix.services.system.websocket_service import websocket_manager
+from MakerMatrix.services.system.task_progress import TaskProgressChannel
+from MakerMatrix.services.system.event_bus import get_event_bus
 from MakerMatrix.services.base_service import BaseService, ServiceResponse
 from MakerMatrix.services.activity_service import get_activity_service
 
 logger = logging.getLogger(__name__)
 
+# Event bus channel for cancelling a task that runs in another worker process
+TASK_CANCEL_CHANNEL = "task_cancel"
+# Finished tasks remembered so that late progress reports do not open a new channel
+FINISHED_TASKS_REMEMBERED = 1000
+
 
 class TaskService(BaseService):
     """
@@ -33,12 +41,14 @@ class TaskService(BaseService):
     separation of concerns between service and repository layers.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, engine_override=None):
+        super().__init__(engine_override)
         self.entity_name = "Task"
         self.task_repository = TaskRepository()
         self.running_tasks: Dict[str, asyncio.Task] = {}
         self.task_instances: Dict[str, Any] = {}  # Cache task instances
+        self.progress_channels: Dict[str, TaskProgressChannel] = {}
+        self.finished_task_ids: "OrderedDict[str, None]" = OrderedDict()
         self.is_worker_running = False
 
         # Register modular task handlers
@@ -178,6 +188,20 @@ class TaskService(BaseService):
                 return None
 
             if update_request.status is not None:
+                # A status transition ends the progress channel; write its pending state along with it
+                channel = self.progress_channels.pop(task_id, None)
+                if channel is not None:
+                    pending = channel.close()
+                    task.progress_percentage = pending.progress
+                    task.current_step = pending.step
+                    task.set_log_entries(pending.log_entries)
+                if update_request.status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED):
+                    self.finished_task_ids[task_id] = None
+                    while len(self.finished_task_ids) > FINISHED_TASKS_REMEMBERED:
+                        self.finished_task_ids.popitem(last=False)
+                else:
+                    self.finished_task_ids.pop(task_id, None)
+
                 task.status = update_request.status
                 if update_request.status == TaskStatus.RUNNING and not task.started_at:
                     task.started_at = datetime.utcnow()
@@ -204,18 +228,51 @@ class TaskService(BaseService):
 
             return updated_task
 
+    def progress_channel(self, task: TaskModel) -> TaskProgressChannel:
+        """
+        Get the progress channel of a running task, creating it on first use. A finished task
+        gets a closed channel that is not kept, so late reports are dropped.
+        """
+        channel = self.progress_channels.get(task.id)
+        if channel is None:
+            channel = TaskProgressChannel(self, task)
+            if task.id in self.finished_task_ids:
+                channel.close()
+            else:
+                self.progress_channels[task.id] = channel
+        return channel
+
+    async def get_task_logs(self, task_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Log lines of a task: the live buffer while it runs, the persisted copy afterwards"""
+        channel = self.progress_channels.get(task_id)
+        if channel is not None:
+            return channel.log_entries()
+
+        async with self.get_async_session() as session:
+            task = self.task_repository.get_by_id(session, task_id)
+            return task.get_log_entries() if task else None
+
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a task"""
         # Cancel running task if exists
         if task_id in self.running_tasks:
             self.running_tasks[task_id].cancel()
             del self.running_tasks[task_id]
+        else:
+            # It may be running in the worker process that holds the task worker
+            await get_event_bus().publish(TASK_CANCEL_CHANNEL, {"task_id": task_id}, local=False)
 
         # Update database
         update_request = UpdateTaskRequest(status=TaskStatus.CANCELLED, current_step="Task cancelled by user")
         task = await self.update_task(task_id, update_request)
         return task is not None
 
+    def _on_cancel_event(self, payload: Dict[str, Any]) -> None:
+        # Cancellation requested in another worker process
+        running = self.running_tasks.pop(payload.get("task_id"), None)
+        if running is not None:
+            running.cancel()
+
     async def retry_task(self, task_id: str) -> bool:
         """
         Retry a failed task using repository pattern.
@@ -520,6 +577,7 @@ class TaskService(BaseService):
 
 # Global task service instance
 task_service = TaskService()
+get_event_bus().subscribe(TASK_CANCEL_CHANNEL, task_service._on_cancel_event)
 
 
 async def create_file_import_enrichment_task(
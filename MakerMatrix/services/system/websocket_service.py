@@ -5,12 +5,17 @@ WebSocket service for real-time task monitoring and system events
 import json
 import asyncio
 import logging
-from typing import Dict, Set, Any, Optional
+from typing import Dict, Set, Any, List, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 
+from MakerMatrix.services.system.event_bus import get_event_bus
+
 logger = logging.getLogger(__name__)
 
+# Event bus channel that carries broadcasts to the other worker processes
+WEBSOCKET_CHANNEL = "websocket"
+
 
 class WebSocketManager:
     """Manages WebSocket connections for real-time updates"""
@@ -76,7 +81,18 @@ class WebSocketManager:
             self.disconnect(websocket)
 
     async def broadcast_to_type(self, connection_type: str, message: Dict[str, Any]):
-        """Broadcast message to all connections of a specific type"""
+        """Broadcast message to all connections of a specific type, in every worker process"""
+        await self.send_to_local_connections(connection_type, message)
+        await get_event_bus().publish(
+            WEBSOCKET_CHANNEL, {"connection_type": connection_type, "message": message}, local=False
+        )
+
+    async def _on_bus_event(self, payload: Dict[str, Any]):
+        # Broadcast from another worker process
+        await self.send_to_local_connections(payload["connection_type"], payload["message"])
+
+    async def send_to_local_connections(self, connection_type: str, message: Dict[str, Any]):
+        """Send message to the connections of a specific type held by this process"""
         if connection_type not in self.connections:
             return
 
@@ -111,6 +127,15 @@ class WebSocketManager:
         }
         await self.broadcast_to_type("tasks", log_message)
 
+    async def broadcast_task_logs(self, task_id: str, entries: List[Dict[str, Any]]):
+        """Broadcast a batch of task log lines (timestamp, level, message, step) as one message"""
+        message = {
+            "type": "task_logs",
+            "data": {"task_id": task_id, "entries": entries},
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        await self.broadcast_to_type("tasks", message)
+
     async def broadcast_worker_status(self, status_data: Dict[str, Any]):
         """Broadcast worker status update"""
         message = {"type": "worker_status", "data": status_data, "timestamp": datetime.utcnow().isoformat()}
@@ -177,8 +202,9 @@ class WebSocketManager:
         """Send ping to all connections to keep them alive"""
         ping_message = {"type": "ping", "timestamp": datetime.utcnow().isoformat()}
 
-        for connection_type in self.connections:
-            await self.broadcast_to_type(connection_type, ping_message)
+        # Every process pings its own connections
+        for connection_type in list(self.connections):
+            await self.send_to_local_connections(connection_type, ping_message)
 
     def get_connection_stats(self) -> Dict[str, Any]:
         """Get connection statistics"""
@@ -194,6 +220,7 @@ class WebSocketManager:
 
 # Global WebSocket manager instance
 websocket_manager = WebSocketManager()
+get_event_bus().subscribe(WEBSOCKET_CHANNEL, websocket_manager._on_bus_event)
 
 
 async def broadcast_message(message: Dict[str, Any], connection_types: list = None):
@@ -28,14 +28,16 @@ from .base import BaseSupplier, FieldDefinition, SupplierCapability
 from .registry import SupplierRegistry
 from .exceptions import SupplierError, SupplierConfigurationError, SupplierAuthenticationError
 
-# Import supplier implementations to register them
-from . import digikey
-from . import lcsc
-from . import mouser
-from . import mcmaster_carr
-from . import bolt_depot
-from . import adafruit
-from . import seeed_studio
+# Supplier implementations register themselves when their module is imported; the registry
+# imports a module the first time its supplier is used, so startup does not load every
+# supplier SDK
+SupplierRegistry.register_lazy("digikey", "MakerMatrix.suppliers.digikey")
+SupplierRegistry.register_lazy("lcsc", "MakerMatrix.suppliers.lcsc")
+SupplierRegistry.register_lazy("mouser", "MakerMatrix.suppliers.mouser")
+SupplierRegistry.register_lazy("mcmaster-carr", "MakerMatrix.suppliers.mcmaster_carr")
+SupplierRegistry.register_lazy("boltdepot", "MakerMatrix.suppliers.bolt_depot")
+SupplierRegistry.register_lazy("adafruit", "MakerMatrix.suppliers.adafruit")
+SupplierRegistry.register_lazy("seeedstudio", "MakerMatrix.suppliers.seeed_studio")
 
 __all__ = [
     "BaseSupplier",
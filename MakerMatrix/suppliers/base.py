@@ -12,6 +12,7 @@ from enum import Enum
 import asyncio
 import aiohttp
 import functools
+import os
 import time
 import logging
 from datetime import datetime
@@ -41,6 +42,7 @@ class SupplierCapability(Enum):
     FETCH_PRICING_STOCK = "fetch_pricing_stock"  # Combined pricing and stock information
     IMPORT_ORDERS = "import_orders"  # Import order files (CSV, XLS, etc.)
     SCRAPE_PART_DETAILS = "scrape_part_details"  # Web scraping fallback when API unavailable
+    BULK_SEARCH = "bulk_search"  # Native batch lookup - many part numbers resolved per API request
 
 
 @dataclass
@@ -200,6 +202,24 @@ class EnrichmentFieldMapping:
 logger = logging.getLogger(__name__)
 
 
+def get_base_url_override(supplier_name: str) -> Optional[str]:
+    """
+    API base URL to use instead of the supplier's live endpoint, if one is configured.
+
+    SUPPLIER_BASE_URL_<NAME> (e.g. SUPPLIER_BASE_URL_MCMASTER_CARR) points one supplier
+    elsewhere; SUPPLIER_MOCK_URL points every supplier at <url>/<name> of the local mock
+    supplier server (python -m MakerMatrix.benchmarks mock-suppliers).
+    """
+    env_name = supplier_name.upper().replace("-", "_").replace(" ", "_")
+    override = os.getenv(f"SUPPLIER_BASE_URL_{env_name}")
+    if override:
+        return override.rstrip("/")
+    mock_url = os.getenv("SUPPLIER_MOCK_URL")
+    if mock_url:
+        return f"{mock_url.rstrip('/')}/{supplier_name.lower()}"
+    return None
+
+
 class BaseSupplier(ABC):
     """
     Abstract base class for all supplier implementations.
@@ -216,6 +236,7 @@ class BaseSupplier(ABC):
         self._config: Dict[str, Any] = {}
         self._session: Optional[aiohttp.ClientSession] = None
         self._rate_limit_service = None  # Lazy loaded to avoid circular imports
+        self._prefetched_part_details: Dict[str, PartSearchResult] = {}  # Filled by bulk lookups
 
     def _get_rate_limit_service(self):
         """Lazy load rate limit service to avoid circular imports"""
@@ -716,20 +737,134 @@ class BaseSupplier(ABC):
     async def bulk_search_parts(
         self, queries: List[str], limit_per_query: int = 10
     ) -> Dict[str, List[PartSearchResult]]:
-        """Search for multiple parts at once (if supported)"""
+        """Search for multiple parts at once using bounded-concurrency fan-out"""
 
-        # Default implementation with tracking - subclasses can override for more efficient bulk operations
         async def _impl():
-            results = {}
-            for query in queries:
-                try:
-                    results[query] = await self.search_parts(query, limit=limit_per_query)
-                except Exception as e:
-                    results[query] = []
-            return results
+            semaphore = asyncio.Semaphore(self.get_bulk_concurrency())
+
+            async def _search(query: str) -> List[PartSearchResult]:
+                async with semaphore:
+                    try:
+                        return await self.search_parts(query, limit=limit_per_query)
+                    except Exception as e:
+                        logger.warning(f"Bulk search failed for {query}: {e}")
+                        return []
+
+            unique_queries = list(dict.fromkeys(queries))
+            results = await asyncio.gather(*[_search(query) for query in unique_queries])
+            return dict(zip(unique_queries, results))
 
         return await self._tracked_api_call("bulk_search", _impl)
 
+    # ========== Batch Lookups ==========
+
+    def get_bulk_batch_size(self) -> int:
+        """
+        Maximum number of part numbers resolved by a single batch request.
+
+        Suppliers declaring SupplierCapability.BULK_SEARCH override this together with
+        _fetch_part_details_batch(). The default of 1 means one request per part.
+        """
+        return 1
+
+    def get_bulk_concurrency(self) -> int:
+        """Maximum number of lookup requests in flight at once during bulk operations"""
+        config = self._config or {}
+        try:
+            return max(1, int(config.get("bulk_concurrency", 4)))
+        except (TypeError, ValueError):
+            return 4
+
+    async def _fetch_part_details_batch(self, supplier_part_numbers: List[str]) -> Dict[str, PartSearchResult]:
+        """
+        Resolve a batch of part numbers with one API request.
+
+        Only called when the supplier declares SupplierCapability.BULK_SEARCH. Returns a dict
+        keyed by the requested part numbers; numbers that were not found are simply omitted.
+        The default resolves the batch one part at a time with get_part_details(), for
+        suppliers whose API has no batch endpoint (their batch size stays 1).
+        """
+        found = {}
+        for part_number in supplier_part_numbers:
+            part = await self.get_part_details(part_number)
+            if part is not None:
+                found[part_number] = part
+        return found
+
+    async def bulk_get_part_details(self, supplier_part_numbers: List[str]) -> Dict[str, Optional[PartSearchResult]]:
+        """
+        Get part details for many parts at once.
+
+        Suppliers with SupplierCapability.BULK_SEARCH pack up to get_bulk_batch_size() part numbers
+        into each request; all others fall back to get_part_details() fanned out with at most
+        get_bulk_concurrency() requests in flight. Duplicate part numbers are looked up once.
+
+        Args:
+            supplier_part_numbers: Part numbers to resolve
+
+        Returns:
+            Dict mapping every requested part number to its PartSearchResult (None if not found or failed)
+        """
+        unique_numbers = [pn for pn in dict.fromkeys(supplier_part_numbers) if pn]
+        results: Dict[str, Optional[PartSearchResult]] = {pn: None for pn in unique_numbers}
+        if not unique_numbers:
+            return results
+
+        semaphore = asyncio.Semaphore(self.get_bulk_concurrency())
+        use_batches = SupplierCapability.BULK_SEARCH in self.get_capabilities() and self.is_capability_available(
+            SupplierCapability.BULK_SEARCH
+        )
+
+        if use_batches:
+            batch_size = max(1, self.get_bulk_batch_size())
+            batches = [unique_numbers[i : i + batch_size] for i in range(0, len(unique_numbers), batch_size)]
+
+            async def _lookup_batch(batch: List[str]):
+                async with semaphore:
+                    try:
+                        found = await self._tracked_api_call("bulk_search", self._fetch_part_details_batch, batch)
+                        for part_number, part in (found or {}).items():
+                            if part_number in results:
+                                results[part_number] = part
+                    except Exception as e:
+                        logger.warning(f"Batch lookup of {len(batch)} parts failed: {e}")
+
+            await asyncio.gather(*[_lookup_batch(batch) for batch in batches])
+        else:
+
+            async def _lookup_one(part_number: str):
+                async with semaphore:
+                    try:
+                        results[part_number] = await self.get_part_details(part_number)
+                    except Exception as e:
+                        logger.warning(f"Bulk lookup failed for {part_number}: {e}")
+
+            await asyncio.gather(*[_lookup_one(part_number) for part_number in unique_numbers])
+
+        return results
+
+    async def bulk_fetch_pricing_stock(self, supplier_part_numbers: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch pricing and stock for many parts at once via bulk_get_part_details().
+
+        Returns:
+            Dict mapping each part number to {"pricing": [...], "stock_quantity": int}, or None if unavailable
+        """
+        details = await self.bulk_get_part_details(supplier_part_numbers)
+        pricing_stock: Dict[str, Optional[Dict[str, Any]]] = {}
+        for part_number, part in details.items():
+            result = {}
+            if part and part.pricing:
+                result["pricing"] = part.pricing
+            if part and part.stock_quantity is not None:
+                result["stock_quantity"] = part.stock_quantity
+            pricing_stock[part_number] = result or None
+        return pricing_stock
+
+    def prime_part_details(self, part_details: Dict[str, Optional[PartSearchResult]]) -> None:
+        """Seed enrich_part() with results from an earlier bulk lookup so it skips the per-part request"""
+        self._prefetched_part_details.update({pn: part for pn, part in part_details.items() if part is not None})
+
     # ========== Optional Advanced Features ==========
 
     async def fetch_datasheet(self, supplier_part_number: str) -> Optional[str]:
@@ -813,7 +948,8 @@ class BaseSupplier(ABC):
         part_data = None
         if SupplierCapability.GET_PART_DETAILS in capabilities:
             try:
-                part_data = await self.get_part_details(supplier_part_number)
+                prefetched = self._prefetched_part_details.pop(supplier_part_number, None)
+                part_data = prefetched or await self.get_part_details(supplier_part_number)
                 if part_data:
                     enriched_fields.append("part_details")
                 else:
@@ -968,6 +1104,10 @@ class BaseSupplier(ABC):
         """Check if supplier has been configured with credentials"""
         return self._configured and bool(self._credentials)
 
+    def _get_base_url_override(self) -> Optional[str]:
+        """Base URL replacing this supplier's live API endpoint (see get_base_url_override)"""
+        return get_base_url_override(self.get_supplier_info().name)
+
     def get_rate_limit_delay(self) -> float:
         """Get the delay (in seconds) to respect rate limits"""
         # Default 1 second delay - subclasses can customize
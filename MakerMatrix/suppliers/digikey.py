@@ -11,7 +11,6 @@ import base64
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-import pandas as pd
 
 # Import the official DigiKey API library
 try:
@@ -50,9 +49,13 @@ from .exceptions import (
 )
 from MakerMatrix.services.data.unified_column_mapper import UnifiedColumnMapper
 from MakerMatrix.services.data.supplier_data_mapper import SupplierDataMapper
+from MakerMatrix.services.system.coordination import coordination_enabled, get_coordination_store
 
 logger = logging.getLogger(__name__)
 
+# Coordination store key of the access token shared between worker processes
+SHARED_TOKEN_KEY = "digikey:access_token"
+
 
 @register_supplier("digikey")
 class DigiKeySupplier(BaseSupplier):
@@ -71,15 +74,30 @@ class DigiKeySupplier(BaseSupplier):
 
     def _has_valid_cached_token(self) -> bool:
         """Check if we have a valid cached token that hasn't expired"""
-        if not DigiKeySupplier._shared_access_token or not DigiKeySupplier._shared_token_expires_at:
-            return False
-
         # Check if token expires within the next 30 seconds (buffer for API calls)
-        from datetime import timedelta
-
         buffer_time = timedelta(seconds=30)
+        expires_at = DigiKeySupplier._shared_token_expires_at
+        if not DigiKeySupplier._shared_access_token or not expires_at or datetime.now() + buffer_time >= expires_at:
+            # Another worker process may already have fetched a new token
+            self._load_token_from_other_workers()
+
+        if not DigiKeySupplier._shared_access_token or not DigiKeySupplier._shared_token_expires_at:
+            return False
         return datetime.now() + buffer_time < DigiKeySupplier._shared_token_expires_at
 
+    def _load_token_from_other_workers(self) -> None:
+        if not coordination_enabled():
+            return
+        try:
+            token = get_coordination_store().get_value(SHARED_TOKEN_KEY)
+        except Exception as e:
+            logger.debug(f"DigiKey: Failed to read shared token: {e}")
+            return
+        if token:
+            DigiKeySupplier._shared_access_token = token["access_token"]
+            DigiKeySupplier._shared_token_expires_at = datetime.fromisoformat(token["expires_at"])
+            DigiKeySupplier._shared_refresh_token = token.get("refresh_token")
+
     def _use_cached_token(self) -> None:
         """Copy cached token to instance variables"""
         self._access_token = DigiKeySupplier._shared_access_token
@@ -92,6 +110,21 @@ class DigiKeySupplier(BaseSupplier):
         DigiKeySupplier._shared_token_expires_at = datetime.now() + timedelta(seconds=expires_in)
         DigiKeySupplier._shared_refresh_token = refresh_token
 
+        # Share with the other worker processes so they don't each request a token
+        if coordination_enabled():
+            try:
+                get_coordination_store().set_value(
+                    SHARED_TOKEN_KEY,
+                    {
+                        "access_token": access_token,
+                        "expires_at": DigiKeySupplier._shared_token_expires_at.isoformat(),
+                        "refresh_token": refresh_token,
+                    },
+                    ttl_seconds=expires_in,
+                )
+            except Exception as e:
+                logger.debug(f"DigiKey: Failed to share token: {e}")
+
         # Also set on instance
         self._access_token = access_token
         self._token_expires_at = DigiKeySupplier._shared_token_expires_at
@@ -330,16 +363,16 @@ class DigiKeySupplier(BaseSupplier):
         ]
 
     def _get_base_url(self) -> str:
-        """Get base URL for DigiKey production API"""
-        return "https://api.digikey.com"
+        """Get base URL for DigiKey production API (or its configured override)"""
+        return self._get_base_url_override() or "https://api.digikey.com"
 
     def _get_auth_url(self) -> str:
         """Get authorization URL for DigiKey production API"""
-        return "https://api.digikey.com/v1/oauth2/authorize"
+        return f"{self._get_base_url()}/v1/oauth2/authorize"
 
     def _get_token_url(self) -> str:
         """Get token URL for DigiKey production API"""
-        return "https://api.digikey.com/v1/oauth2/token"
+        return f"{self._get_base_url()}/v1/oauth2/token"
 
     def _get_server_url(self) -> str:
         """Automatically detect the server URL for OAuth callbacks"""
@@ -1140,6 +1173,18 @@ class DigiKeySupplier(BaseSupplier):
 
         return await self._tracked_api_call("get_part_details", _impl)
 
+    async def bulk_get_part_details(self, supplier_part_numbers: List[str]) -> Dict[str, Optional[PartSearchResult]]:
+        """
+        Get part details for many DigiKey parts at once.
+
+        Product Information V4 has no multi-part details endpoint, so this authenticates once up
+        front (all concurrent lookups then reuse the shared token cache) and fans out through the
+        base class with bounded concurrency.
+        """
+        if not await self.authenticate():
+            raise SupplierAuthenticationError("Authentication required", supplier_name="digikey")
+        return await super().bulk_get_part_details(supplier_part_numbers)
+
     def _extract_pricing_from_dict(self, product: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract pricing information from product dictionary"""
         pricing = []
@@ -14,7 +14,6 @@ import logging
 import html
 from urllib.parse import urljoin
 from html.parser import HTMLParser
-import pandas as pd
 from typing import List, Dict, Any, Optional
 
 from .base import (
@@ -412,7 +411,13 @@ class LCSCSupplier(BaseSupplier):
         """Get EasyEDA API URL for a specific LCSC part"""
         config = self._config or {}
         version = config.get("api_version", "6.4.19.5")
-        return f"https://easyeda.com/api/products/{lcsc_id}/components?version={version}"
+        base_url = self._get_base_url_override() or "https://easyeda.com"
+        return f"{base_url}/api/products/{lcsc_id}/components?version={version}"
+
+    def _get_product_page_fetch_url(self, lcsc_id: str) -> str:
+        """URL the product page is fetched from; stored product URLs always point at lcsc.com"""
+        base_url = self._get_base_url_override() or "https://www.lcsc.com"
+        return f"{base_url}/product-detail/{lcsc_id}.html"
 
     async def authenticate(self) -> bool:
         """No authentication required for EasyEDA public API"""
@@ -538,7 +543,7 @@ class LCSCSupplier(BaseSupplier):
         """Fetch the public LCSC product page for additional metadata."""
         try:
             http_client = self._get_http_client()
-            product_url = f"https://www.lcsc.com/product-detail/{lcsc_id}.html"
+            product_url = self._get_product_page_fetch_url(lcsc_id)
             response = await http_client.get(product_url, endpoint_type="product_page")
 
             if not response.success or not response.raw_content:
@@ -1171,6 +1176,8 @@ class LCSCSupplier(BaseSupplier):
                 # Use pandas for robust CSV parsing
                 from io import StringIO
 
+                import pandas as pd
+
                 df = pd.read_csv(StringIO(csv_text))
 
                 if df.empty:
@@ -304,6 +304,10 @@ class McMasterCarrSupplier(BaseSupplier):
             await self.close()
             raise SupplierConfigurationError(f"Failed to setup SSL context: {str(e)}")
 
+    def _get_api_base_url(self) -> str:
+        """API base URL: the configured override, the api_base_url setting or the live API"""
+        return self._get_base_url_override() or self._config.get("api_base_url", "https://api.mcmaster.com")
+
     async def _authenticate(self, credentials: Dict[str, str] = None) -> str:
         """Authenticate with McMaster-Carr API using certificate + username/password.
 
@@ -332,7 +336,7 @@ class McMasterCarrSupplier(BaseSupplier):
         if not username or not password:
             raise SupplierAuthenticationError("Username and password are required for McMaster-Carr API")
 
-        base_url = self._config.get("api_base_url", "https://api.mcmaster.com")
+        base_url = self._get_api_base_url()
         login_url = f"{base_url.rstrip('/')}/v1/login"
 
         connector = aiohttp.TCPConnector(ssl=ssl_context)
@@ -395,7 +399,7 @@ class McMasterCarrSupplier(BaseSupplier):
             connector = aiohttp.TCPConnector(ssl=ssl_context)
             timeout = aiohttp.ClientTimeout(total=self._config.get("timeout_seconds", 30))
 
-            base_url = self._config.get("api_base_url", "https://api.mcmaster.com")
+            base_url = self._get_api_base_url()
             url = f"{base_url.rstrip('/')}/v1/{endpoint.lstrip('/')}"
 
             headers = {
@@ -695,7 +699,7 @@ class McMasterCarrSupplier(BaseSupplier):
             datasheet_url = None
             price_link = None
             links = part_data.get("Links", [])
-            base_api_url = self._config.get("api_base_url", "https://api.mcmaster.com")
+            base_api_url = self._get_api_base_url()
             for link in links:
                 key = link.get("Key", "")
                 value = link.get("Value", "")
@@ -8,7 +8,6 @@ Supports part search, pricing, stock, datasheets, and comprehensive part data.
 import os
 import logging
 from typing import List, Dict, Any, Optional
-import pandas as pd
 
 from .base import (
     BaseSupplier,
@@ -63,6 +62,7 @@ class MouserSupplier(BaseSupplier):
             SupplierCapability.FETCH_DATASHEET,  # Data Sheet URL
             SupplierCapability.FETCH_PRICING_STOCK,  # Combined pricing and stock information
             SupplierCapability.IMPORT_ORDERS,  # Import Mouser order Excel files
+            SupplierCapability.BULK_SEARCH,  # Up to 10 pipe-separated part numbers per request
         ]
 
     def get_capability_requirements(self) -> Dict[SupplierCapability, CapabilityRequirement]:
@@ -326,6 +326,9 @@ class MouserSupplier(BaseSupplier):
 
     def _get_base_url(self) -> str:
         """Get API base URL"""
+        override = self._get_base_url_override()
+        if override:
+            return override
         config = self._config or {}  # Handle case where _config might be None
         return config.get("base_url", "https://api.mouser.com/api/v1")
 
@@ -724,8 +727,8 @@ class MouserSupplier(BaseSupplier):
 
         return results
 
-    async def get_part_details(self, supplier_part_number: str) -> Optional[PartSearchResult]:
-        """Get detailed information about a specific Mouser part"""
+    async def _search_by_part_number(self, part_number_query: str, endpoint_type: str):
+        """POST a SearchByPartRequest; part_number_query may hold several pipe-separated part numbers"""
         if not await self.authenticate():
             raise SupplierAuthenticationError("Authentication required", supplier_name="mouser")
 
@@ -739,15 +742,17 @@ class MouserSupplier(BaseSupplier):
         config = self._config or {}  # Handle case where _config might be None
         search_data = {
             "SearchByPartRequest": {
-                "mouserPartNumber": supplier_part_number,
+                "mouserPartNumber": part_number_query,
                 "partSearchOptions": config.get("search_option", "None"),
             }
         }
 
+        return await http_client.post(url, endpoint_type=endpoint_type, params=params, json_data=search_data)
+
+    async def get_part_details(self, supplier_part_number: str) -> Optional[PartSearchResult]:
+        """Get detailed information about a specific Mouser part"""
         try:
-            response = await http_client.post(
-                url, endpoint_type="get_part_details", params=params, json_data=search_data
-            )
+            response = await self._search_by_part_number(supplier_part_number, "get_part_details")
 
             if response.success:
                 search_results = response.data.get("SearchResults", {})
@@ -758,9 +763,41 @@ class MouserSupplier(BaseSupplier):
                 return None
             else:
                 return None
+        except SupplierAuthenticationError:
+            raise
         except Exception:
             return None
 
+    def get_bulk_batch_size(self) -> int:
+        """Mouser's part number search accepts up to 10 pipe-separated part numbers"""
+        return 10
+
+    async def _fetch_part_details_batch(self, supplier_part_numbers: List[str]) -> Dict[str, PartSearchResult]:
+        """Resolve up to 10 Mouser or manufacturer part numbers with a single part number search"""
+        response = await self._search_by_part_number("|".join(supplier_part_numbers), "bulk_search")
+
+        if response.status == 429:
+            raise SupplierRateLimitError("Rate limit exceeded", supplier_name="mouser")
+        if not response.success:
+            raise SupplierConnectionError(
+                f"Batch lookup failed: {response.status} - {response.error_message}", supplier_name="mouser"
+            )
+
+        parsed = self._parse_search_results(response.data)
+        matched: Dict[str, PartSearchResult] = {}
+        for requested in supplier_part_numbers:
+            key = requested.strip().upper()
+            # Prefer exact matches on either part number, then fall back to Mouser's prefix matching
+            candidates = [
+                part
+                for part in parsed
+                if key in ((part.supplier_part_number or "").upper(), (part.manufacturer_part_number or "").upper())
+            ] or [part for part in parsed if (part.supplier_part_number or "").upper().startswith(key)]
+            if candidates:
+                matched[requested] = candidates[0]
+
+        return matched
+
     async def fetch_pricing(self, supplier_part_number: str) -> Optional[List[Dict[str, Any]]]:
         """Fetch current pricing for a Mouser part"""
 
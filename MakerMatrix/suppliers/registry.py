@@ -3,8 +3,12 @@ Supplier Registry
 
 Central registry for discovering and instantiating supplier implementations.
 Provides a factory pattern for getting supplier instances.
+
+Supplier modules can be registered lazily by name (see suppliers/__init__.py); the module,
+and the SDKs it imports, is loaded the first time that supplier is used.
 """
 
+import importlib
 from typing import Dict, List, Type, Optional
 from .base import BaseSupplier, SupplierInfo
 from .exceptions import SupplierNotFoundError
@@ -19,6 +23,7 @@ class SupplierRegistry:
     """
 
     _suppliers: Dict[str, Type[BaseSupplier]] = {}
+    _lazy_modules: Dict[str, str] = {}
     _supplier_info_cache: Dict[str, SupplierInfo] = {}
 
     @classmethod
@@ -32,10 +37,28 @@ class SupplierRegistry:
         if name.lower() in cls._supplier_info_cache:
             del cls._supplier_info_cache[name.lower()]
 
+    @classmethod
+    def register_lazy(cls, name: str, module_path: str):
+        """Register a supplier whose module registers its class when it is first imported"""
+        cls._lazy_modules[name.lower()] = module_path
+
+    @classmethod
+    def _load(cls, name: str) -> None:
+        """Import the module of a lazily registered supplier"""
+        if name not in cls._suppliers and name in cls._lazy_modules:
+            importlib.import_module(cls._lazy_modules[name])
+
+    @classmethod
+    def load_all(cls) -> None:
+        """Import every lazily registered supplier module"""
+        for name in list(cls._lazy_modules):
+            cls._load(name)
+
     @classmethod
     def get_supplier(cls, name: str) -> BaseSupplier:
         """Get an instance of the specified supplier"""
         name = name.lower()
+        cls._load(name)
         if name not in cls._suppliers:
             raise SupplierNotFoundError(f"Supplier '{name}' not found", supplier_name=name)
 
@@ -44,7 +67,7 @@ class SupplierRegistry:
     @classmethod
     def get_available_suppliers(cls) -> List[str]:
         """Get list of all registered supplier names"""
-        return list(cls._suppliers.keys())
+        return list(dict.fromkeys([*cls._lazy_modules, *cls._suppliers]))
 
     @classmethod
     def get_supplier_info(cls, name: str) -> SupplierInfo:
@@ -72,7 +95,7 @@ class SupplierRegistry:
     @classmethod
     def is_supplier_available(cls, name: str) -> bool:
         """Check if a supplier is available"""
-        return name.lower() in cls._suppliers
+        return name.lower() in cls._suppliers or name.lower() in cls._lazy_modules
 
     @classmethod
     def clear_cache(cls):
@@ -113,4 +136,5 @@ def get_all_supplier_info() -> Dict[str, SupplierInfo]:
 
 def get_supplier_registry() -> Dict[str, Type[BaseSupplier]]:
     """Get the raw supplier registry (class references)"""
+    SupplierRegistry.load_all()
     return SupplierRegistry._suppliers.copy()
@@ -6,7 +6,7 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from MakerMatrix.models.task_models import TaskModel, UpdateTaskRequest
+from MakerMatrix.models.task_models import TaskModel
 
 logger = logging.getLogger(__name__)
 
@@ -50,16 +50,19 @@ class BaseTask(ABC):
         pass
 
     async def update_progress(self, task: TaskModel, progress: int, step: Optional[str] = None):
-        """Update task progress"""
+        """
+        Update task progress.
+
+        Updates go through the task's progress channel, which persists and broadcasts
+        them at a bounded rate; call as often as is convenient.
+        """
         if self.task_service:
-            await self.task_service.update_task(
-                task.id, UpdateTaskRequest(progress_percentage=progress, current_step=step)
-            )
+            await self.task_service.progress_channel(task).update(progress, step)
 
     async def update_step(self, task: TaskModel, step: str):
         """Update current step without changing progress"""
         if self.task_service:
-            await self.task_service.update_task(task.id, UpdateTaskRequest(current_step=step))
+            await self.task_service.progress_channel(task).update(step=step)
 
     async def sleep(self, seconds: float):
         """Async sleep with logging"""
@@ -73,30 +76,40 @@ class BaseTask(ABC):
         """Log info message"""
         if task:
             self.logger.info(f"Task {task.id}: {message}")
-            # Send to WebSocket (import here to avoid circular imports)
-            try:
-                from MakerMatrix.services.system.websocket_service import websocket_manager
-
-                asyncio.create_task(websocket_manager.broadcast_task_log(task.id, "info", message, task.current_step))
-            except ImportError:
-                pass  # WebSocket service not available
+            self._log_to_task(task, "info", message)
         else:
             self.logger.info(message)
 
+    def log_warning(self, message: str, task: TaskModel = None):
+        """Log warning message"""
+        if task:
+            self.logger.warning(f"Task {task.id}: {message}")
+            self._log_to_task(task, "warning", message)
+        else:
+            self.logger.warning(message)
+
     def log_error(self, message: str, task: TaskModel = None, exc_info: bool = False):
         """Log error message"""
         if task:
             self.logger.error(f"Task {task.id}: {message}", exc_info=exc_info)
-            # Send to WebSocket
-            try:
-                from MakerMatrix.services.system.websocket_service import websocket_manager
-
-                asyncio.create_task(websocket_manager.broadcast_task_log(task.id, "error", message, task.current_step))
-            except ImportError:
-                pass
+            self._log_to_task(task, "error", message)
         else:
             self.logger.error(message, exc_info=exc_info)
 
+    def _log_to_task(self, task: TaskModel, level: str, message: str):
+        """Add a line to the task log; the progress channel batches the WebSocket broadcasts"""
+        if self.task_service:
+            self.task_service.progress_channel(task).log(level, message)
+            return
+
+        # Send to WebSocket (import here to avoid circular imports)
+        try:
+            from MakerMatrix.services.system.websocket_service import websocket_manager
+
+            asyncio.create_task(websocket_manager.broadcast_task_log(task.id, level, message, task.current_step))
+        except (ImportError, RuntimeError):
+            pass  # WebSocket service or event loop not available
+
     def validate_input_data(self, task: TaskModel, required_fields: list) -> bool:
         """Validate that required fields are present in input data"""
         input_data = self.get_input_data(task)
@@ -1,11 +1,44 @@
 """
-Database Cleanup Task - Cleans up orphaned records and optimizes database
+Database Cleanup Task - Removes expired and orphaned records and reclaims database space
+
+The work is done by DatabaseMaintenance; see services/system/database_maintenance.py for
+the individual steps. Input (all optional):
+
+- cleanup_type: "full" (default), "orphaned", "logs", "optimize" or "vacuum"
+- activity_log_days / supplier_usage_days / task_days: retention overrides, 0 keeps all
+- convert_auto_vacuum: allow the one-time full VACUUM that enables incremental
+  auto_vacuum (default True)
 """
 
 import asyncio
-from typing import Dict, Any
+from typing import Any, Dict
 from .base_task import BaseTask
 from MakerMatrix.models.task_models import TaskModel
+from MakerMatrix.services.system.database_maintenance import (
+    ACTIVITY_LOG_RETENTION_DAYS,
+    FINISHED_TASK_RETENTION_DAYS,
+    SUPPLIER_USAGE_RETENTION_DAYS,
+    DatabaseMaintenance,
+)
+
+# Steps of each cleanup type, in the order they run
+CLEANUP_STEPS = {
+    "orphaned": ["orphaned_links"],
+    "logs": ["activity_logs", "supplier_usage", "finished_tasks"],
+    "optimize": ["analyze"],
+    "vacuum": ["vacuum", "wal_checkpoint"],
+}
+CLEANUP_STEPS["full"] = [step for steps in CLEANUP_STEPS.values() for step in steps]
+
+STEP_DESCRIPTIONS = {
+    "orphaned_links": "Removing orphaned link rows",
+    "activity_logs": "Removing old activity log entries",
+    "supplier_usage": "Removing old supplier usage records",
+    "finished_tasks": "Removing old finished tasks",
+    "analyze": "Updating query planner statistics",
+    "vacuum": "Reclaiming free database pages",
+    "wal_checkpoint": "Checkpointing the write-ahead log",
+}
 
 
 class DatabaseCleanupTask(BaseTask):
@@ -21,76 +54,58 @@ class DatabaseCleanupTask(BaseTask):
 
     @property
     def description(self) -> str:
-        return "Clean up orphaned records, optimize indexes, and maintain database health"
+        return "Clean up orphaned and expired records, optimize indexes, and reclaim database space"
 
     async def execute(self, task: TaskModel) -> Dict[str, Any]:
         """Execute database cleanup task"""
         input_data = self.get_input_data(task)
         cleanup_type = input_data.get("cleanup_type", "full")
+        if cleanup_type not in CLEANUP_STEPS:
+            raise ValueError(f"Unknown cleanup_type '{cleanup_type}', expected one of: {', '.join(CLEANUP_STEPS)}")
 
-        await self.update_progress(task, 5, "Starting database cleanup")
-
-        cleanup_results = {}
-
-        if cleanup_type in ["full", "orphaned"]:
-            await self.update_progress(task, 20, "Cleaning orphaned part references")
-            orphaned_count = await self._clean_orphaned_parts()
-            cleanup_results["orphaned_parts_removed"] = orphaned_count
-
-            await self.update_progress(task, 35, "Cleaning orphaned location references")
-            orphaned_locations = await self._clean_orphaned_locations()
-            cleanup_results["orphaned_locations_removed"] = orphaned_locations
-
-        if cleanup_type in ["full", "logs"]:
-            await self.update_progress(task, 50, "Cleaning old log entries")
-            old_logs = await self._clean_old_logs()
-            cleanup_results["old_logs_removed"] = old_logs
-
-        if cleanup_type in ["full", "sessions"]:
-            await self.update_progress(task, 65, "Cleaning expired sessions")
-            expired_sessions = await self._clean_expired_sessions()
-            cleanup_results["expired_sessions_removed"] = expired_sessions
+        maintenance = DatabaseMaintenance()
+        steps = self._build_steps(maintenance, input_data)
+        step_names = CLEANUP_STEPS[cleanup_type]
 
-        if cleanup_type in ["full", "optimize"]:
-            await self.update_progress(task, 80, "Optimizing database indexes")
-            await self._optimize_indexes()
-            cleanup_results["indexes_optimized"] = True
+        await self.update_progress(task, 5, "Starting database cleanup")
+        size_before = await asyncio.to_thread(maintenance.database_size)
 
-            await self.update_progress(task, 90, "Updating table statistics")
-            await self._update_statistics()
-            cleanup_results["statistics_updated"] = True
+        step_results = {}
+        for i, step_name in enumerate(step_names):
+            await self.update_progress(task, 5 + int(90 * i / len(step_names)), STEP_DESCRIPTIONS[step_name])
+            # Maintenance blocks on SQLite; keep it off the event loop
+            step_results[step_name] = await asyncio.to_thread(steps[step_name])
+            self.log_info(f"{STEP_DESCRIPTIONS[step_name]}: {step_results[step_name]}", task)
 
+        size_after = await asyncio.to_thread(maintenance.database_size)
         await self.update_progress(task, 100, "Database cleanup completed")
 
-        total_cleaned = sum(v for v in cleanup_results.values() if isinstance(v, int))
-        self.log_info(f"Database cleanup complete: {total_cleaned} records processed", task)
-
-        return cleanup_results
-
-    async def _clean_orphaned_parts(self) -> int:
-        """Clean orphaned part references"""
-        await self.sleep(1)  # Simulate database work
-        return 15  # Simulate cleaning 15 orphaned records
-
-    async def _clean_orphaned_locations(self) -> int:
-        """Clean orphaned location references"""
-        await self.sleep(0.8)
-        return 8
-
-    async def _clean_old_logs(self) -> int:
-        """Clean old log entries (older than 30 days)"""
-        await self.sleep(1.2)
-        return 250  # Simulate cleaning 250 old log entries
-
-    async def _clean_expired_sessions(self) -> int:
-        """Clean expired user sessions"""
-        await self.sleep(0.5)
-        return 42
-
-    async def _optimize_indexes(self):
-        """Optimize database indexes"""
-        await self.sleep(2)  # Simulate index optimization
-
-    async def _update_statistics(self):
-        """Update table statistics"""
-        await self.sleep(1)  # Simulate statistics update
+        rows_deleted = sum(result.get("rows_deleted", 0) for result in step_results.values())
+        self.log_info(
+            f"Database cleanup complete: {rows_deleted} rows deleted, {size_before - size_after} bytes reclaimed", task
+        )
+
+        return {
+            "cleanup_type": cleanup_type,
+            "rows_deleted": rows_deleted,
+            "database_size_before": size_before,
+            "database_size_after": size_after,
+            "bytes_reclaimed": size_before - size_after,
+            "steps": step_results,
+        }
+
+    @staticmethod
+    def _build_steps(maintenance: DatabaseMaintenance, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        activity_log_days = int(input_data.get("activity_log_days", ACTIVITY_LOG_RETENTION_DAYS))
+        supplier_usage_days = int(input_data.get("supplier_usage_days", SUPPLIER_USAGE_RETENTION_DAYS))
+        task_days = int(input_data.get("task_days", FINISHED_TASK_RETENTION_DAYS))
+        convert = bool(input_data.get("convert_auto_vacuum", True))
+        return {
+            "orphaned_links": maintenance.delete_orphaned_links,
+            "activity_logs": lambda: maintenance.delete_old_activity_logs(activity_log_days),
+            "supplier_usage": lambda: maintenance.delete_old_supplier_usage(supplier_usage_days),
+            "finished_tasks": lambda: maintenance.delete_finished_tasks(task_days),
+            "analyze": maintenance.analyze,
+            "vacuum": lambda: maintenance.vacuum(convert=convert),
+            "wal_checkpoint": maintenance.wal_checkpoint,
+        }
@@ -11,6 +11,7 @@ from MakerMatrix.models.task_models import TaskModel
 from MakerMatrix.tasks.base_task import BaseTask
 from MakerMatrix.services.system.file_download_service import file_download_service
 from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.repositories.datasheet_repository import DatasheetRepository
 from MakerMatrix.database.db import get_session
 
 logger = logging.getLogger(__name__)
@@ -82,7 +83,7 @@ class DatasheetDownloadTask(BaseTask):
             # Download the datasheet
             await self.update_progress(task, 30, "Downloading datasheet file...")
 
-            download_result = file_download_service.download_datasheet(
+            download_result = await file_download_service.download_datasheet_async(
                 url=datasheet_url, part_number=part_number, supplier=supplier
             )
 
@@ -100,7 +101,9 @@ class DatasheetDownloadTask(BaseTask):
             await self.update_progress(task, 70, "Processing downloaded datasheet...")
 
             # Update part with download information
-            await self._update_part_download_status(part_id, success=True, download_info=download_result)
+            await self._update_part_download_status(
+                part_id, success=True, download_info=download_result, supplier=supplier
+            )
 
             # Final progress update
             await self.update_progress(task, 100, f"Datasheet downloaded successfully: {download_result['filename']}")
@@ -132,7 +135,12 @@ class DatasheetDownloadTask(BaseTask):
             return {"success": False, "error": error_msg}
 
     async def _update_part_download_status(
-        self, part_id: str, success: bool, download_info: Dict[str, Any] = None, error: str = None
+        self,
+        part_id: str,
+        success: bool,
+        download_info: Dict[str, Any] = None,
+        error: str = None,
+        supplier: str = None,
     ):
         """
         Update part's additional_properties with download status.
@@ -142,6 +150,7 @@ class DatasheetDownloadTask(BaseTask):
             success: Whether download was successful
             download_info: Download result information (if successful)
             error: Error message (if failed)
+            supplier: Supplier the datasheet came from
         """
         session = next(get_session())
         try:
@@ -158,6 +167,14 @@ class DatasheetDownloadTask(BaseTask):
                     part.additional_properties["datasheet_downloaded"] = True
                     part.additional_properties["datasheet_size"] = download_info["size"]
 
+                    DatasheetRepository().record_download(
+                        session,
+                        part_id,
+                        download_info,
+                        supplier=supplier,
+                        title=f"{supplier} Datasheet - {part.part_number or part.part_name}",
+                    )
+
                     # Remove any previous error
                     if "datasheet_download_error" in part.additional_properties:
                         del part.additional_properties["datasheet_download_error"]
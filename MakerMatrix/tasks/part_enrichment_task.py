@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 
 from MakerMatrix.tasks.base_task import BaseTask
-from MakerMatrix.models.task_models import TaskModel, TaskStatus, UpdateTaskRequest
+from MakerMatrix.models.task_models import TaskModel, TaskStatus
 from MakerMatrix.repositories.parts_repositories import PartRepository
 from MakerMatrix.services.data.part_service import PartService
 from MakerMatrix.services.system.enrichment_coordinator_service import EnrichmentCoordinatorService
@@ -102,12 +102,10 @@ class PartEnrichmentTask(BaseTask):
 
     async def _update_task_progress(self, task: TaskModel, percentage: int, step: str):
         """Update task progress"""
-        if self.task_service:
-            try:
-                update_request = UpdateTaskRequest(progress_percentage=percentage, current_step=step)
-                await self.task_service.update_task(task.id, update_request)
-            except Exception as e:
-                logger.warning(f"Failed to update task progress: {e}")
+        try:
+            await self.update_progress(task, percentage, step)
+        except Exception as e:
+            logger.warning(f"Failed to update task progress: {e}")
 
 
 class DatasheetFetchTask(BaseTask):
@@ -154,12 +152,10 @@ class DatasheetFetchTask(BaseTask):
 
     async def _update_task_progress(self, task: TaskModel, percentage: int, step: str):
         """Update task progress"""
-        if self.task_service:
-            try:
-                update_request = UpdateTaskRequest(progress_percentage=percentage, current_step=step)
-                await self.task_service.update_task(task.id, update_request)
-            except Exception as e:
-                logger.warning(f"Failed to update task progress: {e}")
+        try:
+            await self.update_progress(task, percentage, step)
+        except Exception as e:
+            logger.warning(f"Failed to update task progress: {e}")
 
 
 class ImageFetchTask(BaseTask):
@@ -206,12 +202,10 @@ class ImageFetchTask(BaseTask):
 
     async def _update_task_progress(self, task: TaskModel, percentage: int, step: str):
         """Update task progress"""
-        if self.task_service:
-            try:
-                update_request = UpdateTaskRequest(progress_percentage=percentage, current_step=step)
-                await self.task_service.update_task(task.id, update_request)
-            except Exception as e:
-                logger.warning(f"Failed to update task progress: {e}")
+        try:
+            await self.update_progress(task, percentage, step)
+        except Exception as e:
+            logger.warning(f"Failed to update task progress: {e}")
 
 
 class BulkEnrichmentTask(BaseTask):
@@ -280,9 +274,7 @@ class BulkEnrichmentTask(BaseTask):
 
     async def _update_task_progress(self, task: TaskModel, percentage: int, step: str):
         """Update task progress"""
-        if self.task_service:
-            try:
-                update_request = UpdateTaskRequest(progress_percentage=percentage, current_step=step)
-                await self.task_service.update_task(task.id, update_request)
-            except Exception as e:
-                logger.warning(f"Failed to update task progress: {e}")
+        try:
+            await self.update_progress(task, percentage, step)
+        except Exception as e:
+            logger.warning(f"Failed to update task progress: {e}")
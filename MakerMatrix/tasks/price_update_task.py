@@ -3,11 +3,13 @@ Price Update Task - Updates part prices from supplier APIs using the modular sup
 """
 
 import asyncio
+from datetime import datetime
 from typing import Dict, Any, List
 from .base_task import BaseTask
 from MakerMatrix.models.task_models import TaskModel
 from MakerMatrix.database.db import get_session
 from MakerMatrix.models.models import PartModel
+from MakerMatrix.models.part_metadata_models import PartPricingHistory
 from MakerMatrix.suppliers import SupplierRegistry
 from MakerMatrix.suppliers.base import SupplierCapability
 from MakerMatrix.services.system.supplier_config_service import SupplierConfigService
@@ -20,6 +22,9 @@ logger = logging.getLogger(__name__)
 class PriceUpdateTask(BaseTask):
     """Task for updating part prices from supplier APIs using the modular supplier system"""
 
+    # Parts handed to the supplier's batch lookup per progress update / commit
+    LOOKUP_CHUNK_SIZE = 100
+
     @property
     def task_type(self) -> str:
         return "price_update"
@@ -67,7 +72,7 @@ class PriceUpdateTask(BaseTask):
             # Group parts by supplier for efficient processing
             parts_by_supplier = {}
             for part in parts:
-                supplier = part.supplier or part.part_vendor
+                supplier = part.supplier
                 if supplier:
                     if supplier not in parts_by_supplier:
                         parts_by_supplier[supplier] = []
@@ -102,8 +107,11 @@ class PriceUpdateTask(BaseTask):
                     supplier = SupplierRegistry.get_supplier(supplier_name)
 
                     # Check if supplier is configured
-                    config = await config_service.get_supplier_config(supplier_name)
-                    if not config or not config.is_configured:
+                    try:
+                        config = config_service.get_supplier_config(supplier_name.upper())
+                    except Exception:
+                        config = None
+                    if not config or not config.get("enabled", False):
                         self.log_warning(f"Supplier {supplier_name} is not configured", task)
                         for part in supplier_parts:
                             failed_updates.append(
@@ -118,10 +126,11 @@ class PriceUpdateTask(BaseTask):
                         continue
 
                     # Configure the supplier with credentials
-                    supplier.configure(config.credentials, config.config)
+                    credentials = config_service.get_supplier_credentials(supplier_name.upper())
+                    supplier.configure(credentials or {}, config.get("custom_parameters", {}))
 
                     # Check if supplier supports pricing capability
-                    if SupplierCapability.FETCH_PRICING not in supplier.get_capabilities():
+                    if SupplierCapability.FETCH_PRICING_STOCK not in supplier.get_capabilities():
                         self.log_warning(f"Supplier {supplier_name} does not support pricing fetch", task)
                         for part in supplier_parts:
                             failed_updates.append(
@@ -149,98 +158,137 @@ class PriceUpdateTask(BaseTask):
                         total_processed += 1
                     continue
 
-                # Update prices for parts from this supplier
-                for i, part in enumerate(supplier_parts):
+                # Fetch prices in chunks through the supplier's batch lookup. Suppliers with native
+                # batch support pack many part numbers per request; the rest fan out with bounded
+                # concurrency, so no per-part rate limit sleep is needed here.
+                for chunk_start in range(0, len(supplier_parts), self.LOOKUP_CHUNK_SIZE):
+                    chunk = supplier_parts[chunk_start : chunk_start + self.LOOKUP_CHUNK_SIZE]
+                    progress = int(20 + (total_processed / len(parts)) * 70)
+                    await self.update_progress(
+                        task,
+                        progress,
+                        f"Fetching prices for {len(chunk)} {supplier_name} parts - {total_processed + len(chunk)}/{len(parts)}",
+                    )
+
+                    part_numbers = {part.id: part.supplier_part_number or part.part_number for part in chunk}
                     try:
-                        progress = int(20 + (total_processed / len(parts)) * 70)
-                        await self.update_progress(
-                            task,
-                            progress,
-                            f"Updating price for {part.part_name} ({supplier_name}) - {total_processed + 1}/{len(parts)}",
+                        pricing_by_number = await supplier.bulk_fetch_pricing_stock(
+                            [pn for pn in part_numbers.values() if pn]
                         )
-
-                        # Use supplier to fetch pricing
-                        pricing_data = await supplier.fetch_pricing(part.part_number)
-
-                        if pricing_data:
-                            # Extract pricing information
-                            old_price = part.price
-
-                            # Pricing data is a list of price breaks
-                            # Find the price for quantity 1 or the lowest quantity
-                            unit_price = None
-                            if isinstance(pricing_data, list) and len(pricing_data) > 0:
-                                # Sort by quantity to find the lowest quantity price
-                                sorted_prices = sorted(pricing_data, key=lambda x: x.get("quantity", 1))
-                                unit_price = sorted_prices[0].get("price")
-
-                            if unit_price is not None:
-                                new_price = float(unit_price)
-
-                                # Update part price in database
-                                part.price = new_price
-
-                                # Store pricing data in additional_properties
-                                if not part.additional_properties:
-                                    part.additional_properties = {}
-                                part.additional_properties["pricing_data"] = pricing_data
-                                part.additional_properties["last_price_update"] = task.created_at.isoformat()
-
-                                session.add(part)
-                                session.commit()
-
-                                updated_parts.append(
-                                    {
-                                        "part_id": part.id,
-                                        "part_name": part.part_name,
-                                        "supplier": supplier_name,
-                                        "old_price": old_price,
-                                        "new_price": new_price,
-                                        "currency": sorted_prices[0].get("currency", "USD"),
-                                        "pricing_data": pricing_data,
-                                    }
-                                )
-
-                                self.log_info(f"Updated price for {part.part_name}: {old_price} -> {new_price}", task)
-                            else:
-                                failed_updates.append(
-                                    {
-                                        "part_id": part.id,
-                                        "part_name": part.part_name,
-                                        "supplier": supplier_name,
-                                        "error": "No unit price found in pricing data",
-                                    }
-                                )
-                        else:
+                    except Exception as e:
+                        self.log_error(f"Batch price lookup failed for {supplier_name}: {str(e)}", task, exc_info=True)
+                        for part in chunk:
                             failed_updates.append(
                                 {
                                     "part_id": part.id,
                                     "part_name": part.part_name,
                                     "supplier": supplier_name,
-                                    "error": "No pricing data returned from supplier",
+                                    "error": str(e),
                                 }
                             )
+                        total_processed += len(chunk)
+                        continue
+
+                    # Current price history rows for the whole chunk in one query
+                    current_prices = {
+                        row.part_id: row
+                        for row in session.exec(
+                            select(PartPricingHistory).where(
+                                PartPricingHistory.part_id.in_([part.id for part in chunk]),
+                                PartPricingHistory.supplier == supplier_name,
+                                PartPricingHistory.is_current == True,
+                            )
+                        ).all()
+                    }
 
+                    chunk_updated = False
+                    now = datetime.utcnow()
+                    for part in chunk:
                         total_processed += 1
+                        part_number = part_numbers[part.id]
+                        pricing_stock = pricing_by_number.get(part_number) if part_number else None
+                        pricing_data = (pricing_stock or {}).get("pricing")
+
+                        if not pricing_data:
+                            failed_updates.append(
+                                {
+                                    "part_id": part.id,
+                                    "part_name": part.part_name,
+                                    "supplier": supplier_name,
+                                    "error": "No pricing data returned from supplier",
+                                }
+                            )
+                            continue
 
-                        # Rate limiting to avoid overwhelming APIs
-                        # Use supplier-specific rate limit delay
-                        delay = supplier.get_rate_limit_delay()
-                        await self.sleep(delay)
+                        # Pricing data is a list of price breaks
+                        # Find the price for quantity 1 or the lowest quantity
+                        sorted_prices = sorted(pricing_data, key=lambda x: x.get("quantity", 1))
+                        unit_price = sorted_prices[0].get("price")
 
-                    except Exception as e:
-                        self.log_error(
-                            f"Failed to update price for part {part.part_name}: {str(e)}", task, exc_info=True
+                        if unit_price is None:
+                            failed_updates.append(
+                                {
+                                    "part_id": part.id,
+                                    "part_name": part.part_name,
+                                    "supplier": supplier_name,
+                                    "error": "No unit price found in pricing data",
+                                }
+                            )
+                            continue
+
+                        new_price = float(unit_price)
+                        currency = sorted_prices[0].get("currency", "USD")
+                        previous = current_prices.get(part.id)
+                        old_price = float(previous.unit_price) if previous and previous.unit_price is not None else None
+
+                        # Supersede the previous current price and record the new one
+                        if previous:
+                            previous.is_current = False
+                            previous.valid_until = now
+                            session.add(previous)
+                        session.add(
+                            PartPricingHistory(
+                                part_id=part.id,
+                                supplier=supplier_name,
+                                unit_price=new_price,
+                                currency=currency,
+                                stock_quantity=pricing_stock.get("stock_quantity"),
+                                pricing_tiers={"tiers": pricing_data},
+                                source="api",
+                                source_reference=task.id,
+                                valid_from=now,
+                                is_current=True,
+                            )
                         )
-                        failed_updates.append(
+
+                        # Keep the raw price breaks in additional_properties for the UI
+                        additional_properties = dict(part.additional_properties or {})
+                        additional_properties["pricing_data"] = pricing_data
+                        additional_properties["last_price_update"] = task.created_at.isoformat()
+                        part.additional_properties = additional_properties
+                        session.add(part)
+                        chunk_updated = True
+
+                        updated_parts.append(
                             {
                                 "part_id": part.id,
                                 "part_name": part.part_name,
                                 "supplier": supplier_name,
-                                "error": str(e),
+                                "old_price": old_price,
+                                "new_price": new_price,
+                                "currency": currency,
+                                "pricing_data": pricing_data,
                             }
                         )
-                        total_processed += 1
+
+                    # One commit per chunk instead of one per part
+                    if chunk_updated:
+                        session.commit()
+
+                    self.log_info(
+                        f"Updated prices for {supplier_name}: {len(updated_parts)} updated, {len(failed_updates)} failed so far",
+                        task,
+                    )
 
                 # Clean up supplier resources
                 try:
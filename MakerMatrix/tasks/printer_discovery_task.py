@@ -10,7 +10,7 @@ import threading
 from typing import Dict, List, Any
 import ipaddress
 
-from MakerMatrix.models.task_models import TaskStatus, UpdateTaskRequest
+from MakerMatrix.models.task_models import TaskStatus
 from MakerMatrix.tasks.base_task import BaseTask
 
 
@@ -465,12 +465,10 @@ class PrinterDiscoveryTask(BaseTask):
 
     async def _update_task_progress(self, task: "TaskModel", percentage: int, step: str):
         """Update task progress"""
-        if self.task_service:
-            try:
-                update_request = UpdateTaskRequest(progress_percentage=percentage, current_step=step)
-                await self.task_service.update_task(task.id, update_request)
-            except Exception as e:
-                self.logger.warning(f"Failed to update task progress: {e}")
+        try:
+            await self.update_progress(task, percentage, step)
+        except Exception as e:
+            self.logger.warning(f"Failed to update task progress: {e}")
 
 
 # The task will be automatically discovered and registered by the task system
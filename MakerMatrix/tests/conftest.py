@@ -16,9 +16,18 @@ from MakerMatrix.main import app
 from MakerMatrix.tests.test_database_config import (
     TestDatabaseConfig,
     create_isolated_test_engine,
+    create_shared_memory_engine,
     setup_test_database_with_admin,
 )
 
+# SQL statement counts per test and the query_budget marker
+from MakerMatrix.tests.query_budget import (
+    pytest_addoption,
+    pytest_configure,
+    pytest_runtest_call,
+    pytest_terminal_summary,
+)
+
 
 @pytest.fixture(scope="session")
 def test_app():
@@ -66,6 +75,19 @@ def memory_test_engine():
     test_engine.dispose()
 
 
+@pytest.fixture(scope="function")
+def engine():
+    """
+    An empty in-memory database shared by all connections and threads, without the
+    default admin user; for repository and service tests that create their own rows.
+    """
+    test_engine = create_shared_memory_engine()
+
+    yield test_engine
+
+    test_engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def test_session(isolated_test_engine):
     """
@@ -1820,13 +1820,13 @@ class TestUtilityRoutes:
         assert "database_size" in data["data"]
 
     def test_backup_export(self, setup_test_data, admin_token):
-        """Test exporting data as JSON."""
+        """Test streaming the data export as NDJSON."""
         headers = get_auth_headers(admin_token)
         response = client.get("/api/utility/backup/export", headers=headers)
         # Export may fail in test environment, allow various responses
         assert response.status_code in [200, 500]
         if response.status_code == 200:
-            assert response.headers["content-type"] == "application/json"
+            assert response.headers["content-type"].startswith("application/x-ndjson")
         else:
             # If it fails, ensure it's a proper error response
             data = response.json()
@@ -0,0 +1,149 @@
+"""
+Query Budgets - SQL statement limits that catch N+1 regressions in tests.
+
+A QueryCounter records every statement any engine executes while it is active, through one
+before_cursor_execute listener on Engine. Unlike track_queries() it does not depend on the
+context, so statements that a route handler runs in the test client's thread count too.
+
+Limit one service call or request:
+
+    with assert_max_queries(6):
+        service.get_all_locations()
+
+or a whole test (fixture setup is not counted):
+
+    @pytest.mark.query_budget(20)
+    def test_dashboard_summary(...):
+
+A call that exceeds its budget fails with the statements it ran, the most repeated first,
+which is usually the N+1. The budgets should not depend on the amount of data, so the tests
+that declare them create enough rows for a statement per row to break the budget.
+
+The pytest hooks below are loaded by tests/conftest.py. They count the statements of every
+test, fail tests over their query_budget marker, and with --query-report=N list the N tests
+that ran the most statements.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Repeated statements listed in a budget failure
+MAX_REPORTED_STATEMENTS = 5
+MAX_STATEMENT_LENGTH = 300
+
+_USER_PROPERTY = "sql_statements"
+
+_active: List["QueryCounter"] = []
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More statements were executed than the budget allows"""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    for counter in _active:
+        counter.statements.append(statement)
+
+
+def _install_listener() -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+
+
+class QueryCounter:
+    """The statements executed on any engine between __enter__ and __exit__"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        _install_listener()
+        _active.append(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active.remove(self)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def most_repeated(self, limit: int = MAX_REPORTED_STATEMENTS) -> List[Tuple[str, int]]:
+        """Statements by how often they ran, whitespace collapsed"""
+        normalized = Counter(re.sub(r"\s+", " ", statement).strip() for statement in self.statements)
+        return normalized.most_common(limit)
+
+    def describe(self) -> str:
+        lines = [f"{self.count} statements, most repeated:"]
+        for statement, executions in self.most_repeated():
+            lines.append(f"  {executions} x {statement[:MAX_STATEMENT_LENGTH]}")
+        return "\n".join(lines)
+
+
+def check_budget(counter: QueryCounter, max_statements: int, label: str) -> None:
+    if counter.count > max_statements:
+        raise QueryBudgetExceeded(f"{label} exceeded its budget of {max_statements} statements: {counter.describe()}")
+
+
+@contextmanager
+def assert_max_queries(max_statements: int, label: str = "Block") -> Iterator[QueryCounter]:
+    """Fail if the block executes more than max_statements SQL statements"""
+    with QueryCounter() as counter:
+        yield counter
+    check_budget(counter, max_statements, label)
+
+
+# === pytest hooks ===
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--query-report",
+        type=int,
+        default=0,
+        metavar="N",
+        help="List the N tests that executed the most SQL statements",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "query_budget(max_statements): fail the test if it executes more SQL statements")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with QueryCounter() as counter:
+        outcome = yield
+    item.user_properties.append((_USER_PROPERTY, counter.count))
+
+    marker = item.get_closest_marker("query_budget")
+    if marker is not None and outcome.excinfo is None:
+        try:
+            check_budget(counter, marker.args[0], item.name)
+        except QueryBudgetExceeded as e:
+            outcome.force_exception(e)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    limit = config.getoption("--query-report")
+    if not limit:
+        return
+    counts = []
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) != "call":
+                continue
+            for name, value in report.user_properties:
+                if name == _USER_PROPERTY:
+                    counts.append((value, report.nodeid))
+    if not counts:
+        return
+    terminalreporter.section("SQL statements per test")
+    for value, nodeid in sorted(counts, reverse=True)[:limit]:
+        terminalreporter.write_line(f"{value:6d}  {nodeid}")
@@ -8,6 +8,7 @@ contamination of the main application database.
 import os
 import tempfile
 from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, Session
 from typing import Generator
 
@@ -83,6 +84,18 @@ def create_isolated_test_engine(use_memory: bool = False) -> "Engine":
     return test_engine
 
 
+def create_shared_memory_engine() -> "Engine":
+    """
+    Create an in-memory test database with every table.
+
+    All connections share the one database (StaticPool), so code that opens its own
+    connections or runs in worker threads sees the same data as the test.
+    """
+    test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(test_engine)
+    return test_engine
+
+
 def setup_test_database_with_admin(test_engine: "Engine"):
     """
     Set up test database with default admin user and roles.
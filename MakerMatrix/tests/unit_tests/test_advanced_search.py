@@ -3,6 +3,7 @@ from sqlmodel import Session, SQLModel, create_engine
 from sqlalchemy.pool import StaticPool
 
 from MakerMatrix.models.models import PartModel, CategoryModel, LocationModel, AdvancedPartSearch
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
 from MakerMatrix.repositories.parts_repositories import PartRepository
 from MakerMatrix.services.data.part_service import PartService
 
@@ -71,6 +72,11 @@ def test_data_fixture(session: Session):
         session.add(part)
     session.commit()
 
+    # Stock lives in allocations; the quantity filters and sorts read the totals they maintain
+    for part, location, quantity in zip(parts, locations, (10, 5, 3)):
+        session.add(PartLocationAllocation(part_id=part.id, location_id=location.id, quantity_at_location=quantity))
+    session.commit()
+
     return {"categories": categories, "locations": locations, "parts": parts}
 
 
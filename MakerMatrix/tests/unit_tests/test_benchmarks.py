@@ -0,0 +1,136 @@
+"""
+Tests for the benchmark dataset generator and suite
+
+The same seed produces the same dataset with consistent derived data, the benchmarks run
+against a generated dataset and leave it unchanged, and result comparison only reports
+slowdowns beyond the threshold.
+"""
+
+import pytest
+from sqlalchemy import func, select
+
+from MakerMatrix.benchmarks.dataset import generate_dataset, parse_size
+from MakerMatrix.benchmarks.results import compare_results
+from MakerMatrix.benchmarks.suite import BenchmarkContext, run_suite
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.tag_models import PartTagLink, TagModel
+from MakerMatrix.models.task_models import TaskModel
+from MakerMatrix.tests.test_database_config import create_shared_memory_engine
+
+
+@pytest.fixture(name="engine", scope="module")
+def engine_fixture():
+    engine = create_shared_memory_engine()
+    generate_dataset(engine, 300, seed=7)
+    yield engine
+
+
+def _snapshot(engine):
+    parts = PartModel.__table__
+    locations = LocationModel.__table__
+    with engine.connect() as conn:
+        return (
+            conn.execute(
+                select(parts.c.id, parts.c.part_name, parts.c.cached_total_quantity).order_by(parts.c.id)
+            ).all(),
+            conn.execute(select(locations.c.id, locations.c.parent_id).order_by(locations.c.id)).all(),
+        )
+
+
+def test_parse_size():
+    assert parse_size("10k") == 10_000
+    assert parse_size("60k") == 60_000
+    assert parse_size("2500") == 2500
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_same_seed_same_dataset(engine):
+    other = create_shared_memory_engine()
+    generate_dataset(other, 300, seed=7)
+    assert _snapshot(other) == _snapshot(engine)
+
+    different = create_shared_memory_engine()
+    generate_dataset(different, 300, seed=8)
+    assert _snapshot(different)[0] != _snapshot(engine)[0]
+
+
+def test_derived_data_is_consistent(engine):
+    parts = PartModel.__table__
+    allocations = PartLocationAllocation.__table__
+    locations = LocationModel.__table__
+    tags = TagModel.__table__
+    links = PartTagLink.__table__
+
+    with engine.connect() as conn:
+        totals = dict(
+            conn.execute(
+                select(allocations.c.part_id, func.sum(allocations.c.quantity_at_location)).group_by(
+                    allocations.c.part_id
+                )
+            ).all()
+        )
+        for part_id, cached in conn.execute(select(parts.c.id, parts.c.cached_total_quantity)):
+            assert cached == totals.get(part_id, 0)
+
+        tag_counts = dict(conn.execute(select(links.c.tag_id, func.count()).group_by(links.c.tag_id)).all())
+        for tag_id, parts_count in conn.execute(select(tags.c.id, tags.c.parts_count)):
+            assert parts_count == tag_counts.get(tag_id, 0)
+
+        by_id = {row.id: row for row in conn.execute(select(locations))}
+    for location in by_id.values():
+        path = location.path_ids.split("/")
+        assert path[-1] == location.id
+        assert len(path) == 1 or path[-2] == location.parent_id
+        if location.location_type == "slot":
+            assert location.is_auto_generated_slot
+            assert by_id[location.parent_id].location_type == "container"
+
+
+@pytest.mark.asyncio
+async def test_suite_runs_and_leaves_the_dataset_unchanged(engine):
+    before = _snapshot(engine)
+    context = BenchmarkContext(engine, seed=7, tasks=3)
+
+    results = await run_suite(context, repeat=1, warmup=0, only=["parts.", "dashboard.", "locations.", "tasks."])
+
+    assert not [name for name, result in results.items() if "error" in result]
+    assert {"parts.search.text", "dashboard.summary", "locations.move_subtree", "tasks.throughput"} <= set(results)
+    assert results["tasks.throughput"]["items"] == 3
+    assert _snapshot(engine) == before
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(TaskModel.__table__)).scalar() == 0
+
+
+def _results(medians, **thresholds):
+    benchmarks = {name: {"median_ms": median} for name, median in medians.items()}
+    for name, threshold in thresholds.items():
+        benchmarks[name]["threshold"] = threshold
+    return {"dataset": {"parts": 1000, "seed": 42}, "benchmarks": benchmarks}
+
+
+def test_compare_reports_changes_beyond_the_threshold():
+    baseline = _results({"slower": 100.0, "faster": 100.0, "jitter": 1.0, "noisy": 100.0, "gone": 5.0})
+    current = _results({"slower": 130.0, "faster": 60.0, "jitter": 2.5, "noisy": 130.0, "added": 5.0}, noisy=0.4)
+
+    statuses = {row["name"]: row["status"] for row in compare_results(current, baseline, threshold=0.25)}
+
+    assert statuses == {
+        "slower": "regression",
+        "faster": "improvement",
+        "jitter": "ok",  # Below the minimum delta
+        "noisy": "ok",  # Within its own threshold
+        "added": "new",
+        "gone": "missing",
+    }
+
+
+def test_compare_refuses_other_datasets():
+    baseline = _results({"a": 1.0})
+    current = _results({"a": 1.0})
+    current["dataset"]["parts"] = 10_000
+
+    with pytest.raises(ValueError):
+        compare_results(current, baseline)
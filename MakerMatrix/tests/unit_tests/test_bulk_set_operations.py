@@ -0,0 +1,147 @@
+"""
+Tests for the set-based bulk operations
+
+Covers TagService.bulk_tag_operation and PartService.bulk_update_parts, which replace
+per-item sessions with IN queries, bulk link inserts/deletes and single UPDATE statements.
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from MakerMatrix.models.part_models import PartModel, PartCategoryLink
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.tag_models import TagModel, PartTagLink
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.schemas.tag_schemas import TagBulkOperation
+from MakerMatrix.services.data.tag_service import TagService
+from MakerMatrix.services.data.part_service import PartService
+from MakerMatrix.services.data.dashboard_service import DashboardService
+
+
+@pytest.fixture(name="parts")
+def parts_fixture(engine):
+    with Session(engine) as session:
+        parts = [PartModel(part_name=f"Part {i}", supplier="LCSC") for i in range(5)]
+        session.add_all(parts)
+        session.commit()
+        return [part.id for part in parts]
+
+
+@pytest.fixture(name="tags")
+def tags_fixture(engine):
+    with Session(engine) as session:
+        tags = [TagModel(name=name, name_lower=name) for name in ("todo", "review")]
+        session.add_all(tags)
+        session.commit()
+        return [tag.id for tag in tags]
+
+
+class TestBulkTagOperation:
+    def test_add_inserts_links_and_updates_statistics(self, engine, parts, tags):
+        service = TagService(engine_override=engine)
+        service.assign_tag_to_part(tags[0], parts[0])
+
+        response = service.bulk_tag_operation(
+            TagBulkOperation(item_ids=parts + ["missing"], tag_ids=tags, operation="add", item_type="part"),
+            user_id="user-1",
+        )
+
+        assert response.success
+        assert len(response.data["successful"]) == 9
+        assert len(response.data["skipped"]) == 1
+        assert {entry["item_id"] for entry in response.data["failed"]} == {"missing"}
+
+        with Session(engine) as session:
+            assert len(session.exec(select(PartTagLink)).all()) == 10
+            for tag in session.exec(select(TagModel)).all():
+                assert tag.parts_count == 5
+                assert tag.usage_count == 5
+                assert tag.last_used_at is not None
+
+    def test_remove_deletes_links(self, engine, parts, tags):
+        service = TagService(engine_override=engine)
+        service.bulk_tag_operation(TagBulkOperation(item_ids=parts, tag_ids=tags, operation="add", item_type="part"))
+
+        response = service.bulk_tag_operation(
+            TagBulkOperation(item_ids=parts[:3], tag_ids=[tags[0]], operation="remove", item_type="part")
+        )
+
+        assert response.success
+        assert len(response.data["successful"]) == 3
+        with Session(engine) as session:
+            assert session.get(TagModel, tags[0]).parts_count == 2
+            assert session.get(TagModel, tags[1]).parts_count == 5
+
+    def test_unknown_tag_is_rejected(self, engine, parts, tags):
+        service = TagService(engine_override=engine)
+        response = service.bulk_tag_operation(
+            TagBulkOperation(item_ids=parts, tag_ids=[tags[0], "nope"], operation="add", item_type="part")
+        )
+        assert not response.success
+
+
+class TestBulkUpdateParts:
+    def test_supplier_and_categories(self, engine, parts):
+        with Session(engine) as session:
+            old = CategoryModel(name="Old")
+            session.add(old)
+            session.commit()
+            session.add(PartCategoryLink(part_id=parts[0], category_id=old.id))
+            session.commit()
+
+        response = PartService(engine_override=engine).bulk_update_parts(
+            {
+                "part_ids": parts + ["missing"],
+                "supplier": "Mouser",
+                "add_categories": ["Resistors"],
+                "remove_categories": ["Old"],
+            }
+        )
+
+        assert response.success
+        assert response.data["updated_count"] == 5
+        assert response.data["errors"] == [{"part_id": "missing", "error": "Part not found"}]
+
+        with Session(engine) as session:
+            assert {p.supplier for p in session.exec(select(PartModel)).all()} == {"Mouser"}
+            for part in session.exec(select(PartModel)).all():
+                assert [c.name for c in part.categories] == ["Resistors"]
+
+    def test_location_moves_primary_allocation(self, engine, parts):
+        with Session(engine) as session:
+            shelf = LocationModel(name="Shelf", location_type="shelf")
+            bin_ = LocationModel(name="Bin", location_type="bin")
+            session.add_all([shelf, bin_])
+            session.commit()
+            session.add_all(
+                [
+                    PartLocationAllocation(part_id=parts[0], location_id=shelf.id, quantity_at_location=5),
+                    PartLocationAllocation(
+                        part_id=parts[1], location_id=shelf.id, quantity_at_location=5, is_primary_storage=True
+                    ),
+                    PartLocationAllocation(part_id=parts[1], location_id=bin_.id, quantity_at_location=1),
+                ]
+            )
+            session.commit()
+            bin_id = bin_.id
+
+        response = PartService(engine_override=engine).bulk_update_parts({"part_ids": parts[:2], "location_id": bin_id})
+
+        assert response.data["updated_count"] == 1
+        assert response.data["errors"][0]["part_id"] == parts[1]
+        with Session(engine) as session:
+            moved = session.exec(select(PartLocationAllocation).where(PartLocationAllocation.part_id == parts[0])).one()
+            assert moved.location_id == bin_id
+
+    def test_dashboard_aggregates_follow_bulk_update(self, engine, parts):
+        dashboard = DashboardService(engine_override=engine)
+        dashboard.rebuild_aggregates()
+
+        PartService(engine_override=engine).bulk_update_parts(
+            {"part_ids": parts[:2], "supplier": "DigiKey", "add_categories": ["Caps"]}
+        )
+
+        incremental = dashboard.get_dashboard_summary(use_cache=False)
+        dashboard.rebuild_aggregates()
+        assert incremental == dashboard.get_dashboard_summary(use_cache=False)
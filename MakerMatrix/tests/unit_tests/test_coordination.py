@@ -0,0 +1,162 @@
+"""
+Tests for multi-process coordination
+
+Two "worker processes" are simulated in one interpreter by giving each its own origin
+or lease holder on a shared coordination store file: leader election, cross-process
+event fan-out to WebSocket clients, and rate limits shared between workers.
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from limits import parse
+from limits.strategies import MovingWindowRateLimiter
+
+from MakerMatrix.middleware.guest_rate_limit import SharedRateLimitStorage
+from MakerMatrix.services.system.coordination import CoordinationStore
+from MakerMatrix.services.system.event_bus import LocalEventBus, SQLiteEventBus
+from MakerMatrix.services.system.leader_election import LeaderElector
+from MakerMatrix.services.system.websocket_service import WebSocketManager
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CoordinationStore(tmp_path / "coordination.db")
+    yield store
+    store.close()
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.messages.append(json.loads(data))
+
+
+def test_lease_is_held_by_one_process_until_it_expires(store):
+    assert store.acquire_lease("services", "worker-a", ttl_seconds=30)
+    assert not store.acquire_lease("services", "worker-b", ttl_seconds=30)
+    assert store.acquire_lease("services", "worker-a", ttl_seconds=-1)  # Renewed, but already expired
+
+    assert store.acquire_lease("services", "worker-b", ttl_seconds=30)
+    assert store.get_lease("services")["holder"] == "worker-b"
+    assert not store.release_lease("services", "worker-a")
+    assert store.release_lease("services", "worker-b")
+    assert store.get_lease("services") is None
+
+
+@pytest.mark.asyncio
+async def test_only_one_elector_runs_services_and_the_other_takes_over(store):
+    started = []
+
+    def make_elector(holder):
+        async def on_elected():
+            started.append(holder)
+
+        async def on_demoted():
+            started.remove(holder)
+
+        return LeaderElector("services", store, on_elected, on_demoted, lease_seconds=30, holder=holder)
+
+    a, b = make_elector("worker-a"), make_elector("worker-b")
+    assert await a.check()
+    assert not await b.check()
+    assert started == ["worker-a"]
+
+    await a.stop()
+    assert started == []
+    assert await b.check()
+    assert started == ["worker-b"]
+    assert b.get_status()["lease"]["holder"] == "worker-b"
+
+
+@pytest.mark.asyncio
+async def test_elector_without_store_is_always_leader():
+    on_elected = AsyncMock()
+    elector = LeaderElector("services", None, on_elected, AsyncMock())
+
+    await elector.start()
+
+    assert elector.is_leader
+    on_elected.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_bus_delivers_to_other_processes_only(store):
+    bus_a = SQLiteEventBus(store, origin="worker-a")
+    bus_b = SQLiteEventBus(store, origin="worker-b")
+    received_a, received_b = [], []
+    bus_a.subscribe("cache_invalidation", received_a.append)
+    bus_b.subscribe("cache_invalidation", received_b.append)
+
+    await bus_a.publish("cache_invalidation", {"cache": "dashboard_summary", "key": None})
+    assert await bus_a.poll() == 0
+    assert await bus_b.poll() == 1
+    assert await bus_b.poll() == 0
+
+    assert received_a == [{"cache": "dashboard_summary", "key": None}]
+    assert received_b == [{"cache": "dashboard_summary", "key": None}]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_clients_connected_to_another_worker(store):
+    bus_a = SQLiteEventBus(store, origin="worker-a")
+    bus_b = SQLiteEventBus(store, origin="worker-b")
+    manager_a, manager_b = WebSocketManager(), WebSocketManager()
+    bus_b.subscribe("websocket", manager_b._on_bus_event)
+
+    client_a, client_b = RecordingWebSocket(), RecordingWebSocket()
+    await manager_a.connect(client_a, "tasks")
+    await manager_b.connect(client_b, "tasks")
+
+    with patch("MakerMatrix.services.system.websocket_service.get_event_bus", return_value=bus_a):
+        await manager_a.broadcast_task_update({"id": "task-1", "progress_percentage": 40})
+    await bus_b.poll()
+
+    for client in (client_a, client_b):
+        assert [m["type"] for m in client.messages] == ["connection", "task_update"]
+        assert client.messages[-1]["data"]["progress_percentage"] == 40
+
+
+@pytest.mark.asyncio
+async def test_local_bus_does_not_deliver_broadcasts_twice():
+    bus = LocalEventBus()
+    manager = WebSocketManager()
+    bus.subscribe("websocket", manager._on_bus_event)
+    client = RecordingWebSocket()
+    await manager.connect(client, "general")
+
+    with patch("MakerMatrix.services.system.websocket_service.get_event_bus", return_value=bus):
+        await manager.broadcast_to_type("general", {"type": "test"})
+
+    assert [m["type"] for m in client.messages] == ["connection", "test"]
+
+
+def test_rate_limit_is_shared_between_workers(store, tmp_path):
+    other_worker_store = CoordinationStore(tmp_path / "coordination.db")
+    limiter_a = MovingWindowRateLimiter(SharedRateLimitStorage(store))
+    limiter_b = MovingWindowRateLimiter(SharedRateLimitStorage(other_worker_store))
+    limit = parse("3/minute")
+
+    results = [limiter.hit(limit, "guest:10.0.0.1") for limiter in (limiter_a, limiter_b, limiter_a, limiter_b)]
+
+    assert results == [True, True, True, False]
+    assert limiter_b.get_window_stats(limit, "guest:10.0.0.1").remaining == 0
+    assert limiter_a.hit(limit, "guest:10.0.0.2")
+    other_worker_store.close()
+
+
+def test_prune_removes_expired_entries(store):
+    store.append_event("websocket", {"n": 1})
+    store.set_value("digikey:access_token", {"access_token": "x"}, ttl_seconds=-1)
+    store.acquire_rate_limit_entry("guest:10.0.0.1", limit=5, window_seconds=-1)
+
+    pruned = store.prune(event_retention_seconds=-1)
+
+    assert pruned == {"events": 1, "shared_values": 1, "rate_limit_hits": 1}
+    assert store.get_value("digikey:access_token") is None
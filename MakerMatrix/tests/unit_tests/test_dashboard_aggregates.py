@@ -0,0 +1,172 @@
+"""
+Tests for the materialized dashboard aggregates
+
+Verifies that the flush hooks keep PartInventoryAggregate/InventoryRollup in sync with
+part and allocation writes, and that the incremental result always matches a full rebuild.
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.inventory_aggregate_models import PartInventoryAggregate
+from MakerMatrix.services.data.dashboard_service import DashboardService
+
+
+@pytest.fixture(name="service")
+def service_fixture(engine):
+    return DashboardService(engine_override=engine)
+
+
+@pytest.fixture(name="inventory")
+def inventory_fixture(engine):
+    """Two locations, two categories and three parts with a mix of stock levels"""
+    with Session(engine) as session:
+        shelf = LocationModel(name="Shelf", location_type="shelf")
+        drawer = LocationModel(name="Drawer", location_type="drawer")
+        resistors = CategoryModel(name="Resistors")
+        caps = CategoryModel(name="Capacitors")
+        session.add_all([shelf, drawer, resistors, caps])
+        session.commit()
+
+        r1 = PartModel(part_name="R 10k", part_number="R10K", supplier="LCSC", categories=[resistors])
+        c1 = PartModel(part_name="C 100n", part_number="C100N", supplier="LCSC", categories=[caps])
+        loose = PartModel(part_name="Loose", supplier="Mouser")
+        session.add_all([r1, c1, loose])
+        session.commit()
+
+        session.add_all(
+            [
+                PartLocationAllocation(part_id=r1.id, location_id=shelf.id, quantity_at_location=500),
+                PartLocationAllocation(part_id=r1.id, location_id=drawer.id, quantity_at_location=20),
+                PartLocationAllocation(part_id=c1.id, location_id=drawer.id, quantity_at_location=5),
+            ]
+        )
+        session.commit()
+
+        return {"shelf": shelf.id, "drawer": drawer.id, "r1": r1.id, "c1": c1.id, "loose": loose.id}
+
+
+def _assert_matches_rebuild(service: DashboardService):
+    incremental = service.get_dashboard_summary(use_cache=False)
+    service.rebuild_aggregates()
+    rebuilt = service.get_dashboard_summary(use_cache=False)
+    assert incremental == rebuilt
+    return rebuilt
+
+
+class TestIncrementalMaintenance:
+    def test_initial_writes_are_aggregated(self, service, inventory):
+        summary = _assert_matches_rebuild(service)
+
+        assert summary["summary"]["total_parts"] == 3
+        assert summary["summary"]["total_units"] == 525
+        assert summary["summary"]["parts_with_location"] == 2
+        assert summary["summary"]["parts_without_location"] == 1
+        assert summary["summary"]["low_stock_count"] == 1
+        assert summary["summary"]["zero_stock_count"] == 0
+
+        by_category = {row["category"]: row for row in summary["parts_by_category"]}
+        assert by_category["Resistors"]["total_quantity"] == 520
+        assert by_category["Uncategorized"]["part_count"] == 1
+
+        by_location = {row["location"]: row for row in summary["parts_by_location"]}
+        assert by_location["Drawer"] == {"location": "Drawer", "part_count": 2, "total_quantity": 25}
+
+        by_supplier = {row["supplier"]: row for row in summary["parts_by_supplier"]}
+        assert by_supplier["LCSC"] == {"supplier": "LCSC", "part_count": 2, "total_quantity": 525}
+        assert by_supplier["Mouser"]["total_quantity"] == 0
+
+        assert summary["most_stocked_parts"][0]["id"] == inventory["r1"]
+        assert summary["low_stock_parts"][0]["id"] == inventory["c1"]
+
+    def test_quantity_change_and_allocation_delete(self, engine, service, inventory):
+        with Session(engine) as session:
+            alloc = session.exec(
+                select(PartLocationAllocation).where(PartLocationAllocation.part_id == inventory["c1"])
+            ).one()
+            alloc.quantity_at_location = 0
+            session.add(alloc)
+            shelf_alloc = session.exec(
+                select(PartLocationAllocation).where(
+                    PartLocationAllocation.part_id == inventory["r1"],
+                    PartLocationAllocation.location_id == inventory["shelf"],
+                )
+            ).one()
+            session.delete(shelf_alloc)
+            session.commit()
+
+        summary = _assert_matches_rebuild(service)
+        assert summary["summary"]["total_units"] == 20
+        assert summary["summary"]["zero_stock_count"] == 1
+        assert all(row["location"] != "Shelf" for row in summary["parts_by_location"])
+
+    def test_locations_sharing_a_name_count_each_part_once(self, engine, service, inventory):
+        with Session(engine) as session:
+            # Names are unique per parent only
+            other_drawer = LocationModel(name="Drawer", location_type="drawer", parent_id=inventory["shelf"])
+            session.add(other_drawer)
+            session.commit()
+            session.add(
+                PartLocationAllocation(part_id=inventory["r1"], location_id=other_drawer.id, quantity_at_location=3)
+            )
+            session.commit()
+
+        summary = _assert_matches_rebuild(service)
+        by_location = {row["location"]: row for row in summary["parts_by_location"]}
+        assert by_location["Drawer"] == {"location": "Drawer", "part_count": 2, "total_quantity": 28}
+
+    def test_part_edits_move_rollup_buckets(self, engine, service, inventory):
+        with Session(engine) as session:
+            part = session.get(PartModel, inventory["r1"])
+            part.supplier = "DigiKey"
+            part.categories = []
+            session.add(part)
+            location = session.get(LocationModel, inventory["drawer"])
+            location.name = "Bin"
+            session.add(location)
+            session.commit()
+
+        summary = _assert_matches_rebuild(service)
+        suppliers = {row["supplier"] for row in summary["parts_by_supplier"]}
+        assert "DigiKey" in suppliers
+        categories = {row["category"] for row in summary["parts_by_category"]}
+        assert "Resistors" not in categories
+
+        with Session(engine) as session:
+            names = session.get(PartInventoryAggregate, inventory["r1"]).location_names
+        assert "Bin" in names
+
+    def test_part_delete_removes_contributions(self, engine, service, inventory):
+        with Session(engine) as session:
+            for alloc in session.exec(
+                select(PartLocationAllocation).where(PartLocationAllocation.part_id == inventory["r1"])
+            ).all():
+                session.delete(alloc)
+            session.delete(session.get(PartModel, inventory["r1"]))
+            session.commit()
+
+        summary = _assert_matches_rebuild(service)
+        assert summary["summary"]["total_parts"] == 2
+        assert summary["summary"]["total_units"] == 5
+
+
+class TestSummaryCache:
+    def test_summary_is_cached_until_invalidated(self, service, inventory):
+        first = service.get_dashboard_summary()
+        assert service.get_dashboard_summary() is first
+
+        service.invalidate_cache()
+        assert service.get_dashboard_summary() is not first
+
+    def test_empty_aggregates_are_built_on_demand(self, engine, service, inventory):
+        with Session(engine) as session:
+            for row in session.exec(select(PartInventoryAggregate)).all():
+                session.delete(row)
+            session.commit()
+
+        summary = service.get_dashboard_summary(use_cache=False)
+        assert summary["summary"]["total_units"] == 525
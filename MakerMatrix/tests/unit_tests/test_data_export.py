@@ -0,0 +1,123 @@
+"""
+Tests for the streaming data export
+
+DataExportService pages through the database with a server-side cursor and encodes
+NDJSON or CSV batches, optionally gzipped, filtered by fields and by update time.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, update
+
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.services.data import export_service
+from MakerMatrix.services.data.export_service import DataExportService
+
+
+@pytest.fixture(name="inventory")
+def inventory_fixture(engine):
+    with Session(engine) as session:
+        shelf = LocationModel(name="Shelf", location_type="shelf")
+        drawer = LocationModel(name="Drawer", location_type="drawer")
+        resistors = CategoryModel(name="Resistors")
+        parts = [PartModel(part_name=f"Part {i:02d}", supplier="LCSC") for i in range(25)]
+        parts[0].categories = [resistors]
+        session.add_all([shelf, drawer, resistors, *parts])
+        session.commit()
+
+        session.add_all(
+            [
+                PartLocationAllocation(part_id=parts[0].id, location_id=drawer.id, quantity_at_location=4),
+                PartLocationAllocation(
+                    part_id=parts[0].id, location_id=shelf.id, quantity_at_location=6, is_primary_storage=True
+                ),
+            ]
+        )
+        session.commit()
+        return [part.id for part in parts]
+
+
+@pytest.fixture(name="service")
+def service_fixture(engine, monkeypatch):
+    # Small batches so the tests cover several cursor partitions
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 10)
+    return DataExportService(engine_override=engine)
+
+
+def _read(chunks) -> str:
+    return b"".join(chunks).decode("utf-8")
+
+
+class TestNdjsonExport:
+    def test_all_entities_are_tagged(self, service, inventory):
+        lines = [json.loads(line) for line in _read(service.stream_export()).splitlines()]
+
+        counts = {}
+        for line in lines:
+            counts[line["_entity"]] = counts.get(line["_entity"], 0) + 1
+        assert counts == {"categories": 1, "locations": 2, "parts": 25, "allocations": 2}
+
+        part = next(line for line in lines if line.get("id") == inventory[0])
+        assert part["total_quantity"] == 10
+        assert part["location_count"] == 2
+        assert part["categories"] == ["Resistors"]
+        assert part["primary_location"] == "Shelf"
+
+    def test_field_selection_and_gzip(self, service, inventory):
+        chunks = service.stream_export(entity="parts", fields=["part_name", "total_quantity"], compress=True)
+        lines = gzip.decompress(b"".join(chunks)).decode("utf-8").splitlines()
+
+        assert len(lines) == 25
+        assert json.loads(lines[0]).keys() == {"part_name", "total_quantity"}
+
+    def test_since_exports_changed_parts_only(self, engine, service, inventory):
+        with Session(engine) as session:
+            session.exec(update(PartModel).values(updated_at=datetime.utcnow() - timedelta(days=2)))
+            session.commit()
+            part = session.get(PartModel, inventory[3])
+            part.description = "changed"
+            session.add(part)
+            session.commit()
+
+        since = datetime.utcnow() - timedelta(days=1)
+        lines = _read(service.stream_export(entity="parts", fields=["id"], since=since)).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [inventory[3]]
+
+
+class TestCsvExport:
+    def test_csv_rows(self, service, inventory):
+        text = _read(service.stream_export(entity="parts", export_format="csv", fields=["part_name", "categories"]))
+        rows = list(csv.reader(io.StringIO(text)))
+
+        assert rows[0] == ["part_name", "categories"]
+        assert len(rows) == 26
+        assert ["Part 00", '["Resistors"]'] in rows
+        assert ["Part 01", "[]"] in rows
+
+    def test_empty_table_still_has_header(self, service):
+        text = _read(service.stream_export(entity="categories", export_format="csv"))
+        assert text.strip() == "id,name,description"
+
+
+class TestValidation:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"entity": "widgets"},
+            {"export_format": "xml"},
+            {"entity": "all", "export_format": "csv"},
+            {"entity": "all", "fields": ["id"]},
+            {"entity": "parts", "fields": ["nope"]},
+        ],
+    )
+    def test_invalid_parameters_raise_before_streaming(self, service, kwargs):
+        with pytest.raises(ValueError):
+            service.stream_export(**kwargs)
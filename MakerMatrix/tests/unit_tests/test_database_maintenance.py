@@ -0,0 +1,160 @@
+"""
+Tests for the database maintenance engine
+
+Retention deletes run in batches and only touch expired rows, orphaned link rows are
+found through the foreign keys, and vacuum converts the database to incremental
+auto_vacuum and then returns freed pages to the filesystem.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.part_models import PartCategoryLink, PartModel
+from MakerMatrix.models.rate_limiting_models import SupplierUsageTrackingModel
+from MakerMatrix.models.system_models import ActivityLogModel
+from MakerMatrix.models.task_models import TaskModel, TaskStatus, TaskType
+from MakerMatrix.services.system.database_maintenance import DatabaseMaintenance
+from MakerMatrix.tasks.database_cleanup_task import DatabaseCleanupTask
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'maintenance.db'}")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="maintenance")
+def maintenance_fixture(engine):
+    return DatabaseMaintenance(engine, batch_size=3, vacuum_batch_pages=16, pause_seconds=0)
+
+
+def _count(engine, model):
+    with Session(engine) as session:
+        return len(session.query(model).all())
+
+
+def test_retention_deletes_only_expired_rows(engine, maintenance):
+    old = datetime.utcnow() - timedelta(days=100)
+    with Session(engine) as session:
+        session.add_all(ActivityLogModel(action="updated", entity_type="part", timestamp=old) for _ in range(7))
+        session.add(ActivityLogModel(action="updated", entity_type="part"))
+        session.add_all(
+            SupplierUsageTrackingModel(supplier_name="LCSC", endpoint_type="search", request_timestamp=old)
+            for _ in range(4)
+        )
+        session.commit()
+
+    logs = maintenance.delete_old_activity_logs(retention_days=90)
+    usage = maintenance.delete_old_supplier_usage(retention_days=30)
+
+    assert logs["rows_deleted"] == 7  # Three batches of up to three rows
+    assert usage["rows_deleted"] == 4
+    assert _count(engine, ActivityLogModel) == 1
+    assert _count(engine, SupplierUsageTrackingModel) == 0
+    assert maintenance.delete_old_activity_logs(retention_days=0)["skipped"]
+
+
+def test_only_finished_tasks_are_deleted(engine, maintenance):
+    old = datetime.utcnow() - timedelta(days=60)
+    with Session(engine) as session:
+        for status in TaskStatus:
+            session.add(
+                TaskModel(
+                    task_type=TaskType.PRICE_UPDATE, name=status.value, status=status, created_at=old, completed_at=old
+                )
+            )
+        session.add(
+            TaskModel(
+                task_type=TaskType.PRICE_UPDATE,
+                name="recent",
+                status=TaskStatus.COMPLETED,
+                completed_at=datetime.utcnow(),
+            )
+        )
+        session.commit()
+
+    assert maintenance.delete_finished_tasks(retention_days=30)["rows_deleted"] == 3
+
+    with Session(engine) as session:
+        remaining = {task.name for task in session.query(TaskModel).all()}
+    assert remaining == {"pending", "running", "retry", "recent"}
+
+
+def test_orphaned_links_are_removed(engine, maintenance):
+    with Session(engine) as session:
+        part = PartModel(part_name="Resistor")
+        category = CategoryModel(name="Passives")
+        session.add_all([part, category])
+        session.flush()
+        # Foreign keys are not enforced on this engine, as on databases created before they were
+        session.add_all(
+            [
+                PartCategoryLink(part_id=part.id, category_id=category.id),
+                PartCategoryLink(part_id="deleted-part", category_id=category.id),
+                PartCategoryLink(part_id=part.id, category_id="deleted-category"),
+            ]
+        )
+        session.commit()
+
+    result = maintenance.delete_orphaned_links()
+
+    assert result["rows_deleted"] == 2
+    assert result["tables"] == {"partcategorylink": 2}
+    assert _count(engine, PartCategoryLink) == 1
+
+
+def test_vacuum_converts_then_reclaims_incrementally(engine, maintenance):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE filler (data TEXT)")
+        for _ in range(200):
+            conn.exec_driver_sql("INSERT INTO filler VALUES (hex(randomblob(2000)))")
+
+    first = maintenance.vacuum()
+    assert first["mode"] == "converted"
+    assert maintenance._pragma("auto_vacuum") == 2
+
+    size_before = maintenance.database_size()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM filler")
+    assert maintenance._pragma("freelist_count") > 0
+
+    second = maintenance.vacuum()
+    assert second["mode"] == "incremental"
+    assert second["bytes_reclaimed"] > 0
+    assert maintenance._pragma("freelist_count") == 0
+    assert maintenance.database_size() < size_before
+
+
+def test_vacuum_without_conversion_leaves_the_database_alone(maintenance):
+    assert maintenance.vacuum(convert=False)["skipped"] == "auto_vacuum is not incremental"
+
+
+def test_wal_checkpoint(engine, maintenance):
+    assert maintenance.wal_checkpoint()["skipped"] == "journal_mode is delete"
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.exec_driver_sql("CREATE TABLE filler (data TEXT)")
+        for _ in range(50):
+            conn.exec_driver_sql("INSERT INTO filler VALUES (hex(randomblob(2000)))")
+
+    result = maintenance.wal_checkpoint()
+    assert result["busy"] is False
+    assert result["bytes_reclaimed"] > 0
+
+
+def test_analyze_creates_statistics_then_optimizes(maintenance):
+    assert maintenance.analyze()["mode"] == "analyze"
+    assert maintenance.analyze()["mode"] == "optimize"
+
+
+@pytest.mark.asyncio
+async def test_cleanup_task_rejects_unknown_type():
+    task = TaskModel(task_type=TaskType.DATABASE_CLEANUP, name="cleanup", input_data='{"cleanup_type": "sessions"}')
+    with pytest.raises(ValueError, match="Unknown cleanup_type"):
+        await DatabaseCleanupTask().execute(task)
@@ -0,0 +1,284 @@
+"""
+Tests for the async download manager
+
+Downloads run against a local aiohttp server: content-addressed storage, conditional
+revalidation, retries, per-host concurrency limits and atomic commits.
+"""
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlmodel import Session
+
+from MakerMatrix.models.part_models import PartModel, DatasheetModel
+from MakerMatrix.repositories.datasheet_repository import DatasheetRepository
+from MakerMatrix.services.system.download_manager import ContentStore, DownloadError, DownloadManager
+from MakerMatrix.services.system.file_download_service import FileDownloadService
+
+PDF_BODY = b"%PDF-1.4\n" + b"0" * 4096
+PDF_ETAG = '"v1"'
+
+
+def pdf_extension(content_type):
+    return None if "html" in content_type else ".pdf"
+
+
+class PdfServer:
+    """Serves PDF_BODY on any path and records what it was asked for"""
+
+    def __init__(self, failures_before_success=0, delay=0.0):
+        self.requests = []
+        self.failures_left = failures_before_success
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        self.requests.append(request)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.failures_left:
+                self.failures_left -= 1
+                return web.Response(status=503)
+            if request.headers.get("If-None-Match") == PDF_ETAG:
+                return web.Response(status=304, headers={"ETag": PDF_ETAG})
+            if request.path.endswith(".html"):
+                return web.Response(body=b"<html>" + b" " * 2048, content_type="text/html")
+            return web.Response(body=PDF_BODY, content_type="application/pdf", headers={"ETag": PDF_ETAG})
+        finally:
+            self.active -= 1
+
+
+@asynccontextmanager
+async def serve(handler):
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler.handle)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(tmp_path / "datasheets")
+
+
+@pytest.mark.asyncio
+async def test_download_is_stored_by_content_hash(store):
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        result = await manager.download(str(server.make_url("/a.pdf")), store, pdf_extension)
+    await manager.close()
+
+    assert result.content_hash == hashlib.sha256(PDF_BODY).hexdigest()
+    assert result.path == store.directory / f"{result.content_hash}.pdf"
+    assert result.path.read_bytes() == PDF_BODY
+    assert result.etag == PDF_ETAG
+    assert not result.deduplicated
+
+
+@pytest.mark.asyncio
+async def test_identical_files_from_different_urls_are_stored_once(store):
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        first = await manager.download(str(server.make_url("/vendor-a/part1.pdf")), store, pdf_extension)
+        second = await manager.download(str(server.make_url("/vendor-b/part2.pdf")), store, pdf_extension)
+    await manager.close()
+
+    assert first.path == second.path
+    assert second.deduplicated
+    assert [p.name for p in store.directory.iterdir()] == [first.path.name]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_one_url_share_a_transfer(store):
+    handler = PdfServer(delay=0.05)
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        url = str(server.make_url("/shared.pdf"))
+        results = await asyncio.gather(*(manager.download(url, store, pdf_extension) for _ in range(5)))
+    await manager.close()
+
+    assert len(handler.requests) == 1
+    assert len({result.path for result in results}) == 1
+
+
+@pytest.mark.asyncio
+async def test_revalidation_sends_etag_and_keeps_file_on_304(store):
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        url = str(server.make_url("/a.pdf"))
+        first = await manager.download(url, store, pdf_extension)
+        second = await manager.download(url, store, pdf_extension, etag=first.etag, existing_path=first.path)
+    await manager.close()
+
+    assert handler.requests[1].headers["If-None-Match"] == PDF_ETAG
+    assert second.not_modified
+    assert second.path == first.path
+
+
+@pytest.mark.asyncio
+async def test_not_modified_reports_the_content_hash_not_the_file_name(store, tmp_path):
+    # Files downloaded before content addressing are named by a URL-based UUID
+    legacy_path = tmp_path / "6f1ed002-ab5f-5e8d-9f3e-7a8b5c6d9e0f.pdf"
+    legacy_path.write_bytes(PDF_BODY)
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        url = str(server.make_url("/a.pdf"))
+        hashed = await manager.download(url, store, pdf_extension, etag=PDF_ETAG, existing_path=legacy_path)
+        stored = await manager.download(
+            url, store, pdf_extension, etag=PDF_ETAG, existing_path=legacy_path, existing_hash="abc123"
+        )
+    await manager.close()
+
+    assert hashed.not_modified and hashed.path == legacy_path
+    assert hashed.content_hash == hashlib.sha256(PDF_BODY).hexdigest()
+    assert stored.content_hash == "abc123"
+
+
+@pytest.mark.asyncio
+async def test_validators_are_not_sent_when_file_is_missing(store, tmp_path):
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        result = await manager.download(
+            str(server.make_url("/a.pdf")), store, pdf_extension, etag=PDF_ETAG, existing_path=tmp_path / "gone.pdf"
+        )
+    await manager.close()
+
+    assert "If-None-Match" not in handler.requests[0].headers
+    assert not result.not_modified
+    assert result.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_retries_on_service_unavailable(store):
+    handler = PdfServer(failures_before_success=2)
+    manager = DownloadManager(max_retries=3, retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        result = await manager.download(str(server.make_url("/a.pdf")), store, pdf_extension)
+    await manager.close()
+
+    assert len(handler.requests) == 3
+    assert result.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(store):
+    handler = PdfServer(failures_before_success=10)
+    manager = DownloadManager(max_retries=2, retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        with pytest.raises(DownloadError):
+            await manager.download(str(server.make_url("/a.pdf")), store, pdf_extension)
+    await manager.close()
+
+    assert len(handler.requests) == 3
+    assert list(store.directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_rejected_content_type_leaves_no_files(store):
+    handler = PdfServer()
+    manager = DownloadManager(retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        with pytest.raises(DownloadError):
+            await manager.download(str(server.make_url("/landing.html")), store, pdf_extension)
+    await manager.close()
+
+    assert len(handler.requests) == 1
+    assert list(store.directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_per_host_limit_bounds_concurrent_requests(store):
+    handler = PdfServer(delay=0.05)
+    manager = DownloadManager(per_host_limit=2, retry_backoff_seconds=0)
+    async with serve(handler) as server:
+        urls = [str(server.make_url(f"/part{i}.pdf")) for i in range(8)]
+        await asyncio.gather(*(manager.download(url, store, pdf_extension) for url in urls))
+    await manager.close()
+
+    assert len(handler.requests) == 8
+    assert handler.max_active == 2
+
+
+# === FileDownloadService ===
+
+
+@pytest.fixture
+def service(tmp_path, engine, monkeypatch):
+    monkeypatch.setenv("STATIC_FILES_PATH", str(tmp_path / "static"))
+    return FileDownloadService(engine_override=engine)
+
+
+@pytest.mark.asyncio
+async def test_known_url_is_served_from_disk_and_revalidated_on_request(service, engine):
+    handler = PdfServer()
+    async with serve(handler) as server:
+        url = str(server.make_url("/datasheet.pdf"))
+        first = await service.download_datasheet_async(url, "R1", "LCSC")
+
+        with Session(engine) as session:
+            part = PartModel(part_name="R1")
+            session.add(part)
+            session.commit()
+            DatasheetRepository().record_download(session, part.id, first, supplier="LCSC")
+
+        cached = await service.download_datasheet_async(url, "R1", "LCSC")
+        revalidated = await service.download_datasheet_async(url, "R1", "LCSC", revalidate=True)
+    await service.download_manager.close()
+
+    assert first["content_hash"] == hashlib.sha256(PDF_BODY).hexdigest()
+    assert first["filename"] == f"{first['content_hash']}.pdf"
+    assert cached["exists"] and cached["filename"] == first["filename"]
+    assert len(handler.requests) == 2
+    assert handler.requests[1].headers["If-None-Match"] == PDF_ETAG
+    assert revalidated["filename"] == first["filename"]
+
+
+@pytest.mark.asyncio
+async def test_failed_datasheet_download_returns_none(service):
+    handler = PdfServer()
+    async with serve(handler) as server:
+        result = await service.download_datasheet_async(str(server.make_url("/landing.html")), "R1")
+    await service.download_manager.close()
+
+    assert result is None
+
+
+def test_shared_datasheet_is_counted_per_part(engine):
+    repo = DatasheetRepository()
+    download = {
+        "url": "https://example.com/a.pdf",
+        "filename": f"{'a' * 64}.pdf",
+        "file_path": f"/tmp/{'a' * 64}.pdf",
+        "size": 2048,
+        "extension": ".pdf",
+        "content_hash": "a" * 64,
+    }
+    with Session(engine) as session:
+        parts = [PartModel(part_name=f"P{i}") for i in range(2)]
+        session.add_all(parts)
+        session.commit()
+        for part in parts:
+            repo.record_download(session, part.id, download)
+        # Re-recording the same URL for a part refreshes its row instead of adding one
+        repo.record_download(session, parts[0].id, download)
+
+        assert len(session.query(DatasheetModel).all()) == 2
+        assert repo.count_file_references(session, download["filename"]) == 2
+        assert repo.count_file_references(session, download["filename"], exclude_part_id=parts[0].id) == 1
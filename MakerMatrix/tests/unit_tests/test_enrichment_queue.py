@@ -0,0 +1,209 @@
+"""
+Tests for the durable enrichment queue
+
+Items are claimed atomically in priority order, retries wait for their not_before time,
+items abandoned by a stopped worker are resumed, a stopped supplier loop hands back the
+item it holds, and finished items are pruned.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import update
+
+from MakerMatrix.models.enrichment_queue_models import EnrichmentQueueItemModel
+from MakerMatrix.repositories.enrichment_queue_repository import EnrichmentQueueRepository
+from MakerMatrix.services.system.enrichment_queue_manager import (
+    EnrichmentPriority,
+    EnrichmentQueueManager,
+    EnrichmentStatus,
+    EnrichmentTask,
+    SupplierQueue,
+    TaskStatusCache,
+)
+
+
+def _queue(engine, worker_id="worker-a"):
+    with patch("MakerMatrix.services.system.enrichment_queue_manager.get_supplier", side_effect=KeyError):
+        return SupplierQueue("LCSC", MagicMock(), engine, worker_id)
+
+
+def _manager(engine):
+    with (
+        patch("MakerMatrix.services.system.enrichment_queue_manager.get_available_suppliers", return_value=["lcsc"]),
+        patch("MakerMatrix.services.system.enrichment_queue_manager.get_supplier", side_effect=KeyError),
+    ):
+        return EnrichmentQueueManager(engine, MagicMock())
+
+
+def _task(task_id, priority=EnrichmentPriority.NORMAL, capabilities=("fetch_datasheet",)):
+    return EnrichmentTask(
+        id=task_id,
+        part_id=f"part-{task_id}",
+        part_name=f"Part {task_id}",
+        supplier_name="LCSC",
+        capabilities=list(capabilities),
+        priority=priority,
+    )
+
+
+def test_tasks_are_claimed_by_priority_then_age(engine):
+    queue = _queue(engine)
+    queue.add_task(_task("low", EnrichmentPriority.LOW))
+    queue.add_task(_task("normal"))
+    queue.add_task(_task("urgent", EnrichmentPriority.URGENT))
+
+    claimed = [queue.get_next_task().id for _ in range(3)]
+
+    assert claimed == ["urgent", "normal", "low"]
+    assert queue.get_next_task() is None
+    assert queue.running_count == 3
+
+
+def test_a_claimed_task_is_not_handed_to_another_worker(engine):
+    first, second = _queue(engine, "worker-a"), _queue(engine, "worker-b")
+    first.add_task(_task("only"))
+
+    task = first.get_next_task()
+
+    assert task.id == "only" and task.status == EnrichmentStatus.RUNNING
+    assert second.get_next_task() is None
+    # Only the holder can report progress or finish it
+    assert not second.record_progress(task)
+    assert first.record_progress(task)
+
+
+def test_failed_task_is_retried_after_backoff(engine):
+    queue = _queue(engine)
+    queue.add_task(_task("flaky"))
+    task = queue.get_next_task()
+
+    queue.mark_task_failed(task, "timeout")
+
+    assert task.status == EnrichmentStatus.PENDING and task.retry_count == 1
+    assert queue.get_next_task() is None
+    assert 0 < queue.seconds_until_ready() <= 30
+
+    with engine.begin() as conn:
+        conn.execute(update(EnrichmentQueueItemModel).values(not_before=None))
+    retried = queue.get_next_task()
+    assert retried.id == "flaky" and retried.retry_count == 1 and retried.error_message == "timeout"
+
+
+def test_last_retry_fails_the_task(engine):
+    queue = _queue(engine)
+    task = _task("broken")
+    task.max_retries = 0
+    queue.add_task(task)
+
+    queue.mark_task_failed(queue.get_next_task(), "bad part")
+
+    assert queue.status_counts() == {"failed": 1}
+
+
+def test_progress_survives_a_restart(engine):
+    queue = _queue(engine, "crashed")
+    queue.add_task(_task("resume", capabilities=["fetch_datasheet", "fetch_image"]))
+    task = queue.get_next_task()
+    task.completed_capabilities.append("fetch_datasheet")
+    queue.record_progress(task)
+
+    # The crashed worker stops reporting; its item is released back to pending
+    with engine.begin() as conn:
+        released = EnrichmentQueueRepository.release_stale(conn, datetime.utcnow() + timedelta(seconds=1))
+    assert released == 1
+
+    resumed = _queue(engine, "restarted").get_next_task()
+    assert resumed.id == "resume"
+    assert resumed.remaining_capabilities == ["fetch_image"]
+    assert resumed.progress_percentage == 50
+
+
+def test_finished_items_are_pruned(engine):
+    queue = _queue(engine)
+    for n in range(5):
+        queue.add_task(_task(f"done-{n}"))
+        queue.mark_task_completed(queue.get_next_task())
+    queue.add_task(_task("waiting"))
+
+    with engine.begin() as conn:
+        assert EnrichmentQueueRepository.prune(conn, datetime.utcnow() - timedelta(hours=1), keep_max=2) == 3
+        assert EnrichmentQueueRepository.prune(conn, datetime.utcnow() + timedelta(seconds=1), keep_max=10) == 2
+
+    assert queue.status_counts() == {"pending": 1}
+
+
+@pytest.mark.asyncio
+async def test_manager_status_and_cancel(engine):
+    manager = _manager(engine)
+    # Mark the queue busy so nothing picks the task up
+    manager.supplier_queues["LCSC"].is_processing = True
+
+    task_id = await manager.queue_part_enrichment("p1", "Resistor", "lcsc", ["fetch_datasheet"])
+
+    assert manager.get_queue_status("LCSC")["queue_size"] == 1
+    assert (await manager.get_queue_statistics())["total_pending"] == 1
+    assert await manager.cancel_task(task_id)
+    assert not await manager.cancel_task(task_id)
+
+    # Another process sees the cancellation through the table
+    manager.task_registry = TaskStatusCache()
+    assert manager.get_task_status(task_id)["status"] == EnrichmentStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_processing_loop_releases_stale_items(engine):
+    crashed = _queue(engine, "crashed")
+    crashed.add_task(_task("abandoned"))
+    crashed.get_next_task()
+    with engine.begin() as conn:
+        conn.execute(update(EnrichmentQueueItemModel).values(heartbeat_at=datetime.utcnow() - timedelta(hours=1)))
+
+    manager = _manager(engine)
+    processed = []
+
+    async def process(task, queue):
+        processed.append(task.id)
+        queue.mark_task_completed(task)
+
+    with patch.object(manager, "_process_enrichment_task", side_effect=process):
+        await manager._process_supplier_queue("LCSC")
+
+    assert processed == ["abandoned"]
+    assert crashed.status_counts() == {"completed": 1}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loop_returns_its_task(engine):
+    manager = _manager(engine)
+    queue = manager.supplier_queues["LCSC"]
+    queue.add_task(_task("interrupted"))
+    started = asyncio.Event()
+
+    async def process(task, queue):
+        started.set()
+        await asyncio.sleep(60)
+
+    with patch.object(manager, "_process_enrichment_task", side_effect=process):
+        loop = asyncio.create_task(manager._process_supplier_queue("LCSC"))
+        await started.wait()
+        loop.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop
+
+    assert not queue.is_processing
+    assert queue.status_counts() == {"pending": 1}
+    assert _queue(engine, "worker-b").get_next_task().id == "interrupted"
+
+
+def test_status_cache_is_bounded():
+    cache = TaskStatusCache(max_size=2)
+    for task_id in ("a", "b"):
+        cache.put(_task(task_id))
+    cache.get("a")
+    cache.put(_task("c"))
+
+    assert len(cache) == 2
+    assert "a" in cache and "c" in cache and "b" not in cache
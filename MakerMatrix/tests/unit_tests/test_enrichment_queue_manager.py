@@ -9,7 +9,7 @@ import pytest
 import asyncio
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, AsyncMock, patch
-from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel import Session
 
 from MakerMatrix.services.system.enrichment_queue_manager import (
     EnrichmentQueueManager,
@@ -22,14 +22,6 @@ from MakerMatrix.services.rate_limit_service import RateLimitService
 from MakerMatrix.models.rate_limiting_models import SupplierRateLimitModel
 
 
-@pytest.fixture
-def memory_engine():
-    """Create in-memory SQLite engine for testing"""
-    engine = create_engine("sqlite:///:memory:")
-    SQLModel.metadata.create_all(engine)
-    return engine
-
-
 @pytest.fixture
 def mock_rate_limit_service():
     """Create mock rate limit service"""
@@ -54,12 +46,15 @@ def mock_websocket_manager():
 
 
 @pytest.fixture
-def enrichment_queue_manager(memory_engine, mock_rate_limit_service, mock_websocket_manager):
+def enrichment_queue_manager(engine, mock_rate_limit_service, mock_websocket_manager):
     """Create EnrichmentQueueManager instance with mocks"""
     with patch("MakerMatrix.services.system.enrichment_queue_manager.get_available_suppliers") as mock_suppliers:
         mock_suppliers.return_value = ["mouser", "lcsc", "digikey"]
 
-        manager = EnrichmentQueueManager(memory_engine, mock_rate_limit_service, mock_websocket_manager)
+        manager = EnrichmentQueueManager(engine, mock_rate_limit_service, mock_websocket_manager)
+        # The queue table is written from worker threads, so queuing yields to the event loop;
+        # keep the processing loops it starts from claiming the tasks under test
+        manager._process_supplier_queue = AsyncMock()
         return manager
 
 
@@ -151,23 +146,22 @@ class TestSupplierQueue:
     """Test SupplierQueue functionality"""
 
     @pytest.fixture
-    def supplier_queue(self, mock_rate_limit_service):
+    def supplier_queue(self, engine, mock_rate_limit_service):
         """Create a supplier queue"""
         with patch("MakerMatrix.services.system.enrichment_queue_manager.get_supplier") as mock_get_supplier:
             mock_supplier = Mock()
             mock_supplier.get_rate_limit_delay.return_value = 2.0
             mock_get_supplier.return_value = mock_supplier
 
-            queue = SupplierQueue("MOUSER", mock_rate_limit_service)
+            queue = SupplierQueue("MOUSER", mock_rate_limit_service, engine, "test-worker")
             return queue
 
     def test_create_supplier_queue(self, supplier_queue):
         """Test creating a supplier queue"""
         assert supplier_queue.supplier_name == "MOUSER"
-        assert supplier_queue.pending_tasks == []
-        assert supplier_queue.running_tasks == set()
-        assert supplier_queue.completed_tasks == []
-        assert supplier_queue.failed_tasks == []
+        assert supplier_queue.queue_size == 0
+        assert supplier_queue.running_count == 0
+        assert supplier_queue.status_counts() == {}
         assert supplier_queue.is_processing is False
         assert supplier_queue.rate_limit_delay == 2.0
 
@@ -176,7 +170,7 @@ class TestSupplierQueue:
         supplier_queue.add_task(sample_enrichment_task)
 
         assert supplier_queue.queue_size == 1
-        assert supplier_queue.pending_tasks[0] == sample_enrichment_task
+        assert supplier_queue.get_next_task().id == sample_enrichment_task.id
 
     def test_add_tasks_priority_ordering(self, supplier_queue):
         """Test that tasks are ordered by priority"""
@@ -220,19 +214,21 @@ class TestSupplierQueue:
         supplier_queue.add_task(high_task)
         supplier_queue.add_task(low_task)
 
-        # Should be ordered: urgent, high, normal, low
-        assert supplier_queue.pending_tasks[0].priority == EnrichmentPriority.URGENT
-        assert supplier_queue.pending_tasks[1].priority == EnrichmentPriority.HIGH
-        assert supplier_queue.pending_tasks[2].priority == EnrichmentPriority.NORMAL
-        assert supplier_queue.pending_tasks[3].priority == EnrichmentPriority.LOW
+        # Should be claimed in order: urgent, high, normal, low
+        assert supplier_queue.get_next_task().priority == EnrichmentPriority.URGENT
+        assert supplier_queue.get_next_task().priority == EnrichmentPriority.HIGH
+        assert supplier_queue.get_next_task().priority == EnrichmentPriority.NORMAL
+        assert supplier_queue.get_next_task().priority == EnrichmentPriority.LOW
 
     def test_get_next_task(self, supplier_queue, sample_enrichment_task):
         """Test getting next task from queue"""
         supplier_queue.add_task(sample_enrichment_task)
 
         next_task = supplier_queue.get_next_task()
-        assert next_task == sample_enrichment_task
-        assert supplier_queue.queue_size == 0  # Should be removed from queue
+        assert next_task.id == sample_enrichment_task.id
+        assert next_task.capabilities == sample_enrichment_task.capabilities
+        assert next_task.status == EnrichmentStatus.RUNNING
+        assert supplier_queue.queue_size == 0  # Claimed, no longer pending
 
     def test_get_next_task_empty_queue(self, supplier_queue):
         """Test getting next task from empty queue"""
@@ -241,40 +237,43 @@ class TestSupplierQueue:
 
     def test_mark_task_running(self, supplier_queue, sample_enrichment_task):
         """Test marking task as running"""
-        supplier_queue.mark_task_running(sample_enrichment_task)
+        supplier_queue.add_task(sample_enrichment_task)
+        task = supplier_queue.get_next_task()
+        supplier_queue.mark_task_running(task)
 
-        assert sample_enrichment_task.status == EnrichmentStatus.RUNNING
-        assert isinstance(sample_enrichment_task.started_at, datetime)
-        assert sample_enrichment_task.id in supplier_queue.running_tasks
+        assert task.status == EnrichmentStatus.RUNNING
+        assert isinstance(task.started_at, datetime)
         assert supplier_queue.running_count == 1
 
     def test_mark_task_completed(self, supplier_queue, sample_enrichment_task):
         """Test marking task as completed"""
-        # First mark as running
-        supplier_queue.mark_task_running(sample_enrichment_task)
+        # First claim the task
+        supplier_queue.add_task(sample_enrichment_task)
+        task = supplier_queue.get_next_task()
 
         # Then mark as completed
-        supplier_queue.mark_task_completed(sample_enrichment_task)
+        supplier_queue.mark_task_completed(task)
 
-        assert sample_enrichment_task.status == EnrichmentStatus.COMPLETED
-        assert isinstance(sample_enrichment_task.completed_at, datetime)
-        assert sample_enrichment_task.id not in supplier_queue.running_tasks
-        assert sample_enrichment_task in supplier_queue.completed_tasks
+        assert task.status == EnrichmentStatus.COMPLETED
+        assert isinstance(task.completed_at, datetime)
+        assert supplier_queue.status_counts() == {"completed": 1}
         assert supplier_queue.running_count == 0
 
     def test_mark_task_failed_with_retries(self, supplier_queue, sample_enrichment_task):
         """Test marking task as failed with retry logic"""
-        # First mark as running
-        supplier_queue.mark_task_running(sample_enrichment_task)
+        # First claim the task
+        supplier_queue.add_task(sample_enrichment_task)
+        task = supplier_queue.get_next_task()
 
         # Mark as failed (should retry)
-        supplier_queue.mark_task_failed(sample_enrichment_task, "Test error")
+        supplier_queue.mark_task_failed(task, "Test error")
 
-        assert sample_enrichment_task.status == EnrichmentStatus.PENDING  # Re-queued for retry
-        assert sample_enrichment_task.retry_count == 1
-        assert sample_enrichment_task.error_message == "Test error"
-        assert sample_enrichment_task.id not in supplier_queue.running_tasks
+        assert task.status == EnrichmentStatus.PENDING  # Re-queued for retry
+        assert task.retry_count == 1
+        assert task.error_message == "Test error"
+        assert supplier_queue.running_count == 0
         assert supplier_queue.queue_size == 1  # Re-added to queue
+        assert supplier_queue.get_next_task() is None  # Not before the retry delay
 
     def test_mark_task_failed_max_retries(self, supplier_queue, sample_enrichment_task):
         """Test marking task as failed after max retries"""
@@ -282,14 +281,15 @@ class TestSupplierQueue:
         sample_enrichment_task.retry_count = 3
         sample_enrichment_task.max_retries = 3
 
-        # First mark as running
-        supplier_queue.mark_task_running(sample_enrichment_task)
+        # First claim the task
+        supplier_queue.add_task(sample_enrichment_task)
+        task = supplier_queue.get_next_task()
 
         # Mark as failed (should not retry)
-        supplier_queue.mark_task_failed(sample_enrichment_task, "Final error")
+        supplier_queue.mark_task_failed(task, "Final error")
 
-        assert sample_enrichment_task.status == EnrichmentStatus.FAILED
-        assert sample_enrichment_task in supplier_queue.failed_tasks
+        assert task.status == EnrichmentStatus.FAILED
+        assert supplier_queue.status_counts() == {"failed": 1}
         assert supplier_queue.queue_size == 0  # Not re-added to queue
 
     def test_estimate_completion_time(self, supplier_queue):
@@ -340,7 +340,7 @@ class TestEnrichmentQueueManager:
         assert "DIGIKEY" in manager.supplier_queues
         assert len(manager.supplier_queues) == 3
         assert manager.is_running is False
-        assert manager.task_registry == {}
+        assert len(manager.task_registry) == 0
 
     @pytest.mark.asyncio
     async def test_queue_part_enrichment(self, enrichment_queue_manager):
@@ -361,7 +361,7 @@ class TestEnrichmentQueueManager:
         assert mouser_queue.queue_size == 1
 
         # Check task details
-        task = enrichment_queue_manager.task_registry[task_id]
+        task = enrichment_queue_manager.task_registry.get(task_id)
         assert task.part_id == "part-123"
         assert task.part_name == "Test Part"
         assert task.supplier_name == "MOUSER"
@@ -479,8 +479,9 @@ class TestEnrichmentQueueManager:
         assert success is True
 
         # Check task status
-        task = enrichment_queue_manager.task_registry[task_id]
+        task = enrichment_queue_manager.task_registry.get(task_id)
         assert task.status == EnrichmentStatus.CANCELLED
+        assert enrichment_queue_manager.get_task_status(task_id)["status"] == EnrichmentStatus.CANCELLED
 
         # Check it was removed from queue
         mouser_queue = enrichment_queue_manager.supplier_queues["MOUSER"]
@@ -503,8 +504,8 @@ class TestEnrichmentQueueManager:
             capabilities=["fetch_datasheet"],
         )
 
-        task = enrichment_queue_manager.task_registry[task_id]
-        task.status = EnrichmentStatus.COMPLETED
+        mouser_queue = enrichment_queue_manager.supplier_queues["MOUSER"]
+        mouser_queue.mark_task_completed(mouser_queue.get_next_task())
 
         # Try to cancel
         success = await enrichment_queue_manager.cancel_task(task_id)
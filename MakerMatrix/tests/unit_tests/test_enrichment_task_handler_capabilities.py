@@ -16,7 +16,14 @@ class TestEnrichmentTaskHandlerCapabilities:
 
     def test_all_supplier_capability_enum_values_exist(self):
         """Test that all expected SupplierCapability enum values exist"""
-        expected_capabilities = {"GET_PART_DETAILS", "FETCH_DATASHEET", "FETCH_PRICING_STOCK", "IMPORT_ORDERS"}
+        expected_capabilities = {
+            "GET_PART_DETAILS",
+            "FETCH_DATASHEET",
+            "FETCH_PRICING_STOCK",
+            "IMPORT_ORDERS",
+            "SCRAPE_PART_DETAILS",
+            "BULK_SEARCH",
+        }
 
         actual_capabilities = {cap.name for cap in SupplierCapability}
 
@@ -57,6 +64,7 @@ class TestEnrichmentTaskHandlerCapabilities:
             "get_part_details": SupplierCapability.GET_PART_DETAILS,
             "fetch_pricing_stock": SupplierCapability.FETCH_PRICING_STOCK,
             "import_orders": SupplierCapability.IMPORT_ORDERS,
+            "bulk_search": SupplierCapability.BULK_SEARCH,
         }
 
         mapped_enums = set(capability_map.values())
@@ -152,7 +160,8 @@ class TestEnrichmentTaskHandlerCapabilities:
         }
 
         for supplier in suppliers:
-            supplier_caps = set(supplier.get_capabilities())
+            # BULK_SEARCH is an optional optimisation only some suppliers' APIs support
+            supplier_caps = set(supplier.get_capabilities()) - {SupplierCapability.BULK_SEARCH}
             assert (
                 supplier_caps == expected_capabilities
             ), f"{supplier.__class__.__name__} has inconsistent capabilities: {supplier_caps}"
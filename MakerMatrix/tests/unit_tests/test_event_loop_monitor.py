@@ -0,0 +1,72 @@
+"""
+Tests for the event loop monitor
+
+A synchronous call that holds the loop past the threshold is attributed to the application
+frame that made it, with its duration and stack; short pauses only show up as lag.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from MakerMatrix.services.system.event_loop_monitor import EventLoopMonitor
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_attributed_to_its_caller():
+    monitor = EventLoopMonitor(interval_ms=10, block_threshold_ms=100)
+    await monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert report["stalls"] == 1
+    stall = report["locations"][0]
+    assert stall["location"].startswith("MakerMatrix/tests/unit_tests/test_event_loop_monitor.py:")
+    assert stall["location"].endswith("in _block_the_loop")
+    assert "in sleep" not in stall["location"]
+    assert stall["max_ms"] >= 250
+    assert any("test_blocking_call_is_attributed_to_its_caller" in frame for frame in stall["stack"])
+
+    metrics = monitor.render()
+    assert "makermatrix_event_loop_lag_seconds_count " in metrics
+    assert f'makermatrix_event_loop_stalls_total{{location="{stall["location"]}"}} 1' in metrics
+
+
+@pytest.mark.asyncio
+async def test_short_pauses_are_not_stalls():
+    monitor = EventLoopMonitor(interval_ms=10, block_threshold_ms=200)
+    await monitor.start()
+    try:
+        for _ in range(3):
+            _block_the_loop(0.03)
+            await asyncio.sleep(0.02)
+    finally:
+        await monitor.stop()
+
+    report = monitor.report()
+    assert report["stalls"] == 0
+    assert report["max_lag_ms"] >= 20
+
+    monitor.reset()
+    assert monitor.report()["max_lag_ms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_locations_beyond_the_limit_are_grouped():
+    monitor = EventLoopMonitor(max_locations=1)
+    monitor._record(0.5, ("a.py:1 in a", "sleep", []))
+    monitor._record(0.5, ("b.py:2 in b", "sleep", []))
+    monitor._record(0.5, ("c.py:3 in c", "sleep", []))
+
+    assert [entry["location"] for entry in monitor.report()["locations"]] == ["other", "a.py:1 in a"]
+    assert monitor.report()["locations"][0]["count"] == 2
@@ -0,0 +1,51 @@
+"""
+Tests for the query index migration and the index advisor
+
+A database created by an older version lacks the composite and expression indexes, so the
+advisor flags the hot queries that scan whole tables and lists the missing indexes; the
+migration creates them once and the same queries then search an index.
+"""
+
+from MakerMatrix.migrations import add_query_indexes
+from MakerMatrix.services.system.index_advisor import IndexAdvisor
+
+
+def _upgrade(engine) -> bool:
+    raw_connection = engine.raw_connection()
+    try:
+        created = add_query_indexes.upgrade(raw_connection.cursor())
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+    return created
+
+
+def test_fresh_database_has_the_indexes(engine):
+    report = IndexAdvisor(engine).report()
+
+    assert report["flagged"] == []
+    assert report["missing_indexes"] == []
+    assert not any(query["error"] for query in report["queries"])
+    plans = {query["name"]: query for query in report["queries"]}
+    assert "ix_partmodel_supplier_lower" in plans["parts.search_supplier"]["plan"][0]
+    assert not plans["tasks.pending_ready"]["temp_sort"]
+    assert not _upgrade(engine)
+
+
+def test_migration_adds_indexes_flagged_by_the_advisor(engine):
+    # The database as an older version created it
+    with engine.begin() as conn:
+        for name in add_query_indexes.INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+
+    report = IndexAdvisor(engine).report()
+    assert set(report["missing_indexes"]) == set(add_query_indexes.INDEXES)
+    assert {"parts.search_supplier", "tags.parts", "locations.children"} <= set(report["flagged"])
+    plans = {query["name"]: query for query in report["queries"]}
+    assert plans["tags.parts"]["full_scans"] == ["part_tag_links"]
+    assert plans["tasks.pending_ready"]["temp_sort"]
+
+    assert _upgrade(engine)
+    report = IndexAdvisor(engine).report()
+    assert report["flagged"] == []
+    assert report["missing_indexes"] == []
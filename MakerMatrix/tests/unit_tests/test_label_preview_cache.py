@@ -0,0 +1,159 @@
+"""
+Tests for the label preview cache and live preview sessions
+
+Preview keys depend only on what changes the image, the cache evicts least recently used
+previews within its bounds, concurrent requests share one render, PNG responses honour
+If-None-Match, and live sessions debounce and drop superseded requests.
+"""
+
+import asyncio
+import io
+import threading
+
+import pytest
+from PIL import Image
+from starlette.requests import Request
+
+from MakerMatrix.models.label_template_models import LabelTemplateModel, TextRotation
+from MakerMatrix.routers.printer_routes import _png_response
+from MakerMatrix.services.printer.label_preview_cache import (
+    CachedPreview,
+    LabelPreviewCache,
+    label_preview_cache,
+    preview_key,
+    template_render_config,
+)
+from MakerMatrix.services.printer.live_label_preview import LivePreviewSession
+from MakerMatrix.services.printer.printer_manager_service import PrinterManagerService
+
+
+def _template(**overrides):
+    values = dict(
+        name="box",
+        display_name="Box",
+        text_template="{part_name}",
+        label_width_mm=39.0,
+        label_height_mm=12.0,
+        qr_enabled=False,
+    )
+    values.update(overrides)
+    return LabelTemplateModel(**values)
+
+
+def _preview(key, size=10):
+    return CachedPreview(key=key, png=b"x" * size, width=1, height=1)
+
+
+def test_key_ignores_template_bookkeeping():
+    data = {"part_name": "Resistor"}
+    key = preview_key(template_render_config(_template()), data, {"dpi": 300})
+
+    renamed = _template(name="copy", display_name="Copy", usage_count=12)
+    assert preview_key(template_render_config(renamed), data, {"dpi": 300}) == key
+    assert preview_key(template_render_config(_template(label_width_mm=62.0)), data, {"dpi": 300}) != key
+    assert preview_key(template_render_config(_template()), {"part_name": "Capacitor"}, {"dpi": 300}) != key
+    assert preview_key(template_render_config(_template()), data, {"dpi": 600}) != key
+
+
+def test_key_treats_enums_like_draft_strings():
+    draft = template_render_config(_template(text_rotation="90"))
+    saved = template_render_config(_template(text_rotation=TextRotation.QUARTER))
+
+    assert preview_key(draft, {}, {}) == preview_key(saved, {}, {})
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LabelPreviewCache(max_entries=2, max_bytes=100)
+    cache.put(_preview("a"))
+    cache.put(_preview("b"))
+    cache.get("a")
+    cache.put(_preview("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+    cache.put(_preview("big", size=95))
+    assert cache.get_stats()["entries"] == 1
+    assert cache.get_stats()["bytes"] == 95
+    cache.put(_preview("huge", size=101))
+    assert cache.get("huge") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_render():
+    cache = LabelPreviewCache()
+    calls = []
+
+    def render():
+        calls.append(threading.get_ident())
+        return b"png", 3, 2
+
+    results = await asyncio.gather(*(cache.get_or_render("k", render) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert calls[0] != threading.get_ident()  # Rendered off the event loop
+    assert all(preview.png == b"png" for preview, _ in results)
+    assert (await cache.get_or_render("k", render))[1] is True
+
+
+@pytest.mark.asyncio
+async def test_draft_preview_is_rendered_once():
+    label_preview_cache.clear()
+    manager = PrinterManagerService()
+    config = {"text_template": "{part_name}", "label_width_mm": 39.0, "label_height_mm": 12.0}
+
+    preview, cached = await manager.render_draft_preview(config, {"part_name": "Resistor"})
+    again, cached_again = await manager.render_draft_preview(dict(config), {"part_name": "Resistor"})
+
+    assert not cached and cached_again
+    assert again.key == preview.key
+    image = Image.open(io.BytesIO(preview.png))
+    assert image.format == "PNG" and image.size == (preview.width, preview.height)
+
+    result = await manager.preview_template_draft(config, {"part_name": "Resistor"})
+    assert result.success and result.preview_url.startswith("data:image/png;base64,")
+
+
+def test_png_response_honours_if_none_match():
+    preview = _preview("abc")
+
+    def request(headers):
+        return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers.items()]})
+
+    response = _png_response(request({}), preview, False)
+    assert response.status_code == 200
+    assert response.media_type == "image/png"
+    assert response.headers["etag"] == '"abc"'
+
+    assert _png_response(request({"if-none-match": '"abc"'}), preview, True).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_live_session_renders_only_the_latest_request():
+    rendered, sent_json, sent_bytes = [], [], []
+
+    async def render(request):
+        rendered.append(request["text"])
+        return _preview(request["text"]), False
+
+    async def send_json(message):
+        sent_json.append(message)
+
+    async def send_bytes(data):
+        sent_bytes.append(data)
+
+    session = LivePreviewSession(render, send_json, send_bytes, debounce_seconds=0.05)
+    for text in ("R", "Re", "Res"):
+        session.submit({"request_id": text, "text": text})
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+
+    assert rendered == ["Res"]
+    assert [message["request_id"] for message in sent_json] == ["Res"]
+    assert sent_bytes == [b"x" * 10]
+
+    session.submit({"request_id": "gone", "text": "gone"})
+    assert session.cancel()
+    await session.close()
+    assert rendered == ["Res"]
+    assert session.stats["superseded"] == 3
@@ -0,0 +1,187 @@
+"""
+Tests for materialized location paths
+
+LocationModel.path_ids/path_names follow creates, renames and moves of whole subtrees through
+the location path flush hooks, and part listings serialize locations from the materialized
+path plus one batch of parent/capacity data instead of per-part lazy loads.
+"""
+
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from MakerMatrix.migrations import add_location_path_columns
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.repositories.custom_exceptions import InvalidReferenceError
+from MakerMatrix.repositories.location_path_repository import LocationPathRepository
+from MakerMatrix.repositories.location_repositories import LocationRepository
+from MakerMatrix.repositories.parts_repositories import PartRepository
+
+
+@pytest.fixture(name="tree")
+def tree_fixture(engine):
+    """Office > Cabinet > Drawer > Box (container) > Slot 1..3, plus a separate Garage"""
+    with Session(engine) as session:
+        office = LocationModel(name="Office")
+        cabinet = LocationModel(name="Cabinet", parent=office)
+        drawer = LocationModel(name="Drawer", parent=cabinet)
+        box = LocationModel(name="Box", parent=drawer, is_mobile=True, container_capacity=100)
+        slots = [
+            LocationModel(name=f"Slot {n}", parent=box, is_auto_generated_slot=True, slot_number=n) for n in (1, 2, 3)
+        ]
+        garage = LocationModel(name="Garage")
+        session.add_all([office, garage])
+        session.commit()
+        return {
+            "office": office.id,
+            "cabinet": cabinet.id,
+            "drawer": drawer.id,
+            "box": box.id,
+            "slots": [slot.id for slot in slots],
+            "garage": garage.id,
+        }
+
+
+def _path(engine, location_id):
+    with Session(engine) as session:
+        location = session.get(LocationModel, location_id)
+        return location.path_ids, location.path_names
+
+
+def test_new_locations_get_their_path(engine, tree):
+    path_ids, path_names = _path(engine, tree["slots"][0])
+
+    assert path_ids == "/".join([tree["office"], tree["cabinet"], tree["drawer"], tree["box"], tree["slots"][0]])
+    assert path_names == ["Office", "Cabinet", "Drawer", "Box", "Slot 1"]
+
+
+def test_rename_updates_the_whole_subtree(engine, tree):
+    with Session(engine) as session:
+        slot = session.get(LocationModel, tree["slots"][1])  # Loaded instance is kept in step
+        LocationRepository.update_location(session, tree["cabinet"], {"name": "Tall Cabinet"})
+        assert slot.path_names == ["Office", "Tall Cabinet", "Drawer", "Box", "Slot 2"]
+
+    assert _path(engine, tree["box"])[1] == ["Office", "Tall Cabinet", "Drawer", "Box"]
+    assert _path(engine, tree["garage"])[1] == ["Garage"]
+
+
+def test_move_reroots_the_whole_subtree(engine, tree):
+    with Session(engine) as session:
+        LocationRepository.update_location(session, tree["drawer"], {"parent_id": tree["garage"]})
+
+    path_ids, path_names = _path(engine, tree["slots"][2])
+    assert path_ids == "/".join([tree["garage"], tree["drawer"], tree["box"], tree["slots"][2]])
+    assert path_names == ["Garage", "Drawer", "Box", "Slot 3"]
+
+    with Session(engine) as session:
+        office = session.get(LocationModel, tree["office"])
+        assert LocationPathRepository.get_descendant_ids(session.connection(), office.path_ids) == [tree["cabinet"]]
+
+
+def test_hierarchy_and_recursive_parts_follow_a_move(engine, tree):
+    with Session(engine) as session:
+        LocationRepository.update_location(session, tree["drawer"], {"parent_id": tree["garage"]})
+        fuse = PartModel(part_name="Fuse")
+        session.add(fuse)
+        session.flush()
+        session.add(PartLocationAllocation(part_id=fuse.id, location_id=tree["slots"][0], quantity_at_location=1))
+        session.commit()
+
+        hierarchy = LocationRepository.get_location_hierarchy(session, tree["garage"])
+        garage_parts = PartRepository.get_parts_by_location_id(session, tree["garage"], recursive=True)
+        office_parts = PartRepository.get_parts_by_location_id(session, tree["office"], recursive=True)
+
+    affected = hierarchy["affected_location_ids"]
+    assert affected[:3] == [tree["garage"], tree["drawer"], tree["box"]]
+    assert sorted(affected[3:]) == sorted(tree["slots"])
+    drawer = hierarchy["hierarchy"]["children"][0]
+    assert drawer["name"] == "Drawer" and drawer["children"][0]["name"] == "Box"
+    assert [part.part_name for part in garage_parts] == ["Fuse"]
+    assert office_parts == []
+
+
+def test_move_and_rename_in_one_flush(engine, tree):
+    with Session(engine) as session:
+        drawer = session.get(LocationModel, tree["drawer"])
+        box = session.get(LocationModel, tree["box"])
+        drawer.parent_id = tree["garage"]
+        box.name = "Bin"
+        session.commit()
+
+    assert _path(engine, tree["slots"][0])[1] == ["Garage", "Drawer", "Bin", "Slot 1"]
+
+
+def test_moving_a_location_below_itself_is_rejected(engine, tree):
+    with Session(engine) as session:
+        with pytest.raises(InvalidReferenceError):
+            LocationRepository.update_location(session, tree["cabinet"], {"parent_id": tree["box"]})
+        with pytest.raises(InvalidReferenceError):
+            LocationRepository.update_location(session, tree["cabinet"], {"parent_id": tree["cabinet"]})
+
+
+def test_location_path_lookup_uses_materialized_ids(engine, tree):
+    with Session(engine) as session:
+        path = LocationRepository.get_location_path(session, tree["box"])
+
+    assert path["name"] == "Box"
+    assert path["parent"]["name"] == "Drawer"
+    assert path["parent"]["parent"]["parent"]["name"] == "Office"
+    assert "parent" not in path["parent"]["parent"]["parent"]
+
+
+def test_part_page_serializes_without_lazy_loads(engine, tree):
+    with Session(engine) as session:
+        parts = [PartModel(part_name=f"Resistor {n}") for n in range(30)]
+        session.add_all(parts)
+        session.flush()
+        session.add_all(
+            PartLocationAllocation(
+                part_id=part.id,
+                location_id=tree["slots"][n % 3],
+                quantity_at_location=2,
+                is_primary_storage=True,
+            )
+            for n, part in enumerate(parts)
+        )
+        session.add(PartLocationAllocation(part_id=parts[0].id, location_id=tree["box"], quantity_at_location=10))
+        session.commit()
+
+    with Session(engine) as session:
+        parts = session.exec(select(PartModel)).all()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        batch = LocationPathRepository.load_batch(session.connection(), [part.primary_location for part in parts])
+        items = [part.to_dict(location_batch=batch) for part in parts]
+
+    assert len(statements) == 1  # Parent summaries; the slots themselves are not containers
+    location = items[0]["location"]
+    assert location["full_path"] == "Office > Cabinet > Drawer > Box > Slot 1"
+    assert location["parent"]["name"] == "Box"
+    assert "children" not in location
+
+    with Session(engine) as session:
+        box = session.get(LocationModel, tree["box"])
+        batch = LocationPathRepository.load_batch(session.connection(), [box])
+        assert box.to_dict(batch=batch)["capacity_info"] == box.to_dict()["capacity_info"]
+        assert box.to_dict(batch=batch)["capacity_info"]["used"] == 10
+
+
+def test_migration_backfills_paths(tmp_path):
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.executescript("""
+        CREATE TABLE locationmodel (id VARCHAR PRIMARY KEY, name VARCHAR, parent_id VARCHAR);
+        INSERT INTO locationmodel VALUES ('a', 'Office', NULL), ('b', 'Shelf', 'a'), ('c', 'Bin', 'b');
+        """)
+
+    assert add_location_path_columns.upgrade(conn.cursor())
+    assert not add_location_path_columns.upgrade(conn.cursor())
+    assert conn.execute("SELECT path_ids, path_names FROM locationmodel WHERE id = 'c'").fetchone() == (
+        "a/b/c",
+        '["Office", "Shelf", "Bin"]',
+    )
+    conn.close()
@@ -0,0 +1,123 @@
+"""
+Tests for the mock supplier server and the supplier endpoint overrides
+
+The supplier clients reach the mock server through SUPPLIER_MOCK_URL and parse its synthetic
+parts; the server injects 429s and 503s as configured and serves recorded fixtures verbatim.
+"""
+
+import json
+
+import aiohttp
+import pytest
+
+from MakerMatrix.benchmarks.load import latency_summary, load_part_number
+from MakerMatrix.benchmarks.mock_suppliers import MockBehavior, MockSupplierServer, synthetic_part
+from MakerMatrix.suppliers.base import BaseSupplier, get_base_url_override
+from MakerMatrix.suppliers.http_client import SupplierHTTPClient
+from MakerMatrix.suppliers.lcsc import LCSCSupplier
+from MakerMatrix.suppliers.mouser import MouserSupplier
+
+
+@pytest.fixture
+def no_rate_limits(monkeypatch):
+    """The supplier clients would otherwise track their calls in the application database"""
+    monkeypatch.setattr(BaseSupplier, "_get_rate_limit_service", lambda self: None)
+    monkeypatch.setattr(SupplierHTTPClient, "_get_rate_limit_service", lambda self: None)
+
+
+def _recorded_fixtures(tmp_path) -> str:
+    fixtures = tmp_path / "fixtures"
+    (fixtures / "mouser").mkdir(parents=True)
+    (fixtures / "mouser" / "RECORDED-1.json").write_text(
+        json.dumps({"MouserPartNumber": "RECORDED-1", "Manufacturer": "Acme"})
+    )
+    return str(fixtures)
+
+
+def test_base_url_override_precedence(monkeypatch):
+    monkeypatch.delenv("SUPPLIER_MOCK_URL", raising=False)
+    monkeypatch.delenv("SUPPLIER_BASE_URL_MCMASTER_CARR", raising=False)
+    assert get_base_url_override("McMaster-Carr") is None
+
+    monkeypatch.setenv("SUPPLIER_MOCK_URL", "http://127.0.0.1:8089/")
+    assert get_base_url_override("McMaster-Carr") == "http://127.0.0.1:8089/mcmaster-carr"
+
+    monkeypatch.setenv("SUPPLIER_BASE_URL_MCMASTER_CARR", "https://staging.example.com/")
+    assert get_base_url_override("McMaster-Carr") == "https://staging.example.com"
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("no_rate_limits")
+async def test_clients_parse_mock_responses(monkeypatch, tmp_path):
+    mock_server = MockSupplierServer(fixtures_dir=_recorded_fixtures(tmp_path))
+    monkeypatch.setenv("SUPPLIER_MOCK_URL", await mock_server.start())
+    monkeypatch.delenv("SUPPLIER_BASE_URL_LCSC", raising=False)
+    monkeypatch.delenv("SUPPLIER_BASE_URL_MOUSER", raising=False)
+
+    lcsc = LCSCSupplier()
+    lcsc.configure({}, {})
+    mouser = MouserSupplier()
+    mouser.configure({"api_key": "mock-key"}, {})
+    try:
+        part = await lcsc.get_part_details("C25804")
+        expected = synthetic_part("lcsc", "C25804")
+        assert part.manufacturer == expected["manufacturer"]
+        assert part.manufacturer_part_number == expected["mpn"]
+        assert part.datasheet_url == f"{mock_server.url}/files/lcsc/C25804.pdf"
+        assert part.additional_data["product_url"] == "https://www.lcsc.com/product-detail/C25804.html"
+
+        part = await mouser.get_part_details("511-LOAD000001")
+        assert part.manufacturer_part_number == synthetic_part("mouser", "511-LOAD000001")["mpn"]
+        assert part.pricing[0]["quantity"] == 1
+        assert part.stock_quantity == synthetic_part("mouser", "511-LOAD000001")["stock"]
+
+        assert await mouser.get_part_details("MISSING-1") is None
+        assert (await mouser.get_part_details("RECORDED-1")).manufacturer == "Acme"
+    finally:
+        await lcsc.close()
+        await mouser.close()
+        await mock_server.stop()
+
+    assert mock_server.stats()["lcsc"]["requests"] == 2
+    assert mock_server.stats()["mouser"]["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_injected_errors():
+    server = MockSupplierServer(
+        supplier_behavior={
+            "mouser": MockBehavior(rate_limit_per_minute=2),
+            "lcsc": MockBehavior(error_rate=1.0),
+        }
+    )
+    url = await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            body = {"SearchByPartRequest": {"mouserPartNumber": "511-A"}}
+            statuses = []
+            for _ in range(3):
+                async with session.post(f"{url}/mouser/search/partnumber", json=body) as response:
+                    statuses.append(response.status)
+                    retry_after = response.headers.get("Retry-After")
+            async with session.get(f"{url}/lcsc/api/products/C1/components") as response:
+                lcsc_status = response.status
+    finally:
+        await server.stop()
+
+    assert statuses == [200, 200, 429]
+    assert 1 <= int(retry_after) <= 60
+    assert lcsc_status == 503
+    assert server.stats()["mouser"]["rate_limited"] == 1
+    assert server.stats()["lcsc"]["errors"] == 1
+
+
+def test_load_helpers():
+    assert load_part_number("digikey", 7) == "LOAD000007-ND"
+    assert load_part_number("lcsc", 7) == "C900007"
+
+    summary = latency_summary([0.1 * n for n in range(1, 101)])
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 5000.0
+    assert summary["p99_ms"] == 9900.0
+    assert summary["max_ms"] == 10000.0
+    assert latency_summary([]) == {"count": 0}
@@ -0,0 +1,122 @@
+"""
+Tests for part listing projections
+
+view=summary loads only the grid columns and builds the rows from batch queries, fields=
+returns only the requested keys and loads only the relationships behind them, and the
+default full view is unchanged.
+"""
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlmodel import Session
+
+from MakerMatrix.models.category_models import CategoryModel
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.project_models import ProjectModel
+from MakerMatrix.models.tag_models import TagModel
+from MakerMatrix.repositories.part_projection_repository import PartProjection
+from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.services.data.part_service import PartService
+
+
+@pytest.fixture(name="parts")
+def parts_fixture(engine):
+    """Twenty parts sharing two categories, a tag and a project, stocked in Shelf > Bin"""
+    with Session(engine) as session:
+        shelf = LocationModel(name="Shelf")
+        bin_ = LocationModel(name="Bin", parent=shelf)
+        passives = CategoryModel(name="Passives")
+        smd = CategoryModel(name="SMD")
+        robot = ProjectModel(name="Robot", slug="robot")
+        tag = TagModel(name="reorder")
+        parts = [
+            PartModel(part_name=f"Resistor {n:02d}", part_number=f"R{n}", supplier="LCSC", description="0603")
+            for n in range(20)
+        ]
+        for part in parts:
+            part.categories = [passives, smd]
+            part.projects = [robot]
+            part.tags = [tag]
+        session.add_all([shelf, bin_, *parts])
+        session.flush()
+        session.add_all(
+            [PartLocationAllocation(part_id=part.id, location_id=bin_.id, quantity_at_location=5) for part in parts]
+        )
+        session.add(
+            PartLocationAllocation(
+                part_id=parts[0].id, location_id=shelf.id, quantity_at_location=7, is_primary_storage=True
+            )
+        )
+        session.commit()
+        return [part.id for part in parts]
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_summary_view_builds_grid_rows_from_batch_queries(engine, parts):
+    service = PartService(engine_override=engine)
+    statements = _count_statements(engine)
+
+    items = service.get_all_parts(page=1, page_size=20, projection=PartProjection.parse("summary")).data["items"]
+
+    # Parts, count, then one query each for locations, categories and projects
+    assert len(statements) == 5
+    first = next(item for item in items if item["id"] == parts[0])
+    assert first["quantity"] == 12 and first["location_count"] == 2
+    assert first["location"] == {"id": first["location_id"], "name": "Shelf", "full_path": "Shelf"}
+    assert [category["name"] for category in first["categories"]] == ["Passives", "SMD"]
+    assert [project["name"] for project in first["projects"]] == ["Robot"]
+    assert "description" not in first and "additional_properties" not in first
+
+    other = next(item for item in items if item["id"] == parts[1])
+    assert other["location"]["full_path"] == "Shelf > Bin"
+
+
+def test_fields_load_only_the_relationships_they_need(engine, parts):
+    projection = PartProjection.parse(fields="part_name,quantity,categories")
+    with Session(engine) as session:
+        statements = _count_statements(engine)
+        results, total = PartRepository.search_parts_text(session, "resistor", options=projection.loader_options())
+        items = PartService._serialize_parts(session, results, projection)
+
+        assert total == 20
+        assert len(statements) == 3  # Parts, count and categories
+        assert set(items[0]) == {"id", "part_name", "quantity", "categories"}
+        assert {"tags", "projects", "allocations", "datasheets"} <= inspect(results[0]).unloaded
+        quantities = {item["id"]: item["quantity"] for item in items}
+        assert quantities[parts[0]] == 12  # From the denormalized total
+
+
+def test_location_fields_use_the_location_batch(engine, parts):
+    projection = PartProjection.parse(fields="location,location_id")
+    with Session(engine) as session:
+        results = PartRepository.get_all_parts(session, page_size=20, options=projection.loader_options())
+        items = {item["id"]: item for item in PartService._serialize_parts(session, results, projection)}
+
+    assert set(items[parts[0]]) == {"id", "location", "location_id"}
+    assert items[parts[1]]["location"]["full_path"] == "Shelf > Bin"
+
+
+def test_full_view_is_unchanged(engine, parts):
+    service = PartService(engine_override=engine)
+    default = service.get_all_parts(page=1, page_size=5).data["items"]
+    full = service.get_all_parts(page=1, page_size=5, projection=PartProjection.parse("full")).data["items"]
+
+    assert full == default
+    assert {"tags", "projects", "datasheets", "allocations", "description"} <= set(full[0])
+
+
+def test_invalid_projections_are_rejected():
+    with pytest.raises(ValueError, match="Unknown view"):
+        PartProjection.parse("compact")
+    with pytest.raises(ValueError, match="part_colour"):
+        PartProjection.parse(fields="part_name,part_colour")
+    with pytest.raises(ValueError):
+        PartProjection.parse("summary", "part_name")
+    assert PartProjection.parse(" Full ", " ").is_default
@@ -0,0 +1,148 @@
+"""
+Tests for the parametric property index
+
+Covers unit normalization, index maintenance on part writes and the typed
+property filters exposed through AdvancedPartSearch and prop: text search.
+"""
+
+import pytest
+from sqlmodel import Session, select
+
+from MakerMatrix.models.part_models import PartModel, AdvancedPartSearch, PropertyFilter
+from MakerMatrix.models.part_property_models import PartPropertyIndex
+from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.repositories.part_property_repository import PartPropertyRepository
+from MakerMatrix.utils.unit_values import parse_value
+
+
+@pytest.fixture(name="passives")
+def passives_fixture(engine):
+    with Session(engine) as session:
+        parts = [
+            PartModel(part_name="R 1k", additional_properties={"resistance": "1kΩ", "package": "0603"}),
+            PartModel(part_name="R 4k7", additional_properties={"resistance": "4k7", "package": "0805"}),
+            PartModel(part_name="R 10M", additional_properties={"Resistance": "10M", "package": "0603"}),
+            PartModel(
+                part_name="C 100n 50V",
+                additional_properties={"capacitance": "100nF", "voltage_rating": "50V", "package": "0603"},
+            ),
+            PartModel(
+                part_name="C 0.1u 16V",
+                additional_properties={"capacitance": "0.1uF", "voltage_rating": "16 V", "package": "0402"},
+            ),
+            PartModel(part_name="No props"),
+        ]
+        session.add_all(parts)
+        session.commit()
+        return {part.part_name: part.id for part in parts}
+
+
+def _search(engine, **kwargs):
+    with Session(engine) as session:
+        results, total = PartRepository.advanced_search(session, AdvancedPartSearch(page_size=50, **kwargs))
+        return sorted(part.part_name for part in results), total
+
+
+class TestParseValue:
+    @pytest.mark.parametrize(
+        "value, key, expected",
+        [
+            ("10k", "resistance", (10000.0, "ohm")),
+            ("4k7", None, (4700.0, "ohm")),
+            ("4R7", None, (4.7, "ohm")),
+            ("100nF", None, (100e-9, "F")),
+            ("4.7µF", None, (4.7e-6, "F")),
+            ("1/4W", None, (0.25, "W")),
+            ("25V", None, (25.0, "V")),
+            ("16MHz", None, (16e6, "Hz")),
+            ("±5%", "tolerance", (5.0, "%")),
+        ],
+    )
+    def test_quantities(self, value, key, expected):
+        number, unit = parse_value(value, key)
+        assert number == pytest.approx(expected[0])
+        assert unit == expected[1]
+
+    @pytest.mark.parametrize("value", ["SOIC-8", "-40°C~+85°C", "0603", "", True, None])
+    def test_non_quantities(self, value):
+        assert parse_value(value) is None
+
+
+class TestIndexMaintenance:
+    def test_rows_follow_part_writes(self, engine, passives):
+        part_id = passives["R 1k"]
+        with Session(engine) as session:
+            rows = session.exec(select(PartPropertyIndex).where(PartPropertyIndex.part_id == part_id)).all()
+            assert {row.key: (row.numeric_value, row.unit) for row in rows}["resistance"] == (1000.0, "ohm")
+
+            part = session.get(PartModel, part_id)
+            part.additional_properties = {"resistance": "2k2", "notes": {"nested": True}}
+            session.add(part)
+            session.commit()
+
+            rows = session.exec(select(PartPropertyIndex).where(PartPropertyIndex.part_id == part_id)).all()
+            assert [(row.key, row.numeric_value) for row in rows] == [("resistance", 2200.0)]
+
+            session.delete(part)
+            session.commit()
+            assert not session.exec(select(PartPropertyIndex).where(PartPropertyIndex.part_id == part_id)).all()
+
+    def test_rebuild_matches_incremental(self, engine, passives):
+        with Session(engine) as session:
+            before = {(r.part_id, r.key, r.numeric_value) for r in session.exec(select(PartPropertyIndex)).all()}
+        with engine.begin() as conn:
+            assert PartPropertyRepository.rebuild(conn)["parts"] == 6
+            assert not PartPropertyRepository.needs_rebuild(conn)
+        with Session(engine) as session:
+            after = {(r.part_id, r.key, r.numeric_value) for r in session.exec(select(PartPropertyIndex)).all()}
+        assert before == after
+
+    def test_zero_padded_codes_indexed_as_numbers_trigger_a_rebuild(self, engine, passives):
+        with engine.begin() as conn:
+            conn.execute(
+                PartPropertyIndex.__table__.update()
+                .where(PartPropertyIndex.key == "package", PartPropertyIndex.text_value == "0603")
+                .values(numeric_value=603.0)
+            )
+            assert PartPropertyRepository.needs_rebuild(conn)
+            PartPropertyRepository.rebuild(conn)
+            assert not PartPropertyRepository.needs_rebuild(conn)
+
+
+class TestPropertyFilters:
+    def test_range_with_units(self, engine, passives):
+        names, total = _search(
+            engine, property_filters=[PropertyFilter(key="resistance", min_value="1k", max_value="10k")]
+        )
+        assert names == ["R 1k", "R 4k7"]
+        assert total == 2
+
+    def test_equality_and_minimum_combined(self, engine, passives):
+        names, _ = _search(
+            engine,
+            property_filters=[
+                PropertyFilter(key="package", equals="0603"),
+                PropertyFilter(key="voltage_rating", min_value="25V"),
+            ],
+        )
+        assert names == ["C 100n 50V"]
+
+    def test_numeric_equality_across_notations(self, engine, passives):
+        names, _ = _search(engine, property_filters=[PropertyFilter(key="capacitance", equals="100n")])
+        assert names == ["C 0.1u 16V", "C 100n 50V"]
+
+    def test_zero_padded_codes_match_as_text(self, engine, passives):
+        names, _ = _search(engine, property_filters=[PropertyFilter(key="package", equals="0603")])
+        assert names == ["C 100n 50V", "R 10M", "R 1k"]
+        names, _ = _search(engine, property_filters=[PropertyFilter(key="package", equals="603")])
+        assert names == []
+
+    def test_unparseable_bound_is_rejected(self, engine, passives):
+        with pytest.raises(ValueError):
+            _search(engine, property_filters=[PropertyFilter(key="resistance", min_value="lots")])
+
+    def test_prop_text_search_range(self, engine, passives):
+        with Session(engine) as session:
+            results, total = PartRepository.search_parts_text(session, "prop:voltage_rating<=20V")
+        assert [part.part_name for part in results] == ["C 0.1u 16V"]
+        assert total == 1
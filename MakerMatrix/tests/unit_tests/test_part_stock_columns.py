@@ -0,0 +1,114 @@
+"""
+Tests for the denormalized part stock columns
+
+PartModel.cached_total_quantity and cached_location_count follow allocation writes through
+the inventory flush hooks, back the advanced search quantity filters and sorts, and can be
+checked and repaired against the allocation rows.
+"""
+
+import pytest
+from sqlmodel import Session, select, update
+
+from MakerMatrix.models.part_models import PartModel, AdvancedPartSearch
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.services.data.part_allocation_service import PartAllocationService
+
+
+@pytest.fixture(name="inventory")
+def inventory_fixture(engine):
+    with Session(engine) as session:
+        shelf = LocationModel(name="Shelf", location_type="shelf")
+        drawer = LocationModel(name="Drawer", location_type="drawer")
+        parts = [PartModel(part_name=name) for name in ("Alpha", "Bravo", "Charlie")]
+        session.add_all([shelf, drawer, *parts])
+        session.commit()
+
+        session.add_all(
+            [
+                PartLocationAllocation(part_id=parts[0].id, location_id=shelf.id, quantity_at_location=100),
+                PartLocationAllocation(part_id=parts[0].id, location_id=drawer.id, quantity_at_location=5),
+                PartLocationAllocation(part_id=parts[1].id, location_id=shelf.id, quantity_at_location=20),
+            ]
+        )
+        session.commit()
+        return {"shelf": shelf.id, "drawer": drawer.id, "parts": [part.id for part in parts]}
+
+
+def _columns(engine, part_id):
+    with Session(engine) as session:
+        part = session.get(PartModel, part_id)
+        return part.cached_total_quantity, part.cached_location_count
+
+
+class TestColumnMaintenance:
+    def test_allocation_writes_update_columns(self, engine, inventory):
+        alpha, bravo, charlie = inventory["parts"]
+        assert _columns(engine, alpha) == (105, 2)
+        assert _columns(engine, bravo) == (20, 1)
+        assert _columns(engine, charlie) == (0, 0)
+
+        with Session(engine) as session:
+            alloc = session.exec(select(PartLocationAllocation).where(PartLocationAllocation.part_id == bravo)).one()
+            alloc.quantity_at_location = 7
+            session.add(alloc)
+            drawer_alloc = session.exec(
+                select(PartLocationAllocation).where(
+                    PartLocationAllocation.part_id == alpha, PartLocationAllocation.location_id == inventory["drawer"]
+                )
+            ).one()
+            session.delete(drawer_alloc)
+            session.commit()
+
+        assert _columns(engine, alpha) == (100, 1)
+        assert _columns(engine, bravo) == (7, 1)
+
+    def test_loaded_instance_sees_new_total(self, engine, inventory):
+        charlie = inventory["parts"][2]
+        with Session(engine) as session:
+            part = session.get(PartModel, charlie)
+            session.add(PartLocationAllocation(part_id=charlie, location_id=inventory["shelf"], quantity_at_location=3))
+            session.flush()
+            assert part.cached_total_quantity == 3
+            assert part not in session.dirty
+
+
+class TestAdvancedSearch:
+    def test_quantity_range_filter(self, engine, inventory):
+        with Session(engine) as session:
+            results, total = PartRepository.advanced_search(
+                session, AdvancedPartSearch(min_quantity=10, max_quantity=50)
+            )
+        assert total == 1
+        assert [part.part_name for part in results] == ["Bravo"]
+
+    def test_sort_by_quantity_and_location_count(self, engine, inventory):
+        with Session(engine) as session:
+            by_quantity, _ = PartRepository.advanced_search(
+                session, AdvancedPartSearch(sort_by="quantity", sort_order="desc")
+            )
+            by_locations, _ = PartRepository.advanced_search(
+                session, AdvancedPartSearch(sort_by="location_count", sort_order="asc")
+            )
+        assert [part.part_name for part in by_quantity] == ["Alpha", "Bravo", "Charlie"]
+        assert [part.part_name for part in by_locations] == ["Charlie", "Bravo", "Alpha"]
+
+
+class TestConsistencyCheck:
+    def test_detects_and_repairs_drift(self, engine, inventory):
+        alpha = inventory["parts"][0]
+        with Session(engine) as session:
+            session.exec(update(PartModel).where(PartModel.id == alpha).values(cached_total_quantity=1))
+            session.commit()
+
+        service = PartAllocationService(engine_override=engine)
+        report = service.check_quantity_consistency()
+        assert report.success
+        assert report.data["mismatch_count"] == 1
+        assert report.data["mismatches"][0]["actual_total_quantity"] == 105
+
+        repaired = service.check_quantity_consistency(repair=True)
+        assert repaired.data["repaired_count"] == 1
+        assert _columns(engine, alpha) == (105, 2)
+        assert service.check_quantity_consistency().data["consistent"]
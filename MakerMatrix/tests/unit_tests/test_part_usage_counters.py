@@ -0,0 +1,129 @@
+"""
+Tests for the write-behind part usage counters
+
+Views and search hits are aggregated in memory and written as one additive UPSERT into
+PartSystemMetadata, and the stored counts rank search results, suggestions and the
+most viewed parts.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, select
+
+from MakerMatrix.models.models import AdvancedPartSearch
+from MakerMatrix.models.part_metadata_models import PartSystemMetadata
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.services.system.part_usage_counters import PartUsageCounters
+
+
+@pytest.fixture(name="parts")
+def parts_fixture(engine):
+    with Session(engine) as session:
+        parts = {name: PartModel(part_name=name) for name in ("Resistor 10k", "Resistor 1k", "Resistor 4k7")}
+        session.add_all(parts.values())
+        session.commit()
+        return {name: part.id for name, part in parts.items()}
+
+
+def _counts(engine):
+    with Session(engine) as session:
+        return {
+            row.part_id: (row.view_count, row.search_count) for row in session.exec(select(PartSystemMetadata)).all()
+        }
+
+
+def test_flush_writes_all_deltas_in_one_statement(engine, parts):
+    counters = PartUsageCounters(engine=engine)
+    for _ in range(3):
+        counters.record_view(parts["Resistor 1k"])
+    counters.record_search_hits(parts.values())
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert counters.flush() == 3
+
+    assert len([sql for sql in statements if sql.startswith("INSERT")]) == 1
+    assert _counts(engine)[parts["Resistor 1k"]] == (3, 1)
+    assert counters.pending_count == 0
+    assert counters.flush() == 0
+
+
+def test_flushes_add_to_existing_rows(engine, parts):
+    with Session(engine) as session:
+        session.add(PartSystemMetadata(part_id=parts["Resistor 10k"], view_count=10, is_favorite=True))
+        session.commit()
+
+    # Two workers flushing their own deltas
+    for counters in (PartUsageCounters(engine=engine), PartUsageCounters(engine=engine)):
+        counters.record_view(parts["Resistor 10k"])
+        counters.record_search_hits([parts["Resistor 10k"]])
+        counters.flush()
+
+    with Session(engine) as session:
+        metadata = session.exec(select(PartSystemMetadata)).one()
+        assert (metadata.view_count, metadata.search_count) == (12, 2)
+        assert metadata.is_favorite is True
+        assert metadata.last_accessed is not None
+
+
+def test_deleted_parts_are_skipped_and_failed_flushes_retry(engine, parts):
+    counters = PartUsageCounters(engine=engine)
+    counters.record_view("deleted-part")
+    counters.record_view(parts["Resistor 4k7"])
+
+    broken = PartUsageCounters(engine=create_engine("sqlite:////nonexistent/dir/db.sqlite"))
+    broken.record_view(parts["Resistor 4k7"])
+    assert broken.flush() == 0
+    assert broken.pending_count == 1 and broken.stats["failed_flushes"] == 1
+
+    assert counters.flush() == 1
+    assert _counts(engine) == {parts["Resistor 4k7"]: (1, 0)}
+
+
+@pytest.mark.asyncio
+async def test_background_loop_flushes_early_and_on_stop(engine, parts):
+    counters = PartUsageCounters(engine=engine, flush_interval=3600, max_pending=2)
+    await counters.start()
+
+    counters.record_search_hits([parts["Resistor 1k"], parts["Resistor 4k7"]])
+    for _ in range(50):
+        if counters.stats["flushes"]:
+            break
+        await asyncio.sleep(0.01)
+    assert counters.stats["flushes"] == 1
+
+    counters.record_view(parts["Resistor 10k"])
+    await counters.stop()
+    assert _counts(engine)[parts["Resistor 10k"]] == (1, 0)
+
+
+def test_popularity_ranks_search_results_and_most_viewed(engine, parts):
+    counters = PartUsageCounters(engine=engine)
+    for _ in range(2):
+        counters.record_view(parts["Resistor 4k7"])
+    counters.record_view(parts["Resistor 10k"])
+    counters.record_search_hits([parts["Resistor 10k"]])
+    counters.flush()
+
+    with Session(engine) as session:
+        results, total = PartRepository.search_parts_text(session, "resistor")
+        assert [part.part_name for part in results] == ["Resistor 4k7", "Resistor 10k", "Resistor 1k"]
+
+        # An exact name match still comes first
+        results, _ = PartRepository.search_parts_text(session, "resistor 1k")
+        assert results[0].part_name == "Resistor 1k"
+
+        assert PartRepository.get_part_suggestions(session, "res") == ["Resistor 4k7", "Resistor 10k", "Resistor 1k"]
+
+        search = AdvancedPartSearch(sort_by="popularity", sort_order="desc")
+        results, _ = PartRepository.advanced_search(session, search)
+        assert results[-1].part_name == "Resistor 1k"
+
+        most_viewed = PartRepository.get_most_viewed_parts(session, limit=5)
+        assert [(part.part_name, metadata.view_count) for part, metadata in most_viewed] == [
+            ("Resistor 4k7", 2),
+            ("Resistor 10k", 1),
+        ]
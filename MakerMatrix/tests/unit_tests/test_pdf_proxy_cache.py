@@ -0,0 +1,200 @@
+"""
+Tests for the proxied PDF cache
+
+Upstream servers are replaced by httpx.MockTransport so hits, conditional
+revalidation, stale fallback, LRU eviction and restart persistence can be checked
+without network access.
+"""
+
+import time
+
+import httpx
+import pytest
+
+from MakerMatrix.services.system.pdf_proxy_cache import PdfProxyCache, UpstreamError, cache_key, normalize_url
+
+PDF_BODY = b"%PDF-1.4\n" + b"1" * 2048
+
+
+class Upstream:
+    """Mock origin that serves PDF_BODY with an ETag and honours If-None-Match"""
+
+    def __init__(self, etag='"v1"', status=200):
+        self.etag = etag
+        self.status = status
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(200, content=PDF_BODY, headers={"Content-Type": "application/pdf", "ETag": self.etag})
+
+
+def make_cache(tmp_path, upstream, **kwargs):
+    return PdfProxyCache(tmp_path / "pdf_cache", transport=httpx.MockTransport(upstream), **kwargs)
+
+
+def test_normalize_url_ignores_case_default_port_query_order_and_fragment():
+    assert normalize_url("HTTPS://WWW.TI.com:443/lit/ds.pdf?b=2&a=1#page=3") == "https://www.ti.com/lit/ds.pdf?a=1&b=2"
+    assert cache_key("https://ti.com/x.pdf?a=1&b=2") == cache_key("https://TI.com/x.pdf?b=2&a=1")
+    assert cache_key("https://ti.com/x.pdf") != cache_key("https://ti.com/y.pdf")
+
+
+@pytest.mark.asyncio
+async def test_second_view_is_served_from_disk(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream)
+
+    first = await cache.get("https://www.ti.com/lit/ds.pdf")
+    second = await cache.get("https://WWW.TI.COM/lit/ds.pdf")
+    await cache.close()
+
+    assert len(upstream.requests) == 1
+    assert first.key == second.key
+    assert cache.path_for(first.key).read_bytes() == PDF_BODY
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_served_from_cache"] == len(PDF_BODY)
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_with_etag(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream, max_age_seconds=0)
+
+    await cache.get("https://www.ti.com/lit/ds.pdf")
+    await cache.get("https://www.ti.com/lit/ds.pdf")
+    await cache.close()
+
+    assert upstream.requests[1].headers["if-none-match"] == '"v1"'
+    assert cache.stats()["revalidated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_upstream_replaces_cached_copy(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream, max_age_seconds=0)
+
+    await cache.get("https://www.ti.com/lit/ds.pdf")
+    upstream.etag = '"v2"'
+    entry = await cache.get("https://www.ti.com/lit/ds.pdf")
+    await cache.close()
+
+    assert entry.etag == '"v2"'
+    assert cache.stats()["refreshed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_copy_is_served_when_upstream_fails(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream, max_age_seconds=0)
+
+    entry = await cache.get("https://www.ti.com/lit/ds.pdf")
+    upstream.status = 503
+    stale = await cache.get("https://www.ti.com/lit/ds.pdf")
+    await cache.close()
+
+    assert stale.key == entry.key
+    assert cache.stats()["stale_served"] == 1
+
+
+@pytest.mark.asyncio
+async def test_uncached_upstream_error_is_raised(tmp_path):
+    cache = make_cache(tmp_path, Upstream(status=404))
+
+    with pytest.raises(UpstreamError) as exc_info:
+        await cache.get("https://www.ti.com/missing.pdf")
+    await cache.close()
+
+    assert exc_info.value.status_code == 404
+    assert list(cache.directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream, max_bytes=len(PDF_BODY) * 2)
+
+    a = await cache.get("https://www.ti.com/a.pdf")
+    b = await cache.get("https://www.ti.com/b.pdf")
+    await cache.get("https://www.ti.com/a.pdf")  # a is now most recently used
+    await cache.get("https://www.ti.com/c.pdf")
+    await cache.close()
+
+    assert cache.path_for(a.key).exists()
+    assert not cache.path_for(b.key).exists()
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_entries_being_served_are_not_evicted_or_cleared(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream, max_bytes=len(PDF_BODY))
+
+    a = await cache.acquire("https://www.ti.com/a.pdf")
+    b = await cache.get("https://www.ti.com/b.pdf")
+    assert cache.path_for(a.key).exists() and cache.path_for(b.key).exists()
+    assert cache.clear() == 1
+    assert cache.path_for(a.key).exists()
+
+    c = await cache.get("https://www.ti.com/c.pdf")
+    cache.release(a.key)
+    await cache.close()
+
+    assert not cache.path_for(a.key).exists()
+    assert cache.path_for(c.key).exists()
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_hits_save_access_times_on_close_and_drop_their_locks(tmp_path):
+    cache = make_cache(tmp_path, Upstream())
+    a = await cache.get("https://www.ti.com/a.pdf")
+    await cache.get("https://www.ti.com/b.pdf")
+    meta_path = cache.directory / f"{a.key}.json"
+    saved = meta_path.read_text()
+
+    await cache.get("https://www.ti.com/a.pdf")  # a is now most recently used
+    assert meta_path.read_text() == saved
+    assert not cache._locks
+    await cache.close()
+
+    assert meta_path.read_text() != saved
+    restarted = make_cache(tmp_path, Upstream())
+    assert list(restarted._entries)[-1] == a.key
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_restart(tmp_path):
+    upstream = Upstream()
+    cache = make_cache(tmp_path, upstream)
+    await cache.get("https://www.ti.com/lit/ds.pdf")
+    await cache.close()
+
+    (cache.directory / ".leftover.part").write_bytes(b"partial")
+    restarted = make_cache(tmp_path, upstream)
+    await restarted.get("https://www.ti.com/lit/ds.pdf")
+    await restarted.close()
+
+    assert len(upstream.requests) == 1
+    assert restarted.stats()["hits"] == 1
+    assert not (cache.directory / ".leftover.part").exists()
+
+
+def test_clear_removes_files(tmp_path):
+    cache = make_cache(tmp_path, Upstream())
+    key = cache_key("https://www.ti.com/lit/ds.pdf")
+    cache.path_for(key).write_bytes(PDF_BODY)
+    (cache.directory / f"{key}.json").write_text(
+        f'{{"key": "{key}", "url": "https://www.ti.com/lit/ds.pdf", "size": {len(PDF_BODY)}, '
+        f'"fetched_at": {time.time()}}}'
+    )
+    cache = make_cache(tmp_path, Upstream())
+
+    assert cache.clear() == 1
+    assert list(cache.directory.iterdir()) == []
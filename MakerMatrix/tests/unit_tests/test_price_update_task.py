@@ -33,13 +33,17 @@ def mock_parts():
 def mock_supplier_with_pricing():
     """Create a mock supplier that supports pricing"""
     supplier = MagicMock()
-    supplier.get_capabilities.return_value = [SupplierCapability.FETCH_PRICING]
-    supplier.fetch_pricing = AsyncMock(
-        return_value=[
+    supplier.get_capabilities.return_value = [SupplierCapability.FETCH_PRICING_STOCK]
+
+    async def bulk_fetch_pricing_stock(part_numbers):
+        pricing = [
             {"quantity": 1, "price": 1.25, "currency": "USD"},
             {"quantity": 10, "price": 1.00, "currency": "USD"},
         ]
-    )
+        return {pn: {"pricing": pricing, "stock_quantity": 100} for pn in part_numbers}
+
+    supplier.bulk_fetch_pricing_stock = AsyncMock(side_effect=bulk_fetch_pricing_stock)
+    supplier.close = AsyncMock()
     return supplier
 
 
@@ -66,10 +70,11 @@ class TestPriceUpdateTask:
 
             # Setup mocks
             mock_session = MagicMock()
-            mock_get_session.return_value = mock_session
+            mock_get_session.side_effect = lambda: iter([mock_session])
             mock_session.__enter__ = MagicMock(return_value=mock_session)
             mock_session.__exit__ = MagicMock(return_value=None)
-            mock_session.exec.return_value.all.return_value = mock_parts
+            # First query returns the parts, later ones (current price history) return nothing
+            mock_session.exec.return_value.all.side_effect = [mock_parts] + [[]] * 10
 
             # Mock supplier registry
             def supplier_side_effect(supplier_name):
@@ -100,8 +105,8 @@ class TestPriceUpdateTask:
             # Verify suppliers were checked for pricing capability
             assert mock_get_supplier.call_count > 0
 
-            # Verify pricing was only fetched for capable suppliers
-            assert mock_supplier_with_pricing.fetch_pricing.call_count >= 0
+            # Prices are fetched with one batch call per supplier chunk, not one call per part
+            assert mock_supplier_with_pricing.bulk_fetch_pricing_stock.call_count == 2
 
     @pytest.mark.asyncio
     async def test_skips_suppliers_without_pricing_capability(
@@ -117,7 +122,7 @@ class TestPriceUpdateTask:
 
             # Setup mocks
             mock_session = MagicMock()
-            mock_get_session.return_value = mock_session
+            mock_get_session.side_effect = lambda: iter([mock_session])
             mock_session.__enter__ = MagicMock(return_value=mock_session)
             mock_session.__exit__ = MagicMock(return_value=None)
             mock_session.exec.return_value.all.return_value = [mock_parts[1]]  # Only LCSC part
@@ -149,7 +154,7 @@ class TestPriceUpdateTask:
 
             # Setup mocks
             mock_session = MagicMock()
-            mock_get_session.return_value = mock_session
+            mock_get_session.side_effect = lambda: iter([mock_session])
             mock_session.__enter__ = MagicMock(return_value=mock_session)
             mock_session.__exit__ = MagicMock(return_value=None)
             mock_session.exec.return_value.all.return_value = mock_parts
@@ -181,7 +186,7 @@ def test_supplier_capability_checking():
     # Mock suppliers with different capabilities
     pricing_supplier = MagicMock()
     pricing_supplier.get_capabilities.return_value = [
-        SupplierCapability.FETCH_PRICING,
+        SupplierCapability.FETCH_PRICING_STOCK,
         SupplierCapability.FETCH_DATASHEET,
     ]
 
@@ -189,8 +194,8 @@ def test_supplier_capability_checking():
     datasheet_only_supplier.get_capabilities.return_value = [SupplierCapability.FETCH_DATASHEET]
 
     # Test capability checking
-    assert SupplierCapability.FETCH_PRICING in pricing_supplier.get_capabilities()
-    assert SupplierCapability.FETCH_PRICING not in datasheet_only_supplier.get_capabilities()
+    assert SupplierCapability.FETCH_PRICING_STOCK in pricing_supplier.get_capabilities()
+    assert SupplierCapability.FETCH_PRICING_STOCK not in datasheet_only_supplier.get_capabilities()
 
     # This demonstrates the pattern all tasks should follow:
     # 1. Get supplier instance
@@ -0,0 +1,152 @@
+"""
+Tests for project BOM availability
+
+ProjectBomService answers "what can we build" from set-based queries over the BOM lines,
+the denormalized stock columns and current prices, and drops cached results when
+allocations, prices or BOM lines change.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_allocation_models import PartLocationAllocation
+from MakerMatrix.models.part_metadata_models import PartPricingHistory
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.project_models import PartProjectLink, ProjectModel
+from MakerMatrix.services.data.project_bom_service import BomCache, ProjectBomService
+
+
+@pytest.fixture(name="shop")
+def shop_fixture(engine):
+    """A robot needing 4 motors and 2 boards, and a lamp needing 1 board and 3 LEDs"""
+    with Session(engine) as session:
+        shelf = LocationModel(name="Shelf")
+        drawer = LocationModel(name="Drawer", parent=shelf)
+        motor, board, led = (PartModel(part_name=name) for name in ("Motor", "Board", "LED"))
+        robot = ProjectModel(name="Robot", slug="robot", status="active")
+        lamp = ProjectModel(name="Lamp", slug="lamp", status="active")
+        session.add_all([shelf, drawer, motor, board, led, robot, lamp])
+        session.flush()
+
+        session.add_all(
+            [
+                PartLocationAllocation(part_id=motor.id, location_id=shelf.id, quantity_at_location=6),
+                PartLocationAllocation(part_id=motor.id, location_id=drawer.id, quantity_at_location=3),
+                PartLocationAllocation(part_id=board.id, location_id=drawer.id, quantity_at_location=3),
+                PartLocationAllocation(part_id=led.id, location_id=shelf.id, quantity_at_location=100),
+                PartPricingHistory(part_id=motor.id, supplier="DigiKey", unit_price=12.5, source="manual"),
+                PartPricingHistory(part_id=motor.id, supplier="Mouser", unit_price=11.0, source="manual"),
+                PartPricingHistory(
+                    part_id=motor.id, supplier="LCSC", unit_price=1.0, source="manual", is_current=False
+                ),
+                PartProjectLink(part_id=motor.id, project_id=robot.id, quantity_required=4),
+                PartProjectLink(part_id=board.id, project_id=robot.id, quantity_required=2),
+                PartProjectLink(part_id=board.id, project_id=lamp.id, quantity_required=1),
+                PartProjectLink(part_id=led.id, project_id=lamp.id, quantity_required=3),
+            ]
+        )
+        session.commit()
+        return {
+            "robot": robot.id,
+            "lamp": lamp.id,
+            "motor": motor.id,
+            "board": board.id,
+            "shelf": shelf.id,
+        }
+
+
+@pytest.fixture(name="service")
+def service_fixture(engine):
+    return ProjectBomService(engine_override=engine, cache=BomCache(ttl_seconds=60))
+
+
+def test_bom_reports_buildable_count_shortages_and_sources(service, shop):
+    bom = service.get_project_bom(shop["robot"], build_quantity=2).data
+
+    summary = bom["summary"]
+    assert summary["buildable"] == 1  # 9 motors / 4 per robot = 2, 3 boards / 2 = 1
+    assert summary["can_build"] is False
+    assert summary["short_lines"] == 1
+    assert summary["shortage_units"] == 1  # 4 boards for two robots, 3 in stock
+    assert summary["unit_cost"] == 44.0  # 4 motors at the cheapest current price; boards unpriced
+    assert summary["unpriced_short_lines"] == 1
+
+    board, motor = bom["lines"]
+    assert (board["part_id"], board["required"], board["shortage"]) == (shop["board"], 4, 1)
+    assert (motor["shortage"], motor["unit_price"], motor["price_supplier"]) == (0, 11.0, "Mouser")
+    assert [source["quantity"] for source in motor["sources"]] == [6, 3]
+    assert motor["sources"][1]["location_path"] == "Shelf > Drawer"
+
+
+def test_shortfall_is_costed_from_current_prices(service, shop, engine):
+    with Session(engine) as session:
+        session.add(PartPricingHistory(part_id=shop["board"], supplier="LCSC", unit_price=2.25, source="manual"))
+        session.commit()
+
+    summary = service.get_project_bom(shop["robot"], build_quantity=3).data["summary"]
+
+    assert summary["shortage_units"] == 3 + 3  # 12 motors (9 on hand) and 6 boards (3 on hand)
+    assert summary["shortfall_cost"] == 3 * 11.0 + 3 * 2.25
+
+
+def test_buildable_answers_for_all_projects_in_one_query(service, shop, engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    data = service.get_buildable(status="active").data
+
+    assert {p["project_name"]: p["buildable"] for p in data["projects"]} == {"Lamp": 3, "Robot": 1}
+    assert data["buildable_count"] == 2
+    assert len(statements) == 2  # Project ids, then one aggregate over every BOM line
+
+    statements.clear()
+    service.get_buildable(status="active")
+    assert len(statements) == 1  # Summaries come from the cache
+
+
+def test_allocation_change_invalidates_affected_projects_only(service, shop, engine):
+    service.get_buildable()
+    with Session(engine) as session:
+        motor_alloc = session.exec(
+            select(PartLocationAllocation).where(
+                PartLocationAllocation.part_id == shop["motor"], PartLocationAllocation.location_id == shop["shelf"]
+            )
+        ).one()
+        motor_alloc.quantity_at_location = 0
+        session.commit()
+
+    assert service.cache.get(("summary", shop["lamp"], 1)) is not None
+    assert service.cache.get(("summary", shop["robot"], 1)) is None
+    assert service.get_project_bom(shop["robot"]).data["summary"]["buildable"] == 0
+
+
+def test_price_and_line_changes_invalidate(service, shop, engine):
+    service.get_buildable()
+    with Session(engine) as session:
+        session.add(PartPricingHistory(part_id=shop["board"], supplier="LCSC", unit_price=1.5, source="manual"))
+        session.commit()
+    assert service.cache.get(("summary", shop["lamp"], 1)) is None
+
+    service.get_buildable()
+    with Session(engine) as session:
+        link = session.get(PartProjectLink, (shop["board"], shop["lamp"]))
+        link.quantity_required = 5
+        session.commit()
+    assert service.get_project_bom(shop["lamp"]).data["summary"]["buildable"] == 0
+
+
+def test_rolled_back_changes_keep_the_cache(service, shop, engine):
+    service.get_buildable()
+    with Session(engine) as session:
+        session.add(PartPricingHistory(part_id=shop["board"], supplier="LCSC", unit_price=1.5, source="manual"))
+        session.flush()
+        session.rollback()
+
+    assert service.cache.get(("summary", shop["lamp"], 1)) is not None
+
+
+def test_unknown_project_and_invalid_quantity(service, shop):
+    assert not service.get_project_bom("missing").success
+    assert not service.get_buildable(build_quantity=0).success
@@ -0,0 +1,112 @@
+"""
+Query budgets for the main parts, locations, tags, projects and dashboard calls
+
+Each call runs against a generated inventory large enough that a statement per part,
+location or tag exceeds its budget, so an N+1 introduced in any of them fails here with
+the repeated statement in the message.
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from MakerMatrix.benchmarks.dataset import generate_dataset
+from MakerMatrix.models.location_models import LocationModel
+from MakerMatrix.models.part_models import PartModel
+from MakerMatrix.models.project_models import ProjectModel
+from MakerMatrix.models.tag_models import TagModel
+from MakerMatrix.repositories.location_repositories import LocationRepository
+from MakerMatrix.repositories.parts_repositories import PartRepository
+from MakerMatrix.services.data.dashboard_service import DashboardService
+from MakerMatrix.services.data.location_service import LocationService
+from MakerMatrix.services.data.part_service import PartService
+from MakerMatrix.services.data.project_service import ProjectService
+from MakerMatrix.services.data.tag_service import TagService
+from MakerMatrix.tests.query_budget import QueryBudgetExceeded, assert_max_queries
+from MakerMatrix.tests.test_database_config import create_shared_memory_engine
+
+
+@pytest.fixture(name="engine", scope="module")
+def engine_fixture():
+    engine = create_shared_memory_engine()
+    generate_dataset(engine, 300, seed=7)
+    yield engine
+
+
+@pytest.fixture(name="ids", scope="module")
+def ids_fixture(engine):
+    with Session(engine) as session:
+        return {
+            "part": session.exec(select(PartModel.id)).first(),
+            "location": session.exec(select(LocationModel.id).where(LocationModel.parent_id.is_(None))).first(),
+            "tag": session.exec(select(TagModel.id)).first(),
+            "project": session.exec(select(ProjectModel.id)).first(),
+        }
+
+
+def test_parts_budgets(engine, ids):
+    service = PartService(engine)
+    with assert_max_queries(12, "get_all_parts"):
+        assert service.get_all_parts(page=1, page_size=20).success
+    with assert_max_queries(12, "get_part_by_id"):
+        assert service.get_part_by_id(ids["part"]).success
+    with assert_max_queries(12, "search_parts_text"):
+        service.search_parts_text("res", page=1, page_size=20)
+    with assert_max_queries(2, "get_part_counts"):
+        service.get_part_counts()
+
+
+def test_locations_budgets(engine, ids):
+    service = LocationService(engine)
+    with assert_max_queries(3, "get_all_locations"):
+        assert service.get_all_locations().success
+    with assert_max_queries(5, "get_location_details"):
+        assert service.get_location_details(ids["location"]).success
+    with assert_max_queries(3, "get_location_path"):
+        assert service.get_location_path(ids["location"]).success
+
+
+def test_location_subtree_budgets(engine, ids):
+    # The subtree comes from one range query on the materialized path, whatever its depth
+    with Session(engine) as session:
+        with assert_max_queries(2, "get_location_hierarchy"):
+            hierarchy = LocationRepository.get_location_hierarchy(session, ids["location"])
+        with assert_max_queries(12, "get_parts_by_location_id(recursive=True)"):
+            parts = PartRepository.get_parts_by_location_id(session, ids["location"], recursive=True)
+
+    assert len(hierarchy["affected_location_ids"]) > 8
+    assert len(parts) > 16
+
+
+def test_tags_budgets(engine, ids):
+    service = TagService(engine)
+    with assert_max_queries(12, "get_all_tags"):
+        assert service.get_all_tags().success
+    with assert_max_queries(40, "get_parts_by_tag"):
+        assert service.get_parts_by_tag(ids["tag"]).success
+    with assert_max_queries(16, "get_tag_statistics"):
+        assert service.get_tag_statistics().success
+
+
+def test_projects_budgets(engine, ids):
+    service = ProjectService(engine)
+    with assert_max_queries(2, "get_all_projects"):
+        assert service.get_all_projects().success
+    with assert_max_queries(12, "get_parts_for_project"):
+        assert service.get_parts_for_project(ids["project"]).success
+
+
+@pytest.mark.query_budget(15)
+def test_dashboard_summary_budget(engine):
+    assert DashboardService(engine_override=engine).get_dashboard_summary(use_cache=False)
+
+
+def test_exceeded_budget_reports_the_repeated_statement(engine):
+    with pytest.raises(QueryBudgetExceeded) as excinfo:
+        with assert_max_queries(2, "loop"):
+            with engine.connect() as conn:
+                for _ in range(5):
+                    conn.execute(text("SELECT 1"))
+
+    assert "loop exceeded its budget of 2 statements" in str(excinfo.value)
+    assert "5 x SELECT 1" in str(excinfo.value)
@@ -0,0 +1,171 @@
+"""
+Tests for request metrics
+
+SQL statements and rows are counted per request (also from threadpool endpoints), requests
+are recorded under their route template, slow requests are logged without bound values and
+the metrics render in the Prometheus text format.
+"""
+
+import logging
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+import MakerMatrix.middleware.request_metrics as middleware_module
+from MakerMatrix.database.query_stats import (
+    InstrumentedConnection,
+    redact_parameters,
+    register_query_hooks,
+    track_queries,
+)
+from MakerMatrix.middleware.request_metrics import request_metrics_middleware
+from MakerMatrix.services.system.request_metrics import RequestMetrics
+
+
+@pytest.fixture(name="engine")
+def engine_fixture():
+    register_query_hooks()
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False, "factory": InstrumentedConnection},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, secret TEXT)"))
+        conn.execute(text("INSERT INTO item (secret) VALUES ('a'), ('b'), ('c')"))
+    return engine
+
+
+@pytest.fixture(name="metrics")
+def metrics_fixture(monkeypatch):
+    # Every request counts as slow
+    metrics = RequestMetrics(slow_request_ms=0.001, server_timing=True)
+    monkeypatch.setattr(middleware_module, "request_metrics", metrics)
+    return metrics
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine, metrics):
+    app = FastAPI()
+    app.middleware("http")(request_metrics_middleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        # Sync endpoint: runs in the threadpool
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT secret FROM item WHERE id = :id"), {"id": item_id}).all()
+            rows = conn.execute(text("SELECT * FROM item")).all()
+        return {"rows": len(rows)}
+
+    router = APIRouter()
+
+    @router.get("/{name}/detail")
+    async def get_detail(name: str):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1")).first()
+        return {}
+
+    app.include_router(router, prefix="/api/things")
+
+    @app.get("/export")
+    def export():
+        def rows():
+            # Runs while the body is sent, after the headers went out
+            with engine.connect() as conn:
+                for item_id in (1, 2, 3):
+                    yield conn.execute(text("SELECT secret FROM item WHERE id = :id"), {"id": item_id}).scalar()
+
+        return StreamingResponse(rows(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def _sample(metrics: RequestMetrics, line_start: str) -> float:
+    for line in metrics.render().splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not in metrics")
+
+
+def test_counts_statements_and_rows_per_route_template(client, metrics):
+    assert client.get("/items/1").status_code == 200
+    assert client.get("/items/2").status_code == 200
+    client.get("/api/things/x/detail")
+
+    route = 'method="GET",route="/items/{item_id}"'
+    assert _sample(metrics, f"makermatrix_http_request_duration_seconds_count{{{route}}}") == 2
+    assert _sample(metrics, f"makermatrix_http_request_db_statements_sum{{{route}}}") == 8
+    # Three single-row lookups plus the three-row scan, per request
+    assert _sample(metrics, f"makermatrix_http_request_db_rows_sum{{{route}}}") == 12
+    assert _sample(metrics, f'makermatrix_http_requests_total{{{route},status="200"}}') == 2
+    # Routes of included routers are reported with the router prefix
+    assert (
+        _sample(metrics, 'makermatrix_http_request_db_statements_sum{method="GET",route="/api/things/{name}/detail"}')
+        == 1
+    )
+    assert _sample(metrics, f"makermatrix_http_request_event_loop_lag_seconds_count{{{route}}}") == 2
+
+
+def test_unmatched_paths_share_one_series(client, metrics):
+    client.get("/nope/1")
+    client.get("/nope/2")
+
+    assert _sample(metrics, 'makermatrix_http_requests_total{method="GET",route="unmatched",status="404"}') == 2
+
+
+def test_server_timing_header(client):
+    response = client.get("/items/1")
+
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert "db;dur=" in response.headers["Server-Timing"]
+    assert "4 statements, 6 rows" in response.headers["Server-Timing"]
+
+
+def test_streamed_body_is_counted_until_it_ends(client, metrics):
+    response = client.get("/export")
+
+    assert response.text == "abc"
+    assert _sample(metrics, 'makermatrix_http_request_db_statements_sum{method="GET",route="/export"}') == 3
+    assert _sample(metrics, 'makermatrix_http_request_db_rows_sum{method="GET",route="/export"}') == 3
+    assert metrics.in_progress == 0
+
+
+def test_slow_requests_log_statements_without_values(client, caplog):
+    with caplog.at_level(logging.WARNING, logger="MakerMatrix.services.system.request_metrics"):
+        client.get("/items/1")
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("Slow request GET /items/{item_id} -> 200")
+    assert "x3    SELECT secret FROM item WHERE id = ?" in message
+    assert "<int>" in message
+    assert "'1'" not in message
+
+
+def test_histogram_buckets_are_cumulative(metrics, engine):
+    with track_queries() as stats:
+        pass
+    for seconds in (0.001, 0.2, 20):
+        metrics.record("GET", "/x", 200, seconds, stats)
+
+    lines = [line for line in metrics.render().splitlines() if line.startswith("makermatrix_http_request_duration")]
+    assert 'makermatrix_http_request_duration_seconds_bucket{method="GET",route="/x",le="0.005"} 1' in lines
+    assert 'makermatrix_http_request_duration_seconds_bucket{method="GET",route="/x",le="0.25"} 2' in lines
+    assert 'makermatrix_http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"} 3' in lines
+    assert 'makermatrix_http_request_duration_seconds_count{method="GET",route="/x"} 3' in lines
+
+
+def test_statements_outside_a_scope_are_not_attributed(engine):
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1")).all()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1")).all()
+
+    assert (stats.statements, stats.rows) == (1, 1)
+    assert redact_parameters({"name": "secret", "id": None}) == {"name": "<str>", "id": "NULL"}
+    assert redact_parameters([("a",), ("b",)], executemany=True) == "<2 parameter sets>"
@@ -0,0 +1,81 @@
+"""
+Tests for the startup report, the FAST_START setup fingerprint and lazy supplier loading
+
+Steps are timed whether they are blocking or async; a failing optional step is recorded
+without stopping startup. The fingerprint stored in the database changes with the inputs
+of the setup, such as supplier credentials in the environment.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from MakerMatrix.services.system.startup import (
+    StartupReport,
+    setup_fingerprint,
+    setup_is_current,
+    write_setup_fingerprint,
+)
+from MakerMatrix.suppliers.registry import SupplierRegistry, get_available_suppliers
+
+
+@pytest.mark.asyncio
+async def test_steps_are_timed_and_failures_recorded():
+    report = StartupReport()
+    report.begin()
+    loop_thread = threading.current_thread()
+
+    def blocking_step():
+        return threading.current_thread() is not loop_thread
+
+    async def async_step():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    def failing_step():
+        raise RuntimeError("no printer")
+
+    assert await report.run("blocking", blocking_step) is True
+    assert await report.run("async", async_step) == "done"
+    assert await report.run("optional", failing_step) is None
+    with pytest.raises(RuntimeError):
+        await report.run("required", failing_step, required=True)
+    report.skip("setup")
+    report.ready()
+
+    steps = {step["name"]: step for step in report.to_dict()["steps"]}
+    assert steps["async"]["duration_ms"] >= 10
+    assert steps["optional"]["status"] == "failed"
+    assert steps["optional"]["error"] == "no printer"
+    assert steps["setup"]["status"] == "skipped"
+    assert report.failed
+    assert 'makermatrix_startup_step_seconds{step="blocking",status="ok"}' in report.render()
+    assert report.summary().startswith("Startup ready in")
+
+
+def test_setup_fingerprint_round_trip(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    monkeypatch.delenv("MOUSER_API_KEY", raising=False)
+    fingerprint = setup_fingerprint()
+    assert 0 < fingerprint < 2**31
+    assert fingerprint == setup_fingerprint()
+
+    assert not setup_is_current(engine, fingerprint)
+    write_setup_fingerprint(engine, fingerprint)
+    assert setup_is_current(engine, fingerprint)
+
+    # New credentials in the environment need the supplier setup to run again
+    monkeypatch.setenv("MOUSER_API_KEY", "key")
+    assert not setup_is_current(engine, setup_fingerprint())
+
+
+def test_suppliers_are_listed_before_their_modules_load():
+    assert "digikey" in get_available_suppliers()
+    assert SupplierRegistry.is_supplier_available("seeedstudio")
+
+    supplier = SupplierRegistry.get_supplier("digikey")
+    assert type(supplier).__name__ == "DigiKeySupplier"
+    assert "digikey" in SupplierRegistry._suppliers
+    assert get_available_suppliers().count("digikey") == 1
@@ -0,0 +1,161 @@
+"""
+Unit tests for supplier batch lookups.
+
+Covers the BaseSupplier bulk_get_part_details() fan-out/batching logic and the
+Mouser multi-part-number implementation without making real API calls.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from MakerMatrix.suppliers.base import SupplierCapability, PartSearchResult
+from MakerMatrix.suppliers.lcsc import LCSCSupplier
+from MakerMatrix.suppliers.mouser import MouserSupplier
+from MakerMatrix.suppliers.http_client import HTTPResponse
+
+
+def _mouser_part(mouser_pn: str, mpn: str) -> dict:
+    return {
+        "MouserPartNumber": mouser_pn,
+        "ManufacturerPartNumber": mpn,
+        "Manufacturer": "Yageo",
+        "Description": "Thick Film Resistor",
+        "PriceBreaks": [{"Quantity": 1, "Price": "$0.10", "Currency": "USD"}],
+        "Availability": "1,234 In Stock",
+    }
+
+
+class TestFanOutFallback:
+    """Suppliers without BULK_SEARCH fan out get_part_details() with bounded concurrency"""
+
+    def setup_method(self):
+        self.supplier = LCSCSupplier()
+        self.supplier.configure({}, {"bulk_concurrency": 2})
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_dedupe(self):
+        in_flight = 0
+        max_in_flight = 0
+        calls = []
+
+        async def fake_details(part_number):
+            nonlocal in_flight, max_in_flight
+            calls.append(part_number)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return None if part_number == "C404" else PartSearchResult(supplier_part_number=part_number)
+
+        with patch.object(self.supplier, "get_part_details", side_effect=fake_details):
+            results = await self.supplier.bulk_get_part_details(["C1", "C2", "C1", "C3", "C404", ""])
+
+        assert sorted(calls) == ["C1", "C2", "C3", "C404"]
+        assert max_in_flight <= 2
+        assert set(results) == {"C1", "C2", "C3", "C404"}
+        assert results["C404"] is None
+        assert results["C2"].supplier_part_number == "C2"
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_does_not_abort_batch(self):
+        async def fake_details(part_number):
+            if part_number == "C2":
+                raise RuntimeError("boom")
+            return PartSearchResult(supplier_part_number=part_number)
+
+        with patch.object(self.supplier, "get_part_details", side_effect=fake_details):
+            results = await self.supplier.bulk_get_part_details(["C1", "C2"])
+
+        assert results["C1"] is not None
+        assert results["C2"] is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_fetch_pricing_stock(self):
+        part = PartSearchResult(
+            supplier_part_number="C1", pricing=[{"quantity": 1, "price": 0.5, "currency": "USD"}], stock_quantity=7
+        )
+        with patch.object(self.supplier, "bulk_get_part_details", AsyncMock(return_value={"C1": part, "C2": None})):
+            results = await self.supplier.bulk_fetch_pricing_stock(["C1", "C2"])
+
+        assert results["C1"] == {"pricing": part.pricing, "stock_quantity": 7}
+        assert results["C2"] is None
+
+    @pytest.mark.asyncio
+    async def test_default_batch_fetch_resolves_parts_one_by_one(self):
+        async def fake_details(part_number):
+            return None if part_number == "C404" else PartSearchResult(supplier_part_number=part_number)
+
+        with patch.object(self.supplier, "get_part_details", side_effect=fake_details):
+            found = await self.supplier._fetch_part_details_batch(["C1", "C404"])
+
+        assert list(found) == ["C1"]
+
+
+class TestMouserBatchLookup:
+    """Mouser packs up to 10 part numbers into each part number search"""
+
+    def setup_method(self):
+        self.supplier = MouserSupplier()
+        self.supplier.configure({"api_key": "test"}, {})
+
+    def test_declares_bulk_capability(self):
+        assert SupplierCapability.BULK_SEARCH in self.supplier.get_capabilities()
+        assert self.supplier.is_capability_available(SupplierCapability.BULK_SEARCH)
+        assert self.supplier.get_bulk_batch_size() == 10
+
+    @pytest.mark.asyncio
+    async def test_batches_part_numbers_per_request(self):
+        requested = [f"603-RC0603FR-07{i}KL" for i in range(25)]
+        queries = []
+
+        async def fake_search(query, endpoint_type):
+            queries.append(query)
+            parts = [_mouser_part(pn, pn.split("-", 1)[1]) for pn in query.split("|")]
+            return HTTPResponse(status=200, data={"SearchResults": {"Parts": parts}}, headers={}, url="", duration_ms=1)
+
+        with (
+            patch.object(self.supplier, "_search_by_part_number", side_effect=fake_search),
+            patch.object(self.supplier, "_get_rate_limit_service", return_value=None),
+        ):
+            results = await self.supplier.bulk_get_part_details(requested)
+
+        assert len(queries) == 3
+        assert sorted(len(q.split("|")) for q in queries) == [5, 10, 10]
+        assert all(results[pn] is not None for pn in requested)
+        assert results[requested[0]].pricing[0]["price"] == 0.10
+
+    @pytest.mark.asyncio
+    async def test_matches_on_manufacturer_part_number(self):
+        async def fake_search(query, endpoint_type):
+            parts = [_mouser_part("603-RC0603FR-0710KL", "RC0603FR-0710KL")]
+            return HTTPResponse(status=200, data={"SearchResults": {"Parts": parts}}, headers={}, url="", duration_ms=1)
+
+        with (
+            patch.object(self.supplier, "_search_by_part_number", side_effect=fake_search),
+            patch.object(self.supplier, "_get_rate_limit_service", return_value=None),
+        ):
+            results = await self.supplier.bulk_get_part_details(["rc0603fr-0710kl", "NOPE-123"])
+
+        assert results["rc0603fr-0710kl"].supplier_part_number == "603-RC0603FR-0710KL"
+        assert results["NOPE-123"] is None
+
+    @pytest.mark.asyncio
+    async def test_enrich_part_uses_primed_details(self):
+        primed = PartSearchResult(
+            supplier_part_number="603-X",
+            datasheet_url="https://example.com/ds.pdf",
+            pricing=[{"quantity": 1, "price": 1.0, "currency": "USD"}],
+            stock_quantity=3,
+        )
+        self.supplier.prime_part_details({"603-X": primed})
+
+        with (
+            patch.object(self.supplier, "get_part_details", AsyncMock()) as get_details,
+            patch.object(self.supplier, "_get_rate_limit_service", return_value=None),
+        ):
+            result = await self.supplier.enrich_part("603-X")
+
+        get_details.assert_not_called()
+        assert result.success
+        assert result.data is primed
@@ -0,0 +1,167 @@
+"""
+Tests for the supplier usage rollups
+
+Window counts and summaries match the raw rows whether or not they have been folded,
+raw rows are only pruned once folded, and windows reaching past the raw retention are
+rounded to the buckets still kept.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from MakerMatrix.models.rate_limiting_models import SupplierUsageBucketModel, SupplierUsageTrackingModel
+from MakerMatrix.repositories.rate_limit_repository import RateLimitRepository
+from MakerMatrix.repositories.supplier_usage_bucket_repository import (
+    LATENCY_COLUMNS,
+    SupplierUsageBucketRepository,
+    latency_percentiles,
+    plan_window,
+    retention_cutoffs,
+)
+from MakerMatrix.services.system.supplier_usage_rollup import SupplierUsageRollup
+
+NOW = datetime(2026, 3, 10, 12, 30, 20)
+
+
+def _record(engine, *ages, supplier="LCSC", endpoint="search", success=True, response_time_ms=100):
+    with Session(engine) as session:
+        for age in ages:
+            session.add(
+                SupplierUsageTrackingModel(
+                    supplier_name=supplier,
+                    endpoint_type=endpoint,
+                    success=success,
+                    response_time_ms=response_time_ms,
+                    request_timestamp=NOW - age,
+                )
+            )
+        session.commit()
+
+
+def _counts(engine, supplier="LCSC"):
+    starts = {
+        "per_minute": NOW - timedelta(minutes=1),
+        "per_hour": NOW - timedelta(hours=1),
+        "per_day": NOW - timedelta(days=1),
+    }
+    with engine.connect() as conn:
+        return SupplierUsageBucketRepository.window_counts(conn, supplier, starts, NOW)
+
+
+def test_counts_are_the_same_before_and_after_folding(engine):
+    ages = [timedelta(seconds=s) for s in (5, 50, 70, 600, 3500, 3700, 20000, 86000, 90000)]
+    _record(engine, *ages)
+    _record(engine, timedelta(seconds=30), supplier="DigiKey")
+    expected = {"per_minute": 2, "per_hour": 5, "per_day": 8}
+
+    assert _counts(engine) == expected
+
+    result = SupplierUsageRollup(engine).run_once(NOW)
+
+    assert result["rows_folded"] == 6  # Requests of the last two minutes stay raw
+    assert _counts(engine) == expected
+    assert _counts(engine, "DigiKey") == {"per_minute": 1, "per_hour": 1, "per_day": 1}
+
+
+def test_fold_is_incremental(engine):
+    rollup = SupplierUsageRollup(engine)
+    _record(engine, timedelta(minutes=30))
+    rollup.run_once(NOW - timedelta(minutes=10))
+    _record(engine, timedelta(minutes=5))
+    rollup.run_once(NOW)
+
+    with Session(engine) as session:
+        hours = session.exec(
+            select(SupplierUsageBucketModel).where(SupplierUsageBucketModel.resolution == "hour")
+        ).all()
+    assert [bucket.total_requests for bucket in hours] == [2]
+    assert _counts(engine)["per_hour"] == 2
+
+
+def test_summary_has_failures_and_percentiles(engine):
+    _record(engine, *[timedelta(minutes=10)] * 90, response_time_ms=40)
+    _record(engine, *[timedelta(minutes=10)] * 10, endpoint="details", success=False, response_time_ms=800)
+    SupplierUsageRollup(engine).run_once(NOW)
+
+    with Session(engine) as session:
+        summary = RateLimitRepository().get_usage_summary(session, "LCSC", NOW - timedelta(hours=1), NOW)
+
+    assert summary["total_requests"] == 100
+    assert summary["failed_requests"] == 10
+    assert summary["endpoint_breakdown"] == {"search": 90, "details": 10}
+    assert summary["avg_response_time"] == pytest.approx(116)
+    percentiles = summary["response_time_percentiles"]
+    assert 0 < percentiles["p50"] <= 50
+    assert 500 < percentiles["p95"] <= 800
+    assert percentiles["p99"] <= 800
+
+
+def test_prune_keeps_raw_rows_until_folded(engine):
+    _record(engine, timedelta(days=5), timedelta(days=3))
+    with engine.begin() as conn:
+        assert SupplierUsageBucketRepository.prune(conn, NOW)["raw"] == 0
+
+    SupplierUsageRollup(engine).run_once(NOW)
+
+    with Session(engine) as session:
+        assert session.exec(select(SupplierUsageTrackingModel)).all() == []
+    # Minute buckets are kept for a week, so the days-old requests are still counted
+    with engine.connect() as conn:
+        counts = SupplierUsageBucketRepository.window_counts(conn, "LCSC", {"week": NOW - timedelta(days=7)}, NOW)
+    assert counts == {"week": 2}
+
+
+def test_window_queries_search_from_the_earliest_start(engine):
+    _record(engine, timedelta(minutes=30), timedelta(days=3))
+    SupplierUsageRollup(engine).run_once(NOW)
+
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert _counts(engine)["per_day"] == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    counting = [(sql, params) for sql, params in statements if "sum(" in sql]
+    assert len(counting) == 2
+    with engine.connect() as conn:
+        for sql, params in counting:
+            plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+            assert all(detail.startswith("SEARCH") for detail in plan), plan
+            assert "<" in plan[0] or ">" in plan[0], plan
+
+
+def test_plan_uses_coarse_buckets_and_raw_edges():
+    watermark = datetime(2026, 3, 10, 12, 28)
+    segments = plan_window(datetime(2026, 3, 9, 22, 58, 30), watermark, watermark, retention_cutoffs(NOW))
+
+    assert segments == [
+        ("raw", datetime(2026, 3, 9, 22, 58, 30), datetime(2026, 3, 9, 22, 59)),
+        ("minute", datetime(2026, 3, 9, 22, 59), datetime(2026, 3, 9, 23, 0)),
+        ("hour", datetime(2026, 3, 9, 23, 0), datetime(2026, 3, 10, 0, 0)),
+        ("day", datetime(2026, 3, 10, 0, 0), watermark),
+    ]
+
+
+def test_plan_rounds_down_once_raw_rows_are_gone():
+    watermark = datetime(2026, 3, 10, 12, 28)
+    segments = plan_window(
+        datetime(2026, 2, 1, 10, 15, 30), datetime(2026, 2, 1, 13), watermark, retention_cutoffs(NOW)
+    )
+
+    # Older than the minute buckets too: rounded to the hour
+    assert segments == [("hour", datetime(2026, 2, 1, 10), datetime(2026, 2, 1, 13))]
+
+
+def test_percentiles_of_an_empty_histogram():
+    empty = {column: 0 for column in LATENCY_COLUMNS}
+    empty["max_response_time_ms"] = None
+
+    assert latency_percentiles(empty) == {"p50": None, "p95": None, "p99": None}
@@ -0,0 +1,149 @@
+"""
+Tests for coalesced task progress
+
+TaskProgressChannel keeps progress in memory and persists it at a bounded rate;
+TaskService folds the pending progress and the log buffer into the status transition
+that ends a task.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlmodel import Session
+
+from MakerMatrix.models.task_models import TaskModel, TaskStatus, TaskType, UpdateTaskRequest
+from MakerMatrix.services.system.task_progress import TaskProgressChannel
+from MakerMatrix.services.system.task_service import TaskService
+
+
+class RecordingTaskService:
+    """Stands in for TaskService and records the writes a channel makes"""
+
+    def __init__(self):
+        self.updates = []
+
+    async def update_task(self, task_id, update_request):
+        self.updates.append(update_request)
+
+
+@pytest.fixture(autouse=True)
+def websocket_manager():
+    with patch("MakerMatrix.services.system.websocket_service.websocket_manager") as manager:
+        manager.broadcast_task_update = AsyncMock()
+        manager.broadcast_task_logs = AsyncMock()
+        yield manager
+
+
+def make_task():
+    return TaskModel(id="task-1", task_type=TaskType.BACKUP_CREATION, name="Backup")
+
+
+@pytest.mark.asyncio
+async def test_rapid_updates_are_coalesced_into_few_writes():
+    service = RecordingTaskService()
+    channel = TaskProgressChannel(service, make_task(), persist_interval=0.2, broadcast_interval=0.01)
+
+    for i in range(1000):
+        await channel.update(i // 10, f"Copying file {i}")
+    await asyncio.sleep(0.3)  # Let the trailing write run
+
+    assert len(service.updates) <= 3
+    assert service.updates[-1].progress_percentage == 99
+    assert service.updates[-1].current_step == "Copying file 999"
+    assert channel.stats["updates"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_unchanged_progress_is_not_written_again():
+    service = RecordingTaskService()
+    channel = TaskProgressChannel(service, make_task(), persist_interval=0)
+
+    await channel.update(10, "Step")
+    await channel.update(10, "Step")
+
+    assert len(service.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_progress_between_writes_is_broadcast(websocket_manager):
+    service = RecordingTaskService()
+    channel = TaskProgressChannel(service, make_task(), persist_interval=60, broadcast_interval=0)
+
+    await channel.update(5, "First")  # Persisted
+    await channel.update(6, "Second")  # Broadcast only
+    await asyncio.sleep(0)
+    channel.close()
+
+    assert len(service.updates) == 1
+    sent = websocket_manager.broadcast_task_update.call_args.args[0]
+    assert sent["progress_percentage"] == 6 and sent["current_step"] == "Second"
+    assert sent["name"] == "Backup"
+
+
+@pytest.mark.asyncio
+async def test_log_lines_are_kept_in_a_ring_buffer(websocket_manager):
+    channel = TaskProgressChannel(RecordingTaskService(), make_task(), broadcast_interval=0, log_capacity=3)
+
+    for i in range(5):
+        channel.log("info", f"line {i}")
+    await asyncio.sleep(0.01)
+
+    assert [entry["message"] for entry in channel.log_entries()] == ["line 2", "line 3", "line 4"]
+    # The lines of one interval go out as one message
+    websocket_manager.broadcast_task_logs.assert_awaited_once()
+    task_id, entries = websocket_manager.broadcast_task_logs.call_args.args
+    assert [entry["message"] for entry in entries] == ["line 2", "line 3", "line 4"]
+
+
+@pytest.mark.asyncio
+async def test_close_returns_pending_state_and_stops_writes():
+    service = RecordingTaskService()
+    channel = TaskProgressChannel(service, make_task(), persist_interval=0.02)
+
+    await channel.update(10, "Start")
+    await channel.update(50, "Halfway")  # Waiting for the trailing write
+    channel.log("warning", "slow disk")
+    pending = channel.close()
+    await asyncio.sleep(0.05)
+    await channel.update(60, "Ignored")
+
+    assert pending.progress == 50 and pending.step == "Halfway"
+    assert pending.log_entries[0]["message"] == "slow disk"
+    assert len(service.updates) == 1
+
+
+@pytest.mark.asyncio
+async def test_status_transition_writes_pending_progress_and_logs(engine):
+    service = TaskService()
+    service.engine = engine
+
+    task = make_task()
+    with Session(engine) as session:
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+
+    channel = service.progress_channel(task)
+    channel.persist_interval = 60
+    await channel.update(10, "Copying")
+    await channel.update(40, "Copying more")
+    channel.log("info", "copied 400 files")
+
+    await service.update_task(task.id, UpdateTaskRequest(status=TaskStatus.FAILED, error_message="disk full"))
+
+    with Session(engine) as session:
+        stored = session.get(TaskModel, task.id)
+        assert stored.status == TaskStatus.FAILED
+        assert stored.progress_percentage == 40
+        assert stored.current_step == "Copying more"
+        assert [entry["message"] for entry in stored.get_log_entries()] == ["copied 400 files"]
+
+    assert task.id not in service.progress_channels
+    assert await service.get_task_logs(task.id) == stored.get_log_entries()
+
+    # Reports arriving after the final status do not open a new channel
+    late = service.progress_channel(task)
+    assert late.closed
+    late.log("info", "too late")
+    assert task.id not in service.progress_channels
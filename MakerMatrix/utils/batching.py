@@ -0,0 +1,18 @@
+"""
+Splitting id lists into chunks for IN (...) filters and multi-row INSERTs.
+
+SQLite limits the number of bound parameters per statement, so queries over an unbounded
+set of ids run once per chunk.
+"""
+
+from typing import Any, Iterable, Iterator, List
+
+# Keep IN (...) lists well below SQLite's bound parameter limit
+CHUNK_SIZE = 500
+
+
+def chunks(values: Iterable[Any], size: int = CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Consecutive lists of at most `size` values"""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
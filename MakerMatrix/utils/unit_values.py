@@ -0,0 +1,152 @@
+"""
+Parsing of electrical property values such as "10k", "100nF", "4k7", "1/4W" or "25 V".
+
+Values are normalized to SI base units so that "4.7uF" and "4700nF" compare equal and
+can be range filtered. Property keys (e.g. "resistance", "voltage_rating") supply the
+unit when the value itself only has a multiplier.
+"""
+
+import re
+from typing import Optional, Tuple
+
+SI_PREFIXES = {
+    "p": 1e-12,
+    "n": 1e-9,
+    "u": 1e-6,
+    "µ": 1e-6,
+    "μ": 1e-6,
+    "m": 1e-3,
+    "": 1.0,
+    "k": 1e3,
+    "K": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+}
+
+# Unit spelling (lowercase) -> canonical unit
+UNIT_ALIASES = {
+    "ω": "ohm",
+    "Ω": "ohm",
+    "ohm": "ohm",
+    "ohms": "ohm",
+    "r": "ohm",
+    "f": "F",
+    "v": "V",
+    "vdc": "V",
+    "vac": "V",
+    "w": "W",
+    "a": "A",
+    "hz": "Hz",
+    "h": "H",
+    "%": "%",
+    "°c": "°C",
+    "c": "°C",
+}
+
+# Property key fragment -> unit implied for bare values like "10k"
+KEY_UNITS = (
+    ("resistance", "ohm"),
+    ("capacitance", "F"),
+    ("inductance", "H"),
+    ("voltage", "V"),
+    ("power", "W"),
+    ("current", "A"),
+    ("frequency", "Hz"),
+    ("tolerance", "%"),
+)
+
+_PREFIX_PATTERN = "[pnuµμmkKMG]?"
+_UNIT_PATTERN = r"(?:ohms?|Ω|ω|vdc|vac|hz|°c|[rfvwah%c])?"
+
+# 10k, 100 nF, -40°C, 0.25W, ±5%
+_VALUE_RE = re.compile(rf"^[±+]?(-?\d+(?:\.\d+)?|\.\d+)\s*({_PREFIX_PATTERN})\s*({_UNIT_PATTERN})$", re.IGNORECASE)
+# 1/4W
+_FRACTION_RE = re.compile(rf"^(\d+)\s*/\s*(\d+)\s*({_PREFIX_PATTERN})\s*({_UNIT_PATTERN})$", re.IGNORECASE)
+# 4k7, 4R7, 2u2F (the multiplier marks the decimal point)
+_INFIX_RE = re.compile(r"^(\d+)([pnuµμkKMGR])(\d+)\s*(ohms?|Ω|[fvwah])?$", re.IGNORECASE)
+# 0603, 0402: zero-padded digits are codes (package sizes, pin counts), not quantities
+_ZERO_PADDED_RE = re.compile(r"^-?0\d")
+
+
+def unit_for_key(key: Optional[str]) -> Optional[str]:
+    """Return the unit implied by a property key, if any."""
+    if not key:
+        return None
+    key = key.lower()
+    for fragment, unit in KEY_UNITS:
+        if fragment in key:
+            return unit
+    return None
+
+
+def _canonical_unit(unit: str) -> Optional[str]:
+    if not unit:
+        return None
+    return UNIT_ALIASES.get(unit.lower(), UNIT_ALIASES.get(unit))
+
+
+def _prefix_factor(prefix: str, unit: Optional[str]) -> Optional[float]:
+    # Case matters for m/M; "K" is accepted for kilo. Percentages and temperatures take no prefix.
+    if prefix and unit in ("%", "°C"):
+        return None
+    return SI_PREFIXES.get(prefix)
+
+
+def parse_value(value, key: Optional[str] = None) -> Optional[Tuple[float, Optional[str]]]:
+    """
+    Parse a property value into (number in SI base units, unit).
+
+    Returns None when the value is not a single numeric quantity (e.g. "SOIC-8",
+    "-40°C~+85°C", "0603"). Plain numbers take the unit implied by `key`, if any.
+
+    Examples:
+        parse_value("10k", "resistance") -> (10000.0, "ohm")
+        parse_value("100nF") -> (1e-07, "F")
+        parse_value("4k7") -> (4700.0, "ohm")
+        parse_value("1/4W") -> (0.25, "W")
+    """
+    if isinstance(value, bool) or value is None:
+        return None
+    key_unit = unit_for_key(key)
+    if isinstance(value, (int, float)):
+        return float(value), key_unit
+
+    text = str(value).strip().replace(",", "")
+    if not text or len(text) > 32:
+        return None
+
+    match = _VALUE_RE.match(text)
+    if match:
+        number, prefix, unit_text = match.groups()
+        if _ZERO_PADDED_RE.match(number):
+            return None
+        unit = _canonical_unit(unit_text) or key_unit
+        if unit_text and unit is None:
+            return None
+        factor = _prefix_factor(prefix, unit)
+        if factor is None:
+            return None
+        return float(number) * factor, unit
+
+    match = _FRACTION_RE.match(text)
+    if match:
+        numerator, denominator, prefix, unit_text = match.groups()
+        unit = _canonical_unit(unit_text) or key_unit
+        factor = _prefix_factor(prefix, unit)
+        if unit is None or factor is None or int(denominator) == 0:
+            return None
+        return int(numerator) / int(denominator) * factor, unit
+
+    match = _INFIX_RE.match(text)
+    if match:
+        whole, marker, fraction, unit_text = match.groups()
+        if marker.upper() == "R":
+            unit, factor = "ohm", 1.0
+        else:
+            unit = _canonical_unit(unit_text or "") or key_unit or ("ohm" if marker in "kKMG" else None)
+            factor = _prefix_factor(marker, unit)
+        if unit is None or factor is None:
+            return None
+        return float(f"{whole}.{fraction}") * factor, unit
+
+    return None